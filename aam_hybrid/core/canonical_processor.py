@@ -9,12 +9,19 @@ Processing Pipeline:
 2. Validate: Check schema compliance and data quality
 3. Enrich: Add metadata for observability and lineage tracking
 4. Filter: Remove invalid events with warning logs
+
+Field-name normalization is memoized: source schemas repeat the same few
+hundred names, so each schema (connector + fingerprint) keeps a plan of
+source name -> snake_case name, backed by a bounded per-name memo.
 """
 
 import logging
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import sys
 
@@ -29,6 +36,85 @@ from app.config.feature_flags import FeatureFlagConfig, FeatureFlag
 
 logger = logging.getLogger(__name__)
 
+# Bounds for the normalization memos
+FIELD_NAME_MEMO_SIZE = 8192
+PLAN_CACHE_SIZE = 1024
+PLAN_MAX_FIELDS = 1024
+
+_CAMEL_WORD = re.compile('(.)([A-Z][a-z]+)')
+_CAMEL_BOUNDARY = re.compile('([a-z0-9])([A-Z])')
+_UNDERSCORE_RUN = re.compile('_+')
+
+# Lower-cased string values with a fixed normalized value
+_STRING_CONSTANTS = {
+    'null': None, 'none': None, 'n/a': None, 'na': None,
+    'true': True, 'yes': True, 'y': True,
+    'false': False, 'no': False, 'n': False,
+}
+_NOT_CONSTANT = object()
+
+
+@lru_cache(maxsize=FIELD_NAME_MEMO_SIZE)
+def to_snake_case(name: str) -> str:
+    """
+    Convert field name to snake_case (memoized).
+    
+    Examples:
+        "firstName" -> "first_name"
+        "First Name" -> "first_name"
+        "FIRST_NAME" -> "first_name"
+        "first-name" -> "first_name"
+    """
+    # Handle acronyms and camelCase
+    s1 = _CAMEL_WORD.sub(r'\1_\2', name)
+    s2 = _CAMEL_BOUNDARY.sub(r'\1_\2', s1)
+    
+    # Replace spaces and hyphens with underscores
+    s3 = s2.replace(' ', '_').replace('-', '_')
+    
+    # Convert to lowercase and remove multiple underscores
+    s4 = _UNDERSCORE_RUN.sub('_', s3.lower())
+    
+    # Remove leading/trailing underscores
+    return s4.strip('_')
+
+
+class _NormalizationPlans:
+    """
+    LRU of per-schema field-name plans keyed by (connector, fingerprint hash).
+    
+    A plan maps each source field name seen for that schema to its
+    normalized name; at most PLAN_MAX_FIELDS names are kept per plan.
+    """
+    
+    def __init__(self, max_plans: int = PLAN_CACHE_SIZE):
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[Tuple[str, str], Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, connector_name: str, fingerprint_hash: str) -> Dict[str, str]:
+        key = (connector_name, fingerprint_hash)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                plan = self._plans[key] = {}
+                if len(self._plans) > self.max_plans:
+                    self._plans.popitem(last=False)
+            else:
+                self._plans.move_to_end(key)
+            return plan
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+    
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+# Shared by every processor in the process
+_normalization_plans = _NormalizationPlans()
+
 
 class CanonicalProcessor:
     """
@@ -117,18 +203,17 @@ class CanonicalProcessor:
                         normalized_event.metadata["drift_severity"] = drift_event.severity
                         normalized_event.metadata["drift_event_id"] = drift_event.event_id
                         
-                        # NEW: Process drift with RepairAgent
+                        # NEW: Process drift with the shared RepairAgent
                         if FeatureFlagConfig.is_enabled(FeatureFlag.ENABLE_AUTO_REPAIR):
-                            from .repair_agent import RepairAgent
+                            from .repair_agent import get_repair_coordinator
                             from app.contracts.canonical_event import RepairSummary, RepairHistory
                             
-                            repair_agent = RepairAgent(
-                                redis_client=self.redis_client,
-                                db_session=self.db_session
-                            )
+                            repair_coordinator = get_repair_coordinator(self.redis_client)
                             
                             try:
-                                repair_batch = repair_agent.suggest_repairs(drift_event, normalized_event)
+                                repair_batch = repair_coordinator.suggest_repairs(
+                                    drift_event, normalized_event, db_session=self.db_session
+                                )
                                 
                                 # Build RepairHistory objects with EXPLICIT values
                                 repair_history_list = []
@@ -254,11 +339,16 @@ class CanonicalProcessor:
         event.metadata['original_payload'] = event.payload.copy()
         
         # Normalize payload field names and values
+        plan = self._normalization_plan(event)
         normalized_payload = {}
         
         for field_name, value in event.payload.items():
             # Standardize field name to snake_case
-            normalized_name = self._to_snake_case(field_name)
+            normalized_name = plan.get(field_name)
+            if normalized_name is None:
+                normalized_name = to_snake_case(field_name)
+                if len(plan) < PLAN_MAX_FIELDS:
+                    plan[field_name] = normalized_name
             
             # Infer and convert data types
             normalized_value = self._infer_and_convert_type(value)
@@ -270,7 +360,7 @@ class CanonicalProcessor:
         # Update field mappings to reflect normalized names
         if event.field_mappings:
             for mapping in event.field_mappings:
-                mapping.canonical_field = self._to_snake_case(mapping.canonical_field)
+                mapping.canonical_field = to_snake_case(mapping.canonical_field)
         
         logger.debug(f"Normalized event {event.event_id}: {len(normalized_payload)} fields")
         
@@ -422,33 +512,14 @@ class CanonicalProcessor:
         return event
     
     def _to_snake_case(self, name: str) -> str:
-        """
-        Convert field name to snake_case.
-        
-        Examples:
-            "firstName" -> "first_name"
-            "First Name" -> "first_name"
-            "FIRST_NAME" -> "first_name"
-            "first-name" -> "first_name"
-        
-        Args:
-            name: Field name to convert
-            
-        Returns:
-            snake_case field name
-        """
-        # Handle acronyms and camelCase
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-        s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
-        
-        # Replace spaces and hyphens with underscores
-        s3 = s2.replace(' ', '_').replace('-', '_')
-        
-        # Convert to lowercase and remove multiple underscores
-        s4 = re.sub('_+', '_', s3.lower())
-        
-        # Remove leading/trailing underscores
-        return s4.strip('_')
+        """Convert field name to snake_case (memoized, see to_snake_case)."""
+        return to_snake_case(name)
+    
+    def _normalization_plan(self, event: EntityEvent) -> Dict[str, str]:
+        """Cached field-name plan for the event's source schema."""
+        fingerprint = event.schema_fingerprint
+        fingerprint_hash = fingerprint.fingerprint_hash if fingerprint else ""
+        return _normalization_plans.get(event.connector_name or "", fingerprint_hash or "")
     
     def _infer_and_convert_type(self, value: Any) -> Any:
         """
@@ -472,13 +543,11 @@ class CanonicalProcessor:
         if not isinstance(value, str):
             return value
 
-        if value.lower() in ('null', 'none', 'n/a', 'na'):
-            return None
-
-        if value.lower() in ('true', 'yes', 'y'):
-            return True
-        if value.lower() in ('false', 'no', 'n'):
-            return False
+        # One lookup covers the null and boolean spellings
+        if len(value) <= 5:
+            constant = _STRING_CONSTANTS.get(value.lower(), _NOT_CONSTANT)
+            if constant is not _NOT_CONSTANT:
+                return constant
 
         return value
 
@@ -0,0 +1,518 @@
+"""
+AAM Monitoring Rollups
+
+Per-tenant counters behind /api/v1/aam/metrics, kept in Redis hashes and
+updated from state transitions instead of re-counted on every poll:
+- Connections by status
+- Jobs by status, and repair time of completed jobs, per started_at hour
+- Drift events by source type, per created_at hour
+
+Deltas are collected from SQLAlchemy session flushes (sync and async
+sessions) and applied to Redis only after the transaction commits. Bulk
+INSERT/UPDATE/DELETE statements on the source tables bypass the flush, so
+committing one schedules an immediate reconcile(), which recomputes every
+counter from the source tables. reconcile() also runs periodically to catch
+writes no listener sees (database-level cascades, processes without it).
+
+Redis layout (scope is a tenant ID or "all"):
+    aam:rollup:{scope}:connections   status -> count
+    aam:rollup:{scope}:h:{YYYYMMDDHH} jobs:{status}, repair_s, repair_n, drift:{source}
+    aam:rollup:scopes                set of scopes written by reconcile()
+    aam:rollup:reconciled_at         ISO timestamp of the last reconcile()
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import NO_VALUE
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "aam:rollup"
+ALL_SCOPE = "all"
+WINDOW_HOURS = 24
+# Hour buckets outlive the 24h window by a day so late updates still land
+BUCKET_TTL_S = 48 * 3600
+RECONCILE_INTERVAL_S = float(os.getenv("AAM_ROLLUP_RECONCILE_INTERVAL_S", "300"))
+
+_DELTAS_KEY = "aam_rollup_deltas"
+_HOUR_FORMAT = "%Y%m%d%H"
+
+# Drift sources always present in the metrics response
+DRIFT_SOURCES = ("salesforce", "supabase", "mongodb", "filesource")
+
+
+def _models():
+    """Source table models, imported lazily (they pull in the database settings)."""
+    from aam_hybrid.shared.models import Connection, JobHistory
+    from app.models import DriftEvent
+    return Connection, JobHistory, DriftEvent
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _status(value: Any) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+def _drift_source(old_schema: Any, new_schema: Any) -> str:
+    for schema in (new_schema, old_schema):
+        if isinstance(schema, dict) and schema.get("source_type"):
+            return str(schema["source_type"]).lower()
+    return "unknown"
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class _Deltas:
+    """Counter changes for one transaction: (scope, key suffix) -> field -> delta."""
+
+    def __init__(self):
+        self.counts: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        # connection_id -> tenant (None once deleted), applied to the cache on commit
+        self.connection_tenants: Dict[Any, Optional[str]] = {}
+        self.deleted_connections: set = set()
+        self.stale = False  # a change whose previous value was unknown
+
+    def add(self, scopes: Iterable[str], suffix: str, field: str, amount: float) -> None:
+        for scope in scopes:
+            self.counts[(scope, suffix)][field] += amount
+
+
+class MonitoringRollups:
+    """
+    Redis-backed AAM monitoring counters.
+
+    Usage:
+        rollups = MonitoringRollups(redis_client)
+        rollups.install()                  # track ORM writes in this process
+        rollups.reconcile(session)         # initial / periodic rebuild
+        rollups.snapshot(tenant_id=None)   # one pipelined read
+    """
+
+    def __init__(self, redis_client, clock=datetime.utcnow):
+        """
+        Args:
+            redis_client: Sync Redis client (decoded or raw responses)
+            clock: Source of "now" for windows and bucket expiry
+        """
+        self.redis = redis_client
+        self._clock = clock
+        self._connection_tenants: Dict[Any, Optional[str]] = {}
+        self._targets: List[Any] = []
+        self.needs_reconcile = False
+        self.stats = {"commits_applied": 0, "apply_errors": 0, "reconciles": 0}
+
+    # ------------------------------------------------------------------
+    # Listener installation
+    # ------------------------------------------------------------------
+
+    def install(self, target: Any = Session) -> None:
+        """Track Connection/JobHistory/DriftEvent writes made through target (default: every Session)."""
+        if target in self._targets:
+            return
+        event.listen(target, "after_flush", self._after_flush)
+        event.listen(target, "after_commit", self._after_commit)
+        event.listen(target, "after_rollback", self._after_rollback)
+        event.listen(target, "do_orm_execute", self._do_orm_execute)
+        self._targets.append(target)
+
+    def uninstall(self) -> None:
+        for target in self._targets:
+            event.remove(target, "after_flush", self._after_flush)
+            event.remove(target, "after_commit", self._after_commit)
+            event.remove(target, "after_rollback", self._after_rollback)
+            event.remove(target, "do_orm_execute", self._do_orm_execute)
+        self._targets.clear()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def snapshot(self, tenant_id: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Current counters for a tenant (or all tenants) in one round trip.
+
+        The job and drift windows are hour-aligned: the current hour plus the
+        previous 23. Returns None until reconcile() has run once.
+        """
+        scope = str(tenant_id) if tenant_id else ALL_SCOPE
+        hours = self._window_hours()
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(f"{KEY_PREFIX}:reconciled_at")
+        pipe.hgetall(self._key(scope, "connections"))
+        for hour in hours:
+            pipe.hgetall(self._key(scope, self._hour_suffix(hour)))
+        reconciled_at, connections, *buckets = pipe.execute()
+        if reconciled_at is None:
+            return None
+
+        by_status = {_decode(k): int(float(v)) for k, v in connections.items() if float(v)}
+        jobs: Dict[str, int] = defaultdict(int)
+        drift: Dict[str, int] = {source: 0 for source in DRIFT_SOURCES}
+        repair_s = 0.0
+        repair_n = 0
+        for bucket in buckets:
+            for field, value in bucket.items():
+                field, value = _decode(field), float(value)
+                if field.startswith("jobs:"):
+                    jobs[field[5:]] += int(value)
+                elif field.startswith("drift:"):
+                    drift[field[6:]] = drift.get(field[6:], 0) + int(value)
+                elif field == "repair_s":
+                    repair_s += value
+                elif field == "repair_n":
+                    repair_n += int(value)
+
+        return {
+            "total_connections": sum(by_status.values()),
+            "connections_by_status": by_status,
+            "jobs_24h": {status: n for status, n in jobs.items() if n},
+            "average_repair_time_seconds": round(repair_s / repair_n, 2) if repair_n else 0,
+            "drift_24h": {source: n for source, n in drift.items() if n or source in DRIFT_SOURCES},
+            "reconciled_at": _decode(reconciled_at),
+        }
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def reconcile(self, session: Session) -> None:
+        """Rebuild every counter from the source tables (sync session; see reconcile_async)."""
+        Connection, JobHistory, DriftEvent = _models()
+        now = self._clock()
+        window_start = self._window_hours()[0]
+        deltas = _Deltas()
+
+        tenants = {
+            conn_id: self._tenant(tenant_id)
+            for conn_id, tenant_id in session.execute(select(Connection.id, Connection.tenant_id))
+        }
+        rows = session.execute(
+            select(Connection.tenant_id, Connection.status, func.count(Connection.id))
+            .group_by(Connection.tenant_id, Connection.status)
+        )
+        for tenant_id, status, count in rows:
+            deltas.add(self._scopes(self._tenant(tenant_id)), "connections", _status(status), count)
+
+        jobs = session.execute(
+            select(JobHistory.connection_id, JobHistory.status, JobHistory.started_at, JobHistory.completed_at)
+            .where(JobHistory.started_at >= window_start)
+        )
+        for connection_id, status, started_at, completed_at in jobs:
+            scopes = self._scopes(tenants.get(connection_id))
+            self._count_job(deltas, scopes, status, started_at, completed_at, 1)
+
+        drift_events = session.execute(
+            select(DriftEvent.tenant_id, DriftEvent.old_schema, DriftEvent.new_schema, DriftEvent.created_at)
+            .where(DriftEvent.created_at >= window_start)
+        )
+        for tenant_id, old_schema, new_schema, created_at in drift_events:
+            scopes = self._scopes(self._tenant(tenant_id))
+            deltas.add(scopes, self._hour_suffix(created_at), f"drift:{_drift_source(old_schema, new_schema)}", 1)
+
+        scopes = {scope for scope, _ in deltas.counts} | {ALL_SCOPE}
+        previous = {_decode(s) for s in self.redis.smembers(f"{KEY_PREFIX}:scopes")}
+
+        pipe = self.redis.pipeline(transaction=True)
+        for scope in scopes | previous:
+            pipe.delete(self._key(scope, "connections"))
+            for hour in self._window_hours():
+                pipe.delete(self._key(scope, self._hour_suffix(hour)))
+        self._write(pipe, deltas)
+        pipe.delete(f"{KEY_PREFIX}:scopes")
+        pipe.sadd(f"{KEY_PREFIX}:scopes", *scopes)
+        pipe.set(f"{KEY_PREFIX}:reconciled_at", now.isoformat())
+        pipe.execute()
+
+        self._connection_tenants = tenants
+        self.needs_reconcile = False
+        self.stats["reconciles"] += 1
+        logger.debug(f"AAM rollups reconciled: {len(tenants)} connections, {len(scopes)} scopes")
+
+    async def reconcile_async(self, session) -> None:
+        """reconcile() for an AsyncSession."""
+        await session.run_sync(self.reconcile)
+
+    async def run_reconcile_loop(self, session_factory, interval_s: float = RECONCILE_INTERVAL_S) -> None:
+        """Reconcile every interval_s, or within seconds after a failed counter update."""
+        while True:
+            try:
+                async with session_factory() as session:
+                    await self.reconcile_async(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"AAM rollup reconcile failed: {e}")
+            waited = 0.0
+            while waited < interval_s and not self.needs_reconcile:
+                step = min(5.0, interval_s - waited)
+                await asyncio.sleep(step)
+                waited += step
+
+    # ------------------------------------------------------------------
+    # Session events
+    # ------------------------------------------------------------------
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        Connection, JobHistory, DriftEvent = _models()
+        deltas: Optional[_Deltas] = session.info.get(_DELTAS_KEY)
+
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if not isinstance(obj, (Connection, JobHistory, DriftEvent)):
+                continue
+            if deltas is None:
+                deltas = session.info[_DELTAS_KEY] = _Deltas()
+            try:
+                if isinstance(obj, Connection):
+                    self._track_connection(session, deltas, obj)
+                elif isinstance(obj, JobHistory):
+                    self._track_job(session, deltas, obj)
+                else:
+                    self._track_drift(session, deltas, obj)
+            except Exception as e:
+                deltas.stale = True
+                logger.warning(f"AAM rollup tracking error: {e}")
+
+    def _after_commit(self, session: Session) -> None:
+        deltas: Optional[_Deltas] = session.info.pop(_DELTAS_KEY, None)
+        if deltas is None:
+            return
+        if deltas.stale:
+            self.needs_reconcile = True
+        for connection_id in deltas.deleted_connections:
+            self._connection_tenants.pop(connection_id, None)
+        self._connection_tenants.update(deltas.connection_tenants)
+        if not deltas.counts:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            self._write(pipe, deltas)
+            pipe.execute()
+            self.stats["commits_applied"] += 1
+        except Exception as e:
+            self.stats["apply_errors"] += 1
+            self.needs_reconcile = True
+            logger.warning(f"AAM rollup update failed, scheduling reconcile: {e}")
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_DELTAS_KEY, None)
+
+    def _do_orm_execute(self, orm_execute_state) -> None:
+        """Bulk DML on a source table changes rows no flush sees; reconcile after commit."""
+        if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is None or table.name not in {model.__table__.name for model in _models()}:
+            return
+        session = orm_execute_state.session
+        deltas = session.info.get(_DELTAS_KEY)
+        if deltas is None:
+            deltas = session.info[_DELTAS_KEY] = _Deltas()
+        deltas.stale = True
+
+    # Private methods
+
+    def _track_connection(self, session: Session, deltas: _Deltas, conn) -> None:
+        state = inspect(conn)
+        names = ("status", "tenant_id")
+
+        if conn in session.deleted:
+            old = {name: self._before(state, name) for name in names}
+            if _UNKNOWN in old.values():
+                deltas.stale = True
+                return
+            deltas.add(self._scopes(self._tenant(old["tenant_id"])), "connections", _status(old["status"]), -1)
+            deltas.connection_tenants.pop(conn.id, None)
+            deltas.deleted_connections.add(conn.id)
+            return
+
+        if conn in session.new:
+            # Attributes never set on a new object were inserted as NULL/default
+            tenant = self._tenant(state.dict.get("tenant_id"))
+            deltas.connection_tenants[conn.id] = tenant
+            deltas.add(self._scopes(tenant), "connections", _status(state.dict.get("status")), 1)
+            return
+
+        current = {name: self._loaded(state, name) for name in names}
+        if _UNKNOWN in current.values():
+            deltas.stale = True
+            return
+        deltas.connection_tenants[conn.id] = self._tenant(current["tenant_id"])
+        if not any(state.attrs[name].history.has_changes() for name in names):
+            return
+        old = {name: self._before(state, name) for name in current}
+        if _UNKNOWN in old.values():
+            deltas.stale = True
+            return
+        deltas.add(self._scopes(self._tenant(old["tenant_id"])), "connections", _status(old["status"]), -1)
+        deltas.add(self._scopes(self._tenant(current["tenant_id"])), "connections", _status(current["status"]), 1)
+        if self._tenant(old["tenant_id"]) != self._tenant(current["tenant_id"]):
+            # The connection's job buckets stay with the old tenant until reconciled
+            deltas.stale = True
+
+    def _track_job(self, session: Session, deltas: _Deltas, job) -> None:
+        state = inspect(job)
+        names = ("status", "started_at", "completed_at")
+        scopes = self._scopes(self._job_tenant(session, deltas, job))
+
+        if job in session.deleted:
+            old = [self._before(state, name) for name in names]
+            if _UNKNOWN in old:
+                deltas.stale = True
+                return
+            self._count_job(deltas, scopes, old[0], old[1], old[2], -1)
+            return
+
+        if job in session.new:
+            # Attributes never set on a new object were inserted as NULL/default
+            status, started_at, completed_at = [state.dict.get(name) for name in names]
+            self._count_job(deltas, scopes, status, started_at, completed_at, 1)
+            return
+        current = [self._loaded(state, name) for name in names]
+        if _UNKNOWN in current:
+            deltas.stale = True
+            return
+        status, started_at, completed_at = current
+        if not any(state.attrs[name].history.has_changes() for name in names):
+            return
+        old = [self._before(state, name) for name in names]
+        if _UNKNOWN in old:
+            deltas.stale = True
+            return
+        self._count_job(deltas, scopes, old[0], old[1], old[2], -1)
+        self._count_job(deltas, scopes, status, started_at, completed_at, 1)
+
+    def _track_drift(self, session: Session, deltas: _Deltas, drift) -> None:
+        if drift in session.new:
+            sign = 1
+        elif drift in session.deleted:
+            sign = -1
+        else:
+            return  # Updates do not change source, tenant or creation time
+        state = inspect(drift)
+        names = ("tenant_id", "old_schema", "new_schema", "created_at")
+        if sign > 0:
+            # Attributes never set on a new object were inserted as NULL/default
+            values = [state.dict.get(name) for name in names]
+        else:
+            values = [self._loaded(state, name) for name in names]
+        if _UNKNOWN in values:
+            deltas.stale = True
+            return
+        tenant_id, old_schema, new_schema, created_at = values
+        if created_at is not None and created_at >= self._window_hours()[0]:
+            deltas.add(
+                self._scopes(self._tenant(tenant_id)),
+                self._hour_suffix(created_at),
+                f"drift:{_drift_source(old_schema, new_schema)}",
+                sign,
+            )
+
+    def _job_tenant(self, session: Session, deltas: _Deltas, job) -> Optional[str]:
+        """Tenant of a job's connection without emitting SQL (safe inside async flushes)."""
+        Connection, _, _ = _models()
+        state = inspect(job)
+        conn = state.dict.get("connection")
+        connection_id = state.dict.get("connection_id")
+        if conn is None and connection_id is not None:
+            conn = session.identity_map.get(inspect(Connection).identity_key_from_primary_key((connection_id,)))
+        if conn is not None:
+            tenant_id = self._loaded(inspect(conn), "tenant_id")
+            if tenant_id is not _UNKNOWN:
+                return self._tenant(tenant_id)
+        if connection_id in deltas.connection_tenants:
+            return deltas.connection_tenants[connection_id]
+        if connection_id in self._connection_tenants:
+            return self._connection_tenants[connection_id]
+        # Counted under "all" only until the next reconcile
+        self.needs_reconcile = True
+        return None
+
+    def _count_job(self, deltas: _Deltas, scopes, status, started_at, completed_at, sign: int) -> None:
+        if started_at is None or started_at < self._window_hours()[0]:
+            return
+        suffix = self._hour_suffix(started_at)
+        deltas.add(scopes, suffix, f"jobs:{_status(status)}", sign)
+        if completed_at is not None:
+            deltas.add(scopes, suffix, "repair_s", sign * (completed_at - started_at).total_seconds())
+            deltas.add(scopes, suffix, "repair_n", sign)
+
+    @staticmethod
+    def _loaded(state, name: str) -> Any:
+        """Current value of an attribute, or _UNKNOWN if it is not loaded."""
+        return state.dict.get(name, _UNKNOWN)
+
+    @staticmethod
+    def _before(state, name: str) -> Any:
+        """Value of an attribute before this flush, or _UNKNOWN if it was never loaded."""
+        if name in state.committed_state:
+            value = state.committed_state[name]
+            return _UNKNOWN if value is NO_VALUE else value
+        return state.dict.get(name, _UNKNOWN)
+
+    @staticmethod
+    def _tenant(tenant_id: Any) -> Optional[str]:
+        return str(tenant_id) if tenant_id else None
+
+    @staticmethod
+    def _scopes(tenant: Optional[str]) -> Tuple[str, ...]:
+        return (tenant, ALL_SCOPE) if tenant else (ALL_SCOPE,)
+
+    @staticmethod
+    def _key(scope: str, suffix: str) -> str:
+        return f"{KEY_PREFIX}:{scope}:{suffix}"
+
+    @staticmethod
+    def _hour_suffix(ts: datetime) -> str:
+        return f"h:{ts.strftime(_HOUR_FORMAT)}"
+
+    def _window_hours(self) -> List[datetime]:
+        current = _floor_hour(self._clock())
+        return [current - timedelta(hours=i) for i in range(WINDOW_HOURS - 1, -1, -1)]
+
+    def _write(self, pipe, deltas: _Deltas) -> None:
+        for scope in {scope for scope, _ in deltas.counts}:
+            pipe.sadd(f"{KEY_PREFIX}:scopes", scope)
+        for (scope, suffix), fields in deltas.counts.items():
+            key = self._key(scope, suffix)
+            for field, amount in fields.items():
+                if field == "repair_s":
+                    pipe.hincrbyfloat(key, field, amount)
+                elif amount:
+                    pipe.hincrby(key, field, int(amount))
+            if suffix.startswith("h:"):
+                pipe.expire(key, BUCKET_TTL_S)
+
+
+_UNKNOWN = object()
+
+
+# Global rollups instance
+_rollups: Optional[MonitoringRollups] = None
+
+
+def init_monitoring_rollups(redis_client) -> MonitoringRollups:
+    """Create the global rollups and start tracking ORM writes in this process."""
+    global _rollups
+    if _rollups is not None:
+        _rollups.uninstall()
+    _rollups = MonitoringRollups(redis_client)
+    _rollups.install()
+    return _rollups
+
+
+def get_monitoring_rollups() -> Optional[MonitoringRollups]:
+    """Get the global rollups instance (None until initialized)."""
+    return _rollups
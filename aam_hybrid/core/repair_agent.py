@@ -13,13 +13,18 @@ Key Features:
 Usage:
     repair_agent = RepairAgent(redis_client)
     suggestions = repair_agent.suggest_repairs(drift_event, canonical_event)
+
+    # Long-lived, shared per Redis client (bounded concurrency, coalesced drift)
+    coordinator = get_repair_coordinator(redis_client)
+    suggestions = coordinator.suggest_repairs(drift_event, canonical_event, db_session=db)
 """
 
 import logging
 import json
 import os
+import threading
 import uuid
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -90,6 +95,10 @@ class RepairAgent:
         self.llm_service = None
         self.rag_engine = None
         
+        # Reused across DCL calls (created on first delegation)
+        self._http_client = None
+        self._http_lock = threading.Lock()
+        
         logger.info(
             f"RepairAgent initialized (PHASE 2 - RACI COMPLIANT): "
             f"confidence_threshold={confidence_threshold}, "
@@ -100,7 +109,8 @@ class RepairAgent:
     def suggest_repairs(
         self,
         drift_event: DriftEvent,
-        canonical_event: EntityEvent
+        canonical_event: EntityEvent,
+        db_session: Optional[Any] = None
     ) -> RepairBatch:
         """
         Generate repair suggestions for drifted fields in a drift event.
@@ -115,6 +125,7 @@ class RepairAgent:
         Args:
             drift_event: DriftEvent containing schema changes
             canonical_event: EntityEvent that triggered drift detection
+            db_session: Session for HITL audit records (overrides the agent's own)
             
         Returns:
             RepairBatch containing all repair suggestions
@@ -129,7 +140,7 @@ class RepairAgent:
         
         if FeatureFlagConfig.is_enabled(FeatureFlag.USE_DCL_INTELLIGENCE_API):
             logger.info("🚀 Phase 2: Delegating to DCL Intelligence API (RACI compliant)")
-            return self._delegate_to_dcl_intelligence(drift_event, canonical_event)
+            return self._delegate_to_dcl_intelligence(drift_event, canonical_event, db_session)
         
         logger.info(
             f"🔧 Generating repair suggestions for drift event {drift_event.event_id} "
@@ -151,7 +162,8 @@ class RepairAgent:
                 suggestion = self._process_drifted_field(
                     field_info=field_info,
                     drift_event=drift_event,
-                    canonical_event=canonical_event
+                    canonical_event=canonical_event,
+                    db_session=db_session
                 )
                 
                 repair_batch.add_suggestion(suggestion)
@@ -216,7 +228,8 @@ class RepairAgent:
         self,
         field_info: Dict[str, Any],
         drift_event: DriftEvent,
-        canonical_event: EntityEvent
+        canonical_event: EntityEvent,
+        db_session: Optional[Any] = None
     ) -> RepairSuggestion:
         """
         Process a single drifted field and generate repair suggestion.
@@ -225,6 +238,7 @@ class RepairAgent:
             field_info: Dictionary with field_name, drift_type, field_type
             drift_event: Parent drift event
             canonical_event: Canonical event that triggered drift
+            db_session: Session for the HITL audit record (optional)
             
         Returns:
             RepairSuggestion with confidence scoring and action
@@ -287,7 +301,7 @@ class RepairAgent:
         
         if repair_action == RepairAction.HITL_QUEUED:
             logger.info(f"🔄 Queueing {field_name} for HITL review (score: {score:.2f})")
-            self._queue_for_hitl(suggestion, drift_event, rag_context)
+            self._queue_for_hitl(suggestion, drift_event, rag_context, db_session)
         
         return suggestion
     
@@ -449,7 +463,8 @@ IMPORTANT: Always return a valid JSON object with all required fields.
         self,
         suggestion: RepairSuggestion,
         drift_event: DriftEvent,
-        rag_context: str
+        rag_context: str,
+        db_session: Optional[Any] = None
     ) -> None:
         """
         Queue repair suggestion for human-in-the-loop review.
@@ -465,6 +480,7 @@ IMPORTANT: Always return a valid JSON object with all required fields.
             suggestion: RepairSuggestion to queue
             drift_event: Parent drift event
             rag_context: RAG context for human reviewer
+            db_session: Session for the audit record (defaults to the agent's)
         """
         redis_key = (
             f"hitl:repair:{drift_event.tenant_id}:{drift_event.connector_name}:"
@@ -502,7 +518,24 @@ IMPORTANT: Always return a valid JSON object with all required fields.
         except Exception as e:
             logger.error(f"Failed to queue HITL item in Redis: {e}", exc_info=True)
         
-        if self.db_session:
+        self.persist_hitl_audit(suggestion, drift_event, db_session)
+    
+    def persist_hitl_audit(
+        self,
+        suggestion: RepairSuggestion,
+        drift_event: DriftEvent,
+        db_session: Optional[Any] = None
+    ) -> None:
+        """
+        Write the PostgreSQL audit record for a HITL-queued suggestion.
+        
+        Args:
+            suggestion: RepairSuggestion queued for review
+            drift_event: Drift event the record is filed under
+            db_session: Session for the audit record (defaults to the agent's)
+        """
+        db_session = db_session or self.db_session
+        if db_session:
             try:
                 import uuid as uuid_lib
                 
@@ -523,7 +556,7 @@ IMPORTANT: Always return a valid JSON object with all required fields.
                 
                 try:
                     from app.crud import create_hitl_audit_record
-                    create_hitl_audit_record(self.db_session, audit_data)
+                    create_hitl_audit_record(db_session, audit_data)
                     logger.info(f"✅ Persisted HITL audit record to PostgreSQL: {suggestion.field_name}")
                 except ImportError:
                     logger.warning("app.crud not available - skipping PostgreSQL persistence")
@@ -534,7 +567,8 @@ IMPORTANT: Always return a valid JSON object with all required fields.
     def _delegate_to_dcl_intelligence(
         self,
         drift_event: DriftEvent,
-        canonical_event: EntityEvent
+        canonical_event: EntityEvent,
+        db_session: Optional[Any] = None
     ) -> RepairBatch:
         """
         Delegate repair proposal to DCL Intelligence API (Phase 2 - RACI compliant).
@@ -556,9 +590,6 @@ IMPORTANT: Always return a valid JSON object with all required fields.
             RepairBatch containing repair suggestions from DCL
         """
         try:
-            import httpx
-            import os
-            
             dcl_api_url = os.getenv("DCL_API_URL", "http://localhost:5000")
             endpoint = f"{dcl_api_url}/api/v1/dcl/intelligence/repair-drift"
             
@@ -570,10 +601,9 @@ IMPORTANT: Always return a valid JSON object with all required fields.
             logger.info(f"🌐 Calling DCL Intelligence API: {endpoint}")
             logger.debug(f"Request payload: {request_payload}")
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(endpoint, json=request_payload)
-                response.raise_for_status()
-                dcl_proposal = response.json()
+            response = self._get_http_client().post(endpoint, json=request_payload)
+            response.raise_for_status()
+            dcl_proposal = response.json()
             
             logger.info(
                 f"✅ DCL Intelligence API responded: "
@@ -627,12 +657,28 @@ IMPORTANT: Always return a valid JSON object with all required fields.
             )
             logger.warning("Falling back to local RepairAgent logic (degraded mode)")
             
-            return self._fallback_to_local_repair(drift_event, canonical_event)
+            return self._fallback_to_local_repair(drift_event, canonical_event, db_session)
+    
+    def _get_http_client(self):
+        """Shared httpx client for DCL Intelligence API calls."""
+        if self._http_client is None:
+            with self._http_lock:
+                if self._http_client is None:
+                    import httpx
+                    self._http_client = httpx.Client(timeout=30.0)
+        return self._http_client
+    
+    def close(self) -> None:
+        """Close the shared DCL HTTP client."""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
     
     def _fallback_to_local_repair(
         self,
         drift_event: DriftEvent,
-        canonical_event: EntityEvent
+        canonical_event: EntityEvent,
+        db_session: Optional[Any] = None
     ) -> RepairBatch:
         """
         Fallback to local RepairAgent logic if DCL API fails.
@@ -656,7 +702,8 @@ IMPORTANT: Always return a valid JSON object with all required fields.
                 suggestion = self._process_drifted_field(
                     field_info=field_info,
                     drift_event=drift_event,
-                    canonical_event=canonical_event
+                    canonical_event=canonical_event,
+                    db_session=db_session
                 )
                 
                 repair_batch.add_suggestion(suggestion)
@@ -700,6 +747,140 @@ IMPORTANT: Always return a valid JSON object with all required fields.
         )
 
 
+def drift_signature(drift_event: DriftEvent) -> Tuple[str, ...]:
+    """
+    Key identifying drift events that need the same repair.
+
+    Two events with the same tenant, source, entity and before/after schema
+    fingerprints get identical suggestions, so only one repair is computed.
+    """
+    return (
+        str(drift_event.tenant_id),
+        drift_event.connector_name,
+        str(drift_event.entity_type),
+        drift_event.previous_fingerprint.fingerprint_hash,
+        drift_event.current_fingerprint.fingerprint_hash,
+    )
+
+
+class _InflightRepair:
+    def __init__(self, drift_event_id: str):
+        self.drift_event_id = drift_event_id
+        self.done = threading.Event()
+        self.batch: Optional[RepairBatch] = None
+        self.error: Optional[BaseException] = None
+
+
+class RepairCoordinator:
+    """
+    Long-lived front for one RepairAgent.
+
+    - At most max_concurrent repairs run at once (each may call the DCL API)
+    - Concurrent requests with the same drift_signature() share one repair:
+      the first caller computes it, the others wait and receive a copy
+      carrying their own drift_event_id (plus HITL audit records for it)
+    """
+
+    DEFAULT_MAX_CONCURRENT = int(os.getenv("AAM_REPAIR_MAX_CONCURRENCY", "4"))
+    WAIT_TIMEOUT_SECONDS = 120.0
+
+    def __init__(self, agent: RepairAgent, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+        """
+        Args:
+            agent: Shared RepairAgent
+            max_concurrent: Maximum repairs in progress at once
+        """
+        self.agent = agent
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, ...], _InflightRepair] = {}
+        self.stats = {"repairs": 0, "coalesced": 0}
+
+    def suggest_repairs(
+        self,
+        drift_event: DriftEvent,
+        canonical_event: EntityEvent,
+        db_session: Optional[Any] = None
+    ) -> RepairBatch:
+        """
+        RepairAgent.suggest_repairs() with concurrency limiting and coalescing.
+
+        Args:
+            drift_event: DriftEvent containing schema changes
+            canonical_event: EntityEvent that triggered drift detection
+            db_session: Session for HITL audit records (optional)
+
+        Returns:
+            RepairBatch for drift_event
+        """
+        key = drift_signature(drift_event)
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InflightRepair(drift_event.event_id)
+
+        if not leader:
+            if not call.done.wait(self.WAIT_TIMEOUT_SECONDS):
+                raise TimeoutError(f"Timed out waiting for repair of drift {call.drift_event_id}")
+            with self._lock:
+                self.stats["coalesced"] += 1
+            if call.error is not None:
+                raise call.error
+            logger.info(
+                f"Reusing repair of drift {call.drift_event_id} for {drift_event.event_id} "
+                f"(identical drift signature)"
+            )
+            batch = call.batch.model_copy(
+                update={"drift_event_id": drift_event.event_id}, deep=True
+            )
+            # The leader's audit records name its own drift event; each
+            # follower gets records for its event too
+            for suggestion in batch.suggestions:
+                if suggestion.repair_action == RepairAction.HITL_QUEUED:
+                    self.agent.persist_hitl_audit(suggestion, drift_event, db_session)
+            return batch
+
+        try:
+            with self._slots:
+                call.batch = self.agent.suggest_repairs(drift_event, canonical_event, db_session=db_session)
+            with self._lock:
+                self.stats["repairs"] += 1
+            return call.batch
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+
+# Shared coordinators, one per Redis client (cleared by reset_repair_coordinators)
+_coordinators: Dict[Any, RepairCoordinator] = {}
+_coordinators_lock = threading.Lock()
+
+
+def get_repair_coordinator(redis_client: redis.Redis) -> RepairCoordinator:
+    """Get (or create) the long-lived RepairCoordinator for a Redis client."""
+    with _coordinators_lock:
+        coordinator = _coordinators.get(redis_client)
+        if coordinator is None:
+            coordinator = RepairCoordinator(RepairAgent(redis_client=redis_client))
+            _coordinators[redis_client] = coordinator
+        return coordinator
+
+
+def reset_repair_coordinators() -> None:
+    """Close every shared coordinator's agent and forget them (e.g. on shutdown or in tests)."""
+    with _coordinators_lock:
+        coordinators = list(_coordinators.values())
+        _coordinators.clear()
+    for coordinator in coordinators:
+        coordinator.agent.close()
+
+
 if __name__ == "__main__":
     print("RepairAgent Module - Auto-Repair Agent for Schema Drift")
     print("=" * 60)
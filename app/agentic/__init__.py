@@ -6,7 +6,9 @@ LangGraph-based agent execution with MCP tool integration.
 Core Modules:
 - checkpointer: Durable checkpoint storage with blob offload
 - workflow: LangGraph workflow builder and executor
+- tool_dispatch: Name-indexed tool registry and concurrent tool-call dispatch
 - mcp_client: MCP protocol client for tool execution
+- mcp_transport: Pooled keep-alive HTTP sessions for MCP servers
 - mcp_servers: AOS-specific MCP servers (DCL, AAM, AOD)
 - gateway: AI Gateway with multi-provider support
 - deep_data: Semantic field explainer and lineage tracer
@@ -40,6 +42,14 @@ from app.agentic.workflow import (
     AgentState,
 )
 
+# Tool Dispatch
+from app.agentic.tool_dispatch import (
+    ToolCall,
+    ToolCallResult,
+    ToolDispatcher,
+    ToolRegistry,
+)
+
 # MCP Client
 from app.agentic.mcp_client import (
     MCPClient,
@@ -52,6 +62,15 @@ from app.agentic.mcp_client import (
     get_mcp_client_pool,
 )
 
+# MCP Transport
+from app.agentic.mcp_transport import (
+    MCPTransportPool,
+    MCPServerSession,
+    TransportSettings,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
 # MCP Servers
 from app.agentic.mcp_servers import (
     DCLMCPServer,
@@ -232,6 +251,11 @@ __all__ = [
     'AgentWorkflow',
     'ToolDefinition',
     'AgentState',
+    # Tool Dispatch
+    'ToolCall',
+    'ToolCallResult',
+    'ToolDispatcher',
+    'ToolRegistry',
     # MCP Client
     'MCPClient',
     'MCPClientPool',
@@ -241,6 +265,12 @@ __all__ = [
     'MCPTransport',
     'MCPAuthType',
     'get_mcp_client_pool',
+    # MCP Transport
+    'MCPTransportPool',
+    'MCPServerSession',
+    'TransportSettings',
+    'CircuitBreaker',
+    'CircuitOpenError',
     # MCP Servers
     'DCLMCPServer',
     'DCL_TOOLS',
@@ -6,14 +6,23 @@ Enables agents to discover and connect with other agents:
 - Search agents by capabilities
 - Health monitoring
 - Trust verification
+
+Queries intersect posting lists (tenant, capability, tag, capability type,
+health status) smallest first and select the top results from a trust-ordered
+ranking maintained on register/unregister, instead of re-checking every
+candidate's capabilities and sorting all matches. Cards are indexed when
+registered; changes to a registered card go through update().
 """
 
 import asyncio
+import bisect
+import heapq
 import logging
+import math
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
 from .agent_card import AgentCard, AgentCapability
@@ -34,6 +43,7 @@ class DiscoveryFilter:
     """Filter criteria for agent discovery."""
     # Identity filters
     agent_ids: Optional[List[str]] = None
+    exclude_agent_ids: Optional[List[str]] = None
     tenant_id: Optional[UUID] = None
     organization: Optional[str] = None
 
@@ -100,11 +110,22 @@ class AgentDiscovery:
         self._by_tenant: Dict[UUID, Set[str]] = {}
         self._by_capability: Dict[str, Set[str]] = {}
         self._by_tag: Dict[str, Set[str]] = {}
+        self._by_capability_type: Dict[str, Set[str]] = {}
+        self._accepts_delegation: Set[str] = set()
+
+        # Trust ranking: sorted (-trust_level, registration seq, agent_id)
+        self._ranking: List[Tuple[int, int, str]] = []
+        self._rank_keys: Dict[str, Tuple[int, int, str]] = {}
+        self._next_seq = 0
 
         # Health tracking
         self._health: Dict[str, AgentHealth] = {}
+        self._by_health: Dict[HealthStatus, Set[str]] = {s: set() for s in HealthStatus}
         self._health_check_interval = 60  # seconds
 
+        # (capability_id, tenant_id) -> ranked delegatees; cleared on any change
+        self._delegatee_cache: Dict[Tuple[str, Optional[UUID]], List[AgentCard]] = {}
+
         # Callbacks
         self._on_register: List[Callable] = []
         self._on_unregister: List[Callable] = []
@@ -118,32 +139,44 @@ class AgentDiscovery:
             card: Agent card to register
         """
         agent_id = card.id
+        if agent_id in self._agents:
+            # Re-registration replaces the old card's index entries
+            self._unindex(self._agents[agent_id])
         self._agents[agent_id] = card
 
         # Index by tenant
         if card.tenant_id:
-            if card.tenant_id not in self._by_tenant:
-                self._by_tenant[card.tenant_id] = set()
-            self._by_tenant[card.tenant_id].add(agent_id)
+            self._by_tenant.setdefault(card.tenant_id, set()).add(agent_id)
 
         # Index by capability
         for cap in card.capabilities:
-            if cap.id not in self._by_capability:
-                self._by_capability[cap.id] = set()
-            self._by_capability[cap.id].add(agent_id)
+            self._by_capability.setdefault(cap.id, set()).add(agent_id)
+            self._by_capability_type.setdefault(cap.capability_type, set()).add(agent_id)
 
             # Index by tags
             for tag in cap.tags:
-                if tag not in self._by_tag:
-                    self._by_tag[tag] = set()
-                self._by_tag[tag].add(agent_id)
+                self._by_tag.setdefault(tag, set()).add(agent_id)
+
+        if card.can_accept_delegation:
+            self._accepts_delegation.add(agent_id)
+
+        # Rank by trust level, ties in registration order
+        rank_key = (-card.trust_level, self._next_seq, agent_id)
+        self._next_seq += 1
+        self._rank_keys[agent_id] = rank_key
+        bisect.insort(self._ranking, rank_key)
 
         # Initialize health
+        old_health = self._health.get(agent_id)
+        if old_health:
+            self._by_health[old_health.status].discard(agent_id)
         self._health[agent_id] = AgentHealth(
             agent_id=agent_id,
             status=HealthStatus.UNKNOWN,
             last_check=datetime.utcnow(),
         )
+        self._by_health[HealthStatus.UNKNOWN].add(agent_id)
+        self._delegatee_cache.clear()
 
         logger.info(f"Agent registered: {card.name} ({agent_id})")
 
@@ -169,18 +202,13 @@ class AgentDiscovery:
             return None
 
         # Remove from indexes
-        if card.tenant_id and card.tenant_id in self._by_tenant:
-            self._by_tenant[card.tenant_id].discard(agent_id)
-
-        for cap in card.capabilities:
-            if cap.id in self._by_capability:
-                self._by_capability[cap.id].discard(agent_id)
-            for tag in cap.tags:
-                if tag in self._by_tag:
-                    self._by_tag[tag].discard(agent_id)
+        self._unindex(card)
 
         # Remove health
-        self._health.pop(agent_id, None)
+        health = self._health.pop(agent_id, None)
+        if health:
+            self._by_health[health.status].discard(agent_id)
+        self._delegatee_cache.clear()
 
         logger.info(f"Agent unregistered: {card.name} ({agent_id})")
 
@@ -225,85 +253,43 @@ class AgentDiscovery:
         """
         start_time = datetime.utcnow()
 
-        # Start with all agents or filtered set
-        candidates: Set[str] = set()
-
-        if filter.agent_ids:
-            candidates = set(filter.agent_ids) & set(self._agents.keys())
-        elif filter.tenant_id:
-            candidates = self._by_tenant.get(filter.tenant_id, set()).copy()
-        elif filter.capability_ids:
-            for cap_id in filter.capability_ids:
-                cap_agents = self._by_capability.get(cap_id, set())
-                if not candidates:
-                    candidates = cap_agents.copy()
-                else:
-                    candidates &= cap_agents
-        elif filter.capability_tags:
-            for tag in filter.capability_tags:
-                tag_agents = self._by_tag.get(tag, set())
-                if not candidates:
-                    candidates = tag_agents.copy()
-                else:
-                    candidates &= tag_agents
+        candidates, excluded = self._candidates(filter)
+        residual = self._residual_filter(filter)
+        wanted = filter.offset + filter.limit
+        min_trust = filter.min_trust_level
+
+        if candidates is None:
+            # Agents at or above min trust are a prefix of the ranking
+            end = bisect.bisect_right(self._ranking, (-min_trust, math.inf)) if min_trust > 0 else len(self._ranking)
+            if residual is None and not excluded:
+                total = end
+                top = [self._agents[agent_id] for _, _, agent_id in self._ranking[:min(end, wanted)]]
+            else:
+                total = 0
+                top = []
+                for _, _, agent_id in self._ranking[:end]:
+                    if agent_id in excluded:
+                        continue
+                    card = self._agents[agent_id]
+                    if residual is None or residual(card):
+                        total += 1
+                        if len(top) < wanted:
+                            top.append(card)
         else:
-            candidates = set(self._agents.keys())
-
-        # Apply additional filters
-        results: List[AgentCard] = []
-
-        for agent_id in candidates:
-            card = self._agents.get(agent_id)
-            if not card:
-                continue
-
-            # Type filter
-            if filter.agent_types and card.agent_type not in filter.agent_types:
-                continue
-
-            # Role filter
-            if filter.roles and card.role not in filter.roles:
-                continue
-
-            # Capability type filter
-            if filter.capability_types:
-                has_type = any(
-                    cap.capability_type in filter.capability_types
-                    for cap in card.capabilities
-                )
-                if not has_type:
-                    continue
-
-            # Trust filter
-            if card.trust_level < filter.min_trust_level:
-                continue
-
-            # Certification filter
-            if filter.require_certified and not card.certification_id:
-                continue
-
-            # Delegation filters
-            if filter.can_delegate is not None and card.can_delegate != filter.can_delegate:
-                continue
-            if filter.can_accept_delegation is not None and card.can_accept_delegation != filter.can_accept_delegation:
-                continue
-
-            # Health filter
-            health = self._health.get(agent_id)
-            if filter.exclude_unhealthy and health and health.status == HealthStatus.UNHEALTHY:
-                continue
-            if filter.health_status and health and health.status != filter.health_status:
-                continue
-
-            results.append(card)
-
-        # Sort by trust level (descending)
-        results.sort(key=lambda c: c.trust_level, reverse=True)
+            if residual is None and min_trust <= 0:
+                matched = candidates
+            else:
+                matched = {
+                    agent_id for agent_id in candidates
+                    if self._rank_keys[agent_id][0] <= -min_trust
+                    and (residual is None or residual(self._agents[agent_id]))
+                }
+            total = len(matched)
+            top = self._top_ranked(matched, wanted)
 
         # Pagination
-        total = len(results)
-        has_more = (filter.offset + filter.limit) < total
-        results = results[filter.offset:filter.offset + filter.limit]
+        has_more = wanted < total
+        results = top[filter.offset:wanted]
 
         query_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
@@ -377,20 +363,23 @@ class AgentDiscovery:
             tenant_id: Optional tenant filter
 
         Returns:
-            List of agents that can accept the delegation
+            List of agents that can accept the delegation, highest trust
+            first. The ranking is cached until an agent registers,
+            unregisters or changes health status.
         """
-        result = self.discover(DiscoveryFilter(
-            capability_ids=[capability_id],
-            tenant_id=tenant_id,
-            can_accept_delegation=True,
-            exclude_unhealthy=True,
-        ))
-
-        agents = result.agents
-        if excluding:
-            agents = [a for a in agents if a.id != excluding]
-
-        return agents
+        key = (capability_id, tenant_id)
+        ranked = self._delegatee_cache.get(key)
+        if ranked is None:
+            # One extra so excluding the delegator still leaves a full page
+            ranked = self._delegatee_cache[key] = self.discover(DiscoveryFilter(
+                capability_ids=[capability_id],
+                tenant_id=tenant_id,
+                can_accept_delegation=True,
+                exclude_unhealthy=True,
+                limit=DiscoveryFilter.limit + 1,
+            )).agents
+
+        return [a for a in ranked if a.id != excluding][:DiscoveryFilter.limit]
 
     async def update_health(
         self,
@@ -414,6 +403,10 @@ class AgentDiscovery:
 
         old_status = health.status
         health.status = status
+        if old_status != status:
+            self._by_health[old_status].discard(agent_id)
+            self._by_health[status].add(agent_id)
+            self._delegatee_cache.clear()
         health.last_check = datetime.utcnow()
         health.response_time_ms = response_time_ms
         health.error = error
@@ -493,9 +486,7 @@ class AgentDiscovery:
         else:
             agents = list(self._agents.values())
 
-        health_counts = {s: 0 for s in HealthStatus}
-        for h in self._health.values():
-            health_counts[h.status] += 1
+        health_counts = {s: len(ids) for s, ids in self._by_health.items()}
 
         return {
             "total_agents": len(agents),
@@ -506,6 +497,109 @@ class AgentDiscovery:
             "certified_agents": sum(1 for a in agents if a.certification_id),
         }
 
+    # Private methods
+
+    def _candidates(self, filter: DiscoveryFilter) -> Tuple[Optional[Set[str]], Set[str]]:
+        """
+        Intersect the posting lists the filter selects, smallest first.
+
+        Returns (candidates, excluded). Candidates is None when no posting
+        list applies; excluded (unhealthy or explicitly excluded agents) is
+        already removed from candidates otherwise.
+        """
+        postings: List[Set[str]] = []
+        if filter.agent_ids:
+            postings.append(set(filter.agent_ids) & self._agents.keys())
+        if filter.tenant_id:
+            postings.append(self._by_tenant.get(filter.tenant_id, set()))
+        for cap_id in filter.capability_ids or ():
+            postings.append(self._by_capability.get(cap_id, set()))
+        for tag in filter.capability_tags or ():
+            postings.append(self._by_tag.get(tag, set()))
+        if filter.capability_types:
+            postings.append(set().union(*(self._by_capability_type.get(t, set()) for t in filter.capability_types)))
+        if filter.health_status:
+            postings.append(self._by_health[filter.health_status])
+        if filter.can_accept_delegation:
+            postings.append(self._accepts_delegation)
+
+        excluded = self._by_health[HealthStatus.UNHEALTHY] if filter.exclude_unhealthy else set()
+        if filter.exclude_agent_ids:
+            excluded = excluded | set(filter.exclude_agent_ids)
+
+        if not postings:
+            return None, excluded
+
+        postings.sort(key=len)
+        if not postings[0]:
+            return set(), excluded
+        candidates = postings[0].intersection(*postings[1:])
+        return (candidates - excluded if excluded else candidates), excluded
+
+    def _residual_filter(self, filter: DiscoveryFilter) -> Optional[Callable[[AgentCard], bool]]:
+        """Card checks not covered by posting lists or the ranking, or None if there are none."""
+        checks: List[Callable[[AgentCard], bool]] = []
+        if filter.agent_types:
+            agent_types = set(filter.agent_types)
+            checks.append(lambda card: card.agent_type in agent_types)
+        if filter.roles:
+            roles = set(filter.roles)
+            checks.append(lambda card: card.role in roles)
+        if filter.organization:
+            checks.append(lambda card: card.organization == filter.organization)
+        if filter.require_certified:
+            checks.append(lambda card: bool(card.certification_id))
+        if filter.can_delegate is not None:
+            checks.append(lambda card: card.can_delegate == filter.can_delegate)
+        if filter.can_accept_delegation is False:
+            checks.append(lambda card: not card.can_accept_delegation)
+
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda card: all(check(card) for check in checks)
+
+    def _top_ranked(self, agent_ids: Set[str], k: int) -> List[AgentCard]:
+        """The k best-ranked agents of a set, without sorting it."""
+        if k * len(self._ranking) < len(agent_ids) ** 2:
+            # Dense set: walking the ranking finds k members after ~k * N / len(set) steps
+            top: List[str] = []
+            if k > 0:
+                for _, _, agent_id in self._ranking:
+                    if agent_id in agent_ids:
+                        top.append(agent_id)
+                        if len(top) >= k:
+                            break
+        else:
+            top = heapq.nsmallest(k, agent_ids, key=self._rank_keys.__getitem__)
+        return [self._agents[agent_id] for agent_id in top]
+
+    def _unindex(self, card: AgentCard) -> None:
+        agent_id = card.id
+        self._accepts_delegation.discard(agent_id)
+        if card.tenant_id:
+            self._discard(self._by_tenant, card.tenant_id, agent_id)
+        for cap in card.capabilities:
+            self._discard(self._by_capability, cap.id, agent_id)
+            self._discard(self._by_capability_type, cap.capability_type, agent_id)
+            for tag in cap.tags:
+                self._discard(self._by_tag, tag, agent_id)
+
+        rank_key = self._rank_keys.pop(agent_id, None)
+        if rank_key is not None:
+            i = bisect.bisect_left(self._ranking, rank_key)
+            if i < len(self._ranking) and self._ranking[i] == rank_key:
+                del self._ranking[i]
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], key: Any, agent_id: str) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(agent_id)
+            if not ids:
+                del index[key]
+
 
 # Global discovery instance
 _discovery: Optional[AgentDiscovery] = None
@@ -5,10 +5,13 @@ Tracks and manages policy overrides.
 Implements Override tracking from RACI.
 """
 
+import fnmatch
+import itertools
 import logging
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 from uuid import UUID
 
 from .models import Override
@@ -46,6 +49,30 @@ class OverridePolicy:
     enabled: bool = True
 
 
+@dataclass
+class _ScopedOverride:
+    """Override entry in the scope index with its patterns precompiled."""
+    seq: int
+    override: Override
+    matcher: Optional[Pattern[str]] = None
+
+    @classmethod
+    def compile(cls, seq: int, override: Override) -> "_ScopedOverride":
+        matcher = None
+        if override.applies_to:
+            matcher = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in override.applies_to))
+        return cls(seq=seq, override=override, matcher=matcher)
+
+    def matches(self, action_type: Optional[str]) -> bool:
+        if self.matcher is None or not action_type:
+            return True
+        return self.matcher.match(action_type) is not None
+
+
+# (agent scope, tenant scope); None means the override is not restricted
+_ScopeKey = Tuple[Optional[UUID], Optional[UUID]]
+
+
 class OverrideManager:
     """
     Override Manager.
@@ -65,6 +92,10 @@ class OverrideManager:
         self._by_agent: Dict[UUID, List[UUID]] = {}
         self._by_tenant: Dict[UUID, List[UUID]] = {}
 
+        # Scope index: policy -> (agent, tenant) scope -> overrides in creation order
+        self._scope_index: Dict[str, Dict[_ScopeKey, List[_ScopedOverride]]] = {}
+        self._seq = itertools.count()
+
         # Override policies
         self._policies: Dict[str, OverridePolicy] = {}
 
@@ -238,28 +269,36 @@ class OverrideManager:
         Returns:
             Applicable override or None
         """
-        override_ids = self._by_policy.get(policy_id, [])
+        scopes = self._scope_index.get(policy_id)
+        if not scopes:
+            return None
 
-        for oid in override_ids:
-            override = self._overrides.get(oid)
-            if not override or not override.is_valid():
-                continue
+        # Only buckets whose scope admits this agent/tenant can match
+        keys = {(None, None), (agent_id, None), (None, tenant_id), (agent_id, tenant_id)}
 
-            # Check scope
-            if override.agent_id and override.agent_id != agent_id:
-                continue
-            if override.tenant_id and override.tenant_id != tenant_id:
+        best: Optional[_ScopedOverride] = None
+        for key in keys:
+            bucket = scopes.get(key)
+            if not bucket:
                 continue
 
-            # Check applies_to
-            if override.applies_to and action_type:
-                import fnmatch
-                if not any(fnmatch.fnmatch(action_type, pattern) for pattern in override.applies_to):
+            stale = False
+            for entry in bucket:
+                if best is not None and entry.seq > best.seq:
+                    break
+                if not entry.override.is_valid():
+                    stale = True
                     continue
+                if entry.matches(action_type):
+                    best = entry
+                    break
 
-            return override
+            # Revoked, expired and exhausted overrides never become valid
+            # again, so they are pruned from the index once seen
+            if stale:
+                bucket[:] = [entry for entry in bucket if entry.override.is_valid()]
 
-        return None
+        return best.override if best else None
 
     def revoke(
         self,
@@ -416,6 +455,11 @@ class OverrideManager:
                 self._by_tenant[override.tenant_id] = []
             self._by_tenant[override.tenant_id].append(override.id)
 
+        scopes = self._scope_index.setdefault(override.policy_id, {})
+        scopes.setdefault((override.agent_id, override.tenant_id), []).append(
+            _ScopedOverride.compile(next(self._seq), override)
+        )
+
     def _validate_override_policy(
         self,
         policy: OverridePolicy,
@@ -0,0 +1,238 @@
+"""
+Approval Queues
+
+Indexed priority queues for pending approvals:
+- Per-assignee, per-group, per-tenant and per-agent priority heaps
+- Ordered top-k reads without sorting the pending set
+- Deadline heaps for expiry and escalation sweeps
+"""
+
+import heapq
+import itertools
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from .models import ApprovalPriority, ApprovalRequest
+
+# Numeric rank used for ordering; higher is more urgent
+PRIORITY_RANK = {
+    ApprovalPriority.CRITICAL: 4,
+    ApprovalPriority.HIGH: 3,
+    ApprovalPriority.MEDIUM: 2,
+    ApprovalPriority.LOW: 1,
+}
+
+# Heap entry: (sort key, sequence, request id); the sequence doubles as version
+_Entry = Tuple[Tuple[int, datetime], int, UUID]
+
+
+class _LazyHeap:
+    """
+    Binary heap with lazy deletion.
+
+    Removed or re-keyed entries stay in the array until the stale share
+    grows past the live share, at which point the heap is compacted.
+    """
+
+    COMPACT_MIN_SIZE = 64
+
+    def __init__(self):
+        self.entries: List[_Entry] = []
+        self.live = 0
+
+    def push(self, entry: _Entry) -> None:
+        heapq.heappush(self.entries, entry)
+        self.live += 1
+
+    def discard(self, is_live: Callable[[_Entry], bool]) -> None:
+        """Account for one entry going stale and compact if worthwhile."""
+        self.live -= 1
+        stale = len(self.entries) - self.live
+        if len(self.entries) >= self.COMPACT_MIN_SIZE and stale > self.live:
+            self.entries = [e for e in self.entries if is_live(e)]
+            heapq.heapify(self.entries)
+
+    def iter_ordered(self, is_live: Callable[[_Entry], bool]) -> Iterator[_Entry]:
+        """
+        Yield live entries in heap order without mutating the heap.
+
+        Walks the implicit tree with a frontier heap of indices, so reading
+        the first k entries costs O(k log k) regardless of heap size.
+        """
+        entries = self.entries
+        if not entries:
+            return
+        frontier = [(entries[0], 0)]
+        while frontier:
+            entry, idx = heapq.heappop(frontier)
+            if is_live(entry):
+                yield entry
+            for child in (2 * idx + 1, 2 * idx + 2):
+                if child < len(entries):
+                    heapq.heappush(frontier, (entries[child], child))
+
+
+class PendingApprovalIndex:
+    """
+    Priority index over requests awaiting a decision.
+
+    Every request sits in a global heap and in one heap per assignee,
+    group, tenant and agent. Requests are ordered by priority (highest
+    first) and then creation time. Re-adding a request re-keys it, which
+    covers reassignment after escalation.
+    """
+
+    def __init__(self):
+        self._all = _LazyHeap()
+        self._by_assignee: Dict[UUID, _LazyHeap] = {}
+        self._by_group: Dict[str, _LazyHeap] = {}
+        self._by_tenant: Dict[UUID, _LazyHeap] = {}
+        self._by_agent: Dict[UUID, _LazyHeap] = {}
+
+        self._requests: Dict[UUID, ApprovalRequest] = {}
+        self._versions: Dict[UUID, int] = {}
+        self._memberships: Dict[UUID, List[Tuple[Dict[Hashable, _LazyHeap], Hashable]]] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __contains__(self, request_id: UUID) -> bool:
+        return request_id in self._requests
+
+    def add(self, request: ApprovalRequest) -> None:
+        """Index a request, replacing any previous entry for it."""
+        self.remove(request.id)
+
+        seq = next(self._seq)
+        self._versions[request.id] = seq
+        self._requests[request.id] = request
+
+        key = (-PRIORITY_RANK.get(request.priority, 0), request.created_at)
+        entry = (key, seq, request.id)
+
+        self._all.push(entry)
+        memberships = [(self._by_agent, request.agent_id)]
+        if request.assigned_to:
+            memberships.append((self._by_assignee, request.assigned_to))
+        if request.assigned_group:
+            memberships.append((self._by_group, request.assigned_group))
+        if request.tenant_id:
+            memberships.append((self._by_tenant, request.tenant_id))
+
+        for index, key in memberships:
+            index.setdefault(key, _LazyHeap()).push(entry)
+        self._memberships[request.id] = memberships
+
+    def remove(self, request_id: UUID) -> None:
+        """Drop a request from the index (no-op if absent)."""
+        if self._requests.pop(request_id, None) is None:
+            return
+        # Existing heap entries read as stale once the version is gone
+        del self._versions[request_id]
+        self._all.discard(self._is_live)
+        for index, key in self._memberships.pop(request_id, []):
+            heap = index[key]
+            heap.discard(self._is_live)
+            if heap.live == 0:
+                del index[key]
+
+    def query(
+        self,
+        assignee: Optional[UUID] = None,
+        group: Optional[str] = None,
+        agent_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+        limit: int = 100,
+    ) -> List[ApprovalRequest]:
+        """
+        Return up to ``limit`` requests in priority order.
+
+        Scans the smallest heap among the requested filters and checks the
+        remaining filters per entry.
+        """
+        candidates: List[_LazyHeap] = []
+        for index, value in (
+            (self._by_assignee, assignee),
+            (self._by_group, group),
+            (self._by_agent, agent_id),
+            (self._by_tenant, tenant_id),
+        ):
+            if value:
+                heap = index.get(value)
+                if heap is None or heap.live == 0:
+                    return []
+                candidates.append(heap)
+
+        source = min(candidates, key=lambda h: h.live) if candidates else self._all
+
+        results: List[ApprovalRequest] = []
+        if limit <= 0:
+            return results
+        for _, _, rid in source.iter_ordered(self._is_live):
+            request = self._requests[rid]
+            if assignee and request.assigned_to != assignee:
+                continue
+            if group and request.assigned_group != group:
+                continue
+            if agent_id and request.agent_id != agent_id:
+                continue
+            if tenant_id and request.tenant_id != tenant_id:
+                continue
+            results.append(request)
+            if len(results) >= limit:
+                break
+        return results
+
+    def _is_live(self, entry: _Entry) -> bool:
+        return self._versions.get(entry[2]) == entry[1]
+
+
+class DeadlineQueue:
+    """
+    Min-heap of per-key deadlines.
+
+    Scheduling a key again supersedes its previous deadline. Sweeps pop only
+    the entries that are due instead of scanning every key.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._versions: Dict[Hashable, int] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def schedule(self, key: Hashable, deadline: Optional[datetime]) -> None:
+        """Set (or replace) the deadline for ``key``; None cancels it."""
+        if deadline is None:
+            self.cancel(key)
+            return
+        version = next(self._seq)
+        self._versions[key] = version
+        heapq.heappush(self._heap, (deadline, version, key))
+
+    def cancel(self, key: Hashable) -> None:
+        """Forget the deadline for ``key``."""
+        self._versions.pop(key, None)
+
+    def peek(self) -> Optional[datetime]:
+        """Earliest live deadline, if any."""
+        while self._heap:
+            deadline, version, key = self._heap[0]
+            if self._versions.get(key) == version:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: datetime) -> List[Hashable]:
+        """Remove and return keys whose deadline is at or before ``now``."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, version, key = heapq.heappop(self._heap)
+            if self._versions.get(key) == version:
+                del self._versions[key]
+                due.append(key)
+        return due
@@ -8,7 +8,7 @@ Implements Approval Workflows from RACI.
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 from uuid import UUID
 
 from .models import (
@@ -19,9 +19,13 @@ from .models import (
     ApprovalType,
     EscalationLevel,
 )
+from .queues import DeadlineQueue, PendingApprovalIndex
 
 logger = logging.getLogger(__name__)
 
+# Statuses still awaiting a decision (subject to expiry and escalation)
+OPEN_STATUSES = (ApprovalStatus.PENDING, ApprovalStatus.ESCALATED)
+
 
 @dataclass
 class ApprovalRoute:
@@ -87,10 +91,18 @@ class ApprovalWorkflow:
         """Initialize the approval workflow."""
         # Request storage
         self._requests: Dict[UUID, ApprovalRequest] = {}
-        self._by_status: Dict[ApprovalStatus, List[UUID]] = {s: [] for s in ApprovalStatus}
+        self._by_status: Dict[ApprovalStatus, Set[UUID]] = {s: set() for s in ApprovalStatus}
         self._by_assignee: Dict[UUID, List[UUID]] = {}
         self._by_agent: Dict[UUID, List[UUID]] = {}
 
+        # Requests awaiting a decision, ordered by priority
+        self._pending = PendingApprovalIndex()
+
+        # Deadline heaps for expiry and escalation sweeps
+        self._expiry_queue = DeadlineQueue()
+        self._escalation_queue = DeadlineQueue()
+        self._escalate_at: Dict[UUID, datetime] = {}
+
         # Routing rules
         self._routes: List[ApprovalRoute] = []
 
@@ -345,6 +357,7 @@ class ApprovalWorkflow:
 
         # Re-route for new level
         self._route_request(request)
+        self._update_indexes(request)
 
         # Notify callbacks
         for callback in self._on_escalation:
@@ -405,36 +418,61 @@ class ApprovalWorkflow:
         tenant_id: Optional[UUID] = None,
         limit: int = 100,
     ) -> List[ApprovalRequest]:
-        """Get pending requests with optional filters."""
-        request_ids = self._by_status.get(ApprovalStatus.PENDING, [])
-        requests = []
+        """
+        Get PENDING requests with optional filters.
 
-        for rid in request_ids:
-            request = self._requests.get(rid)
-            if not request:
-                continue
+        Escalated requests are not included. Results are ordered by priority
+        (highest first) and then creation time, and ``limit`` applies after
+        ordering.
+        """
+        return self._pending.query(
+            assignee=assignee,
+            group=group,
+            agent_id=agent_id,
+            tenant_id=tenant_id,
+            limit=limit,
+        )
 
-            if assignee and request.assigned_to != assignee:
-                continue
-            if group and request.assigned_group != group:
-                continue
-            if agent_id and request.agent_id != agent_id:
-                continue
-            if tenant_id and request.tenant_id != tenant_id:
+    def process_expirations(self, now: Optional[datetime] = None) -> List[ApprovalRequest]:
+        """
+        Expire requests whose deadline has passed.
+
+        Args:
+            now: Reference time (defaults to current UTC time)
+
+        Returns:
+            Requests expired by this sweep
+        """
+        now = now or datetime.utcnow()
+        expired = []
+        for request_id in self._expiry_queue.pop_due(now):
+            request = self._requests.get(request_id)
+            if not request or request.status not in OPEN_STATUSES:
                 continue
+            self._expire_request(request)
+            expired.append(request)
+        return expired
 
-            requests.append(request)
-            if len(requests) >= limit:
-                break
+    def process_escalations(self, now: Optional[datetime] = None) -> List[ApprovalRequest]:
+        """
+        Escalate requests that have waited past their route's escalation time.
 
-        # Sort by priority and creation time
-        requests.sort(
-            key=lambda r: (
-                -self._priority_order(r.priority),
-                r.created_at,
-            )
-        )
-        return requests
+        Args:
+            now: Reference time (defaults to current UTC time)
+
+        Returns:
+            Requests escalated by this sweep
+        """
+        now = now or datetime.utcnow()
+        escalated = []
+        for request_id in self._escalation_queue.pop_due(now):
+            request = self._requests.get(request_id)
+            if not request or request.status not in OPEN_STATUSES:
+                continue
+            if request.escalation_level == EscalationLevel.EMERGENCY:
+                continue
+            escalated.append(self.escalate(request_id, reason="Escalation timeout"))
+        return escalated
 
     def get_stats(self, tenant_id: Optional[UUID] = None) -> Dict[str, Any]:
         """Get approval workflow statistics."""
@@ -488,7 +526,7 @@ class ApprovalWorkflow:
     def _store_request(self, request: ApprovalRequest) -> None:
         """Store request and update indexes."""
         self._requests[request.id] = request
-        self._by_status[request.status].append(request.id)
+        self._by_status[request.status].add(request.id)
 
         if request.assigned_to:
             if request.assigned_to not in self._by_assignee:
@@ -499,16 +537,34 @@ class ApprovalWorkflow:
             self._by_agent[request.agent_id] = []
         self._by_agent[request.agent_id].append(request.id)
 
+        self._sync_pending(request)
+
     def _update_indexes(self, request: ApprovalRequest) -> None:
         """Update indexes after status change."""
-        # Remove from old status lists
+        # Remove from old status sets
         for status, ids in self._by_status.items():
-            if request.id in ids and status != request.status:
-                ids.remove(request.id)
+            if status != request.status:
+                ids.discard(request.id)
 
         # Add to current status
-        if request.id not in self._by_status[request.status]:
-            self._by_status[request.status].append(request.id)
+        self._by_status[request.status].add(request.id)
+
+        self._sync_pending(request)
+
+    def _sync_pending(self, request: ApprovalRequest) -> None:
+        """Keep the pending index and deadline heaps in step with a request."""
+        if request.status == ApprovalStatus.PENDING:
+            self._pending.add(request)
+        else:
+            self._pending.remove(request.id)
+
+        if request.status in OPEN_STATUSES:
+            self._expiry_queue.schedule(request.id, request.expires_at)
+            self._escalation_queue.schedule(request.id, self._escalate_at.get(request.id))
+        else:
+            self._expiry_queue.cancel(request.id)
+            self._escalation_queue.cancel(request.id)
+            self._escalate_at.pop(request.id, None)
 
     def _route_request(self, request: ApprovalRequest) -> None:
         """Route request to appropriate approver."""
@@ -523,6 +579,12 @@ class ApprovalWorkflow:
                 # Update timeout based on route
                 if route.timeout_minutes:
                     request.expires_at = datetime.utcnow() + timedelta(minutes=route.timeout_minutes)
+                if route.escalate_after_minutes:
+                    self._escalate_at[request.id] = request.assigned_at + timedelta(
+                        minutes=route.escalate_after_minutes
+                    )
+                else:
+                    self._escalate_at.pop(request.id, None)
 
                 request.assignment_history.append({
                     "route_id": route.id,
@@ -534,6 +596,7 @@ class ApprovalWorkflow:
 
         # Default routing based on escalation level
         request.assigned_group = f"approvers_{request.escalation_level.value}"
+        self._escalate_at.pop(request.id, None)
 
     def _matches_route(self, request: ApprovalRequest, route: ApprovalRoute) -> bool:
         """Check if request matches routing rule."""
@@ -661,15 +724,6 @@ class ApprovalWorkflow:
             return ApprovalPriority.MEDIUM
         return ApprovalPriority.LOW
 
-    def _priority_order(self, priority: ApprovalPriority) -> int:
-        """Get numeric order for priority sorting."""
-        return {
-            ApprovalPriority.CRITICAL: 4,
-            ApprovalPriority.HIGH: 3,
-            ApprovalPriority.MEDIUM: 2,
-            ApprovalPriority.LOW: 1,
-        }.get(priority, 0)
-
     def _escalation_order(self, level: EscalationLevel) -> int:
         """Get numeric order for escalation levels."""
         return {
@@ -10,6 +10,7 @@ Traces data lineage across multiple systems and sources:
 Part of "The Moat" - deep data understanding capabilities.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -92,77 +93,190 @@ class LineageEdge:
 
 @dataclass
 class LineageGraph:
-    """Complete lineage graph."""
+    """
+    Complete lineage graph.
+
+    Edges are indexed by source and target so neighbour lookups do not scan
+    the edge list. Impact paths are cached per node until the graph changes.
+    """
     root_id: str
     nodes: dict[str, LineageNode] = field(default_factory=dict)
     edges: list[LineageEdge] = field(default_factory=list)
     generated_at: datetime = field(default_factory=datetime.utcnow)
 
+    # Adjacency indexes and derived caches (not part of the graph's identity)
+    _incoming: dict[str, list[LineageEdge]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _outgoing: dict[str, list[LineageEdge]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _path_cache: dict[str, list[tuple[str, ...]]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _acyclic: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for edge in self.edges:
+            self._index_edge(edge)
+
     def add_node(self, node: LineageNode) -> None:
         """Add a node to the graph."""
         self.nodes[node.id] = node
+        self._invalidate()
 
     def add_edge(self, edge: LineageEdge) -> None:
         """Add an edge to the graph."""
         self.edges.append(edge)
+        self._index_edge(edge)
+        self._invalidate()
 
-    def get_upstream(self, node_id: str, depth: int = 1) -> list[LineageNode]:
-        """Get upstream nodes (sources) for a given node."""
-        if depth <= 0:
-            return []
+    def incoming_edges(self, node_id: str) -> list[LineageEdge]:
+        """Edges whose target is ``node_id``."""
+        return self._incoming.get(node_id, [])
 
-        upstream = []
-        for edge in self.edges:
-            if edge.target_id == node_id:
-                if edge.source_id in self.nodes:
-                    upstream.append(self.nodes[edge.source_id])
-                    if depth > 1:
-                        upstream.extend(self.get_upstream(edge.source_id, depth - 1))
+    def outgoing_edges(self, node_id: str) -> list[LineageEdge]:
+        """Edges whose source is ``node_id``."""
+        return self._outgoing.get(node_id, [])
 
-        return upstream
+    def get_upstream(self, node_id: str, depth: int = 1) -> list[LineageNode]:
+        """Get upstream nodes (sources) within ``depth`` hops, nearest first."""
+        return [self.nodes[n] for n in self._walk(node_id, depth, upstream=True)]
 
     def get_downstream(self, node_id: str, depth: int = 1) -> list[LineageNode]:
-        """Get downstream nodes (consumers) for a given node."""
+        """Get downstream nodes (consumers) within ``depth`` hops, nearest first."""
+        return [self.nodes[n] for n in self._walk(node_id, depth, upstream=False)]
+
+    def get_distances(self, node_id: str, depth: int = 10, upstream: bool = False) -> dict[str, int]:
+        """Shortest hop count from ``node_id`` to each reachable node."""
+        return self._walk(node_id, depth, upstream)
+
+    def get_impact_path(self, node_id: str, max_paths: Optional[int] = None) -> list[list[LineageNode]]:
+        """
+        Get all impact paths from a node to end consumers.
+
+        Args:
+            node_id: Starting node
+            max_paths: Stop after this many paths (None for all)
+        """
+        if node_id not in self._path_cache:
+            if self._is_acyclic():
+                self._path_cache[node_id] = self._paths_acyclic(node_id)
+            else:
+                self._path_cache[node_id] = self._paths_with_cycles(node_id)
+
+        paths = self._path_cache[node_id]
+        if max_paths is not None:
+            paths = paths[:max_paths]
+        return [[self.nodes[n] for n in path] for path in paths]
+
+    def _index_edge(self, edge: LineageEdge) -> None:
+        self._outgoing.setdefault(edge.source_id, []).append(edge)
+        self._incoming.setdefault(edge.target_id, []).append(edge)
+
+    def _invalidate(self) -> None:
+        self._path_cache.clear()
+        self._acyclic = None
+
+    def _walk(self, node_id: str, depth: int, upstream: bool) -> dict[str, int]:
+        """Breadth-first walk bounded by ``depth``; returns node -> distance."""
+        distances: dict[str, int] = {}
         if depth <= 0:
-            return []
+            return distances
+
+        seen = {node_id}
+        frontier = [node_id]
+        for level in range(1, depth + 1):
+            next_frontier = []
+            for current in frontier:
+                edges = self._incoming.get(current, []) if upstream else self._outgoing.get(current, [])
+                for edge in edges:
+                    neighbour = edge.source_id if upstream else edge.target_id
+                    if neighbour in seen:
+                        continue
+                    seen.add(neighbour)
+                    next_frontier.append(neighbour)
+                    if neighbour in self.nodes:
+                        distances[neighbour] = level
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return distances
+
+    def _is_acyclic(self) -> bool:
+        """Kahn's algorithm over the edge index; cached until the graph changes."""
+        if self._acyclic is None:
+            indegree: dict[str, int] = {}
+            for source, edges in self._outgoing.items():
+                indegree.setdefault(source, 0)
+                for edge in edges:
+                    indegree[edge.target_id] = indegree.get(edge.target_id, 0) + 1
+
+            ready = [n for n, d in indegree.items() if d == 0]
+            visited = 0
+            while ready:
+                current = ready.pop()
+                visited += 1
+                for edge in self._outgoing.get(current, []):
+                    indegree[edge.target_id] -= 1
+                    if indegree[edge.target_id] == 0:
+                        ready.append(edge.target_id)
+            self._acyclic = visited == len(indegree)
+        return self._acyclic
+
+    def _paths_acyclic(self, node_id: str) -> list[tuple[str, ...]]:
+        """
+        Enumerate root-to-leaf paths on a DAG.
 
-        downstream = []
-        for edge in self.edges:
-            if edge.source_id == node_id:
-                if edge.target_id in self.nodes:
-                    downstream.append(self.nodes[edge.target_id])
-                    if depth > 1:
-                        downstream.extend(self.get_downstream(edge.target_id, depth - 1))
+        Paths are built bottom-up in post-order with an explicit stack, and
+        every node's suffix list is memoized in the path cache so shared
+        sub-graphs are expanded once.
+        """
+        cache = self._path_cache
+        stack: list[tuple[str, bool]] = [(node_id, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current in cache:
+                continue
+            if current not in self.nodes:
+                cache[current] = []
+                continue
 
-        return downstream
+            edges = self._outgoing.get(current, [])
+            if not edges:
+                cache[current] = [(current,)]
+                continue
 
-    def get_impact_path(self, node_id: str) -> list[list[LineageNode]]:
-        """Get all impact paths from a node to end consumers."""
-        paths = []
-        self._find_paths(node_id, [], paths)
-        return paths
+            if not expanded:
+                stack.append((current, True))
+                stack.extend((e.target_id, False) for e in edges if e.target_id not in cache)
+                continue
 
-    def _find_paths(
-        self,
-        node_id: str,
-        current_path: list[LineageNode],
-        all_paths: list[list[LineageNode]]
-    ) -> None:
-        """Recursively find all paths to leaf nodes."""
-        if node_id not in self.nodes:
-            return
+            cache[current] = [(current,) + suffix for e in edges for suffix in cache[e.target_id]]
+        return cache[node_id]
 
-        node = self.nodes[node_id]
-        current_path = current_path + [node]
+    def _paths_with_cycles(self, node_id: str) -> list[tuple[str, ...]]:
+        """
+        Enumerate paths with an iterative DFS that never revisits a node on
+        the current path. A node whose only exits lead back into the path is
+        treated as a leaf.
+        """
+        if node_id not in self.nodes:
+            return []
 
-        downstream_edges = [e for e in self.edges if e.source_id == node_id]
+        paths: list[tuple[str, ...]] = []
+        stack: list[tuple[str, ...]] = [(node_id,)]
+        while stack:
+            path = stack.pop()
+            edges = self._outgoing.get(path[-1], [])
+            if not edges:
+                paths.append(path)
+                continue
 
-        if not downstream_edges:
-            # Leaf node - record the path
-            all_paths.append(current_path)
-        else:
-            for edge in downstream_edges:
-                self._find_paths(edge.target_id, current_path, all_paths)
+            extended = False
+            for edge in reversed(edges):
+                if edge.target_id in path:
+                    continue
+                extended = True
+                if edge.target_id in self.nodes:
+                    stack.append(path + (edge.target_id,))
+            if not extended:
+                paths.append(path)
+        return paths
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -194,7 +308,8 @@ class CrossSystemLineageTracer:
         self,
         aod_server: Optional[Any] = None,
         dcl_server: Optional[Any] = None,
-        aam_server: Optional[Any] = None
+        aam_server: Optional[Any] = None,
+        max_concurrency: int = 16
     ):
         """
         Initialize the lineage tracer.
@@ -203,10 +318,12 @@ class CrossSystemLineageTracer:
             aod_server: AOD MCP server for asset lineage
             dcl_server: DCL MCP server for database lineage
             aam_server: AAM MCP server for connection info
+            max_concurrency: Max lineage lookups in flight per trace level
         """
         self.aod_server = aod_server
         self.dcl_server = dcl_server
         self.aam_server = aam_server
+        self.max_concurrency = max_concurrency
 
         # Cache for lineage graphs
         self._cache: dict[str, LineageGraph] = {}
@@ -321,114 +438,9 @@ class CrossSystemLineageTracer:
         tenant_id: UUID,
         depth: int,
         include_field_level: bool,
-        visited: Optional[set] = None
     ) -> None:
         """Trace upstream lineage."""
-        if depth <= 0:
-            return
-
-        if visited is None:
-            visited = set()
-
-        if node_id in visited:
-            return
-        visited.add(node_id)
-
-        # Get lineage from AOD
-        upstream_nodes = []
-        if self.aod_server:
-            try:
-                from app.agentic.mcp_servers.aod_server import AODContext
-                context = AODContext(tenant_id=tenant_id)
-
-                result = await self.aod_server.execute_tool(
-                    "aod_get_lineage",
-                    {"asset_id": node_id, "direction": "upstream", "depth": 1},
-                    context
-                )
-
-                if result.get("success"):
-                    lineage = result.get("lineage", {})
-                    upstream_nodes = lineage.get("upstream", [])
-            except Exception as e:
-                logger.warning(f"Error tracing upstream: {e}")
-
-        # Also check DCL for database-level lineage
-        if self.dcl_server:
-            try:
-                from app.agentic.mcp_servers.dcl_server import DCLContext
-                dcl_context = DCLContext(tenant_id=tenant_id)
-
-                result = await self.dcl_server.execute_tool(
-                    "dcl_get_lineage",
-                    {"table_name": node_id, "direction": "upstream"},
-                    dcl_context
-                )
-
-                if result.get("success"):
-                    dcl_lineage = result.get("lineage", [])
-                    for item in dcl_lineage:
-                        # Avoid duplicates
-                        if not any(n.get("id") == item.get("id") for n in upstream_nodes):
-                            upstream_nodes.append(item)
-            except Exception as e:
-                logger.warning(f"Error getting DCL lineage: {e}")
-
-        # Process upstream nodes
-        for upstream in upstream_nodes:
-            upstream_id = upstream.get("id", upstream.get("name", "unknown"))
-
-            # Get or create node
-            if upstream_id not in graph.nodes:
-                node = await self._get_node_details(upstream_id, tenant_id)
-                if node:
-                    # Update with info from lineage
-                    node.name = upstream.get("name", node.name)
-                    if upstream.get("type"):
-                        try:
-                            node.node_type = NodeType(upstream.get("type"))
-                        except ValueError:
-                            pass
-                    if upstream.get("source_system"):
-                        node.source_system = upstream.get("source_system")
-                    graph.add_node(node)
-
-            # Create edge
-            edge_type = EdgeType.DIRECT
-            transformation = upstream.get("transformation")
-            if transformation:
-                if "join" in transformation.lower():
-                    edge_type = EdgeType.JOIN
-                elif "aggregate" in transformation.lower():
-                    edge_type = EdgeType.AGGREGATE
-                elif "transform" in transformation.lower():
-                    edge_type = EdgeType.TRANSFORM
-                elif "extract" in transformation.lower():
-                    edge_type = EdgeType.DIRECT
-                else:
-                    edge_type = EdgeType.TRANSFORM
-
-            # Build field mappings if requested
-            fields_mapped = {}
-            if include_field_level and upstream.get("fields_used"):
-                for field in upstream.get("fields_used", []):
-                    fields_mapped[field] = field  # Simple 1:1 mapping
-
-            edge = LineageEdge(
-                source_id=upstream_id,
-                target_id=node_id,
-                edge_type=edge_type,
-                transformation=transformation,
-                fields_mapped=fields_mapped
-            )
-            graph.add_edge(edge)
-
-            # Recurse
-            if depth > 1:
-                await self._trace_upstream(
-                    graph, upstream_id, tenant_id, depth - 1,
-                    include_field_level, visited
-                )
+        await self._trace_levels(graph, node_id, tenant_id, depth, include_field_level, "upstream")
 
     async def _trace_downstream(
         self,
@@ -437,103 +449,169 @@ class CrossSystemLineageTracer:
         tenant_id: UUID,
         depth: int,
         include_field_level: bool,
-        visited: Optional[set] = None
     ) -> None:
         """Trace downstream lineage."""
-        if depth <= 0:
-            return
-
-        if visited is None:
-            visited = set()
+        await self._trace_levels(graph, node_id, tenant_id, depth, include_field_level, "downstream")
 
-        if node_id in visited:
-            return
-        visited.add(node_id)
+    async def _trace_levels(
+        self,
+        graph: LineageGraph,
+        node_id: str,
+        tenant_id: UUID,
+        depth: int,
+        include_field_level: bool,
+        direction: str,
+    ) -> None:
+        """
+        Breadth-first trace in one direction.
 
-        # Get lineage from AOD
-        downstream_nodes = []
-        if self.aod_server:
-            try:
-                from app.agentic.mcp_servers.aod_server import AODContext
-                context = AODContext(tenant_id=tenant_id)
+        Each frontier level is fetched as one concurrent batch (bounded by
+        ``max_concurrency``), followed by one batch of node-detail lookups
+        for the nodes discovered at that level.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        visited = {node_id}
+        frontier = [node_id]
 
-                result = await self.aod_server.execute_tool(
-                    "aod_get_lineage",
-                    {"asset_id": node_id, "direction": "downstream", "depth": 1},
-                    context
-                )
+        for _ in range(depth):
+            if not frontier:
+                break
 
-                if result.get("success"):
-                    lineage = result.get("lineage", {})
-                    downstream_nodes = lineage.get("downstream", [])
-            except Exception as e:
-                logger.warning(f"Error tracing downstream: {e}")
+            neighbour_lists = await asyncio.gather(
+                *(self._fetch_neighbours(n, tenant_id, direction, semaphore) for n in frontier)
+            )
 
-        # Also check DCL
-        if self.dcl_server:
-            try:
-                from app.agentic.mcp_servers.dcl_server import DCLContext
-                dcl_context = DCLContext(tenant_id=tenant_id)
+            new_ids: dict[str, None] = {}
+            discovered: list[tuple[str, dict]] = []
+            for current, neighbours in zip(frontier, neighbour_lists):
+                for item in neighbours:
+                    neighbour_id = item.get("id", item.get("name", "unknown"))
+                    discovered.append((current, item))
+                    if neighbour_id not in graph.nodes:
+                        new_ids[neighbour_id] = None
 
-                result = await self.dcl_server.execute_tool(
-                    "dcl_get_lineage",
-                    {"table_name": node_id, "direction": "downstream"},
-                    dcl_context
-                )
+            async def node_details(neighbour_id: str) -> Optional[LineageNode]:
+                async with semaphore:
+                    return await self._get_node_details(neighbour_id, tenant_id)
 
-                if result.get("success"):
-                    dcl_lineage = result.get("lineage", [])
-                    for item in dcl_lineage:
-                        if not any(n.get("id") == item.get("id") for n in downstream_nodes):
-                            downstream_nodes.append(item)
-            except Exception as e:
-                logger.warning(f"Error getting DCL downstream: {e}")
+            details = await asyncio.gather(*(node_details(n) for n in new_ids))
+            pending_nodes = dict(zip(new_ids, details))
 
-        # Process downstream nodes
-        for downstream in downstream_nodes:
-            downstream_id = downstream.get("id", downstream.get("name", "unknown"))
+            next_frontier: list[str] = []
+            for current, item in discovered:
+                neighbour_id = item.get("id", item.get("name", "unknown"))
 
-            # Get or create node
-            if downstream_id not in graph.nodes:
-                node = await self._get_node_details(downstream_id, tenant_id)
+                node = pending_nodes.pop(neighbour_id, None)
                 if node:
-                    node.name = downstream.get("name", node.name)
-                    if downstream.get("type"):
+                    # Update with info from lineage
+                    node.name = item.get("name", node.name)
+                    if item.get("type"):
                         try:
-                            node.node_type = NodeType(downstream.get("type"))
+                            node.node_type = NodeType(item.get("type"))
                         except ValueError:
                             pass
-                    if downstream.get("source_system"):
-                        node.source_system = downstream.get("source_system")
+                    if item.get("source_system"):
+                        node.source_system = item.get("source_system")
                     graph.add_node(node)
 
-            # Create edge
-            edge_type = EdgeType.DIRECT
-            transformation = downstream.get("transformation")
-            if transformation:
-                if "join" in transformation.lower():
-                    edge_type = EdgeType.JOIN
-                elif "aggregate" in transformation.lower():
-                    edge_type = EdgeType.AGGREGATE
-                elif "transform" in transformation.lower():
-                    edge_type = EdgeType.TRANSFORM
+                if direction == "upstream":
+                    edge = self._build_edge(neighbour_id, current, item, include_field_level)
                 else:
-                    edge_type = EdgeType.TRANSFORM
+                    edge = self._build_edge(current, neighbour_id, item, include_field_level)
+                graph.add_edge(edge)
 
-            edge = LineageEdge(
-                source_id=node_id,
-                target_id=downstream_id,
-                edge_type=edge_type,
-                transformation=transformation
-            )
-            graph.add_edge(edge)
+                if neighbour_id not in visited:
+                    visited.add(neighbour_id)
+                    next_frontier.append(neighbour_id)
 
-            # Recurse
-            if depth > 1:
-                await self._trace_downstream(
-                    graph, downstream_id, tenant_id, depth - 1,
-                    include_field_level, visited
-                )
+            frontier = next_frontier
+
+    async def _fetch_neighbours(
+        self,
+        node_id: str,
+        tenant_id: UUID,
+        direction: str,
+        semaphore: asyncio.Semaphore,
+    ) -> list[dict]:
+        """Fetch one hop of lineage for a node from AOD and DCL."""
+        async with semaphore:
+            neighbours: list[dict] = []
+            if self.aod_server:
+                try:
+                    from app.agentic.mcp_servers.aod_server import AODContext
+                    context = AODContext(tenant_id=tenant_id)
+
+                    result = await self.aod_server.execute_tool(
+                        "aod_get_lineage",
+                        {"asset_id": node_id, "direction": direction, "depth": 1},
+                        context
+                    )
+
+                    if result.get("success"):
+                        lineage = result.get("lineage", {})
+                        neighbours = list(lineage.get(direction, []))
+                except Exception as e:
+                    logger.warning(f"Error tracing {direction}: {e}")
+
+            # Also check DCL for database-level lineage
+            if self.dcl_server:
+                try:
+                    from app.agentic.mcp_servers.dcl_server import DCLContext
+                    dcl_context = DCLContext(tenant_id=tenant_id)
+
+                    result = await self.dcl_server.execute_tool(
+                        "dcl_get_lineage",
+                        {"table_name": node_id, "direction": direction},
+                        dcl_context
+                    )
+
+                    if result.get("success"):
+                        seen_ids = {n.get("id") for n in neighbours}
+                        for item in result.get("lineage", []):
+                            # Avoid duplicates
+                            if item.get("id") not in seen_ids:
+                                seen_ids.add(item.get("id"))
+                                neighbours.append(item)
+                except Exception as e:
+                    logger.warning(f"Error getting DCL {direction} lineage: {e}")
+
+            return neighbours
+
+    def _build_edge(
+        self,
+        source_id: str,
+        target_id: str,
+        item: dict,
+        include_field_level: bool
+    ) -> LineageEdge:
+        """Build an edge from a lineage record."""
+        edge_type = EdgeType.DIRECT
+        transformation = item.get("transformation")
+        if transformation:
+            if "join" in transformation.lower():
+                edge_type = EdgeType.JOIN
+            elif "aggregate" in transformation.lower():
+                edge_type = EdgeType.AGGREGATE
+            elif "transform" in transformation.lower():
+                edge_type = EdgeType.TRANSFORM
+            elif "extract" in transformation.lower():
+                edge_type = EdgeType.DIRECT
+            else:
+                edge_type = EdgeType.TRANSFORM
+
+        # Build field mappings if requested
+        fields_mapped = {}
+        if include_field_level and item.get("fields_used"):
+            for field_name in item.get("fields_used", []):
+                fields_mapped[field_name] = field_name  # Simple 1:1 mapping
+
+        return LineageEdge(
+            source_id=source_id,
+            target_id=target_id,
+            edge_type=edge_type,
+            transformation=transformation,
+            fields_mapped=fields_mapped
+        )
 
     async def analyze_impact(
         self,
@@ -560,29 +638,22 @@ class CrossSystemLineageTracer:
             depth=5
         )
 
-        # Get all impact paths
-        impact_paths = graph.get_impact_path(asset_id)
+        # Shortest distance from the changed asset to each affected node
+        distances = graph.get_distances(asset_id, depth=5)
 
         # Categorize affected assets
         affected_assets = []
-        for node_id, node in graph.nodes.items():
-            if node_id == asset_id:
-                continue
-
-            # Calculate distance from root
-            for path in impact_paths:
-                if node in path:
-                    distance = path.index(node)
-                    affected_assets.append({
-                        "id": node.id,
-                        "name": node.name,
-                        "type": node.node_type.value,
-                        "source_system": node.source_system,
-                        "owner": node.owner,
-                        "distance": distance,
-                        "severity": "high" if distance <= 1 else ("medium" if distance <= 3 else "low")
-                    })
-                    break
+        for node_id, distance in distances.items():
+            node = graph.nodes[node_id]
+            affected_assets.append({
+                "id": node.id,
+                "name": node.name,
+                "type": node.node_type.value,
+                "source_system": node.source_system,
+                "owner": node.owner,
+                "distance": distance,
+                "severity": "high" if distance <= 1 else ("medium" if distance <= 3 else "low")
+            })
 
         # Sort by distance
         affected_assets.sort(key=lambda x: x["distance"])
@@ -6,6 +6,7 @@ Per ARB requirements, this is a Phase 1 deliverable.
 """
 
 from app.agentic.eval.runner import EvalRunner, EvalConfig
+from app.agentic.eval.cache import EvalResultCache
 from app.agentic.eval.golden_dataset import GOLDEN_DATASET, load_golden_dataset
 
-__all__ = ['EvalRunner', 'EvalConfig', 'GOLDEN_DATASET', 'load_golden_dataset']
+__all__ = ['EvalRunner', 'EvalConfig', 'EvalResultCache', 'GOLDEN_DATASET', 'load_golden_dataset']
@@ -0,0 +1,187 @@
+"""
+Evaluation Result Cache
+
+Avoids re-running golden cases whose outcome cannot have changed:
+- Results keyed by (agent config hash, test case hash, model)
+- Config diffs: tool-level changes only affect the cases that expect,
+  forbid or previously used the changed tools; any other change affects
+  every case
+- Deterministic sharding of cases across worker processes
+- Wilson score bounds on the pass rate for early stopping
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import statistics
+from typing import Any, Iterable, Optional
+
+from app.agentic.eval.golden_dataset import GoldenTestCase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def _digest(data: Any) -> str:
+    payload = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def hash_agent_config(agent_config: dict) -> str:
+    """Stable hash of an agent configuration."""
+    return _digest(agent_config)
+
+
+def hash_test_case(test_case: GoldenTestCase) -> str:
+    """Stable hash of everything that defines a test case."""
+    return _digest(dataclasses.asdict(test_case))
+
+
+def shard_of(case_hash: str, shard_count: int) -> int:
+    """Shard a case belongs to; stable across processes and runs."""
+    return int(case_hash[:8], 16) % shard_count
+
+
+def _tools_by_name(agent_config: dict) -> dict[str, Any]:
+    tools = {}
+    for tool in agent_config.get("tools") or []:
+        name = tool if isinstance(tool, str) else tool.get("name")
+        tools[name] = tool
+    return tools
+
+
+def config_diff(old_config: dict, new_config: dict) -> tuple[bool, set[str]]:
+    """
+    Compare two agent configs.
+
+    Returns:
+        (global_changed, changed_tools) - global_changed is True if anything
+        other than the tool list changed; changed_tools are the names of
+        tools added, removed or redefined
+    """
+    def strip(config: dict) -> dict:
+        return {k: v for k, v in config.items() if k != "tools"}
+
+    old_tools, new_tools = _tools_by_name(old_config), _tools_by_name(new_config)
+    changed_tools = {
+        name for name in old_tools.keys() | new_tools.keys()
+        if old_tools.get(name) != new_tools.get(name)
+    }
+    return strip(old_config) != strip(new_config), changed_tools
+
+
+def affected_case_ids(
+    old_config: dict,
+    new_config: dict,
+    test_cases: Iterable[GoldenTestCase],
+    previous_tools: Optional[dict[str, list[str]]] = None,
+) -> set[str]:
+    """
+    Cases whose outcome may change between two agent configs.
+
+    A tool change affects a case that expects or forbids the tool, or whose
+    previous run called it. Added tools no case mentions are assumed not to
+    change outcomes.
+
+    Args:
+        previous_tools: Case id -> tools the case called under old_config
+    """
+    test_cases = list(test_cases)
+    global_changed, changed_tools = config_diff(old_config, new_config)
+    if global_changed:
+        return {tc.id for tc in test_cases}
+    if not changed_tools:
+        return set()
+
+    previous_tools = previous_tools or {}
+    return {
+        tc.id for tc in test_cases
+        if changed_tools & (set(tc.expected_tools) | set(tc.forbidden_tools) | set(previous_tools.get(tc.id, ())))
+    }
+
+
+def wilson_interval(passed: int, total: int, confidence: float = 0.95) -> tuple[float, float]:
+    """Wilson score interval for a pass rate."""
+    if total == 0:
+        return 0.0, 1.0
+    z = statistics.NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = passed / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    margin = z * ((p * (1 - p) / total + z * z / (4 * total * total)) ** 0.5) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class EvalResultCache:
+    """
+    Test case results by (agent config hash, case hash, model).
+
+    Also remembers each evaluated config and the latest config per agent,
+    so a run can re-evaluate only what changed since the previous run.
+
+    Args:
+        path: Optional JSON file to load from and save() to
+        max_entries: Results kept (oldest evicted first)
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._results: dict[tuple[str, str, str], dict] = {}
+        self._configs: dict[str, dict] = {}
+        self._latest: dict[str, str] = {}
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, config_hash: str, case_hash: str, model: str) -> Optional[dict]:
+        """Cached TestCaseResult fields, or None."""
+        return self._results.get((config_hash, case_hash, model))
+
+    def put(self, config_hash: str, case_hash: str, model: str, result: dict):
+        key = (config_hash, case_hash, model)
+        self._results.pop(key, None)
+        self._results[key] = result
+        while len(self._results) > self.max_entries:
+            del self._results[next(iter(self._results))]
+
+    def remember_config(self, agent_id: str, config_hash: str, agent_config: dict):
+        """Record a config and mark it the agent's latest evaluated config."""
+        self._configs[config_hash] = agent_config
+        self._latest[agent_id] = config_hash
+
+    def get_config(self, config_hash: str) -> Optional[dict]:
+        return self._configs.get(config_hash)
+
+    def latest_config_hash(self, agent_id: str) -> Optional[str]:
+        return self._latest.get(agent_id)
+
+    def save(self, path: Optional[str] = None):
+        """Write the cache as JSON (atomically)."""
+        path = path or self.path
+        data = {
+            "results": [[*key, value] for key, value in self._results.items()],
+            "configs": self._configs,
+            "latest": self._latest,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+
+    def _load(self, path: str):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable eval cache {path}: {e}")
+            return
+        for config_hash, case_hash, model, result in data.get("results", []):
+            self._results[(config_hash, case_hash, model)] = result
+        self._configs.update(data.get("configs", {}))
+        self._latest.update(data.get("latest", {}))
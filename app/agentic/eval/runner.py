@@ -3,16 +3,30 @@ Evaluation Runner for TDAD (Test-Driven Agent Development)
 
 Executes golden dataset test cases against an agent and collects results.
 Supports parallel execution, cost tracking, and detailed reporting.
+
+Repeated evaluations reuse cached results for unchanged (agent config,
+case, model) combinations, re-run only the cases a config change affects,
+can shard cases across worker processes, and can stop early once the pass
+rate is decided with the requested confidence.
 """
 
 import asyncio
 import logging
 import time
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
 from typing import Any, Callable, Optional
 from uuid import UUID
 
+from app.agentic.eval.cache import (
+    EvalResultCache,
+    affected_case_ids,
+    hash_agent_config,
+    hash_test_case,
+    shard_of,
+    wilson_interval,
+)
 from app.agentic.eval.golden_dataset import GoldenTestCase, GOLDEN_DATASET, load_golden_dataset
 
 logger = logging.getLogger(__name__)
@@ -30,6 +44,24 @@ class EvalConfig:
     stop_on_failure: bool = False
     mock_mode: bool = False  # Use mock responses for testing
 
+    # Result caching and incremental re-evaluation
+    agent_config: dict = field(default_factory=dict)  # Prompt, tools, settings that define the agent
+    model: Optional[str] = None  # Defaults to agent_config["model"]
+    use_cache: bool = True
+    baseline_config: Optional[dict] = None  # Diff against this (default: agent's last evaluated config)
+
+    # Early stop once the pass rate is known to be above/below the threshold
+    pass_rate_threshold: Optional[float] = None
+    confidence: float = 0.95
+    min_cases_before_stop: int = 10
+
+    # Run only shard_index of shard_count (e.g. one shard per worker host)
+    shard_count: int = 1
+    shard_index: int = 0
+
+
+EARLY_STOP_ERROR = "Skipped: pass rate decided by confidence bound"
+
 
 @dataclass
 class TestCaseResult:
@@ -44,6 +76,7 @@ class TestCaseResult:
     error: Optional[str] = None
     failure_reason: Optional[str] = None
     tool_calls_log: list[dict] = field(default_factory=list)
+    cached: bool = False  # Reused from a previous run instead of evaluated
 
 
 @dataclass
@@ -63,6 +96,37 @@ class EvalRunResult:
     results: list[TestCaseResult] = field(default_factory=list)
     error: Optional[str] = None
 
+    # Work avoided
+    cached_cases: int = 0  # Exact (config, case, model) cache hits
+    carried_over_cases: int = 0  # Unaffected by the config diff, reused from the baseline
+    evaluated_cases: int = 0
+    early_stopped: bool = False
+    pass_rate_lower: float = 0.0
+    pass_rate_upper: float = 1.0
+
+
+@dataclass
+class _EvalPlan:
+    """Which cases a run reuses and which it evaluates."""
+    config_hash: str
+    model: str
+    test_cases: list[GoldenTestCase]
+    case_hashes: dict[str, str]
+    reused: dict[str, TestCaseResult] = field(default_factory=dict)
+    to_run: list[GoldenTestCase] = field(default_factory=list)
+    cached_cases: int = 0
+    carried_over_cases: int = 0
+
+
+def _evaluate_shard(
+    executor_factory: Callable[[], Callable[[str, UUID, UUID], Any]],
+    test_cases: list[GoldenTestCase],
+    config: EvalConfig,
+) -> list[TestCaseResult]:
+    """Worker process entry point: evaluate one shard with a fresh agent executor."""
+    runner = EvalRunner(executor_factory())
+    return asyncio.run(runner._run_parallel(test_cases, config))
+
 
 class EvalRunner:
     """
@@ -79,8 +143,9 @@ class EvalRunner:
 
     def __init__(
         self,
-        agent_executor: Callable[[str, UUID, UUID], Any],
-        on_progress: Optional[Callable[[int, int, TestCaseResult], None]] = None
+        agent_executor: Optional[Callable[[str, UUID, UUID], Any]],
+        on_progress: Optional[Callable[[int, int, TestCaseResult], None]] = None,
+        cache: Optional[EvalResultCache] = None,
     ):
         """
         Initialize the eval runner.
@@ -88,28 +153,81 @@ class EvalRunner:
         Args:
             agent_executor: Async function that executes an agent query.
                             Signature: (input: str, agent_id: UUID, tenant_id: UUID) -> AgentRunResult
+                            (may be None when only run_sharded() is used)
             on_progress: Optional callback for progress updates (current, total, result)
+            cache: Optional result cache shared across runs
         """
         self.agent_executor = agent_executor
         self.on_progress = on_progress
+        self.cache = cache
 
-    async def run(self, config: EvalConfig) -> EvalRunResult:
+    async def run(
+        self,
+        config: EvalConfig,
+        test_cases: Optional[list[GoldenTestCase]] = None,
+    ) -> EvalRunResult:
         """
         Run the evaluation against the golden dataset.
 
         Args:
             config: Evaluation configuration
+            test_cases: Cases to run (default: golden dataset filtered by config)
 
         Returns:
             EvalRunResult with all test case outcomes
         """
+        return await self._run(config, test_cases, self._run_parallel)
+
+    async def run_sharded(
+        self,
+        config: EvalConfig,
+        executor_factory: Callable[[], Callable[[str, UUID, UUID], Any]],
+        processes: int,
+        test_cases: Optional[list[GoldenTestCase]] = None,
+    ) -> EvalRunResult:
+        """
+        Run the evaluation with cases sharded across worker processes.
+
+        Cache lookups and writes stay in this process; each worker evaluates
+        its shard with its own agent executor. Early stopping does not apply
+        across shards.
+
+        Args:
+            config: Evaluation configuration
+            executor_factory: Picklable (module-level) callable returning an agent executor
+            processes: Worker processes
+            test_cases: Cases to run (default: golden dataset filtered by config)
+        """
+        async def evaluate(cases: list[GoldenTestCase], run_config: EvalConfig) -> list[TestCaseResult]:
+            shards: list[list[GoldenTestCase]] = [[] for _ in range(processes)]
+            for tc in cases:
+                shards[shard_of(hash_test_case(tc), processes)].append(tc)
+            shard_config = replace(run_config, pass_rate_threshold=None)
+
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                shard_results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _evaluate_shard, executor_factory, shard, shard_config)
+                    for shard in shards if shard
+                ))
+            return [r for results in shard_results for r in results]
+
+        return await self._run(config, test_cases, evaluate)
+
+    async def _run(
+        self,
+        config: EvalConfig,
+        test_cases: Optional[list[GoldenTestCase]],
+        evaluate: Callable[[list[GoldenTestCase], EvalConfig], Any],
+    ) -> EvalRunResult:
         import uuid
 
         # Load test cases based on config
-        test_cases = load_golden_dataset(
-            categories=config.categories if config.categories else None,
-            difficulties=config.difficulties if config.difficulties else None
-        )
+        if test_cases is None:
+            test_cases = load_golden_dataset(
+                categories=config.categories if config.categories else None,
+                difficulties=config.difficulties if config.difficulties else None
+            )
 
         result = EvalRunResult(
             eval_id=uuid.uuid4(),
@@ -118,21 +236,39 @@ class EvalRunner:
             total_cases=len(test_cases)
         )
 
-        logger.info(f"Starting eval run {result.eval_id} with {len(test_cases)} test cases")
-
         try:
+            plan = self._plan(config, test_cases)
+            result.total_cases = len(plan.test_cases)
+            logger.info(
+                f"Starting eval run {result.eval_id} with {len(plan.test_cases)} test cases "
+                f"({plan.cached_cases} cached, {plan.carried_over_cases} carried over)"
+            )
+
             if config.mock_mode:
                 # Run in mock mode for testing the framework
-                results = await self._run_mock(test_cases, config)
+                evaluated = await self._run_mock(plan.to_run, config)
             else:
                 # Run actual evaluation
-                results = await self._run_parallel(test_cases, config)
+                evaluated = await evaluate(plan.to_run, config) if plan.to_run else []
+
+            self._store(config, plan, evaluated)
+
+            by_id = {**plan.reused, **{r.test_case_id: r for r in evaluated}}
+            results = [by_id[tc.id] for tc in plan.test_cases]
+            decided = [r for r in results if r.error != EARLY_STOP_ERROR]
 
             result.results = results
+            result.cached_cases = plan.cached_cases
+            result.carried_over_cases = plan.carried_over_cases
+            result.evaluated_cases = sum(1 for r in evaluated if r.error != EARLY_STOP_ERROR)
+            result.early_stopped = len(decided) < len(results)
             result.passed_cases = sum(1 for r in results if r.passed)
             result.failed_cases = sum(1 for r in results if not r.passed and not r.error)
             result.skipped_cases = sum(1 for r in results if r.error)
-            result.pass_rate = result.passed_cases / len(results) if results else 0.0
+            result.pass_rate = result.passed_cases / len(decided) if decided else 0.0
+            result.pass_rate_lower, result.pass_rate_upper = wilson_interval(
+                result.passed_cases, len(decided), config.confidence
+            )
             result.total_cost_usd = sum(r.cost_usd for r in results)
             result.total_duration_ms = sum(r.duration_ms for r in results)
             result.completed_at = datetime.utcnow()
@@ -144,6 +280,72 @@ class EvalRunner:
 
         return result
 
+    def _plan(self, config: EvalConfig, test_cases: list[GoldenTestCase]) -> _EvalPlan:
+        """Shard the cases and split them into reused results and cases to evaluate."""
+        case_hashes = {tc.id: hash_test_case(tc) for tc in test_cases}
+        if config.shard_count > 1:
+            test_cases = [
+                tc for tc in test_cases
+                if shard_of(case_hashes[tc.id], config.shard_count) == config.shard_index
+            ]
+
+        plan = _EvalPlan(
+            config_hash=hash_agent_config(config.agent_config),
+            model=config.model or config.agent_config.get("model") or "default",
+            test_cases=test_cases,
+            case_hashes=case_hashes,
+        )
+        if self.cache is None or not config.use_cache or config.mock_mode:
+            plan.to_run = list(test_cases)
+            return plan
+
+        # Baseline for incremental re-evaluation
+        baseline = None
+        if config.baseline_config is not None:
+            baseline = {"agent_config": config.baseline_config, "model": plan.model}
+        else:
+            latest_hash = self.cache.latest_config_hash(str(config.agent_id))
+            if latest_hash and latest_hash != plan.config_hash:
+                baseline = self.cache.get_config(latest_hash)
+
+        previous: dict[str, dict] = {}
+        if baseline is not None and baseline["model"] == plan.model:
+            baseline_hash = hash_agent_config(baseline["agent_config"])
+            for tc in test_cases:
+                cached = self.cache.get(baseline_hash, case_hashes[tc.id], plan.model)
+                if cached is not None:
+                    previous[tc.id] = cached
+        affected = affected_case_ids(
+            baseline["agent_config"], config.agent_config, test_cases,
+            previous_tools={case_id: r["actual_tools"] for case_id, r in previous.items()},
+        ) if previous else set()
+
+        for tc in test_cases:
+            case_hash = case_hashes[tc.id]
+            cached = self.cache.get(plan.config_hash, case_hash, plan.model)
+            if cached is not None:
+                plan.cached_cases += 1
+            elif tc.id in previous and tc.id not in affected:
+                cached = previous[tc.id]
+                self.cache.put(plan.config_hash, case_hash, plan.model, cached)
+                plan.carried_over_cases += 1
+            else:
+                plan.to_run.append(tc)
+                continue
+            plan.reused[tc.id] = TestCaseResult(**{**cached, "cached": True})
+        return plan
+
+    def _store(self, config: EvalConfig, plan: _EvalPlan, evaluated: list[TestCaseResult]):
+        """Cache evaluated results; errors and skips are not cached."""
+        if self.cache is None or not config.use_cache or config.mock_mode:
+            return
+        for r in evaluated:
+            if r.error is None:
+                self.cache.put(plan.config_hash, plan.case_hashes[r.test_case_id], plan.model, asdict(r))
+        self.cache.remember_config(
+            str(config.agent_id), plan.config_hash, {"agent_config": config.agent_config, "model": plan.model}
+        )
+
     async def _run_parallel(
         self,
         test_cases: list[GoldenTestCase],
@@ -153,9 +355,18 @@ class EvalRunner:
         semaphore = asyncio.Semaphore(config.max_parallel)
         results = []
         failed = False
+        decided = False
+        passed_count = 0
+        completed = 0
+
+        if config.pass_rate_threshold is not None:
+            # Spread categories/difficulties over the run so early results are representative
+            order = sorted(range(len(test_cases)), key=lambda i: hash_test_case(test_cases[i]))
+        else:
+            order = list(range(len(test_cases)))
 
         async def run_with_semaphore(tc: GoldenTestCase, index: int) -> TestCaseResult:
-            nonlocal failed
+            nonlocal failed, decided, passed_count, completed
             if failed and config.stop_on_failure:
                 return TestCaseResult(
                     test_case_id=tc.id,
@@ -164,18 +375,28 @@ class EvalRunner:
                 )
 
             async with semaphore:
+                if decided:
+                    return TestCaseResult(test_case_id=tc.id, passed=False, error=EARLY_STOP_ERROR)
+
                 result = await self._run_single_case(tc, config)
 
                 if not result.passed and config.stop_on_failure:
                     failed = True
 
+                completed += 1
+                passed_count += int(result.passed)
+                if config.pass_rate_threshold is not None and completed >= config.min_cases_before_stop:
+                    lower, upper = wilson_interval(passed_count, completed, config.confidence)
+                    decided = lower >= config.pass_rate_threshold or upper < config.pass_rate_threshold
+
                 if self.on_progress:
                     self.on_progress(index + 1, len(test_cases), result)
 
                 return result
 
-        tasks = [run_with_semaphore(tc, i) for i, tc in enumerate(test_cases)]
-        results = await asyncio.gather(*tasks)
+        tasks = [run_with_semaphore(test_cases[i], n) for n, i in enumerate(order)]
+        by_position = dict(zip(order, await asyncio.gather(*tasks)))
+        results = [by_position[i] for i in range(len(test_cases))]
 
         return results
 
@@ -5,7 +5,7 @@ Unified LLM access with:
 - Multi-provider routing (Anthropic, OpenAI fallback)
 - Semantic caching
 - Cost tracking
-- Reasoning router for smart request planning
+- Reasoning router for smart request planning (memoized routing decisions)
 """
 
 from app.agentic.gateway.client import (
@@ -20,6 +20,7 @@ from app.agentic.gateway.router import (
     RoutingStep,
     get_reasoning_router,
 )
+from app.agentic.gateway.intent import IntentClassifier, RoutingDecisionCache
 from app.agentic.gateway.cache import SemanticCache
 from app.agentic.gateway.cost import CostTracker, ModelPricing, get_cost_tracker
 
@@ -32,6 +33,8 @@ __all__ = [
     'RoutingPlan',
     'RoutingStep',
     'get_reasoning_router',
+    'IntentClassifier',
+    'RoutingDecisionCache',
     'SemanticCache',
     'CostTracker',
     'ModelPricing',
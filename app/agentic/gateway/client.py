@@ -5,12 +5,14 @@ Unified LLM access layer supporting:
 - Direct Anthropic API calls
 - Automatic fallback to OpenAI
 - Request/response logging
+- Provider execution: request coalescing, per-model rate/concurrency
+  limits, hedged requests, retries and a shared pooled HTTP client
 """
 
 import asyncio
 import logging
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
@@ -66,6 +68,19 @@ class GatewayConfig:
     max_retries: int = 3
     retry_delay_seconds: float = 1.0
 
+    # Provider execution (per provider/model)
+    requests_per_second: float = 20.0
+    burst: int = 20
+    max_concurrency_per_model: int = 16
+    coalesce_requests: bool = True
+    hedge_requests: bool = True
+    hedge_percentile: float = 95.0
+    hedge_budget: float = 0.1
+
+    # Shared HTTP connection pool
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+
     # Caching
     enable_cache: bool = True
     cache_ttl_seconds: int = 3600
@@ -111,14 +126,30 @@ class AIGateway:
     - Automatic fallback on failure
     - Cost tracking
     - Optional semantic caching
+    - Coalesced, rate-limited and hedged provider calls
     """
 
     def __init__(self, config: Optional[GatewayConfig] = None):
+        from app.agentic.gateway.execution import ProviderExecutor
+
         self.config = config or GatewayConfig()
         self._anthropic_client = None
         self._openai_client = None
+        self._http_clients: dict[type, Any] = {}
         self._cache = None
         self._cost_tracker = None
+        self._executor = ProviderExecutor(
+            requests_per_second=self.config.requests_per_second,
+            burst=self.config.burst,
+            max_concurrency=self.config.max_concurrency_per_model,
+            coalesce=self.config.coalesce_requests,
+            hedge=self.config.hedge_requests,
+            hedge_percentile=self.config.hedge_percentile,
+            hedge_budget=self.config.hedge_budget,
+            max_retries=self.config.max_retries,
+            retry_delay_seconds=self.config.retry_delay_seconds,
+            timeout_seconds=self.config.timeout_seconds,
+        )
 
     async def initialize(self):
         """Initialize clients based on configuration."""
@@ -145,8 +176,11 @@ class AIGateway:
 
         try:
             import anthropic
+            # Retries happen in the provider executor, which knows the rate limits
             self._anthropic_client = anthropic.AsyncAnthropic(
-                api_key=self.config.anthropic_api_key
+                api_key=self.config.anthropic_api_key,
+                http_client=self._shared_http_client(anthropic),
+                max_retries=0,
             )
             logger.info("Anthropic client initialized")
         except ImportError:
@@ -161,12 +195,36 @@ class AIGateway:
         try:
             import openai
             self._openai_client = openai.AsyncOpenAI(
-                api_key=self.config.openai_api_key
+                api_key=self.config.openai_api_key,
+                http_client=self._shared_http_client(openai),
+                max_retries=0,
             )
             logger.info("OpenAI client initialized")
         except ImportError:
             logger.warning("openai package not installed")
 
+    def _shared_http_client(self, sdk) -> Optional[Any]:
+        """
+        Connection pool shared by SDK clients built on the same HTTP library.
+
+        Returns None for SDKs without DefaultAsyncHttpxClient (they keep their
+        own pool).
+        """
+        from app.agentic.gateway.execution import create_http_client, http_client_base
+
+        client_class = getattr(sdk, "DefaultAsyncHttpxClient", None)
+        if client_class is None:
+            return None
+        base = http_client_base(client_class)
+        if base not in self._http_clients:
+            self._http_clients[base] = create_http_client(
+                client_class,
+                self.config.timeout_seconds,
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+            )
+        return self._http_clients[base]
+
     async def complete(
         self,
         messages: list[dict],
@@ -210,7 +268,7 @@ class AIGateway:
         response = None
 
         try:
-            response = await self._call_provider(
+            response = await self._execute(
                 self.config.primary_provider,
                 messages=messages,
                 model_tier=model_tier,
@@ -226,7 +284,7 @@ class AIGateway:
             # Try fallback
             if self.config.fallback_provider:
                 try:
-                    response = await self._call_provider(
+                    response = await self._execute(
                         self.config.fallback_provider,
                         messages=messages,
                         model_tier=model_tier,
@@ -261,6 +319,51 @@ class AIGateway:
 
         return response
 
+    async def _execute(
+        self,
+        provider: LLMProvider,
+        messages: list[dict],
+        model_tier: ModelTier,
+        model: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        tools: Optional[list[dict]],
+        system: Optional[str],
+    ) -> LLMResponse:
+        """Call a provider through the executor (coalescing, limits, hedging, retries)."""
+        models = ANTHROPIC_MODELS if provider == LLMProvider.ANTHROPIC else OPENAI_MODELS
+        model_name = model or models[model_tier]
+        request = {
+            "messages": messages,
+            "system": system,
+            "tools": tools,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+
+        response, shared = await self._executor.execute(
+            provider.value,
+            model_name,
+            request,
+            lambda: self._call_provider(
+                provider, messages, model_tier, model_name, max_tokens, temperature, tools, system
+            ),
+        )
+        if shared:
+            # Served by another caller's request; give each caller its own copy
+            response = replace(response, tool_calls=list(response.tool_calls), cached=True)
+        return response
+
+    def get_execution_stats(self) -> dict:
+        """Coalescing, hedging, retry and rate limit counters."""
+        return dict(self._executor.stats)
+
+    async def close(self):
+        """Close the shared HTTP connection pools."""
+        for http_client in self._http_clients.values():
+            await http_client.aclose()
+        self._http_clients.clear()
+
     async def _call_provider(
         self,
         provider: LLMProvider,
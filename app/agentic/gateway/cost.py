@@ -3,14 +3,21 @@ Cost Tracker
 
 Tracks and calculates LLM API costs per model and provider.
 Provides cost estimation and budget enforcement.
+
+Usage is aggregated into running totals (per tenant, run and model) and
+day/hour rollups as it is recorded, so budget checks and summaries do not
+rescan every record.
 """
 
 import logging
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 from uuid import UUID
 
+from app.agentic.gateway.usage_rollup import DEFAULT_RAW_RETENTION, UsageRollup
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,7 +86,47 @@ MODEL_PRICING: dict[str, ModelPricing] = {
 }
 
 
-@dataclass
+# model string -> MODEL_PRICING key it resolved to (None = default pricing)
+_pricing_keys: dict[str, Optional[str]] = {}
+_pricing_table_size = len(MODEL_PRICING)
+_UNRESOLVED = object()
+
+DEFAULT_PRICING_MODEL = "claude-sonnet-4-20250514"
+
+
+def _resolve_pricing_key(model: str) -> Optional[str]:
+    if model in MODEL_PRICING:
+        return model
+    # Try partial match
+    for model_id in MODEL_PRICING:
+        if model_id in model or model in model_id:
+            return model_id
+    return None
+
+
+def lookup_pricing(model: str) -> Optional[ModelPricing]:
+    """
+    Pricing for a model ID, resolving partial matches once per distinct ID.
+
+    Falls back to DEFAULT_PRICING_MODEL for unknown models. The memo is
+    rebuilt whenever MODEL_PRICING gains or loses entries.
+    """
+    global _pricing_table_size
+    if len(MODEL_PRICING) != _pricing_table_size:
+        _pricing_keys.clear()
+        _pricing_table_size = len(MODEL_PRICING)
+
+    key = _pricing_keys.get(model, _UNRESOLVED)
+    if key is _UNRESOLVED or (key is not None and key not in MODEL_PRICING):
+        key = _pricing_keys[model] = _resolve_pricing_key(model)
+        if key is None:
+            logger.warning(f"Unknown model for pricing: {model}, using default")
+
+    pricing = MODEL_PRICING.get(key) if key is not None else None
+    return pricing or MODEL_PRICING.get(DEFAULT_PRICING_MODEL)
+
+
+@dataclass(slots=True)
 class UsageRecord:
     """Record of a single LLM call."""
     timestamp: datetime
@@ -91,6 +138,10 @@ class UsageRecord:
     tenant_id: Optional[UUID] = None
 
 
+# Rollup key for usage across all tenants (tenant_id itself may be None)
+_ALL_TENANTS = ("__all_tenants__",)
+
+
 class CostTracker:
     """
     Tracks LLM costs across runs and tenants.
@@ -102,8 +153,22 @@ class CostTracker:
     - Usage reporting
     """
 
-    def __init__(self):
-        self._usage_records: list[UsageRecord] = []
+    def __init__(
+        self,
+        raw_retention: timedelta = DEFAULT_RAW_RETENTION,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        """
+        Args:
+            raw_retention: How long individual records are kept for exact
+                window edges; older windows are answered per day
+            clock: Source of record timestamps and default windows
+        """
+        self._clock = clock
+        self._usage = UsageRollup(raw_retention)  # keyed by tenant_id and _ALL_TENANTS
+        self._run_costs: dict[UUID, float] = {}
+        self._run_last_seen: dict[UUID, datetime] = {}
+        self._runs_lock = threading.Lock()
         self._budget_limits: dict[UUID, float] = {}  # tenant_id -> max USD
 
     def calculate_cost(
@@ -123,19 +188,7 @@ class CostTracker:
         Returns:
             Cost in USD
         """
-        pricing = MODEL_PRICING.get(model)
-
-        if not pricing:
-            # Try partial match
-            for model_id, p in MODEL_PRICING.items():
-                if model_id in model or model in model_id:
-                    pricing = p
-                    break
-
-        if not pricing:
-            logger.warning(f"Unknown model for pricing: {model}, using default")
-            # Default to Sonnet pricing
-            pricing = MODEL_PRICING.get("claude-sonnet-4-20250514")
+        pricing = lookup_pricing(model)
 
         if not pricing:
             return 0.0
@@ -172,7 +225,7 @@ class CostTracker:
             cost_usd = self.calculate_cost(model, input_tokens, output_tokens)
 
         record = UsageRecord(
-            timestamp=datetime.utcnow(),
+            timestamp=self._clock(),
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
@@ -181,9 +234,19 @@ class CostTracker:
             tenant_id=tenant_id
         )
 
-        self._usage_records.append(record)
+        self.add_record(record)
         return record
 
+    def add_record(self, record: UsageRecord) -> None:
+        """Aggregate an existing record, e.g. one replayed from storage."""
+        self._usage.add((record.tenant_id, _ALL_TENANTS), record)
+        if record.run_id is not None:
+            with self._runs_lock:
+                self._run_costs[record.run_id] = self._run_costs.get(record.run_id, 0.0) + record.cost_usd
+                last_seen = self._run_last_seen.get(record.run_id)
+                if last_seen is None or record.timestamp > last_seen:
+                    self._run_last_seen[record.run_id] = record.timestamp
+
     def set_budget_limit(self, tenant_id: UUID, max_usd: float):
         """Set a budget limit for a tenant."""
         self._budget_limits[tenant_id] = max_usd
@@ -216,19 +279,13 @@ class CostTracker:
     ) -> float:
         """Get total cost for a tenant."""
         if since is None:
-            since = datetime.utcnow() - timedelta(days=30)  # Default: last 30 days
+            since = self._clock() - timedelta(days=30)  # Default: last 30 days
 
-        return sum(
-            r.cost_usd for r in self._usage_records
-            if r.tenant_id == tenant_id and r.timestamp >= since
-        )
+        return self._usage.cost(tenant_id, since=since)
 
     def get_run_cost(self, run_id: UUID) -> float:
         """Get total cost for a specific run."""
-        return sum(
-            r.cost_usd for r in self._usage_records
-            if r.run_id == run_id
-        )
+        return self._run_costs.get(run_id, 0.0)
 
     def get_usage_summary(
         self,
@@ -248,49 +305,20 @@ class CostTracker:
             Summary dict with totals and breakdowns
         """
         if since is None:
-            since = datetime.utcnow() - timedelta(days=30)
+            since = self._clock() - timedelta(days=30)
         if until is None:
-            until = datetime.utcnow()
-
-        # Filter records
-        records = [
-            r for r in self._usage_records
-            if r.timestamp >= since and r.timestamp <= until
-            and (tenant_id is None or r.tenant_id == tenant_id)
-        ]
-
-        # Aggregate
-        total_cost = sum(r.cost_usd for r in records)
-        total_input_tokens = sum(r.input_tokens for r in records)
-        total_output_tokens = sum(r.output_tokens for r in records)
-
-        # By model
-        by_model: dict[str, dict] = {}
-        for r in records:
-            if r.model not in by_model:
-                by_model[r.model] = {
-                    "calls": 0,
-                    "input_tokens": 0,
-                    "output_tokens": 0,
-                    "cost_usd": 0.0
-                }
-            by_model[r.model]["calls"] += 1
-            by_model[r.model]["input_tokens"] += r.input_tokens
-            by_model[r.model]["output_tokens"] += r.output_tokens
-            by_model[r.model]["cost_usd"] += r.cost_usd
+            until = self._clock()
+
+        key = _ALL_TENANTS if tenant_id is None else tenant_id
+        window = self._usage.window(key, since=since, until=until, by_model=True)
 
         return {
             "period": {
                 "since": since.isoformat(),
                 "until": until.isoformat()
             },
-            "total": {
-                "calls": len(records),
-                "input_tokens": total_input_tokens,
-                "output_tokens": total_output_tokens,
-                "cost_usd": total_cost
-            },
-            "by_model": by_model
+            "total": window.total.to_dict(),
+            "by_model": {model: totals.to_dict() for model, totals in window.by_model.items()}
         }
 
     def estimate_cost(
@@ -312,14 +340,26 @@ class CostTracker:
 
         Args:
             older_than: Only clear records older than this (None = all)
+
+        Run totals are reduced by the cleared records still within the raw
+        retention; runs with no usage since ``older_than`` are dropped.
         """
         if older_than:
-            self._usage_records = [
-                r for r in self._usage_records
-                if r.timestamp >= older_than
-            ]
+            removed = self._usage.records(_ALL_TENANTS, before=older_than)
+            self._usage.discard_before(older_than)
+            with self._runs_lock:
+                for r in removed:
+                    if r.run_id in self._run_costs:
+                        self._run_costs[r.run_id] -= r.cost_usd
+                # Runs with nothing left (including compacted history)
+                for run_id in [k for k, ts in self._run_last_seen.items() if ts < older_than]:
+                    self._run_costs.pop(run_id, None)
+                    del self._run_last_seen[run_id]
         else:
-            self._usage_records = []
+            self._usage.clear()
+            with self._runs_lock:
+                self._run_costs.clear()
+                self._run_last_seen.clear()
 
 
 # Global cost tracker
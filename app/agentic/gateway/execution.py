@@ -0,0 +1,411 @@
+"""
+Provider Execution
+
+How the AI Gateway sends requests to a provider:
+- Single-flight coalescing: identical in-flight requests (same provider,
+  model and normalized request) share one provider call
+- Per provider/model lanes: a token bucket for request rate and an AIMD
+  concurrency limit that halves on 429/overload and creeps back on success
+- Hedged requests: when an attempt is slower than the lane's recent latency
+  percentile, a second attempt is started (within a hedge budget) and the
+  first to succeed wins
+- Retries with exponential backoff and jitter for retryable errors
+- One pooled HTTP client shared by provider SDK clients
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_REQUESTS_PER_SECOND = 20.0
+DEFAULT_BURST = 20
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_BUDGET = 0.1  # Hedged attempts per request
+LATENCY_WINDOW = 200
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+RATE_LIMIT_STATUS_CODES = {429, 529}
+
+
+def request_key(provider: str, model: str, request: dict) -> str:
+    """Coalescing key for a normalized request."""
+    payload = json.dumps([provider, model, request], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return _status_code(error) in RATE_LIMIT_STATUS_CODES
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limits, overloads, server errors, timeouts and connection errors."""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError)) or type(error).__name__ in (
+        "APIConnectionError", "APITimeoutError"
+    )
+
+
+class TokenBucket:
+    """
+    Request rate limit.
+
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity
+        clock: Monotonic clock (seconds)
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self):
+        while not self.try_acquire():
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit.
+
+    The limit grows by 1/limit per success and is multiplied by
+    `decrease_factor` when the provider rate limits, so it settles just below
+    the provider's actual capacity.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease_factor: float = 0.5):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: deque = deque()
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def try_acquire(self) -> bool:
+        if self.in_flight < self.current_limit:
+            self.in_flight += 1
+            return True
+        return False
+
+    async def acquire(self):
+        while not self.try_acquire():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def release(self, success: bool = True, rate_limited: bool = False):
+        self.in_flight -= 1
+        if rate_limited:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        elif success:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        free = self.current_limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+@dataclass
+class ProviderLane:
+    """Rate, concurrency and latency state for one provider/model."""
+    bucket: TokenBucket
+    limiter: AdaptiveLimiter
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    requests: int = 0
+    hedges: int = 0
+
+    def latency_percentile(self, percentile: float, min_samples: int) -> Optional[float]:
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call among callers with the same key.
+
+    The call runs as its own task; a caller that is cancelled stops waiting
+    without cancelling it for the others, and the call is cancelled only
+    when its last caller leaves.
+    """
+
+    def __init__(self):
+        self._flights: dict[str, list] = {}  # key -> [task, waiters]
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Returns:
+            (result, shared) - shared is True for callers that joined a flight
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            task = asyncio.ensure_future(fn())
+            flight = self._flights[key] = [task, 0]
+            task.add_done_callback(lambda _, flight=flight: self._finish(key, flight))
+
+        flight[1] += 1
+        try:
+            return await asyncio.shield(flight[0]), shared
+        except asyncio.CancelledError:
+            if flight[1] == 1 and not flight[0].done():
+                flight[0].cancel()
+            raise
+        finally:
+            flight[1] -= 1
+
+    def _finish(self, key: str, flight: list):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+class ProviderExecutor:
+    """
+    Executes provider calls with coalescing, rate/concurrency limits,
+    hedging and retries.
+
+    Args:
+        requests_per_second: Token bucket rate per provider/model
+        burst: Token bucket capacity per provider/model
+        max_concurrency: Upper bound of the adaptive concurrency limit
+        coalesce: Share identical in-flight requests
+        hedge: Start a second attempt for slow requests
+        hedge_percentile: Latency percentile after which to hedge
+        hedge_min_samples: Latencies needed before hedging starts
+        hedge_budget: Max hedged attempts as a fraction of requests
+        max_retries: Retries for retryable errors
+        retry_delay_seconds: Base backoff delay (doubled per retry, jittered)
+        timeout_seconds: Per-attempt timeout
+        clock: Monotonic clock (seconds)
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int = DEFAULT_BURST,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        coalesce: bool = True,
+        hedge: bool = True,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        hedge_min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        hedge_budget: float = DEFAULT_HEDGE_BUDGET,
+        max_retries: int = 3,
+        retry_delay_seconds: float = 1.0,
+        timeout_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.coalesce = coalesce
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_budget = hedge_budget
+        self.max_retries = max_retries
+        self.retry_delay_seconds = retry_delay_seconds
+        self.timeout_seconds = timeout_seconds
+        self._clock = clock
+        self._lanes: dict[tuple[str, str], ProviderLane] = {}
+        self._flights = SingleFlight()
+        self.stats = {
+            "requests": 0, "provider_calls": 0, "coalesced": 0, "hedges": 0,
+            "hedge_wins": 0, "retries": 0, "rate_limited": 0,
+        }
+
+    def lane(self, provider: str, model: str) -> ProviderLane:
+        lane = self._lanes.get((provider, model))
+        if lane is None:
+            lane = self._lanes[(provider, model)] = ProviderLane(
+                bucket=TokenBucket(self.requests_per_second, self.burst, self._clock),
+                limiter=AdaptiveLimiter(self.max_concurrency),
+            )
+        return lane
+
+    async def execute(
+        self,
+        provider: str,
+        model: str,
+        request: dict,
+        call: Callable[[], Awaitable[T]],
+    ) -> tuple[T, bool]:
+        """
+        Run a provider call.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            request: Normalized request (coalescing key)
+            call: Zero-argument coroutine factory making one provider call
+
+        Returns:
+            (result, shared) - shared is True if another caller's call was reused
+        """
+        self.stats["requests"] += 1
+        lane = self.lane(provider, model)
+        if not self.coalesce:
+            return await self._run(lane, call), False
+
+        result, shared = await self._flights.do(request_key(provider, model, request), lambda: self._run(lane, call))
+        if shared:
+            self.stats["coalesced"] += 1
+        return result, shared
+
+    async def _run(self, lane: ProviderLane, call: Callable[[], Awaitable[T]]) -> T:
+        lane.requests += 1
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._hedged(lane, call)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.retry_delay_seconds * (2 ** attempt) * random.uniform(0.5, 1.5)
+                self.stats["retries"] += 1
+                logger.warning(f"Provider call failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _hedged(self, lane: ProviderLane, call: Callable[[], Awaitable[T]]) -> T:
+        hedge_after = lane.latency_percentile(self.hedge_percentile, self.hedge_min_samples) if self.hedge else None
+        primary = asyncio.ensure_future(self._attempt(lane, call))
+        if hedge_after is None:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done and self._start_hedge(lane):
+                tasks.add(asyncio.ensure_future(self._attempt(lane, call, acquired=True)))
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _start_hedge(self, lane: ProviderLane) -> bool:
+        """Claim capacity for a hedged attempt without waiting for it."""
+        if lane.hedges >= self.hedge_budget * lane.requests:
+            return False
+        if not lane.limiter.try_acquire():
+            return False
+        if not lane.bucket.try_acquire():
+            lane.limiter.release(success=False)
+            return False
+        lane.hedges += 1
+        self.stats["hedges"] += 1
+        return True
+
+    async def _attempt(self, lane: ProviderLane, call: Callable[[], Awaitable[T]], acquired: bool = False) -> T:
+        if not acquired:
+            await lane.bucket.acquire()
+            await lane.limiter.acquire()
+
+        self.stats["provider_calls"] += 1
+        start = self._clock()
+        try:
+            result = await asyncio.wait_for(call(), self.timeout_seconds)
+        except asyncio.CancelledError:
+            lane.limiter.release(success=False)
+            raise
+        except Exception as e:
+            rate_limited = is_rate_limited(e)
+            if rate_limited:
+                self.stats["rate_limited"] += 1
+            lane.limiter.release(success=False, rate_limited=rate_limited)
+            raise
+
+        lane.latencies.append(self._clock() - start)
+        lane.limiter.release(success=True)
+        return result
+
+
+def http_client_base(client_class: type) -> type:
+    """The httpx-style AsyncClient class an SDK's default client derives from."""
+    return next((c for c in client_class.__mro__ if c.__name__ == "AsyncClient"), client_class)
+
+
+def create_http_client(
+    client_class: type,
+    timeout_seconds: float,
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+):
+    """
+    Pooled HTTP client for provider SDKs.
+
+    Args:
+        client_class: The SDK's DefaultAsyncHttpxClient
+    """
+    return client_class(
+        timeout=httpx.Timeout(timeout_seconds),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections),
+    )
@@ -0,0 +1,168 @@
+"""
+Local Intent Classification
+
+Cheap routing decisions that avoid a model round trip:
+- Keyword/length feature classifier for TaskCategory with a confidence score
+- Query signatures: normalized prompt text, with literals masked for intent
+- Bounded TTL/LRU cache for routing decisions keyed by signature
+
+The ReasoningRouter uses these before falling back to its LLM classifier.
+"""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# Phrase/keyword -> weight, per TaskCategory value. Multi-word phrases are
+# matched on the normalized text; single words on tokens.
+CATEGORY_KEYWORDS: dict[str, dict[str, float]] = {
+    "query_data": {
+        "show": 1.0, "list": 1.0, "how many": 1.5, "count": 1.0, "total": 1.0, "top": 0.5,
+        "revenue": 1.0, "report": 1.0, "metrics": 1.0, "records": 1.0, "customers": 0.5,
+        "accounts": 0.5, "pipeline": 0.5, "get": 0.5, "find": 0.5, "which": 0.5, "last month": 1.0,
+        "this quarter": 1.0, "per": 0.5,
+    },
+    "manage_connections": {
+        "connect": 1.5, "connection": 1.5, "connections": 1.5, "connector": 1.5, "connectors": 1.5,
+        "integration": 1.0, "sync": 1.0, "credentials": 1.5, "oauth": 1.5, "disconnect": 2.0,
+        "reconnect": 2.0, "data source": 1.5, "data sources": 1.5,
+    },
+    "analyze": {
+        "analyze": 2.0, "analyse": 2.0, "analysis": 2.0, "why": 1.5, "trend": 1.5, "trends": 1.5,
+        "compare": 1.5, "correlation": 2.0, "investigate": 2.0, "root cause": 2.0, "anomaly": 2.0,
+        "anomalies": 2.0, "forecast": 1.5, "drift": 1.5, "breakdown": 1.0,
+    },
+    "explain": {
+        "explain": 2.0, "what does": 1.5, "how does": 1.5, "meaning": 1.5, "define": 1.5,
+        "describe": 1.0, "help me understand": 2.0, "what is a": 1.5, "what is an": 1.5,
+    },
+    "action": {
+        "create": 1.5, "delete": 2.0, "update": 1.5, "run": 1.0, "trigger": 1.5, "start": 1.0,
+        "stop": 1.0, "send": 1.5, "approve": 1.5, "remove": 1.5, "schedule": 1.5, "deploy": 2.0,
+        "rename": 1.5, "cancel": 1.5,
+    },
+}
+
+# Score at which a lone keyword counts as strong evidence
+STRONG_EVIDENCE = 2.0
+MAX_LOCAL_CONFIDENCE = 0.95
+DEFAULT_MIN_LOCAL_CONFIDENCE = 0.75
+
+_WORD = re.compile(r"[a-z0-9_']+")
+_QUOTED = re.compile(r"(\"[^\"]*\"|'[^']*')")
+_NUMBER = re.compile(r"\b\d+(?:[.,:/-]\d+)*\b")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace; keep case and literals (plans carry arguments)."""
+    return _SPACE.sub(" ", query).strip()
+
+
+def intent_signature(query: str) -> str:
+    """
+    Template signature for intent decisions.
+
+    Lowercased, quoted strings and numbers masked, punctuation dropped, so
+    "top 5 accounts in 2025" and "Top 10 accounts in 2024?" share a decision.
+    """
+    text = _QUOTED.sub(" <str> ", query.lower())
+    text = _NUMBER.sub(" <num> ", text)
+    text = " ".join(_WORD.findall(text.replace("<str>", "str_").replace("<num>", "num_")))
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+@dataclass
+class IntentPrediction:
+    """Local classifier output."""
+    category: str  # TaskCategory value
+    confidence: float
+    score: float = 0.0
+
+
+class IntentClassifier:
+    """
+    Keyword and length feature classifier.
+
+    Each category scores the weights of its keywords present in the query.
+    Confidence is the winning share of the total score, damped when the
+    evidence is weak; very short queries with no keywords lean to CLARIFY.
+    """
+
+    def __init__(self, keywords: Optional[dict[str, dict[str, float]]] = None):
+        keywords = keywords or CATEGORY_KEYWORDS
+        self._words: dict[str, list[tuple[str, float]]] = {}
+        self._phrases: list[tuple[str, str, float]] = []
+        for category, weights in keywords.items():
+            for keyword, weight in weights.items():
+                if " " in keyword:
+                    self._phrases.append((keyword, category, weight))
+                else:
+                    self._words.setdefault(keyword, []).append((category, weight))
+
+    def predict(self, query: str) -> IntentPrediction:
+        text = " ".join(_WORD.findall(query.lower()))
+        tokens = text.split()
+        scores: dict[str, float] = {}
+
+        for token in set(tokens):
+            for category, weight in self._words.get(token, ()):
+                scores[category] = scores.get(category, 0.0) + weight
+        padded = f" {text} "
+        for phrase, category, weight in self._phrases:
+            if f" {phrase} " in padded:
+                scores[category] = scores.get(category, 0.0) + weight
+
+        if not scores:
+            if len(tokens) <= 2:
+                return IntentPrediction("clarify", 0.5)
+            return IntentPrediction("query_data", 0.0)
+
+        category, top = max(scores.items(), key=lambda item: item[1])
+        share = top / sum(scores.values())
+        confidence = min(MAX_LOCAL_CONFIDENCE, share * min(1.0, top / STRONG_EVIDENCE))
+        return IntentPrediction(category, round(confidence, 4), top)
+
+
+class RoutingDecisionCache:
+    """
+    Bounded routing decision cache (LRU with TTL).
+
+    Args:
+        max_entries: Entries kept before evicting the least recently used
+        ttl_seconds: Entry lifetime
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 3600, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -7,15 +7,29 @@ LLM-based request routing that:
 - Selects appropriate tools
 - Handles compound/multi-step tasks
 
-Replaces brittle intent classification with dynamic reasoning.
+Replaces brittle intent classification with dynamic reasoning. Routing
+decisions are memoized: intent is tried on a local keyword classifier and
+a template-signature cache before the LLM classifier, and plans are cached
+per exact query, tool set and context.
 """
 
+import copy
+import hashlib
 import json
 import logging
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
+from app.agentic.gateway.intent import (
+    DEFAULT_MIN_LOCAL_CONFIDENCE,
+    IntentClassifier,
+    IntentPrediction,
+    RoutingDecisionCache,
+    intent_signature,
+    normalize_query,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,15 +114,36 @@ class ReasoningRouter:
     Uses a fast model (Haiku) to analyze requests and create execution plans.
     """
 
-    def __init__(self, gateway=None):
+    def __init__(
+        self,
+        gateway=None,
+        classifier: Optional[IntentClassifier] = None,
+        min_local_confidence: float = DEFAULT_MIN_LOCAL_CONFIDENCE,
+        cache_size: int = 2048,
+        cache_ttl_seconds: float = 3600,
+        metrics=None,
+    ):
         """
         Initialize the router.
 
         Args:
             gateway: AIGateway instance (or will use global)
+            classifier: Local intent classifier (keyword/length features)
+            min_local_confidence: Local predictions at or above this skip the LLM
+            cache_size: Entries per routing decision cache
+            cache_ttl_seconds: Routing decision lifetime
+            metrics: MetricsCollector (or will use global)
         """
         self._gateway = gateway
         self._tools_cache: list[dict] = []
+        self._classifier = classifier or IntentClassifier()
+        self.min_local_confidence = min_local_confidence
+        self._intent_cache = RoutingDecisionCache(cache_size, cache_ttl_seconds)
+        self._plan_cache = RoutingDecisionCache(cache_size, cache_ttl_seconds)
+        self._metrics = metrics
+        self._decisions: dict[str, int] = {}
+        # Confidence bucket -> [agreed with LLM, LLM decisions]
+        self._calibration: dict[str, list[int]] = {}
 
     async def _get_gateway(self):
         """Get AI Gateway instance."""
@@ -158,6 +193,14 @@ class ReasoningRouter:
         # Format tools for prompt
         tools_description = self._format_tools(tools)
 
+        plan_key = self._plan_key(query, tools_description, context)
+        cached = self._plan_cache.get(plan_key)
+        if cached is not None:
+            self._record_decision("route", "cache")
+            plan = copy.deepcopy(cached)
+            plan.query = query
+            return plan
+
         # Build system prompt
         system = ROUTING_SYSTEM_PROMPT.format(tools=tools_description)
 
@@ -179,8 +222,16 @@ class ReasoningRouter:
                 max_tokens=1024,
             )
 
-            # Parse response
-            plan = self._parse_routing_response(query, response.content)
+            self._record_decision("route", "llm")
+
+            # Parse response; only well-formed plans are memoized
+            try:
+                plan = self._parse_plan_json(query, response.content)
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                plan = self._generic_plan(query, response.content, e)
+            else:
+                self._plan_cache.put(plan_key, copy.deepcopy(plan))
+                self._learn_intent(query, plan.category)
             plan.estimated_cost_usd = response.cost_usd
 
             return plan
@@ -217,54 +268,60 @@ class ReasoningRouter:
     def _parse_routing_response(self, query: str, response: str) -> RoutingPlan:
         """Parse the LLM's routing response into a RoutingPlan."""
         try:
-            # Extract JSON from response
-            json_str = response
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0]
-
-            data = json.loads(json_str.strip())
-
-            # Parse steps
-            steps = []
-            for step_data in data.get("steps", []):
-                step = RoutingStep(
-                    step_number=step_data.get("step_number", len(steps) + 1),
-                    description=step_data.get("description", ""),
-                    tool_name=step_data.get("tool_name"),
-                    tool_arguments=step_data.get("tool_arguments", {}),
-                    requires_approval=step_data.get("requires_approval", False),
-                    depends_on=step_data.get("depends_on", []),
-                    conditional=step_data.get("conditional"),
-                )
-                steps.append(step)
-
-            return RoutingPlan(
-                query=query,
-                category=TaskCategory(data.get("category", "query_data")),
-                complexity=TaskComplexity(data.get("complexity", "simple")),
-                steps=steps,
-                clarification_needed=data.get("clarification_needed"),
-                reasoning=data.get("reasoning", ""),
-            )
-
+            return self._parse_plan_json(query, response)
         except (json.JSONDecodeError, KeyError, ValueError) as e:
-            logger.warning(f"Failed to parse routing response: {e}")
-            # Return a generic plan
-            return RoutingPlan(
-                query=query,
-                category=TaskCategory.QUERY_DATA,
-                complexity=TaskComplexity.SIMPLE,
-                steps=[
-                    RoutingStep(
-                        step_number=1,
-                        description="Process user request",
-                        tool_name=None,
-                    )
-                ],
-                reasoning=f"Parse failed, using generic plan. Original response: {response[:200]}"
+            return self._generic_plan(query, response, e)
+
+    def _parse_plan_json(self, query: str, response: str) -> RoutingPlan:
+        """Parse a routing response; raises on malformed JSON or values."""
+        # Extract JSON from response
+        json_str = response
+        if "```json" in response:
+            json_str = response.split("```json")[1].split("```")[0]
+        elif "```" in response:
+            json_str = response.split("```")[1].split("```")[0]
+
+        data = json.loads(json_str.strip())
+
+        # Parse steps
+        steps = []
+        for step_data in data.get("steps", []):
+            step = RoutingStep(
+                step_number=step_data.get("step_number", len(steps) + 1),
+                description=step_data.get("description", ""),
+                tool_name=step_data.get("tool_name"),
+                tool_arguments=step_data.get("tool_arguments", {}),
+                requires_approval=step_data.get("requires_approval", False),
+                depends_on=step_data.get("depends_on", []),
+                conditional=step_data.get("conditional"),
             )
+            steps.append(step)
+
+        return RoutingPlan(
+            query=query,
+            category=TaskCategory(data.get("category", "query_data")),
+            complexity=TaskComplexity(data.get("complexity", "simple")),
+            steps=steps,
+            clarification_needed=data.get("clarification_needed"),
+            reasoning=data.get("reasoning", ""),
+        )
+
+    def _generic_plan(self, query: str, response: str, error: Exception) -> RoutingPlan:
+        """Plan used when the routing response cannot be parsed."""
+        logger.warning(f"Failed to parse routing response: {error}")
+        return RoutingPlan(
+            query=query,
+            category=TaskCategory.QUERY_DATA,
+            complexity=TaskComplexity.SIMPLE,
+            steps=[
+                RoutingStep(
+                    step_number=1,
+                    description="Process user request",
+                    tool_name=None,
+                )
+            ],
+            reasoning=f"Parse failed, using generic plan. Original response: {response[:200]}"
+        )
 
     async def should_clarify(self, query: str) -> Optional[str]:
         """
@@ -296,8 +353,22 @@ Keep your response very short."""
         """
         Quick intent classification without full routing.
 
-        Useful for pre-filtering or UI hints.
+        Useful for pre-filtering or UI hints. Tries the local classifier,
+        then the signature cache; only low-confidence, unseen queries reach
+        the LLM classifier.
         """
+        prediction = self._classifier.predict(query)
+        if prediction.confidence >= self.min_local_confidence:
+            self._record_decision("classify_intent", "local")
+            return TaskCategory(prediction.category)
+
+        signature = intent_signature(query)
+        cached = self._intent_cache.get(signature)
+        if cached is not None:
+            self._record_decision("classify_intent", "cache")
+            return cached
+
+        self._record_decision("classify_intent", "llm")
         gateway = await self._get_gateway()
         from app.agentic.gateway.client import ModelTier
 
@@ -316,10 +387,62 @@ Respond with just the category name."""
         response = await gateway.quick_complete(prompt, model_tier=ModelTier.FAST)
 
         try:
-            return TaskCategory(response.strip().lower())
+            category = TaskCategory(response.strip().lower())
         except ValueError:
             return TaskCategory.QUERY_DATA
 
+        self._intent_cache.put(signature, category)
+        self._record_calibration(prediction, category)
+        return category
+
+    def get_stats(self) -> dict:
+        """Routing decision sources, cache sizes and local classifier calibration."""
+        calibration = {
+            bucket: {"agreed": agreed, "total": total, "accuracy": round(agreed / total, 4)}
+            for bucket, (agreed, total) in sorted(self._calibration.items())
+        }
+        return {
+            "decisions": dict(self._decisions),
+            "intent_cache_entries": len(self._intent_cache),
+            "plan_cache_entries": len(self._plan_cache),
+            "calibration": calibration,
+        }
+
+    def _plan_key(self, query: str, tools_description: str, context: Optional[dict]) -> str:
+        """Plans carry tool arguments, so only identical requests share one."""
+        parts = [normalize_query(query), tools_description, json.dumps(context, sort_keys=True, default=str)]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _learn_intent(self, query: str, category: TaskCategory):
+        """Seed the intent cache and calibration from a routed plan."""
+        signature = intent_signature(query)
+        if self._intent_cache.get(signature) is None:
+            self._intent_cache.put(signature, category)
+            self._record_calibration(self._classifier.predict(query), category)
+
+    def _get_metrics(self):
+        if self._metrics is None:
+            from app.agentic.observability.metrics import get_metrics_collector
+            self._metrics = get_metrics_collector()
+        return self._metrics
+
+    def _record_decision(self, method: str, source: str):
+        key = f"{method}:{source}"
+        self._decisions[key] = self._decisions.get(key, 0) + 1
+        self._get_metrics().counter("router.decisions", 1, labels={"method": method, "source": source})
+
+    def _record_calibration(self, prediction: IntentPrediction, category: TaskCategory):
+        """Compare a local prediction with the LLM's decision, by confidence bucket."""
+        bucket = f"{min(int(prediction.confidence * 10), 9) / 10:.1f}"
+        agreed = prediction.category == category.value
+        counts = self._calibration.setdefault(bucket, [0, 0])
+        counts[0] += int(agreed)
+        counts[1] += 1
+        self._get_metrics().counter(
+            "router.intent.calibration", 1,
+            labels={"confidence": bucket, "agreed": str(agreed).lower()},
+        )
+
 
 # Global router instance
 _router: Optional[ReasoningRouter] = None
@@ -0,0 +1,316 @@
+"""
+Usage Rollup
+
+Time-bucketed running totals of LLM usage, shared by CostTracker and
+BudgetEnforcer.
+
+Each key (tenant, budget, ...) gets day and hour buckets with totals and
+per-model breakdowns, plus the raw records of each hour while they are
+within the raw retention. A window query sums whole days, then whole
+hours, and only scans raw records for the partial hours at its edges, so
+its cost depends on the window length rather than on how many records
+have been seen.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Hashable, Iterable, Optional
+
+_DAY = timedelta(days=1)
+_HOUR = timedelta(hours=1)
+_TICK = timedelta(microseconds=1)  # datetime resolution; turns inclusive bounds into exclusive ones
+
+# Covers the default 30-day reporting window and a calendar month
+DEFAULT_RAW_RETENTION = timedelta(days=35)
+
+
+def _floor_day(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(ts: datetime) -> datetime:
+    floor = _floor_day(ts)
+    return floor if floor == ts else floor + _DAY
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    """Running totals for a set of usage records."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, record: Any) -> None:
+        self.calls += 1
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.cost_usd += record.cost_usd
+
+    def merge(self, other: "UsageTotals") -> None:
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cost_usd += other.cost_usd
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": self.cost_usd,
+        }
+
+
+@dataclass(slots=True)
+class UsageWindow:
+    """Totals for one window, optionally broken down by model."""
+    total: UsageTotals = field(default_factory=UsageTotals)
+    by_model: dict[str, UsageTotals] = field(default_factory=dict)
+
+    def add(self, record: Any, by_model: bool) -> None:
+        self.total.add(record)
+        if by_model:
+            totals = self.by_model.get(record.model)
+            if totals is None:
+                totals = self.by_model[record.model] = UsageTotals()
+            totals.add(record)
+
+    def merge(self, other: "UsageWindow", by_model: bool) -> None:
+        self.total.merge(other.total)
+        if by_model:
+            for model, totals in other.by_model.items():
+                mine = self.by_model.get(model)
+                if mine is None:
+                    mine = self.by_model[model] = UsageTotals()
+                mine.merge(totals)
+
+
+class _Series:
+    """Buckets for one key."""
+
+    __slots__ = ("days", "hours", "raw", "first", "last")
+
+    def __init__(self, timestamp: datetime):
+        self.days: dict[datetime, UsageWindow] = {}
+        self.hours: dict[datetime, UsageWindow] = {}
+        self.raw: dict[datetime, list] = {}
+        self.first = timestamp
+        self.last = timestamp
+
+
+class UsageRollup:
+    """
+    Day/hour rollups of usage records per key.
+
+    Records are any objects with ``timestamp``, ``model``, ``input_tokens``,
+    ``output_tokens`` and ``cost_usd`` attributes (see UsageRecord).
+
+    Hour buckets and raw records older than ``raw_retention`` are compacted
+    away; windows that start before that point are answered at day
+    granularity.
+    """
+
+    def __init__(self, raw_retention: timedelta = DEFAULT_RAW_RETENTION):
+        self.raw_retention = raw_retention
+        self._series: dict[Hashable, _Series] = {}
+        self._compacted_before: Optional[datetime] = None
+        self._newest: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def add(self, keys: Iterable[Hashable], record: Any) -> None:
+        """Count ``record`` under each of ``keys``."""
+        ts = record.timestamp
+        day, hour = _floor_day(ts), _floor_hour(ts)
+        with self._lock:
+            detailed = self._compacted_before is None or hour >= self._compacted_before
+            for key in keys:
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Series(ts)
+                elif ts < series.first:
+                    series.first = ts
+                elif ts > series.last:
+                    series.last = ts
+
+                self._bucket(series.days, day).add(record, True)
+                if detailed:
+                    self._bucket(series.hours, hour).add(record, True)
+                    raw = series.raw.get(hour)
+                    if raw is None:
+                        raw = series.raw[hour] = []
+                    raw.append(record)
+
+            if self._newest is None or ts > self._newest:
+                self._newest = ts
+                # Compact at most about once a day
+                horizon = _floor_day(ts - self.raw_retention)
+                if self._compacted_before is None or horizon - self._compacted_before >= _DAY:
+                    self._compact(horizon)
+
+    def window(
+        self,
+        key: Hashable,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        by_model: bool = False,
+    ) -> UsageWindow:
+        """
+        Totals for records under ``key`` with ``since <= timestamp <= until``.
+
+        Either bound may be None for an open-ended window.
+        """
+        result = UsageWindow()
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return result
+
+            # Open ends snap to day boundaries beyond the data, so the common
+            # "everything since X" query never scans raw records at its tail
+            if since is None or since <= series.first:
+                lo = _floor_day(series.first)
+            else:
+                lo = since
+            if until is None or until >= series.last:
+                hi = _ceil_day(series.last + _TICK)
+            else:
+                hi = until + _TICK
+            if lo >= hi:
+                return result
+
+            if self._compacted_before is not None and lo < self._compacted_before:
+                lo = _floor_day(lo)
+                if hi <= self._compacted_before:
+                    hi = _ceil_day(hi)
+
+            self._sum_days(series, lo, hi, result, by_model)
+        return result
+
+    def cost(self, key: Hashable, since: Optional[datetime] = None, until: Optional[datetime] = None) -> float:
+        """Total cost under ``key`` in a window (see window())."""
+        return self.window(key, since, until).total.cost_usd
+
+    def records(self, key: Hashable, before: Optional[datetime] = None) -> list:
+        """Raw records still held for ``key``, optionally only those before a time."""
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return []
+            return [
+                r for hour in sorted(series.raw) for r in series.raw[hour]
+                if before is None or r.timestamp < before
+            ]
+
+    def discard_before(self, cutoff: datetime) -> None:
+        """Forget every record with ``timestamp < cutoff``."""
+        with self._lock:
+            edge_hour, edge_day = _floor_hour(cutoff), _floor_day(cutoff)
+            for key in list(self._series):
+                series = self._series[key]
+                for day in [d for d in series.days if d + _DAY <= cutoff]:
+                    del series.days[day]
+                for hour in [h for h in series.hours if h + _HOUR <= cutoff]:
+                    del series.hours[hour]
+                    series.raw.pop(hour, None)
+
+                if edge_hour < cutoff and edge_hour in series.raw:
+                    kept = [r for r in series.raw[edge_hour] if r.timestamp >= cutoff]
+                    series.raw[edge_hour] = kept
+                    series.hours[edge_hour] = self._window_of(kept)
+                if edge_day < cutoff and edge_day in series.days:
+                    if self._compacted_before is None or edge_day >= self._compacted_before:
+                        rebuilt = UsageWindow()
+                        for hour, bucket in series.hours.items():
+                            if edge_day <= hour < edge_day + _DAY:
+                                rebuilt.merge(bucket, True)
+                        series.days[edge_day] = rebuilt
+
+                series.days = {d: w for d, w in series.days.items() if w.total.calls}
+                series.hours = {h: w for h, w in series.hours.items() if w.total.calls}
+                series.raw = {h: r for h, r in series.raw.items() if r}
+                if not series.days:
+                    del self._series[key]
+                elif series.first < cutoff:
+                    series.first = cutoff
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._compacted_before = None
+            self._newest = None
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._series)
+
+    # Private methods
+
+    @staticmethod
+    def _bucket(buckets: dict, start: datetime) -> UsageWindow:
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = UsageWindow()
+        return bucket
+
+    @staticmethod
+    def _window_of(records: list) -> UsageWindow:
+        window = UsageWindow()
+        for record in records:
+            window.add(record, True)
+        return window
+
+    def _compact(self, horizon: datetime) -> None:
+        """Drop hour buckets and raw records before ``horizon`` (a day boundary)."""
+        for series in self._series.values():
+            for hour in [h for h in series.hours if h < horizon]:
+                del series.hours[hour]
+                series.raw.pop(hour, None)
+        self._compacted_before = horizon
+
+    def _sum_days(self, series: _Series, lo: datetime, hi: datetime, result: UsageWindow, by_model: bool) -> None:
+        first_day, end_day = _ceil_day(lo), _floor_day(hi)
+        if first_day >= end_day:
+            self._sum_hours(series, lo, hi, result, by_model)
+            return
+        day = first_day
+        while day < end_day:
+            bucket = series.days.get(day)
+            if bucket is not None:
+                result.merge(bucket, by_model)
+            day += _DAY
+        self._sum_hours(series, lo, first_day, result, by_model)
+        self._sum_hours(series, end_day, hi, result, by_model)
+
+    def _sum_hours(self, series: _Series, lo: datetime, hi: datetime, result: UsageWindow, by_model: bool) -> None:
+        if lo >= hi:
+            return
+        if _floor_hour(lo) == _floor_hour(hi - _TICK):
+            self._sum_raw(series, lo, hi, result, by_model)
+            return
+        first_hour = _floor_hour(lo)
+        if first_hour != lo:
+            first_hour += _HOUR
+        end_hour = _floor_hour(hi)
+        hour = first_hour
+        while hour < end_hour:
+            bucket = series.hours.get(hour)
+            if bucket is not None:
+                result.merge(bucket, by_model)
+            hour += _HOUR
+        self._sum_raw(series, lo, first_hour, result, by_model)
+        self._sum_raw(series, end_hour, hi, result, by_model)
+
+    @staticmethod
+    def _sum_raw(series: _Series, lo: datetime, hi: datetime, result: UsageWindow, by_model: bool) -> None:
+        """Scan raw records in [lo, hi), which lies within a single hour."""
+        if lo >= hi:
+            return
+        for record in series.raw.get(_floor_hour(lo), ()):
+            if lo <= record.timestamp < hi:
+                result.add(record, by_model)
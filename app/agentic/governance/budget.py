@@ -3,6 +3,9 @@ Budget Enforcer
 
 Budget enforcement for agent execution.
 Implements Economics: Budget enforcement from RACI.
+
+Daily, weekly and monthly usage are read from the same day/hour usage
+rollups as CostTracker, keyed by budget, rather than kept as counters.
 """
 
 import logging
@@ -11,6 +14,9 @@ from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, List, Optional
 from uuid import UUID, uuid4
 
+from app.agentic.gateway.cost import UsageRecord
+from app.agentic.gateway.usage_rollup import UsageRollup
+
 logger = logging.getLogger(__name__)
 
 
@@ -177,8 +183,18 @@ class BudgetEnforcer:
     - Support per-action and per-run limits
     """
 
-    def __init__(self):
-        """Initialize the budget enforcer."""
+    def __init__(self, clock: Callable[[], datetime] = datetime.utcnow):
+        """
+        Initialize the budget enforcer.
+
+        Args:
+            clock: Source of cost timestamps and period boundaries
+        """
+        self._clock = clock
+
+        # Cost history per budget ID; a calendar month fits in the raw retention
+        self._usage = UsageRollup(raw_retention=timedelta(days=32))
+
         # Budget storage
         self._budgets: Dict[UUID, Budget] = {}
         self._by_agent: Dict[UUID, UUID] = {}
@@ -208,8 +224,11 @@ class BudgetEnforcer:
         Returns:
             Set budget
         """
+        if budget.id not in self._budgets:
+            # A restored budget carries usage the rollups have never seen
+            self._seed_usage(budget)
         # Reset usage periods if needed
-        self._reset_periods_if_needed(budget)
+        self._refresh_usage(budget)
 
         self._budgets[budget.id] = budget
 
@@ -244,7 +263,7 @@ class BudgetEnforcer:
             budget_id = self._by_agent[agent_id]
             budget = self._budgets.get(budget_id)
             if budget and budget.active:
-                self._reset_periods_if_needed(budget)
+                self._refresh_usage(budget)
                 return budget
 
         # Check tenant-level budget
@@ -252,9 +271,10 @@ class BudgetEnforcer:
             budget_id = self._by_tenant[tenant_id]
             budget = self._budgets.get(budget_id)
             if budget and budget.active:
-                self._reset_periods_if_needed(budget)
+                self._refresh_usage(budget)
                 return budget
 
+        self._refresh_usage(self._default_budget)
         return self._default_budget
 
     def check_budget(
@@ -346,10 +366,18 @@ class BudgetEnforcer:
         budget = self.get_budget(agent_id, tenant_id)
 
         # Update usage
-        budget.daily_usage_usd += cost_usd
-        budget.weekly_usage_usd += cost_usd
-        budget.monthly_usage_usd += cost_usd
-        budget.updated_at = datetime.utcnow()
+        now = self._clock()
+        self._usage.add((budget.id,), UsageRecord(
+            timestamp=now,
+            model="",
+            input_tokens=0,
+            output_tokens=0,
+            cost_usd=cost_usd,
+            run_id=run_id,
+            tenant_id=tenant_id,
+        ))
+        self._refresh_usage(budget)
+        budget.updated_at = now
 
         # Track run cost
         if run_id:
@@ -430,18 +458,20 @@ class BudgetEnforcer:
     ) -> Budget:
         """Reset usage counters for a budget."""
         budget = self.get_budget(agent_id, tenant_id)
+        now = self._clock()
 
+        # Usage counts from the reset time onwards; see _refresh_usage
         if period in ["daily", "all"]:
             budget.daily_usage_usd = 0.0
-            budget.last_reset_daily = datetime.utcnow()
+            budget.last_reset_daily = now
         if period in ["weekly", "all"]:
             budget.weekly_usage_usd = 0.0
-            budget.last_reset_weekly = datetime.utcnow()
+            budget.last_reset_weekly = now
         if period in ["monthly", "all"]:
             budget.monthly_usage_usd = 0.0
-            budget.last_reset_monthly = datetime.utcnow()
+            budget.last_reset_monthly = now
 
-        budget.updated_at = datetime.utcnow()
+        budget.updated_at = now
 
         # Clear sent alerts
         self._sent_alerts = {
@@ -477,14 +507,48 @@ class BudgetEnforcer:
 
     # Private methods
 
-    def _reset_periods_if_needed(self, budget: Budget) -> None:
-        """Reset usage periods if time has elapsed."""
-        now = datetime.utcnow()
+    def _period_starts(self) -> tuple:
+        """Start of the current day, week (Monday) and month."""
+        now = self._clock()
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = day_start - timedelta(days=day_start.weekday())
+        return day_start, week_start, day_start.replace(day=1)
+
+    def _seed_usage(self, budget: Budget) -> None:
+        """Record a budget's existing counters in the rollups so refreshing keeps them."""
+        day_start, week_start, month_start = self._period_starts()
+        carried = [
+            (since, usage)
+            for since, usage, period_start in (
+                (budget.last_reset_daily, budget.daily_usage_usd, day_start),
+                (budget.last_reset_weekly, budget.weekly_usage_usd, week_start),
+                (budget.last_reset_monthly, budget.monthly_usage_usd, month_start),
+            )
+            if usage > 0 and since >= period_start  # periods that rolled over start empty
+        ]
+
+        # A record counts in every window starting at or before it, so each
+        # window's start gets only what the narrower windows don't cover
+        seeded = 0.0
+        for since, usage in sorted(carried, key=lambda c: c[0], reverse=True):
+            if usage > seeded:
+                self._usage.add((budget.id,), UsageRecord(
+                    timestamp=since,
+                    model="",
+                    input_tokens=0,
+                    output_tokens=0,
+                    cost_usd=usage - seeded,
+                    tenant_id=budget.tenant_id,
+                ))
+                seeded = usage
+
+    def _refresh_usage(self, budget: Budget) -> None:
+        """Roll periods over at calendar boundaries and read usage from the rollups."""
+        day_start, week_start, month_start = self._period_starts()
 
         # Daily reset (midnight)
-        if now.date() > budget.last_reset_daily.date():
-            budget.daily_usage_usd = 0.0
-            budget.last_reset_daily = now
+        if budget.last_reset_daily < day_start:
+            budget.last_reset_daily = day_start
             # Clear daily alerts
             self._sent_alerts = {
                 (bid, atype) for bid, atype in self._sent_alerts
@@ -492,15 +556,16 @@ class BudgetEnforcer:
             }
 
         # Weekly reset (Monday)
-        days_since_weekly = (now - budget.last_reset_weekly).days
-        if days_since_weekly >= 7:
-            budget.weekly_usage_usd = 0.0
-            budget.last_reset_weekly = now
+        if budget.last_reset_weekly < week_start:
+            budget.last_reset_weekly = week_start
 
         # Monthly reset (1st of month)
-        if now.month != budget.last_reset_monthly.month:
-            budget.monthly_usage_usd = 0.0
-            budget.last_reset_monthly = now
+        if budget.last_reset_monthly < month_start:
+            budget.last_reset_monthly = month_start
+
+        budget.daily_usage_usd = self._usage.cost(budget.id, since=budget.last_reset_daily)
+        budget.weekly_usage_usd = self._usage.cost(budget.id, since=budget.last_reset_weekly)
+        budget.monthly_usage_usd = self._usage.cost(budget.id, since=budget.last_reset_monthly)
 
     def _check_alerts(self, budget: Budget) -> None:
         """Check and generate alerts for a budget."""
@@ -14,6 +14,8 @@ from enum import Enum
 from typing import Any, Optional
 from uuid import UUID
 
+from app.agentic.mcp_transport import MCPTransportError, MCPTransportPool, TransportSettings
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +54,7 @@ class MCPTool:
     description: str
     input_schema: dict
     server_name: str
+    read_only: bool = False  # From the MCP readOnlyHint annotation
 
 
 @dataclass
@@ -73,14 +76,19 @@ class MCPClient:
     - Tool discovery
     - Authenticated tool execution
     - On-Behalf-Of (OBO) token management (ARB Condition 1)
+    - Pooled keep-alive HTTP sessions shared through an MCPTransportPool
     """
 
-    def __init__(self):
+    def __init__(self, transport: Optional[MCPTransportPool] = None):
         self._servers: dict[str, MCPServerConfig] = {}
         self._tools: dict[str, MCPTool] = {}
         self._connections: dict[str, Any] = {}
         self._obo_tokens: dict[str, dict] = {}
 
+        # A client created on its own owns its transport; pooled clients share one
+        self._owns_transport = transport is None
+        self._transport = transport or MCPTransportPool()
+
     async def add_server(self, config: MCPServerConfig) -> None:
         """
         Add and connect to an MCP server.
@@ -122,6 +130,13 @@ class MCPClient:
             if v.server_name != name
         }
 
+    async def close(self) -> None:
+        """Disconnect all servers and close the transport if this client owns it."""
+        for name in list(self._servers):
+            await self.remove_server(name)
+        if self._owns_transport:
+            await self._transport.close()
+
     def list_servers(self) -> list[MCPServerConfig]:
         """List all configured servers."""
         return list(self._servers.values())
@@ -213,7 +228,7 @@ class MCPClient:
             if server.transport == MCPTransport.STDIO:
                 result = await self._execute_stdio(server, tool_name, arguments)
             elif server.transport == MCPTransport.HTTP:
-                result = await self._execute_http(server, tool_name, arguments, headers)
+                result = await self._execute_http(server, tool_name, arguments, headers, read_only=tool.read_only)
             elif server.transport == MCPTransport.WEBSOCKET:
                 result = await self._execute_websocket(server, tool_name, arguments)
             else:
@@ -278,15 +293,11 @@ class MCPClient:
             self._connections[config.name] = {"type": "stdio", "config": config}
 
         elif config.transport == MCPTransport.HTTP:
-            # For HTTP, we just validate the endpoint
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{config.url}/health",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status != 200:
-                        raise ConnectionError(f"Health check failed: {response.status}")
+            # For HTTP, validate the endpoint over the pooled session
+            try:
+                await self._transport.session_for(config.url).get_json("/health", timeout_s=5)
+            except MCPTransportError as e:
+                raise ConnectionError(f"Health check failed: {e.status}")
             self._connections[config.name] = {"type": "http", "url": config.url}
 
         elif config.transport == MCPTransport.WEBSOCKET:
@@ -322,7 +333,8 @@ class MCPClient:
                 name=tool_data["name"],
                 description=tool_data.get("description", ""),
                 input_schema=tool_data.get("inputSchema", {}),
-                server_name=config.name
+                server_name=config.name,
+                read_only=bool(tool_data.get("annotations", {}).get("readOnlyHint", False))
             )
             self._tools[tool.name] = tool
 
@@ -331,21 +343,12 @@ class MCPClient:
     async def _discover_http_tools(self, config: MCPServerConfig) -> list[dict]:
         """Discover tools from an HTTP MCP server."""
         try:
-            import aiohttp
             headers = self._get_auth_headers(config.name)
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{config.url}/tools",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("tools", [])
-                    else:
-                        logger.warning(f"Tool discovery failed: {response.status}")
-                        return []
+            data = await self._transport.session_for(config.url).get_json("/tools", headers=headers, timeout_s=10)
+            return data.get("tools", [])
+        except MCPTransportError as e:
+            logger.warning(f"Tool discovery failed: {e.status}")
+            return []
         except ImportError:
             logger.warning("aiohttp not installed, skipping HTTP tool discovery")
             return []
@@ -370,30 +373,18 @@ class MCPClient:
         server: MCPServerConfig,
         tool_name: str,
         arguments: dict,
-        headers: dict
+        headers: dict,
+        read_only: bool = False
     ) -> Any:
-        """Execute a tool via HTTP transport."""
+        """Execute a tool via the server's pooled HTTP session."""
         try:
-            import aiohttp
-
-            payload = {
-                "tool": tool_name,
-                "arguments": arguments
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{server.url}/tools/execute",
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=server.timeout_ms / 1000)
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"Tool execution failed: {response.status} - {error_text}")
-
+            return await self._transport.session_for(server.url).call_tool(
+                tool_name,
+                arguments,
+                headers=headers,
+                timeout_s=server.timeout_ms / 1000,
+                read_only=read_only,
+            )
         except ImportError:
             logger.warning("aiohttp not installed, returning mock result")
             return {"status": "mock", "tool": tool_name}
@@ -414,11 +405,14 @@ class MCPClientPool:
     """
     Pool of MCP clients for multi-tenant usage.
 
-    Manages client instances per tenant to ensure proper isolation.
+    Manages client instances per tenant to ensure proper isolation. All
+    clients share one transport pool, so tenants calling the same server
+    reuse its keep-alive connections; auth stays per request.
     """
 
-    def __init__(self):
+    def __init__(self, settings: Optional[TransportSettings] = None):
         self._clients: dict[UUID, MCPClient] = {}
+        self._transport = MCPTransportPool(settings)
 
     def get_client(self, tenant_id: UUID) -> MCPClient:
         """
@@ -431,9 +425,45 @@ class MCPClientPool:
             MCPClient instance for the tenant
         """
         if tenant_id not in self._clients:
-            self._clients[tenant_id] = MCPClient()
+            self._clients[tenant_id] = MCPClient(transport=self._transport)
         return self._clients[tenant_id]
 
+    async def execute_batch(
+        self,
+        tenant_id: UUID,
+        calls: list[tuple[str, dict]],
+        run_context: Optional[dict] = None
+    ) -> list[MCPToolResult]:
+        """
+        Execute several tool calls for a tenant concurrently.
+
+        Calls are spread over the pooled per-server sessions, which bound
+        how many requests are in flight per server. Results are returned in
+        call order.
+
+        Args:
+            tenant_id: Tenant identifier
+            calls: (tool_name, arguments) pairs
+            run_context: Optional context passed to each call
+
+        Returns:
+            One MCPToolResult per call
+        """
+        client = self.get_client(tenant_id)
+        return list(await asyncio.gather(
+            *(client.execute_tool(name, args, run_context) for name, args in calls)
+        ))
+
+    def get_transport_stats(self) -> dict[str, dict]:
+        """Per-server transport statistics."""
+        return self._transport.get_stats()
+
+    async def close(self) -> None:
+        """Clean up every client and close the shared transport."""
+        for tenant_id in list(self._clients):
+            await self.cleanup_client(tenant_id)
+        await self._transport.close()
+
     async def configure_client(
         self,
         tenant_id: UUID,
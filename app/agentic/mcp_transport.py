@@ -0,0 +1,349 @@
+"""
+MCP HTTP Transport
+
+Long-lived, pooled HTTP sessions for MCP servers:
+- One keep-alive aiohttp session per server with connection limits
+- Retries with exponential backoff and jitter
+- Per-server circuit breaking
+- In-flight deduplication of identical read-only tool calls
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the server's circuit is open."""
+
+
+class MCPTransportError(Exception):
+    """Non-success HTTP response from an MCP server."""
+
+    def __init__(self, status: int, body: str):
+        self.status = status
+        self.body = body
+        super().__init__(f"Tool execution failed: {status} - {body}")
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 429 or self.status >= 500
+
+
+@dataclass
+class TransportSettings:
+    """Tuning knobs for pooled MCP HTTP sessions."""
+    # Connection pool
+    max_connections: int = 100
+    max_connections_per_host: int = 20
+    keepalive_timeout_s: float = 30.0
+    max_in_flight: int = 64  # Concurrent requests scheduled per server
+
+    # Retries
+    max_retries: int = 2
+    backoff_base_ms: int = 100
+    backoff_max_ms: int = 2000
+
+    # Circuit breaker
+    failure_threshold: int = 5
+    reset_timeout_s: float = 30.0
+
+    # Deduplication of identical read-only calls
+    dedupe_read_only: bool = True
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` failures in a row, rejects calls for
+    ``reset_timeout_s``, then lets a single trial call through (half-open).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout_s:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """End a half-open trial that finished without an outcome (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+
+class MCPServerSession:
+    """
+    Keep-alive HTTP session for a single MCP server.
+
+    The underlying aiohttp session is created lazily and reused for every
+    call, so TCP/TLS setup is paid once per pooled connection rather than
+    once per tool call.
+    """
+
+    def __init__(self, base_url: str, settings: Optional[TransportSettings] = None):
+        self.base_url = base_url.rstrip("/")
+        self.settings = settings or TransportSettings()
+        self.breaker = CircuitBreaker(self.settings.failure_threshold, self.settings.reset_timeout_s)
+
+        self._session = None
+        self._slots = asyncio.Semaphore(self.settings.max_in_flight)
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "deduplicated": 0,
+            "rejected_open_circuit": 0,
+            "failures": 0,
+        }
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def get_json(self, path: str, headers: Optional[dict] = None, timeout_s: float = 10.0) -> Any:
+        """GET ``path`` and decode the JSON body (idempotent, retried)."""
+        return await self._request("GET", path, headers=headers, timeout_s=timeout_s, idempotent=True)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict,
+        headers: Optional[dict] = None,
+        timeout_s: float = 30.0,
+        read_only: bool = False,
+    ) -> Any:
+        """
+        POST a tool call to ``/tools/execute``.
+
+        Identical concurrent read-only calls (same tool, arguments and auth
+        headers) share one request; callers receive the same decoded result
+        and must treat it as read-only.
+        """
+        payload = {"tool": tool_name, "arguments": arguments}
+        if not (read_only and self.settings.dedupe_read_only):
+            return await self._request(
+                "POST", "/tools/execute", json_body=payload, headers=headers,
+                timeout_s=timeout_s, idempotent=read_only,
+            )
+
+        key = (
+            tool_name,
+            json.dumps(arguments, sort_keys=True, default=str),
+            tuple(sorted((headers or {}).items())),
+        )
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._request(
+                "POST", "/tools/execute", json_body=payload, headers=headers,
+                timeout_s=timeout_s, idempotent=True,
+            ))
+            self._in_flight[key] = future
+
+            def _forget(done: asyncio.Future, key: tuple = key) -> None:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+                if not done.cancelled():
+                    done.exception()  # Mark retrieved; followers re-raise it
+
+            future.add_done_callback(_forget)
+        else:
+            self.stats["deduplicated"] += 1
+
+        # Shield so one caller's cancellation does not cancel the shared call
+        return await asyncio.shield(future)
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self):
+        if self.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.settings.max_connections,
+                limit_per_host=self.settings.max_connections_per_host,
+                keepalive_timeout=self.settings.keepalive_timeout_s,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        json_body: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout_s: float = 30.0,
+        idempotent: bool = True,
+    ) -> Any:
+        """
+        Send a request with retries and circuit breaking.
+
+        Connection failures are always retried because the request never
+        reached the server. Timeouts, 429 and 5xx responses are retried only
+        for idempotent requests.
+        """
+        import aiohttp
+
+        attempt = 0
+        while True:
+            trial = self.breaker.state == CircuitState.HALF_OPEN
+            if not self.breaker.allow():
+                self.stats["rejected_open_circuit"] += 1
+                raise CircuitOpenError(f"Circuit open for MCP server {self.base_url}")
+
+            try:
+                return await self._send(method, path, json_body, headers, timeout_s)
+            except asyncio.CancelledError:
+                # Says nothing about the server; let the next call be the trial
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            except MCPTransportError as e:
+                if not e.retryable:
+                    # The server answered; it is healthy even if the call failed
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                self.stats["failures"] += 1
+                retry = idempotent
+                error: Exception = e
+            except aiohttp.ClientConnectorError as e:
+                self.breaker.record_failure()
+                self.stats["failures"] += 1
+                retry = True
+                error = e
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                self.breaker.record_failure()
+                self.stats["failures"] += 1
+                retry = idempotent
+                error = e
+            except Exception:
+                self.breaker.record_failure()
+                self.stats["failures"] += 1
+                raise
+
+            if not retry or attempt >= self.settings.max_retries:
+                raise error
+
+            delay_ms = min(self.settings.backoff_max_ms, self.settings.backoff_base_ms * (2 ** attempt))
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.debug(f"Retrying {method} {path} on {self.base_url} (attempt {attempt}): {error}")
+            await asyncio.sleep(delay_ms * random.uniform(0.5, 1.0) / 1000)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        json_body: Optional[dict],
+        headers: Optional[dict],
+        timeout_s: float,
+    ) -> Any:
+        import aiohttp
+
+        session = await self._get_session()
+        async with self._slots:
+            self.stats["requests"] += 1
+            async with session.request(
+                method,
+                f"{self.base_url}{path}",
+                json=json_body,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout_s),
+            ) as response:
+                if response.status != 200:
+                    raise MCPTransportError(response.status, await response.text())
+                result = await response.json()
+
+        self.breaker.record_success()
+        return result
+
+
+class MCPTransportPool:
+    """
+    Shared registry of per-server sessions.
+
+    Clients for different tenants reach the same servers through the same
+    pooled sessions; auth stays per request via headers.
+    """
+
+    def __init__(self, settings: Optional[TransportSettings] = None):
+        self.settings = settings or TransportSettings()
+        self._sessions: dict[str, MCPServerSession] = {}
+
+    def session_for(self, base_url: str) -> MCPServerSession:
+        """Get or create the session for a server URL."""
+        key = base_url.rstrip("/")
+        session = self._sessions.get(key)
+        if session is None:
+            session = MCPServerSession(key, self.settings)
+            self._sessions[key] = session
+        return session
+
+    def get_stats(self) -> dict[str, dict]:
+        """Per-server request, retry, dedupe and circuit statistics."""
+        return {
+            url: {**session.stats, "circuit": session.breaker.state.value}
+            for url, session in self._sessions.items()
+        }
+
+    async def close(self) -> None:
+        """Close every pooled session."""
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
@@ -9,11 +9,13 @@ GDPR-compliant memory management:
 - Audit logging
 """
 
+import asyncio
+import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from app.agentic.memory.vector_store import (
@@ -25,6 +27,12 @@ from app.agentic.memory.vector_store import (
 
 logger = logging.getLogger(__name__)
 
+# Audit entries kept before the oldest are evicted
+MAX_AUDIT_ENTRIES = 10000
+
+# JSONL lines per chunk yielded by stream_user_data_export()
+EXPORT_CHUNK_SIZE = 500
+
 
 class RetentionPeriod(str, Enum):
     """Standard retention periods."""
@@ -256,6 +264,81 @@ class AuditEntry:
         }
 
 
+class AuditLog:
+    """
+    Bounded, time-ordered audit log.
+
+    Entries are appended in time order and keyed by a sequence number; the
+    log and its per-tenant, per-user and per-action indexes are
+    insertion-ordered dicts, so the oldest entry is evicted in O(1) and
+    queries walk the most selective index newest-first, stopping at the
+    limit.
+    """
+
+    def __init__(self, max_entries: int = MAX_AUDIT_ENTRIES):
+        self.max_entries = max_entries
+        self._next_seq = 0
+        self._entries: Dict[int, AuditEntry] = {}
+        self._by_tenant: Dict[str, Dict[int, AuditEntry]] = {}
+        self._by_user: Dict[Tuple[str, str], Dict[int, AuditEntry]] = {}
+        self._by_action: Dict[Tuple[str, str], Dict[int, AuditEntry]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, entry: AuditEntry) -> None:
+        """Add an entry, evicting the oldest beyond max_entries."""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = entry
+        for index, key in self._keys(entry):
+            index.setdefault(key, {})[seq] = entry
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            evicted = self._entries.pop(oldest)
+            for index, key in self._keys(evicted):
+                bucket = index[key]
+                del bucket[oldest]
+                if not bucket:
+                    del index[key]
+
+    def query(
+        self,
+        tenant_id: str,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[AuditEntry]:
+        """Entries matching every given filter, newest first."""
+        candidates = [self._by_tenant.get(tenant_id)]
+        if user_id:
+            candidates.append(self._by_user.get((tenant_id, user_id)))
+        if action:
+            candidates.append(self._by_action.get((tenant_id, action)))
+        if not all(candidates) or limit <= 0:
+            return []
+
+        source = min(candidates, key=len)
+        results = []
+        for seq in reversed(source):
+            entry = source[seq]
+            if user_id and entry.user_id != user_id:
+                continue
+            if action and entry.action != action:
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def _keys(self, entry: AuditEntry):
+        keys = [(self._by_tenant, entry.tenant_id), (self._by_action, (entry.tenant_id, entry.action))]
+        if entry.user_id:
+            keys.append((self._by_user, (entry.tenant_id, entry.user_id)))
+        return keys
+
+
 class MemoryGovernance:
     """
     Memory governance service.
@@ -278,7 +361,11 @@ class MemoryGovernance:
         self._retention_policies: Dict[str, RetentionPolicy] = {}
         self._forget_requests: Dict[str, ForgetRequest] = {}
         self._user_consents: Dict[str, UserConsent] = {}  # keyed by user_id
-        self._audit_log: List[AuditEntry] = []
+        self._audit_log = AuditLog()
+
+        # Forget requests in request order, by tenant and by user
+        self._requests_by_tenant: Dict[str, Dict[str, ForgetRequest]] = {}
+        self._requests_by_user: Dict[str, Dict[str, ForgetRequest]] = {}
 
     async def create_retention_policy(
         self,
@@ -361,6 +448,8 @@ class MemoryGovernance:
         )
 
         self._forget_requests[request.request_id] = request
+        self._requests_by_tenant.setdefault(tenant_id, {})[request.request_id] = request
+        self._requests_by_user.setdefault(user_id, {})[request.request_id] = request
 
         # Audit log
         await self._audit(
@@ -443,14 +532,7 @@ class MemoryGovernance:
         errors = []
 
         try:
-            if request.scope == ForgetScope.ALL:
-                # Delete all user data
-                deleted = await self.vector_store.delete_by_user(
-                    user_id=request.user_id,
-                    tenant_id=request.tenant_id,
-                )
-
-            elif request.scope == ForgetScope.CONVERSATION:
+            if request.scope == ForgetScope.CONVERSATION:
                 if request.conversation_id:
                     deleted = await self.vector_store.delete_by_conversation(
                         conversation_id=request.conversation_id,
@@ -458,8 +540,17 @@ class MemoryGovernance:
                     )
                 else:
                     errors.append("conversation_id required for CONVERSATION scope")
-
-            # TODO: Implement other scopes (DATE_RANGE, DOCUMENT_TYPE, AGENT)
+            else:
+                filters, error = self._scope_filters(request)
+                if error:
+                    errors.append(error)
+                else:
+                    # One index-driven bulk delete of the user's matching documents
+                    deleted = await self.vector_store.delete_where(
+                        tenant_id=request.tenant_id,
+                        user_id=request.user_id,
+                        **filters,
+                    )
 
             request.status = "completed"
             request.processed_at = datetime.utcnow()
@@ -492,6 +583,32 @@ class MemoryGovernance:
             processing_time_ms=processing_time,
         )
 
+    @staticmethod
+    def _scope_filters(request: ForgetRequest) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        VectorStore.delete_where() filters for a user-scoped forget request.
+
+        Returns:
+            (filters, error) - error is set when the scope is missing its parameters
+        """
+        if request.scope == ForgetScope.ALL:
+            return {}, None
+        if request.scope == ForgetScope.DATE_RANGE:
+            if not request.date_from and not request.date_to:
+                return {}, "date_from or date_to required for DATE_RANGE scope"
+            if request.date_from and request.date_to and request.date_from > request.date_to:
+                return {}, "date_from must not be after date_to"
+            return {"created_from": request.date_from, "created_to": request.date_to}, None
+        if request.scope == ForgetScope.DOCUMENT_TYPE:
+            if not request.document_types:
+                return {}, "document_types required for DOCUMENT_TYPE scope"
+            return {"doc_types": request.document_types}, None
+        if request.scope == ForgetScope.AGENT:
+            if not request.agent_id:
+                return {}, "agent_id required for AGENT scope"
+            return {"agent_id": request.agent_id}, None
+        return {}, f"Unsupported scope: {request.scope}"
+
     async def get_forget_request(
         self,
         request_id: str,
@@ -505,19 +622,18 @@ class MemoryGovernance:
         user_id: Optional[str] = None,
         status: Optional[str] = None,
     ) -> List[ForgetRequest]:
-        """List forget requests."""
-        requests = [
-            r for r in self._forget_requests.values()
-            if r.tenant_id == tenant_id
-        ]
-
+        """List forget requests, newest first."""
         if user_id:
-            requests = [r for r in requests if r.user_id == user_id]
-
-        if status:
-            requests = [r for r in requests if r.status == status]
+            source = self._requests_by_user.get(user_id, {})
+        else:
+            source = self._requests_by_tenant.get(tenant_id, {})
 
-        return sorted(requests, key=lambda r: r.requested_at, reverse=True)
+        return [
+            r for r in reversed(source.values())
+            if r.tenant_id == tenant_id
+            and (not user_id or r.user_id == user_id)
+            and (not status or r.status == status)
+        ]
 
     async def set_user_consent(
         self,
@@ -578,12 +694,12 @@ class MemoryGovernance:
         Export all user data (GDPR Article 20 - Data Portability).
 
         Returns all data associated with the user in a portable format.
+        For large histories use stream_user_data_export() instead.
         """
         # Get all documents for user
-        tenant_docs = self.vector_store._documents.get(tenant_id, {})
+        doc_ids = self.vector_store.find_document_ids(tenant_id, user_id=user_id)
         user_docs = [
-            doc.to_dict() for doc in tenant_docs.values()
-            if doc.user_id == user_id
+            doc.to_dict() for doc in self.vector_store.iter_documents(tenant_id, doc_ids)
         ]
 
         # Get consent record
@@ -591,8 +707,7 @@ class MemoryGovernance:
 
         # Get forget requests
         forget_requests = [
-            r.to_dict() for r in self._forget_requests.values()
-            if r.user_id == user_id
+            r.to_dict() for r in self._requests_by_user.get(user_id, {}).values()
         ]
 
         # Audit log
@@ -613,6 +728,55 @@ class MemoryGovernance:
             "forget_requests": forget_requests,
         }
 
+    async def stream_user_data_export(
+        self,
+        tenant_id: str,
+        user_id: str,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[str]:
+        """
+        Export all user data as JSONL, yielded in chunks of up to chunk_size lines.
+
+        Lines are tagged by "record": one "export" header, then "document",
+        "consent" and "forget_request" records, then a "summary" with the
+        document count. Documents are read from the user index one chunk at
+        a time, so memory stays bounded and the event loop gets a turn
+        between chunks.
+        """
+        doc_ids = self.vector_store.find_document_ids(tenant_id, user_id=user_id)
+
+        lines = [json.dumps({
+            "record": "export",
+            "export_date": datetime.utcnow().isoformat(),
+            "user_id": user_id,
+            "tenant_id": tenant_id,
+        })]
+        document_count = 0
+
+        for start in range(0, len(doc_ids), chunk_size):
+            for doc in self.vector_store.iter_documents(tenant_id, doc_ids[start:start + chunk_size]):
+                lines.append(json.dumps({"record": "document", **doc.to_dict()}))
+                document_count += 1
+                if len(lines) >= chunk_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+                    await asyncio.sleep(0)
+
+        consent = self._user_consents.get(user_id)
+        if consent:
+            lines.append(json.dumps({"record": "consent", **consent.to_dict()}))
+        for request in self._requests_by_user.get(user_id, {}).values():
+            lines.append(json.dumps({"record": "forget_request", **request.to_dict()}))
+        lines.append(json.dumps({"record": "summary", "document_count": document_count}))
+        yield "\n".join(lines) + "\n"
+
+        await self._audit(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            action="data_exported",
+            details={"document_count": document_count, "format": "jsonl"},
+        )
+
     async def run_retention_cleanup(
         self,
         tenant_id: Optional[str] = None,
@@ -639,19 +803,8 @@ class MemoryGovernance:
         action: Optional[str] = None,
         limit: int = 100,
     ) -> List[AuditEntry]:
-        """Get audit log entries."""
-        entries = [
-            e for e in self._audit_log
-            if e.tenant_id == tenant_id
-        ]
-
-        if user_id:
-            entries = [e for e in entries if e.user_id == user_id]
-
-        if action:
-            entries = [e for e in entries if e.action == action]
-
-        return sorted(entries, key=lambda e: e.timestamp, reverse=True)[:limit]
+        """Get audit log entries, newest first."""
+        return self._audit_log.query(tenant_id, user_id=user_id, action=action, limit=limit)
 
     async def _audit(
         self,
@@ -675,10 +828,6 @@ class MemoryGovernance:
 
         self._audit_log.append(entry)
 
-        # Keep log bounded
-        if len(self._audit_log) > 10000:
-            self._audit_log = self._audit_log[-10000:]
-
 
 # Global instance
 _memory_governance: Optional[MemoryGovernance] = None
@@ -6,15 +6,18 @@ Provides semantic search over conversation history and context:
 - Similarity search
 - Metadata filtering
 - Namespace isolation for multi-tenancy
+- Per-tenant secondary indexes (conversation, user, agent, type, creation
+  time) so filtered lookups and bulk deletes touch only matching documents
 """
 
 import hashlib
 import logging
 import json
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 import numpy as np
 
@@ -133,10 +136,17 @@ class VectorStore:
         # In-memory storage (keyed by tenant_id -> doc_id -> document)
         self._documents: Dict[str, Dict[str, MemoryDocument]] = {}
 
-        # Index by various fields for fast lookup
-        self._by_conversation: Dict[str, List[str]] = {}  # conversation_id -> doc_ids
-        self._by_user: Dict[str, List[str]] = {}  # user_id -> doc_ids
-        self._by_agent: Dict[str, List[str]] = {}  # agent_id -> doc_ids
+        # Secondary indexes: tenant_id -> value -> doc_ids (insertion-ordered
+        # dicts, so removal is O(1) and iteration follows insertion order)
+        self._by_conversation: Dict[str, Dict[str, Dict[str, None]]] = {}
+        self._by_user: Dict[str, Dict[str, Dict[str, None]]] = {}
+        self._by_agent: Dict[str, Dict[str, Dict[str, None]]] = {}
+        self._by_type: Dict[str, Dict[DocumentType, Dict[str, None]]] = {}
+
+        # tenant_id -> sorted (created_at, doc_id); deleted entries are
+        # tombstoned and compacted away once they make up half the list
+        self._by_created: Dict[str, List[Tuple[datetime, str]]] = {}
+        self._created_dead: Dict[str, Set[Tuple[datetime, str]]] = {}
 
     async def add_document(
         self,
@@ -148,6 +158,7 @@ class VectorStore:
         user_id: Optional[str] = None,
         agent_id: Optional[str] = None,
         expires_at: Optional[datetime] = None,
+        created_at: Optional[datetime] = None,
     ) -> MemoryDocument:
         """
         Add a document to the vector store.
@@ -161,6 +172,7 @@ class VectorStore:
             user_id: Associated user
             agent_id: Associated agent
             expires_at: Expiration time
+            created_at: Creation time (defaults to now)
 
         Returns:
             Created document
@@ -182,30 +194,37 @@ class VectorStore:
             expires_at=expires_at,
             embedding=embedding,
         )
+        if created_at:
+            doc.created_at = created_at
 
-        # Store document
-        if tenant_id not in self._documents:
-            self._documents[tenant_id] = {}
-        self._documents[tenant_id][doc_id] = doc
+        self._store(doc)
 
-        # Update indices
-        if conversation_id:
-            if conversation_id not in self._by_conversation:
-                self._by_conversation[conversation_id] = []
-            self._by_conversation[conversation_id].append(doc_id)
+        logger.debug(f"Added document {doc_id} to vector store")
+        return doc
 
-        if user_id:
-            if user_id not in self._by_user:
-                self._by_user[user_id] = []
-            self._by_user[user_id].append(doc_id)
+    async def add_documents(
+        self,
+        documents: Iterable[MemoryDocument],
+    ) -> int:
+        """
+        Store already-built documents (e.g. restored from an export).
 
-        if agent_id:
-            if agent_id not in self._by_agent:
-                self._by_agent[agent_id] = []
-            self._by_agent[agent_id].append(doc_id)
+        Documents without an embedding are embedded; existing doc_ids are
+        replaced.
 
-        logger.debug(f"Added document {doc_id} to vector store")
-        return doc
+        Returns:
+            Number of documents stored
+        """
+        stored = 0
+        for doc in documents:
+            if doc.embedding is None:
+                doc.embedding = self._generate_embedding(doc.content)
+            existing = self._documents.get(doc.tenant_id, {}).get(doc.doc_id)
+            if existing is not None:
+                self._remove(doc.tenant_id, [doc.doc_id])
+            self._store(doc)
+            stored += 1
+        return stored
 
     async def search(
         self,
@@ -241,12 +260,26 @@ class VectorStore:
         if not tenant_docs:
             return []
 
+        if conversation_id or user_id or agent_id or doc_types:
+            candidates = (
+                tenant_docs[doc_id]
+                for doc_id in self.find_document_ids(
+                    tenant_id,
+                    conversation_id=conversation_id,
+                    user_id=user_id,
+                    agent_id=agent_id,
+                    doc_types=doc_types,
+                )
+            )
+        else:
+            candidates = tenant_docs.values()
+
         # Generate query embedding
         query_embedding = self._generate_embedding(query)
 
         # Calculate similarities
         results = []
-        for doc_id, doc in tenant_docs.items():
+        for doc in candidates:
             # Apply filters
             if doc_types and doc.doc_type not in doc_types:
                 continue
@@ -296,30 +329,47 @@ class VectorStore:
         tenant_id: str,
     ) -> bool:
         """Delete a document."""
-        tenant_docs = self._documents.get(tenant_id, {})
-        if doc_id not in tenant_docs:
+        if not self._remove(tenant_id, [doc_id]):
             return False
 
-        doc = tenant_docs[doc_id]
-
-        # Remove from indices
-        if doc.conversation_id and doc.conversation_id in self._by_conversation:
-            if doc_id in self._by_conversation[doc.conversation_id]:
-                self._by_conversation[doc.conversation_id].remove(doc_id)
-
-        if doc.user_id and doc.user_id in self._by_user:
-            if doc_id in self._by_user[doc.user_id]:
-                self._by_user[doc.user_id].remove(doc_id)
+        logger.debug(f"Deleted document {doc_id} from vector store")
+        return True
 
-        if doc.agent_id and doc.agent_id in self._by_agent:
-            if doc_id in self._by_agent[doc.agent_id]:
-                self._by_agent[doc.agent_id].remove(doc_id)
+    async def delete_documents(
+        self,
+        doc_ids: Iterable[str],
+        tenant_id: str,
+    ) -> int:
+        """Delete several documents at once. Returns the number deleted."""
+        return len(self._remove(tenant_id, doc_ids))
 
-        # Delete document
-        del tenant_docs[doc_id]
+    async def delete_where(
+        self,
+        tenant_id: str,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        doc_types: Optional[List[DocumentType]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> int:
+        """
+        Delete every document matching all given filters.
 
-        logger.debug(f"Deleted document {doc_id} from vector store")
-        return True
+        Same filters as find_document_ids(); at least one must be given.
+        """
+        if not (user_id or conversation_id or agent_id or doc_types or created_from or created_to):
+            raise ValueError("delete_where requires at least one filter")
+        doc_ids = self.find_document_ids(
+            tenant_id,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            agent_id=agent_id,
+            doc_types=doc_types,
+            created_from=created_from,
+            created_to=created_to,
+        )
+        return await self.delete_documents(doc_ids, tenant_id)
 
     async def delete_by_conversation(
         self,
@@ -327,14 +377,7 @@ class VectorStore:
         tenant_id: str,
     ) -> int:
         """Delete all documents for a conversation."""
-        doc_ids = self._by_conversation.get(conversation_id, [])
-        deleted = 0
-
-        for doc_id in list(doc_ids):  # Copy list to avoid modification during iteration
-            if await self.delete_document(doc_id, tenant_id):
-                deleted += 1
-
-        return deleted
+        return await self.delete_where(tenant_id, conversation_id=conversation_id)
 
     async def delete_by_user(
         self,
@@ -342,14 +385,108 @@ class VectorStore:
         tenant_id: str,
     ) -> int:
         """Delete all documents for a user (GDPR Right to Forget)."""
-        doc_ids = self._by_user.get(user_id, [])
-        deleted = 0
+        return await self.delete_where(tenant_id, user_id=user_id)
+
+    def find_document_ids(
+        self,
+        tenant_id: str,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        doc_types: Optional[List[DocumentType]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        IDs of documents matching all given filters (expired ones included).
 
-        for doc_id in list(doc_ids):
-            if await self.delete_document(doc_id, tenant_id):
-                deleted += 1
+        Walks the smallest matching index (or creation-time range) and checks
+        the remaining filters per document, so the cost is proportional to
+        the most selective filter rather than to the tenant's document count.
 
-        return deleted
+        Args:
+            tenant_id: Tenant ID for isolation
+            user_id: Filter by user
+            conversation_id: Filter by conversation
+            agent_id: Filter by agent
+            doc_types: Filter by document types (any of)
+            created_from: Created at or after
+            created_to: Created at or before
+
+        Returns:
+            Matching document IDs
+        """
+        tenant_docs = self._documents.get(tenant_id)
+        if not tenant_docs:
+            return []
+
+        # (size, doc_id iterable) per filter; the smallest is walked
+        sources: List[Tuple[int, Iterable[str]]] = []
+        for index, value in (
+            (self._by_user, user_id),
+            (self._by_conversation, conversation_id),
+            (self._by_agent, agent_id),
+        ):
+            if value:
+                posting = index.get(tenant_id, {}).get(value)
+                if not posting:
+                    return []
+                sources.append((len(posting), posting))
+
+        if doc_types:
+            type_index = self._by_type.get(tenant_id, {})
+            postings = [type_index[t] for t in set(doc_types) if t in type_index]
+            if not postings:
+                return []
+            sources.append((
+                sum(len(p) for p in postings),
+                (doc_id for posting in postings for doc_id in posting),
+            ))
+
+        if created_from or created_to:
+            entries = self._by_created.get(tenant_id, [])
+            lo = bisect_left(entries, (created_from,)) if created_from else 0
+            hi = bisect_right(entries, created_to, key=lambda e: e[0]) if created_to else len(entries)
+            if lo >= hi:
+                return []
+            dead = self._created_dead.get(tenant_id) or ()
+            sources.append((hi - lo, (entries[i][1] for i in range(lo, hi) if entries[i] not in dead)))
+
+        if not sources:
+            return list(tenant_docs)
+
+        _, source = min(sources, key=lambda s: s[0])
+        type_set = set(doc_types) if doc_types else None
+
+        matches = []
+        for doc_id in source:
+            doc = tenant_docs[doc_id]
+            if user_id and doc.user_id != user_id:
+                continue
+            if conversation_id and doc.conversation_id != conversation_id:
+                continue
+            if agent_id and doc.agent_id != agent_id:
+                continue
+            if type_set and doc.doc_type not in type_set:
+                continue
+            if created_from and doc.created_at < created_from:
+                continue
+            if created_to and doc.created_at > created_to:
+                continue
+            matches.append(doc_id)
+        return matches
+
+    def iter_documents(
+        self,
+        tenant_id: str,
+        doc_ids: Iterable[str],
+    ) -> Iterator[MemoryDocument]:
+        """Yield the given documents, skipping any deleted in the meantime."""
+        tenant_docs = self._documents.get(tenant_id, {})
+        for doc_id in doc_ids:
+            doc = tenant_docs.get(doc_id)
+            if doc is not None:
+                yield doc
 
     async def get_conversation_history(
         self,
@@ -358,7 +495,7 @@ class VectorStore:
         limit: int = 100,
     ) -> List[MemoryDocument]:
         """Get conversation history in chronological order."""
-        doc_ids = self._by_conversation.get(conversation_id, [])
+        doc_ids = self._by_conversation.get(tenant_id, {}).get(conversation_id, {})
         tenant_docs = self._documents.get(tenant_id, {})
 
         docs = []
@@ -386,11 +523,11 @@ class VectorStore:
 
         for tid in tenants:
             tenant_docs = self._documents.get(tid, {})
-            for doc_id in list(tenant_docs.keys()):
-                doc = tenant_docs[doc_id]
-                if doc.expires_at and doc.expires_at < now:
-                    if await self.delete_document(doc_id, tid):
-                        deleted += 1
+            expired = [
+                doc_id for doc_id, doc in tenant_docs.items()
+                if doc.expires_at and doc.expires_at < now
+            ]
+            deleted += await self.delete_documents(expired, tid)
 
         return deleted
 
@@ -401,25 +538,86 @@ class VectorStore:
         """Get vector store statistics for a tenant."""
         tenant_docs = self._documents.get(tenant_id, {})
 
-        # Count by type
-        type_counts = {}
-        for doc in tenant_docs.values():
-            doc_type = doc.doc_type.value
-            type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
-
         return {
             "total_documents": len(tenant_docs),
-            "by_type": type_counts,
-            "total_conversations": len(set(
-                doc.conversation_id for doc in tenant_docs.values()
-                if doc.conversation_id
-            )),
-            "total_users": len(set(
-                doc.user_id for doc in tenant_docs.values()
-                if doc.user_id
-            )),
+            "by_type": {
+                doc_type.value: len(doc_ids)
+                for doc_type, doc_ids in self._by_type.get(tenant_id, {}).items()
+            },
+            "total_conversations": len(self._by_conversation.get(tenant_id, {})),
+            "total_users": len(self._by_user.get(tenant_id, {})),
         }
 
+    # Private methods
+
+    def _value_indexes(self, doc: MemoryDocument):
+        """(index, key) pairs the document is listed under."""
+        return (
+            (self._by_conversation, doc.conversation_id),
+            (self._by_user, doc.user_id),
+            (self._by_agent, doc.agent_id),
+            (self._by_type, doc.doc_type),
+        )
+
+    def _store(self, doc: MemoryDocument) -> None:
+        """Store a document and add it to every index."""
+        tenant_id = doc.tenant_id
+        self._documents.setdefault(tenant_id, {})[doc.doc_id] = doc
+
+        for index, key in self._value_indexes(doc):
+            if key:
+                index.setdefault(tenant_id, {}).setdefault(key, {})[doc.doc_id] = None
+
+        entries = self._by_created.setdefault(tenant_id, [])
+        entry = (doc.created_at, doc.doc_id)
+        dead = self._created_dead.get(tenant_id)
+        if dead and entry in dead:
+            # Re-added before compaction: revive the tombstoned entry
+            dead.discard(entry)
+        elif not entries or entries[-1] <= entry:
+            entries.append(entry)
+        else:
+            insort(entries, entry)
+
+    def _remove(
+        self,
+        tenant_id: str,
+        doc_ids: Iterable[str],
+    ) -> List[MemoryDocument]:
+        """Remove documents and their index entries; returns those removed."""
+        tenant_docs = self._documents.get(tenant_id)
+        if not tenant_docs:
+            return []
+
+        removed = []
+        for doc_id in doc_ids:
+            doc = tenant_docs.pop(doc_id, None)
+            if doc is None:
+                continue
+            removed.append(doc)
+            for index, key in self._value_indexes(doc):
+                if not key:
+                    continue
+                tenant_index = index.get(tenant_id)
+                posting = tenant_index.get(key) if tenant_index else None
+                if posting is None:
+                    continue
+                posting.pop(doc_id, None)
+                if not posting:
+                    del tenant_index[key]
+
+        if removed:
+            # Removing from the middle of a large sorted list is O(n) per
+            # call; tombstone instead and compact in one amortized pass
+            entries = self._by_created.get(tenant_id, [])
+            dead = self._created_dead.setdefault(tenant_id, set())
+            dead.update((doc.created_at, doc.doc_id) for doc in removed)
+            if len(dead) * 2 > len(entries):
+                entries[:] = [entry for entry in entries if entry not in dead]
+                dead.clear()
+
+        return removed
+
     def _generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for text.
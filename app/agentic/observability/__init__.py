@@ -23,6 +23,14 @@ from app.agentic.observability.tracing import (
     TraceContext,
     get_tracer,
 )
+from app.agentic.observability.trace_store import TraceStore
+from app.agentic.observability.trace_export import (
+    TraceExportQueue,
+    TraceSink,
+    CallableTraceSink,
+    JsonlTraceSink,
+    OTLPHttpTraceSink,
+)
 from app.agentic.observability.metrics import (
     MetricsCollector,
     MetricsSummary,
@@ -47,6 +55,12 @@ __all__ = [
     "Tracer",
     "TraceContext",
     "get_tracer",
+    "TraceStore",
+    "TraceExportQueue",
+    "TraceSink",
+    "CallableTraceSink",
+    "JsonlTraceSink",
+    "OTLPHttpTraceSink",
     # Metrics
     "MetricsCollector",
     "MetricsSummary",
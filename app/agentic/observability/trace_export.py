@@ -0,0 +1,275 @@
+"""
+Trace Export
+
+Background export of completed traces, so slow exporters never run on the
+agent's execution path:
+- TraceExportQueue: bounded queue drained by a daemon thread in batches
+- TraceSink implementations: per-trace callables (Tracer.add_exporter),
+  JSON Lines files, and OTLP/HTTP JSON collectors
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Protocol, Union
+
+from .models import Span, SpanKind, Trace
+
+logger = logging.getLogger(__name__)
+
+
+def trace_to_dict(trace: Trace) -> Dict[str, Any]:
+    """Full trace record: Trace.to_dict() plus its spans."""
+    data = trace.to_dict()
+    data["spans"] = [span.to_dict() for span in trace.spans]
+    return data
+
+
+class TraceSink(Protocol):
+    """Destination for batches of completed traces."""
+
+    def export(self, traces: List[Trace]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class CallableTraceSink:
+    """Adapts a per-trace exporter callable; one failing trace does not fail the batch."""
+
+    def __init__(self, exporter: Callable[[Trace], None]):
+        self.exporter = exporter
+
+    def export(self, traces: List[Trace]) -> None:
+        for trace in traces:
+            try:
+                self.exporter(trace)
+            except Exception as e:
+                logger.error(f"Trace export error: {e}")
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlTraceSink:
+    """Appends one JSON object per trace (see trace_to_dict) to a file."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = None
+
+    def export(self, traces: List[Trace]) -> None:
+        if self._file is None:
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write("".join(json.dumps(trace_to_dict(t), default=str) + "\n" for t in traces))
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# OTLP span kinds: INTERNAL=1, SERVER=2, CLIENT=3, PRODUCER=4, CONSUMER=5
+_OTLP_KINDS = {
+    SpanKind.SERVER: 2,
+    SpanKind.CLIENT: 3,
+    SpanKind.LLM: 3,
+    SpanKind.TOOL: 3,
+    SpanKind.PRODUCER: 4,
+    SpanKind.CONSUMER: 5,
+}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": str(k), "value": _otlp_value(v)} for k, v in attributes.items() if v is not None]
+
+
+def _nanos(ts) -> str:
+    return str(int(ts.timestamp() * 1_000_000_000)) if ts else "0"
+
+
+def _otlp_span(trace: Trace, span: Span) -> Dict[str, Any]:
+    attributes = dict(span.attributes)
+    attributes.update({
+        "agent.kind": span.kind.value,
+        "agent.id": str(span.agent_id) if span.agent_id else None,
+        "agent.run_id": str(span.run_id) if span.run_id else None,
+        "tenant.id": str(span.tenant_id) if span.tenant_id else None,
+    })
+    otlp = {
+        "traceId": trace.id.hex,
+        "spanId": span.id.hex[:16],
+        "name": span.name,
+        "kind": _OTLP_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": _nanos(span.start_time),
+        "endTimeUnixNano": _nanos(span.end_time),
+        "attributes": _otlp_attributes(attributes),
+        "events": [
+            {"name": e.get("name", ""), "attributes": _otlp_attributes(e.get("attributes") or {})}
+            for e in span.events
+        ],
+        "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id.hex[:16]
+    return otlp
+
+
+def traces_to_otlp(traces: List[Trace], service_name: str) -> Dict[str, Any]:
+    """OTLP/HTTP JSON ExportTraceServiceRequest for a batch of traces."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{
+                "scope": {"name": "app.agentic.observability"},
+                "spans": [_otlp_span(trace, span) for trace in traces for span in trace.spans],
+            }],
+        }]
+    }
+
+
+class OTLPHttpTraceSink:
+    """POSTs batches to an OTLP/HTTP collector's JSON endpoint."""
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:4318/v1/traces",
+        service_name: str = "autonomos-agents",
+        timeout_s: float = 5.0,
+    ):
+        import httpx
+
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._client = httpx.Client(timeout=timeout_s)
+
+    def export(self, traces: List[Trace]) -> None:
+        response = self._client.post(self.endpoint, json=traces_to_otlp(traces, self.service_name))
+        response.raise_for_status()
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class TraceExportQueue:
+    """
+    Bounded queue of completed traces drained by a background thread.
+
+    submit() never blocks: when the queue is full the trace is dropped and
+    counted. Each batch goes to every sink; a sink error is logged and does
+    not affect the others.
+    """
+
+    def __init__(
+        self,
+        sinks: Optional[List[TraceSink]] = None,
+        capacity: int = 10000,
+        batch_size: int = 256,
+        flush_interval_s: float = 1.0,
+    ):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._sinks: List[TraceSink] = list(sinks or [])
+        self._queue: Deque[Trace] = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"submitted": 0, "exported": 0, "dropped": 0, "batches": 0, "sink_errors": 0}
+
+    @property
+    def sinks(self) -> List[TraceSink]:
+        return list(self._sinks)
+
+    def add_sink(self, sink: TraceSink) -> None:
+        with self._cond:
+            self._sinks.append(sink)
+
+    def submit(self, trace: Trace) -> bool:
+        """Queue a trace for export. Returns False if dropped."""
+        with self._cond:
+            if not self._sinks or self._closed:
+                return False
+            if len(self._queue) >= self.capacity:
+                self.stats["dropped"] += 1
+                return False
+            self._queue.append(trace)
+            self.stats["submitted"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._thread.start()
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything submitted so far has been exported."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+                self._cond.notify_all()
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Export what is queued, stop the thread and close the sinks."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        for sink in self._sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"Trace sink close error: {e}")
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue and not self._closed:
+                    self._cond.wait(self.flush_interval_s)
+                if self._closed and not self._queue:
+                    return
+                if len(self._queue) < self.batch_size and not self._closed:
+                    # Give a partial batch until the interval to fill up
+                    self._cond.wait(self.flush_interval_s)
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_flight = len(batch)
+                sinks = list(self._sinks)
+
+            if batch:
+                for sink in sinks:
+                    try:
+                        sink.export(batch)
+                    except Exception as e:
+                        self.stats["sink_errors"] += 1
+                        logger.error(f"Trace export error ({type(sink).__name__}): {e}")
+                self.stats["batches"] += 1
+                self.stats["exported"] += len(batch)
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
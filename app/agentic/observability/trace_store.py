@@ -0,0 +1,182 @@
+"""
+Trace Store
+
+Bounded in-memory storage for the Tracer:
+- Time-ordered ring: traces kept in start order, oldest evicted first in O(1)
+- Secondary indexes by agent, run, tenant and status, each in start order
+  (status buckets are sorted lists, since a trace can change status late)
+- Queries walk the most selective index newest-first and stop at the limit,
+  instead of copying, filtering and sorting every stored trace
+"""
+
+import bisect
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from .models import Trace
+
+logger = logging.getLogger(__name__)
+
+# Trace attributes with a secondary index (status is handled separately
+# because it changes when a trace ends)
+INDEXED_FIELDS = ("agent_id", "run_id", "tenant_id")
+
+
+class TraceStore:
+    """
+    Bounded, indexed store of traces.
+
+    Every trace gets a sequence number when added; the ring and the field
+    indexes are insertion-ordered dicts keyed by that number and the status
+    buckets are sorted lists of it, so iterating one in reverse yields
+    traces newest-first.
+    """
+
+    def __init__(self, max_traces: int = 10000):
+        """
+        Initialize the store.
+
+        Args:
+            max_traces: Traces kept before trim() evicts the oldest
+        """
+        self.max_traces = max_traces
+        self._next_seq = 0
+        self._seqs: Dict[UUID, int] = {}
+        self._ring: Dict[int, Trace] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[int, Trace]]] = {name: {} for name in INDEXED_FIELDS}
+        self._statuses: Dict[int, str] = {}
+        self._by_status: Dict[str, List[int]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def __contains__(self, trace_id: UUID) -> bool:
+        return trace_id in self._seqs
+
+    def add(self, trace: Trace) -> None:
+        """Store a trace. Traces are expected to be added in start order."""
+        with self._lock:
+            if trace.id in self._seqs:
+                return
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seqs[trace.id] = seq
+            self._ring[seq] = trace
+            for name in INDEXED_FIELDS:
+                value = getattr(trace, name)
+                if value:
+                    self._indexes[name].setdefault(value, {})[seq] = trace
+            self._statuses[seq] = trace.status
+            self._by_status.setdefault(trace.status, []).append(seq)
+
+    def get(self, trace_id: UUID) -> Optional[Trace]:
+        seq = self._seqs.get(trace_id)
+        return self._ring.get(seq) if seq is not None else None
+
+    def update_status(self, trace: Trace) -> None:
+        """Re-index a trace whose status changed (e.g. after it ended with an error)."""
+        with self._lock:
+            seq = self._seqs.get(trace.id)
+            if seq is None or self._statuses[seq] == trace.status:
+                return
+            self._drop_status(self._statuses[seq], seq)
+            bisect.insort(self._by_status.setdefault(trace.status, []), seq)
+            self._statuses[seq] = trace.status
+
+    def trim(self) -> List[Trace]:
+        """Evict the oldest traces beyond max_traces and return them."""
+        evicted = []
+        with self._lock:
+            while len(self._ring) > self.max_traces:
+                seq = next(iter(self._ring))
+                evicted.append(self._remove(seq))
+        return evicted
+
+    def remove(self, trace_id: UUID) -> Optional[Trace]:
+        with self._lock:
+            seq = self._seqs.get(trace_id)
+            return self._remove(seq) if seq is not None else None
+
+    def query(
+        self,
+        agent_id: Optional[UUID] = None,
+        run_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[Trace]:
+        """
+        Traces matching every given filter, newest first.
+
+        Same semantics as the original linear Tracer.get_traces.
+        """
+        filters: List[Tuple[str, Any]] = [
+            (name, value)
+            for name, value in (("agent_id", agent_id), ("run_id", run_id), ("tenant_id", tenant_id), ("status", status))
+            if value
+        ]
+        results: List[Trace] = []
+        if limit <= 0:
+            return results
+
+        with self._lock:
+            source = self._ring
+            for name, value in filters:
+                if name == "status":
+                    candidate = self._by_status.get(value)
+                else:
+                    candidate = self._indexes[name].get(value)
+                if not candidate:
+                    return results
+                if len(candidate) < len(source):
+                    source = candidate
+
+            for seq in reversed(source):
+                trace = self._ring[seq]
+                if since and trace.start_time < since:
+                    break  # Everything further back started earlier
+                if all(getattr(trace, name) == value for name, value in filters):
+                    results.append(trace)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seqs.clear()
+            self._ring.clear()
+            for index in self._indexes.values():
+                index.clear()
+            self._statuses.clear()
+            self._by_status.clear()
+
+    # Private methods
+
+    def _remove(self, seq: int) -> Trace:
+        trace = self._ring.pop(seq)
+        del self._seqs[trace.id]
+        for name in INDEXED_FIELDS:
+            value = getattr(trace, name)
+            if value:
+                self._drop_from(self._indexes[name], value, seq)
+        self._drop_status(self._statuses.pop(seq), seq)
+        return trace
+
+    def _drop_status(self, status: str, seq: int) -> None:
+        bucket = self._by_status[status]
+        del bucket[bisect.bisect_left(bucket, seq)]
+        if not bucket:
+            del self._by_status[status]
+
+    @staticmethod
+    def _drop_from(index: Dict[Any, Dict[int, Trace]], key: Any, seq: int) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(seq, None)
+            if not bucket:
+                del index[key]
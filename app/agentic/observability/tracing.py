@@ -3,6 +3,10 @@ Distributed Tracing
 
 Execution trace and audit for agent workflows.
 Implements Observability: Execution trace & audit from RACI.
+
+Traces are kept in a bounded, indexed TraceStore and completed traces are
+exported in batches by a background TraceExportQueue, so exporters never run
+on the agent's execution path.
 """
 
 import logging
@@ -13,6 +17,8 @@ from typing import Any, Callable, Dict, List, Optional
 from uuid import UUID, uuid4
 
 from .models import Trace, Span, SpanKind
+from .trace_export import CallableTraceSink, TraceExportQueue, TraceSink
+from .trace_store import TraceStore
 
 logger = logging.getLogger(__name__)
 
@@ -55,17 +61,23 @@ class Tracer:
     - Export traces for analysis
     """
 
-    def __init__(self):
-        """Initialize the tracer."""
+    def __init__(self, max_traces: int = 10000, export_queue: Optional[TraceExportQueue] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            max_traces: Traces kept in memory before the oldest are evicted
+            export_queue: Queue for completed traces (one is created if omitted)
+        """
         # Trace storage
-        self._traces: Dict[UUID, Trace] = {}
+        self._store = TraceStore(max_traces)
         self._active_traces: Dict[UUID, Trace] = {}
 
         # Span storage
         self._spans: Dict[UUID, Span] = {}
 
-        # Export handlers
-        self._exporters: List[Callable[[Trace], None]] = []
+        # Background export of completed traces
+        self._export_queue = export_queue or TraceExportQueue()
 
         # Callbacks
         self._on_trace_start: List[Callable[[Trace], None]] = []
@@ -74,7 +86,6 @@ class Tracer:
         self._on_span_end: List[Callable[[Span], None]] = []
 
         # Configuration
-        self._max_traces = 10000
         self._sample_rate = 1.0  # 100% sampling
 
     def start_trace(
@@ -109,7 +120,7 @@ class Tracer:
             replayable=replayable,
         )
 
-        self._traces[trace.id] = trace
+        self._store.add(trace)
         self._active_traces[trace.id] = trace
 
         # Create root span
@@ -160,7 +171,7 @@ class Tracer:
         """
         trace = self._active_traces.pop(trace_id, None)
         if not trace:
-            trace = self._traces.get(trace_id)
+            trace = self._store.get(trace_id)
             if not trace:
                 raise ValueError(f"Trace not found: {trace_id}")
 
@@ -171,18 +182,15 @@ class Tracer:
                 self.end_span(root_span.id, error=error)
 
         trace.end(error=error)
+        self._store.update_status(trace)
 
         # Clear context
         context = _current_context.get()
         if context and context.trace_id == trace_id:
             _current_context.set(None)
 
-        # Export trace
-        for exporter in self._exporters:
-            try:
-                exporter(trace)
-            except Exception as e:
-                logger.error(f"Trace export error: {e}")
+        # Export trace (batched in the background)
+        self._export_queue.submit(trace)
 
         # Notify callbacks
         for callback in self._on_trace_end:
@@ -253,7 +261,7 @@ class Tracer:
         self._spans[span.id] = span
 
         # Add to trace
-        trace = self._traces.get(trace_id)
+        trace = self._store.get(trace_id)
         if trace:
             trace.add_span(span)
 
@@ -323,12 +331,12 @@ class Tracer:
         """Get the current trace."""
         context = _current_context.get()
         if context:
-            return self._traces.get(context.trace_id)
+            return self._store.get(context.trace_id)
         return None
 
     def get_trace(self, trace_id: UUID) -> Optional[Trace]:
         """Get a trace by ID."""
-        return self._traces.get(trace_id)
+        return self._store.get(trace_id)
 
     def get_span(self, span_id: UUID) -> Optional[Span]:
         """Get a span by ID."""
@@ -343,27 +351,31 @@ class Tracer:
         since: Optional[datetime] = None,
         limit: int = 100,
     ) -> List[Trace]:
-        """Get traces with optional filters."""
-        traces = list(self._traces.values())
-
-        if agent_id:
-            traces = [t for t in traces if t.agent_id == agent_id]
-        if run_id:
-            traces = [t for t in traces if t.run_id == run_id]
-        if tenant_id:
-            traces = [t for t in traces if t.tenant_id == tenant_id]
-        if status:
-            traces = [t for t in traces if t.status == status]
-        if since:
-            traces = [t for t in traces if t.start_time >= since]
-
-        # Sort by start time descending
-        traces.sort(key=lambda t: t.start_time, reverse=True)
-        return traces[:limit]
+        """Get traces with optional filters, newest first."""
+        return self._store.query(
+            agent_id=agent_id,
+            run_id=run_id,
+            tenant_id=tenant_id,
+            status=status,
+            since=since,
+            limit=limit,
+        )
 
     def add_exporter(self, exporter: Callable[[Trace], None]) -> None:
-        """Add a trace exporter."""
-        self._exporters.append(exporter)
+        """Add a per-trace exporter (called from the background export thread)."""
+        self._export_queue.add_sink(CallableTraceSink(exporter))
+
+    def add_sink(self, sink: TraceSink) -> None:
+        """Add a batch export sink (e.g. JsonlTraceSink, OTLPHttpTraceSink)."""
+        self._export_queue.add_sink(sink)
+
+    def flush_exports(self, timeout: float = 5.0) -> bool:
+        """Wait for completed traces to be exported. Returns False on timeout."""
+        return self._export_queue.flush(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export pending traces and close all sinks."""
+        self._export_queue.close(timeout)
 
     def record_event(
         self,
@@ -418,19 +430,7 @@ class Tracer:
 
     def _trim_traces(self) -> None:
         """Trim old traces to stay within limit."""
-        if len(self._traces) <= self._max_traces:
-            return
-
-        # Sort by start time
-        sorted_traces = sorted(
-            self._traces.values(),
-            key=lambda t: t.start_time,
-        )
-
-        # Remove oldest traces
-        to_remove = sorted_traces[:len(self._traces) - self._max_traces]
-        for trace in to_remove:
-            del self._traces[trace.id]
+        for trace in self._store.trim():
             for span in trace.spans:
                 self._spans.pop(span.id, None)
 
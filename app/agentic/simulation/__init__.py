@@ -24,6 +24,16 @@ from app.agentic.simulation.event_emitter import (
     EventEmitter,
     get_event_emitter,
 )
+from app.agentic.simulation.engine import (
+    ArrivalCurve,
+    ChaosTaskModel,
+    EventEmitterObserver,
+    MetricsBridgeObserver,
+    SimulationEngine,
+    SimulationObserver,
+    SimulationSummary,
+    TaskOutcome,
+)
 
 __all__ = [
     # Executor
@@ -37,4 +47,13 @@ __all__ = [
     # Event Emitter
     'EventEmitter',
     'get_event_emitter',
+    # Virtual-time engine
+    'SimulationEngine',
+    'SimulationSummary',
+    'ArrivalCurve',
+    'TaskOutcome',
+    'ChaosTaskModel',
+    'SimulationObserver',
+    'MetricsBridgeObserver',
+    'EventEmitterObserver',
 ]
@@ -0,0 +1,809 @@
+"""
+Discrete-Event Simulation Engine
+
+Runs FARM workflows in virtual time instead of sleeping through them:
+- Virtual clock and a single event heap (workflow arrivals, task completions)
+- Indegree-based readiness: finishing a task decrements its dependents and
+  queues the ones that reach zero, so no task list is ever rescanned
+- Fleet-wide task slots; ready tasks wait in FIFO order when all are busy
+- Failed tasks are re-queued up to max_retries times, like
+  SimulationExecutor.execute_workflow; every attempt takes its own slot and
+  virtual time, and the final attempt carries the totals
+- Arrival curves (constant, ramp, burst) shape when workflows enter
+- Streaming aggregation: counters plus bounded latency reservoirs, so memory
+  grows with in-flight work rather than with the number of tasks run
+- Observers adapt AOA components (MetricsBridge, EventEmitter) to engine
+  events; async work is drained in batches via flush()
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_DURATION_MS = 500
+DEFAULT_TOKEN_BUDGET = 500
+COST_PER_TOKEN_USD = 0.00001  # $0.01 per 1000 tokens
+TOOL_CALL_MS = 50
+DEFAULT_RESERVOIR_SIZE = 10_000
+DEFAULT_FLUSH_EVERY = 1_000
+
+ARRIVAL_CONSTANT = "constant"
+ARRIVAL_RAMP = "ramp"
+ARRIVAL_BURST = "burst"
+
+
+@dataclass(frozen=True)
+class ChaosRecovery:
+    """Virtual cost of recovering from one chaos type."""
+    delay_ms: int
+    retries: int
+
+
+# Recovery delay and retries per FARM chaos type
+CHAOS_RECOVERY: Dict[str, ChaosRecovery] = {
+    "tool_timeout": ChaosRecovery(500, 1),
+    "tool_failure": ChaosRecovery(200, 1),
+    "agent_conflict": ChaosRecovery(300, 0),
+    "policy_violation": ChaosRecovery(200, 0),
+    "checkpoint_crash": ChaosRecovery(300, 1),
+    "memory_pressure": ChaosRecovery(400, 0),
+    "rate_limit": ChaosRecovery(1000, 2),
+    "data_corruption": ChaosRecovery(500, 1),
+    "network_partition": ChaosRecovery(2000, 3),
+}
+
+
+def task_dependencies(task: Dict[str, Any]) -> List[str]:
+    """Dependency ids of a FARM task ("depends_on" or "dependencies")."""
+    return task.get("depends_on", task.get("dependencies", [])) or []
+
+
+class VirtualClock:
+    """Simulated time in milliseconds; only moves forward."""
+
+    def __init__(self, start_ms: float = 0.0):
+        self.now_ms = start_ms
+
+    def advance_to(self, time_ms: float) -> None:
+        if time_ms > self.now_ms:
+            self.now_ms = time_ms
+
+
+# -------------------------------------------------------------------------
+# Arrival Curves
+# -------------------------------------------------------------------------
+
+
+@dataclass
+class ArrivalCurve:
+    """
+    When workflows arrive, in virtual time.
+
+    - constant: rate_per_sec arrivals per second
+    - ramp: rate rises (or falls) linearly from start_rate_per_sec to
+      rate_per_sec over ramp_seconds, then holds rate_per_sec
+    - burst: burst_size arrivals at once every burst_interval_seconds
+    """
+    kind: str = ARRIVAL_CONSTANT
+    rate_per_sec: float = 10.0
+    start_rate_per_sec: float = 1.0
+    ramp_seconds: float = 60.0
+    burst_size: int = 100
+    burst_interval_seconds: float = 60.0
+
+    @classmethod
+    def constant(cls, rate_per_sec: float) -> "ArrivalCurve":
+        return cls(kind=ARRIVAL_CONSTANT, rate_per_sec=rate_per_sec)
+
+    @classmethod
+    def ramp(cls, start_rate_per_sec: float, end_rate_per_sec: float, ramp_seconds: float) -> "ArrivalCurve":
+        return cls(
+            kind=ARRIVAL_RAMP,
+            start_rate_per_sec=start_rate_per_sec,
+            rate_per_sec=end_rate_per_sec,
+            ramp_seconds=ramp_seconds,
+        )
+
+    @classmethod
+    def burst(cls, burst_size: int, burst_interval_seconds: float) -> "ArrivalCurve":
+        return cls(kind=ARRIVAL_BURST, burst_size=burst_size, burst_interval_seconds=burst_interval_seconds)
+
+    def arrival_times_ms(self) -> Iterator[float]:
+        """
+        Arrival times, first at 0; unbounded unless a ramp falls to zero.
+
+        Raises:
+            ValueError: Unknown kind or a curve that can never produce an arrival
+        """
+        if self.kind == ARRIVAL_CONSTANT:
+            if self.rate_per_sec <= 0:
+                raise ValueError("Constant arrival rate must be positive")
+            return (i * 1000.0 / self.rate_per_sec for i in _count())
+        if self.kind == ARRIVAL_BURST:
+            if self.burst_size < 1:
+                raise ValueError("Burst size must be at least 1")
+            interval_ms = self.burst_interval_seconds * 1000.0
+            return ((i // self.burst_size) * interval_ms for i in _count())
+        if self.kind == ARRIVAL_RAMP:
+            return self._ramp_times_ms()
+        raise ValueError(f"Unknown arrival curve: {self.kind}")
+
+    def _ramp_times_ms(self) -> Iterator[float]:
+        # Cumulative arrivals N(t) = start*t + slope*t^2/2 during the ramp;
+        # the i-th arrival is at N(t) = i.
+        start, end, ramp = self.start_rate_per_sec, self.rate_per_sec, self.ramp_seconds
+        if start < 0 or end < 0 or (start == 0 and end == 0):
+            raise ValueError("Ramp rates must be non-negative and not both zero")
+        if ramp <= 0:
+            yield from ArrivalCurve.constant(end).arrival_times_ms()
+            return
+
+        half_slope = (end - start) / (2 * ramp)
+        ramp_arrivals = (start + end) * ramp / 2
+        for i in _count():
+            if i <= ramp_arrivals:
+                if half_slope == 0:
+                    seconds = i / start
+                else:
+                    seconds = (-start + math.sqrt(max(0.0, start * start + 4 * half_slope * i))) / (2 * half_slope)
+                yield min(seconds, ramp) * 1000.0
+            elif end > 0:
+                yield (ramp + (i - ramp_arrivals) / end) * 1000.0
+            else:
+                return
+
+
+def _count() -> Iterator[int]:
+    i = 0
+    while True:
+        yield i
+        i += 1
+
+
+# -------------------------------------------------------------------------
+# Task Model
+# -------------------------------------------------------------------------
+
+
+@dataclass
+class TaskOutcome:
+    """Virtual result of running one task."""
+    status: str  # completed, failed
+    duration_ms: int
+    retries: int = 0
+    chaos_type: Optional[str] = None
+    chaos_recovered: bool = False
+    error_message: Optional[str] = None
+    tokens_used: int = 0
+    cost_usd: float = 0.0
+
+
+# (task, rng) -> outcome
+TaskModel = Callable[[Dict[str, Any], random.Random], TaskOutcome]
+
+
+class ChaosTaskModel:
+    """
+    Default task model, with SimulationExecutor's chaos semantics.
+
+    A task takes its estimated duration plus TOOL_CALL_MS per required tool;
+    triggered chaos adds its CHAOS_RECOVERY delay and retries, or fails the
+    task when recovery is disabled, the tool failure is non-recoverable or
+    the chaos type is unknown.
+    """
+
+    def __init__(self, chaos_recovery_enabled: bool = True):
+        self.chaos_recovery_enabled = chaos_recovery_enabled
+
+    def __call__(self, task: Dict[str, Any], rng: random.Random) -> TaskOutcome:
+        tokens = task.get("token_budget", DEFAULT_TOKEN_BUDGET)
+        outcome = TaskOutcome(
+            status="completed",
+            duration_ms=0,
+            tokens_used=tokens,
+            cost_usd=tokens * COST_PER_TOKEN_USD,
+        )
+
+        chaos = task.get("chaos_injection")
+        if chaos and rng.random() < chaos.get("trigger_probability", 0):
+            outcome.chaos_type = chaos.get("type")
+            recovery = CHAOS_RECOVERY.get(outcome.chaos_type)
+            recoverable = (chaos.get("parameters") or {}).get("recoverable", True)
+            if not self.chaos_recovery_enabled:
+                outcome.error_message = "Chaos recovery disabled"
+            elif recovery is None:
+                outcome.error_message = f"Unknown chaos type: {outcome.chaos_type}"
+            elif outcome.chaos_type == "tool_failure" and not recoverable:
+                outcome.error_message = "Non-recoverable tool failure"
+            else:
+                outcome.chaos_recovered = True
+                outcome.retries = recovery.retries
+                outcome.duration_ms += recovery.delay_ms
+            if not outcome.chaos_recovered:
+                outcome.status = "failed"
+                return outcome
+
+        outcome.duration_ms += task.get("estimated_duration_ms", task.get("expected_duration_ms", DEFAULT_TASK_DURATION_MS))
+        outcome.duration_ms += TOOL_CALL_MS * len(task.get("tools_required", []))
+        return outcome
+
+
+# -------------------------------------------------------------------------
+# Streaming Aggregation
+# -------------------------------------------------------------------------
+
+
+class StreamingStats:
+    """
+    Count, mean, min and max of a stream, with percentiles from a fixed-size
+    uniform reservoir sample (exact until the reservoir fills).
+    """
+
+    def __init__(self, reservoir_size: int = DEFAULT_RESERVOIR_SIZE, rng: Optional[random.Random] = None):
+        self.reservoir_size = reservoir_size
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._reservoir: List[float] = []
+        self._rng = rng or random.Random(0)
+        self._sorted: Optional[List[float]] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._reservoir) < self.reservoir_size:
+            self._reservoir.append(value)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.reservoir_size:
+                self._reservoir[slot] = value
+        self._sorted = None
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile, p in [0, 100]."""
+        if not self._reservoir:
+            return 0.0
+        if self._sorted is None:
+            self._sorted = sorted(self._reservoir)
+        rank = max(1, math.ceil(p / 100 * len(self._sorted)))
+        return self._sorted[min(rank, len(self._sorted)) - 1]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 3),
+            "min": self.min if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else 0.0,
+        }
+
+
+@dataclass
+class SimulationSummary:
+    """Aggregated outcome of a simulation run (no per-task results kept)."""
+    workflows_total: int = 0
+    workflows_completed: int = 0
+    workflows_partial: int = 0
+    workflows_failed: int = 0
+
+    total_tasks: int = 0
+    tasks_completed: int = 0
+    tasks_failed: int = 0
+    tasks_retried: int = 0
+    tasks_skipped: int = 0  # Never ran: a dependency failed or is missing
+
+    chaos_events_total: int = 0
+    chaos_events_recovered: int = 0
+    chaos_by_type: Dict[str, int] = field(default_factory=dict)
+
+    total_tokens: int = 0
+    total_cost_usd: float = 0.0
+
+    virtual_duration_ms: float = 0.0
+    wall_duration_ms: float = 0.0
+    peak_concurrency: int = 0
+    peak_queue_depth: int = 0
+
+    task_duration_ms: StreamingStats = field(default_factory=StreamingStats)
+    task_wait_ms: StreamingStats = field(default_factory=StreamingStats)
+    workflow_duration_ms: StreamingStats = field(default_factory=StreamingStats)
+
+    @property
+    def completion_rate(self) -> float:
+        return self.workflows_completed / self.workflows_total if self.workflows_total else 0.0
+
+    @property
+    def chaos_recovery_rate(self) -> float:
+        return self.chaos_events_recovered / self.chaos_events_total if self.chaos_events_total else 1.0
+
+    @property
+    def throughput_tasks_per_sec(self) -> float:
+        """Completed tasks per virtual second."""
+        return self.tasks_completed / (self.virtual_duration_ms / 1000) if self.virtual_duration_ms > 0 else 0.0
+
+    @property
+    def throughput_wf_per_sec(self) -> float:
+        """Finished workflows per virtual second."""
+        return self.workflows_total / (self.virtual_duration_ms / 1000) if self.virtual_duration_ms > 0 else 0.0
+
+    @property
+    def time_compression(self) -> float:
+        """Virtual time simulated per unit of wall time."""
+        return self.virtual_duration_ms / self.wall_duration_ms if self.wall_duration_ms > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "workflows": {
+                "total": self.workflows_total,
+                "completed": self.workflows_completed,
+                "partial": self.workflows_partial,
+                "failed": self.workflows_failed,
+            },
+            "tasks": {
+                "total": self.total_tasks,
+                "completed": self.tasks_completed,
+                "failed": self.tasks_failed,
+                "retried": self.tasks_retried,
+                "skipped": self.tasks_skipped,
+            },
+            "chaos": {
+                "total": self.chaos_events_total,
+                "recovered": self.chaos_events_recovered,
+                "by_type": dict(self.chaos_by_type),
+            },
+            "total_tokens": self.total_tokens,
+            "total_cost_usd": round(self.total_cost_usd, 6),
+            "virtual_duration_ms": self.virtual_duration_ms,
+            "wall_duration_ms": round(self.wall_duration_ms, 3),
+            "time_compression": round(self.time_compression, 1),
+            "throughput_tasks_per_sec": round(self.throughput_tasks_per_sec, 3),
+            "peak_concurrency": self.peak_concurrency,
+            "peak_queue_depth": self.peak_queue_depth,
+            "task_duration_ms": self.task_duration_ms.to_dict(),
+            "task_wait_ms": self.task_wait_ms.to_dict(),
+            "workflow_duration_ms": self.workflow_duration_ms.to_dict(),
+        }
+
+
+# -------------------------------------------------------------------------
+# Observers
+# -------------------------------------------------------------------------
+
+
+class SimulationObserver:
+    """
+    Hooks for engine events, all in virtual time. Hooks are synchronous;
+    observers that do async work queue it and drain it in flush(), which the
+    engine awaits every flush_every events and at the end of a run.
+
+    Workflow ids can repeat while runs overlap; run_seq numbers each workflow
+    run within engine.run() and is what per-run state should be keyed by.
+    """
+
+    def workflow_started(
+        self, workflow_id: str, workflow_type: str, task_count: int, time_ms: float, run_seq: int = 0
+    ) -> None:
+        pass
+
+    def task_started(
+        self, workflow_id: str, task: Dict[str, Any], agent_id: Optional[str], time_ms: float, run_seq: int = 0
+    ) -> None:
+        pass
+
+    def task_finished(
+        self,
+        workflow_id: str,
+        task: Dict[str, Any],
+        agent_id: Optional[str],
+        outcome: TaskOutcome,
+        started_ms: float,
+        finished_ms: float,
+        run_seq: int = 0,
+    ) -> None:
+        pass
+
+    def workflow_finished(
+        self,
+        workflow_id: str,
+        status: str,
+        duration_ms: float,
+        tasks_completed: int,
+        tasks_failed: int,
+        time_ms: float,
+        run_seq: int = 0,
+    ) -> None:
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+
+class MetricsBridgeObserver(SimulationObserver):
+    """
+    Feeds MetricsBridge traces, spans, counters and costs.
+
+    Span keys are namespaced by workflow, since workflows overlap in virtual
+    time and FARM task ids repeat across workflows. A run whose workflow id
+    is already in flight is traced as "{workflow_id}#{run_seq}".
+    """
+
+    def __init__(self, bridge, tenant_id: Optional[UUID] = None):
+        self.bridge = bridge
+        self.tenant_id = tenant_id
+        self._trace_keys: Dict[int, str] = {}  # run_seq -> key the bridge knows the run by
+        self._in_flight: set = set()
+
+    def workflow_started(self, workflow_id, workflow_type, task_count, time_ms, run_seq=0):
+        key = workflow_id if workflow_id not in self._in_flight else f"{workflow_id}#{run_seq}"
+        self._trace_keys[run_seq] = key
+        self._in_flight.add(key)
+        self.bridge.start_workflow_trace(key, workflow_type, self.tenant_id)
+
+    def task_started(self, workflow_id, task, agent_id, time_ms, run_seq=0):
+        key = self._trace_keys[run_seq]
+        self.bridge.start_task_span(key, f"{key}:{task['task_id']}", task.get("type", "compute"), agent_id)
+
+    def task_finished(self, workflow_id, task, agent_id, outcome, started_ms, finished_ms, run_seq=0):
+        if self.tenant_id:
+            self.bridge.record_cost(
+                self.tenant_id, outcome.cost_usd, outcome.tokens_used, f"task:{task.get('type', 'compute')}"
+            )
+        self.bridge.end_task_span(
+            f"{self._trace_keys[run_seq]}:{task['task_id']}",
+            outcome.status,
+            int(finished_ms - started_ms),
+            outcome.retries,
+            outcome.chaos_type,
+        )
+
+    def workflow_finished(self, workflow_id, status, duration_ms, tasks_completed, tasks_failed, time_ms, run_seq=0):
+        key = self._trace_keys.pop(run_seq)
+        self._in_flight.discard(key)
+        self.bridge.end_workflow_trace(key, status, int(duration_ms), tasks_completed, tasks_failed)
+
+
+class EventEmitterObserver(SimulationObserver):
+    """
+    Streams run/step events through an EventEmitter.
+
+    Workflow events are always sent; step events for a task_sample_rate
+    share of tasks (evenly spaced), so tens of thousands of simulated tasks
+    do not flood UI clients. Events are queued and sent in flush().
+    """
+
+    def __init__(self, emitter, tenant_id: Optional[UUID] = None, task_sample_rate: float = 1.0):
+        self.emitter = emitter
+        self.tenant_id = tenant_id
+        self.task_sample_rate = task_sample_rate
+        self._run_ids: Dict[int, UUID] = {}  # run_seq -> run id
+        self._sampled: set = set()
+        self._tasks_seen = 0
+        self._tasks_sampled = 0
+        self._pending: List[tuple] = []
+
+    def workflow_started(self, workflow_id, workflow_type, task_count, time_ms, run_seq=0):
+        run_id = self._run_ids[run_seq] = uuid4()
+        self._pending.append((
+            self.emitter.emit_run_started,
+            (run_id, workflow_id, self.tenant_id, {"workflow_type": workflow_type, "task_count": task_count}),
+        ))
+
+    def task_started(self, workflow_id, task, agent_id, time_ms, run_seq=0):
+        self._tasks_seen += 1
+        if int(self._tasks_seen * self.task_sample_rate + 1e-9) <= self._tasks_sampled:
+            return
+        self._tasks_sampled += 1
+        key = (run_seq, task["task_id"])
+        self._sampled.add(key)
+        self._pending.append((
+            self.emitter.emit_step_started,
+            (self._run_ids[run_seq], task["task_id"], task.get("name", task["task_id"]), agent_id, self.tenant_id),
+        ))
+
+    def task_finished(self, workflow_id, task, agent_id, outcome, started_ms, finished_ms, run_seq=0):
+        key = (run_seq, task["task_id"])
+        if key not in self._sampled:
+            return
+        self._sampled.discard(key)
+        self._pending.append((
+            self.emitter.emit_step_completed,
+            (self._run_ids[run_seq], task["task_id"], outcome.status, int(finished_ms - started_ms), self.tenant_id),
+        ))
+
+    def workflow_finished(self, workflow_id, status, duration_ms, tasks_completed, tasks_failed, time_ms, run_seq=0):
+        run_id = self._run_ids.pop(run_seq)
+        self._pending.append((
+            self.emitter.emit_run_completed,
+            (run_id, workflow_id, status, int(duration_ms), tasks_completed, tasks_failed, self.tenant_id),
+        ))
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        for emit, args in pending:
+            try:
+                await emit(*args)
+            except Exception as e:
+                logger.warning(f"Failed to emit simulation event: {e}")
+
+
+# -------------------------------------------------------------------------
+# Engine
+# -------------------------------------------------------------------------
+
+
+class _WorkflowRun:
+    """Per-workflow state while the workflow is in flight."""
+
+    __slots__ = (
+        "seq", "workflow_id", "workflow_type", "tasks", "assignments", "indegree", "dependents",
+        "arrived_ms", "pending", "completed", "failed", "failed_attempts",
+    )
+
+    def __init__(self, seq: int, workflow: Dict[str, Any], assignments: Dict[str, str], arrived_ms: float):
+        self.seq = seq  # Unique per run() call; workflow ids may repeat
+        self.workflow_id = workflow.get("workflow_id") or str(uuid4())
+        self.workflow_type = workflow.get("type", "dag")
+        self.tasks: List[Dict[str, Any]] = workflow.get("tasks", [])
+        self.assignments = assignments
+        self.arrived_ms = arrived_ms
+        self.pending = 0  # Queued or running
+        self.completed = 0
+        self.failed = 0
+        # task index -> (failed attempts, their tokens, their cost) while being retried
+        self.failed_attempts: Dict[int, tuple] = {}
+
+        index = {task["task_id"]: i for i, task in enumerate(self.tasks)}
+        self.indegree: List[int] = []
+        self.dependents: List[List[int]] = [[] for _ in self.tasks]
+        for i, task in enumerate(self.tasks):
+            deps = set(task_dependencies(task))
+            # A dependency on an unknown task is never satisfied
+            self.indegree.append(len(deps))
+            for dep in deps:
+                if dep in index:
+                    self.dependents[index[dep]].append(i)
+
+    def roots(self) -> List[int]:
+        return [i for i, degree in enumerate(self.indegree) if degree == 0]
+
+
+_ARRIVAL = 0
+_COMPLETION = 1
+
+
+class SimulationEngine:
+    """
+    Virtual-time workflow simulator.
+
+    Args:
+        task_model: (task, rng) -> TaskOutcome; defaults to ChaosTaskModel
+        observers: Adapters notified of workflow and task events
+        max_concurrent_tasks: Fleet-wide task slots (None = unbounded)
+        max_retries: Times a failed task is re-queued before it counts as failed
+        seed: RNG seed for chaos triggers and reservoir sampling
+        reservoir_size: Samples kept per latency distribution
+        flush_every: Engine events between observer flushes
+    """
+
+    def __init__(
+        self,
+        task_model: Optional[TaskModel] = None,
+        observers: Sequence[SimulationObserver] = (),
+        max_concurrent_tasks: Optional[int] = None,
+        max_retries: int = 0,
+        seed: Optional[int] = None,
+        reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+    ):
+        if max_concurrent_tasks is not None and max_concurrent_tasks < 1:
+            raise ValueError("max_concurrent_tasks must be at least 1")
+        self.task_model = task_model or ChaosTaskModel()
+        self.observers = list(observers)
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self.max_retries = max_retries
+        self.seed = seed
+        self.reservoir_size = reservoir_size
+        self.flush_every = max(1, flush_every)
+
+    async def run(
+        self,
+        workflows: Iterable[Dict[str, Any]],
+        arrival: Optional[ArrivalCurve] = None,
+        assignments: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> SimulationSummary:
+        """
+        Simulate workflows to completion.
+
+        Workflows are pulled lazily from the iterable as they arrive, so a
+        generator keeps memory flat for arbitrarily long scenarios.
+
+        Args:
+            workflows: FARM workflow dicts
+            arrival: Arrival curve (default: every workflow arrives at 0)
+            assignments: workflow_id -> {task_id: agent_id}
+
+        Returns:
+            SimulationSummary
+        """
+        rng = random.Random(self.seed)
+        summary = SimulationSummary(
+            task_duration_ms=StreamingStats(self.reservoir_size, random.Random(rng.random())),
+            task_wait_ms=StreamingStats(self.reservoir_size, random.Random(rng.random())),
+            workflow_duration_ms=StreamingStats(self.reservoir_size, random.Random(rng.random())),
+        )
+        assignments = assignments or {}
+        clock = VirtualClock()
+        events: List[tuple] = []
+        ready: deque = deque()  # (run, task index, ready_ms)
+        running = 0
+        seq = 0
+        runs_started = 0
+        processed = 0
+        wall_start = time.perf_counter()
+
+        workflow_iter = iter(workflows)
+        times_iter = arrival.arrival_times_ms() if arrival else None
+
+        def schedule_next_arrival():
+            nonlocal seq
+            workflow = next(workflow_iter, None)
+            if workflow is None:
+                return
+            at_ms = next(times_iter, None) if times_iter is not None else 0.0
+            if at_ms is None:
+                logger.warning("Arrival curve ended before the workflows did; remaining workflows not simulated")
+                return
+            heapq.heappush(events, (at_ms, seq, _ARRIVAL, workflow))
+            seq += 1
+
+        def finish_workflow(run: _WorkflowRun):
+            tasks_total = len(run.tasks)
+            summary.workflows_total += 1
+            summary.total_tasks += run.completed + run.failed
+            summary.tasks_skipped += tasks_total - run.completed - run.failed
+            if run.failed == 0 and run.completed == tasks_total:
+                status = "completed"
+                summary.workflows_completed += 1
+            elif run.completed > 0:
+                status = "partial"
+                summary.workflows_partial += 1
+            else:
+                status = "failed"
+                summary.workflows_failed += 1
+            duration_ms = clock.now_ms - run.arrived_ms
+            summary.workflow_duration_ms.add(duration_ms)
+            for observer in self.observers:
+                observer.workflow_finished(
+                    run.workflow_id, status, duration_ms, run.completed, run.failed, clock.now_ms, run_seq=run.seq
+                )
+
+        def start_ready_tasks():
+            nonlocal running, seq
+            while ready and (self.max_concurrent_tasks is None or running < self.max_concurrent_tasks):
+                run, i, ready_ms = ready.popleft()
+                task = run.tasks[i]
+                agent_id = run.assignments.get(task["task_id"])
+                outcome = self.task_model(task, rng)
+                running += 1
+                summary.task_wait_ms.add(clock.now_ms - ready_ms)
+                for observer in self.observers:
+                    observer.task_started(run.workflow_id, task, agent_id, clock.now_ms, run_seq=run.seq)
+                heapq.heappush(
+                    events, (clock.now_ms + outcome.duration_ms, seq, _COMPLETION, (run, i, outcome, clock.now_ms))
+                )
+                seq += 1
+            if running > summary.peak_concurrency:
+                summary.peak_concurrency = running
+
+        schedule_next_arrival()
+        while events:
+            at_ms, _, kind, payload = heapq.heappop(events)
+            clock.advance_to(at_ms)
+
+            if kind == _ARRIVAL:
+                schedule_next_arrival()
+                run = _WorkflowRun(
+                    runs_started, payload, assignments.get(payload.get("workflow_id"), {}), clock.now_ms
+                )
+                runs_started += 1
+                for observer in self.observers:
+                    observer.workflow_started(
+                        run.workflow_id, run.workflow_type, len(run.tasks), clock.now_ms, run_seq=run.seq
+                    )
+                roots = run.roots()
+                run.pending = len(roots)
+                ready.extend((run, i, clock.now_ms) for i in roots)
+                if run.pending == 0:
+                    finish_workflow(run)
+            else:
+                run, i, outcome, started_ms = payload
+                running -= 1
+                run.pending -= 1
+                task = run.tasks[i]
+                for observer in self.observers:
+                    observer.task_finished(
+                        run.workflow_id, task, run.assignments.get(task["task_id"]), outcome, started_ms, clock.now_ms,
+                        run_seq=run.seq,
+                    )
+                attempts, tokens, cost = run.failed_attempts.pop(i, (0, 0, 0.0))
+                if outcome.status != "completed" and attempts < self.max_retries:
+                    # Retry; only the final attempt is recorded, with the totals
+                    run.failed_attempts[i] = (attempts + 1, tokens + outcome.tokens_used, cost + outcome.cost_usd)
+                    run.pending += 1
+                    ready.append((run, i, clock.now_ms))
+                else:
+                    if attempts:
+                        outcome = replace(
+                            outcome,
+                            retries=outcome.retries + attempts,
+                            tokens_used=outcome.tokens_used + tokens,
+                            cost_usd=outcome.cost_usd + cost,
+                        )
+                    self._record_task(summary, outcome, clock.now_ms - started_ms)
+                    if outcome.status == "completed":
+                        run.completed += 1
+                        for j in run.dependents[i]:
+                            run.indegree[j] -= 1
+                            if run.indegree[j] == 0:
+                                run.pending += 1
+                                ready.append((run, j, clock.now_ms))
+                    else:
+                        run.failed += 1
+                if run.pending == 0:
+                    finish_workflow(run)
+
+            start_ready_tasks()
+            if len(ready) > summary.peak_queue_depth:
+                summary.peak_queue_depth = len(ready)
+
+            processed += 1
+            if processed % self.flush_every == 0:
+                await self._flush()
+
+        await self._flush()
+        summary.virtual_duration_ms = clock.now_ms
+        summary.wall_duration_ms = (time.perf_counter() - wall_start) * 1000
+        return summary
+
+    @staticmethod
+    def _record_task(summary: SimulationSummary, outcome: TaskOutcome, duration_ms: float) -> None:
+        if outcome.status == "completed":
+            summary.tasks_completed += 1
+        else:
+            summary.tasks_failed += 1
+        if outcome.retries > 0:
+            summary.tasks_retried += 1
+        if outcome.chaos_type:
+            summary.chaos_events_total += 1
+            summary.chaos_by_type[outcome.chaos_type] = summary.chaos_by_type.get(outcome.chaos_type, 0) + 1
+            if outcome.chaos_recovered:
+                summary.chaos_events_recovered += 1
+        summary.total_tokens += outcome.tokens_used
+        summary.total_cost_usd += outcome.cost_usd
+        summary.task_duration_ms.add(duration_ms)
+
+    async def _flush(self) -> None:
+        for observer in self.observers:
+            await observer.flush()
+        # Let other tasks on the loop run between batches
+        await asyncio.sleep(0)
@@ -2,6 +2,11 @@
 Event Emitter for Simulation
 
 Bridges simulation execution to StreamManager for real-time UI updates.
+
+With buffering enabled, events are published to the stream manager in
+batches from a background task, so emitting never waits on subscribers.
+Batches are chained and published one event at a time, so subscribers see
+events in emit order.
 """
 
 import asyncio
@@ -42,6 +47,7 @@ class EventEmitter:
         self.config = config or EmitterConfig()
         self._stream_manager: Optional[StreamManager] = None
         self._event_buffer: List[StreamEvent] = []
+        self._flush_task: Optional[asyncio.Task] = None  # Latest batch; each awaits the one before
         self._callbacks: List[Callable[[StreamEvent], None]] = []
         self._redis_client = None
 
@@ -248,16 +254,16 @@ class EventEmitter:
 
     async def _emit(self, event: StreamEvent, tenant_id: Optional[UUID] = None) -> None:
         """Emit event to all configured destinations."""
-        # Buffer if configured
+        # Buffer if configured; full buffers are flushed in the background
         if self.config.buffer_events:
             self._event_buffer.append(event)
             if len(self._event_buffer) >= self.config.buffer_size:
-                await self._flush_buffer()
+                self._schedule_flush()
 
         # Emit to stream manager
-        if self.config.emit_to_stream and self._stream_manager:
+        elif self.config.emit_to_stream and self._stream_manager:
             try:
-                await self._stream_manager.broadcast(event, tenant_id)
+                await self._stream_manager.publish(event)
             except Exception as e:
                 logger.warning(f"Failed to emit to stream manager: {e}")
 
@@ -292,14 +298,35 @@ class EventEmitter:
             maxlen=10000,  # Keep last 10k events per stream
         )
 
-    async def _flush_buffer(self) -> None:
-        """Flush buffered events."""
-        events = self._event_buffer.copy()
-        self._event_buffer.clear()
+    def _schedule_flush(self) -> None:
+        """Publish the buffered batch from a background task, after earlier batches."""
+        events, self._event_buffer = self._event_buffer, []
+        self._flush_task = asyncio.create_task(self._flush_buffer(events, self._flush_task))
+
+    async def _flush_buffer(self, events: List[StreamEvent], previous: Optional[asyncio.Task]) -> None:
+        """Publish a batch in order, once the previous batch is done."""
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+
+        if not (self.config.emit_to_stream and self._stream_manager):
+            return
 
+        failures = 0
         for event in events:
-            if self.config.emit_to_stream and self._stream_manager:
-                await self._stream_manager.broadcast(event, None)
+            try:
+                await self._stream_manager.publish(event)
+            except Exception as e:
+                failures += 1
+                error = e
+        if failures:
+            logger.warning(f"Failed to emit {failures} buffered events to stream manager: {error}")
+
+    async def flush(self) -> None:
+        """Publish any buffered events and wait until every batch is out."""
+        if self._event_buffer:
+            self._schedule_flush()
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
 
 
 # Singleton instance
@@ -6,11 +6,13 @@ Executes FARM-generated workflows through AOA modules with:
 - Governance integration (policies, budgets, approvals)
 - All 9 chaos types
 - Event streaming for UI
+- Virtual-time scenarios (simulate_scenario) for large fleets and load curves
 """
 
 import asyncio
 import logging
 import random
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -50,6 +52,15 @@ from app.agentic.approval import (
 
 from app.agentic.simulation.metrics_bridge import MetricsBridge, get_metrics_bridge
 from app.agentic.simulation.event_emitter import EventEmitter, get_event_emitter
+from app.agentic.simulation.engine import (
+    CHAOS_RECOVERY,
+    ArrivalCurve,
+    ChaosTaskModel,
+    EventEmitterObserver,
+    MetricsBridgeObserver,
+    SimulationEngine,
+    task_dependencies,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +96,11 @@ class ExecutionConfig:
     chaos_recovery_enabled: bool = True
     max_retries: int = 3
 
+    # Virtual-time simulation (simulate_scenario)
+    max_concurrent_tasks: Optional[int] = None  # Fleet-wide task slots; None = unbounded
+    event_sample_rate: float = 1.0  # Share of tasks whose step events are streamed
+    seed: Optional[int] = None
+
 
 @dataclass
 class TaskResult:
@@ -161,6 +177,9 @@ class ExecutionResult:
     verdict: str = "PENDING"  # PASS, DEGRADED, FAIL
     analysis: Dict[str, Any] = field(default_factory=dict)
 
+    # Virtual-time runs only: SimulationSummary.to_dict()
+    simulation: Dict[str, Any] = field(default_factory=dict)
+
 
 class SimulationExecutor:
     """
@@ -312,29 +331,33 @@ class SimulationExecutor:
                 metadata={"workflow_type": workflow_type, "task_count": len(tasks)},
             )
 
-        # Build dependency graph
+        # Build dependency graph: unmet dependency counts and reverse edges
         task_map = {t["task_id"]: t for t in tasks}
-        dep_graph = {t["task_id"]: set(t.get("depends_on", t.get("dependencies", []))) for t in tasks}
-
-        # Execute tasks
-        task_results: List[TaskResult] = []
+        indegree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {task_id: [] for task_id in task_map}
+        for task_id, task in task_map.items():
+            deps = set(task_dependencies(task))
+            indegree[task_id] = len(deps)
+            for dep in deps:
+                if dep in dependents:
+                    dependents[dep].append(task_id)
+        ready_tasks = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+
+        # Execute tasks; a retried task keeps only its final result
+        final_results: Dict[str, TaskResult] = {}
         completed_tasks: Set[str] = set()
+        failed_attempts: Dict[str, int] = {}
+        exhausted = False
 
         while len(completed_tasks) < len(tasks):
-            # Find tasks ready to execute
-            ready_tasks = [
-                task_id for task_id, deps in dep_graph.items()
-                if task_id not in completed_tasks
-                and all(d in completed_tasks for d in deps)
-            ]
-
             if not ready_tasks:
-                logger.warning(f"Workflow {workflow_id}: No ready tasks, possible deadlock")
+                if not exhausted:
+                    logger.warning(f"Workflow {workflow_id}: No ready tasks, possible deadlock")
                 break
 
             # Execute ready tasks in parallel (up to limit)
-            batch = ready_tasks[:self.config.max_parallel_tasks]
-            batch_tasks = [task_map[task_id] for task_id in batch]
+            batch_size = min(len(ready_tasks), self.config.max_parallel_tasks)
+            batch_tasks = [task_map[ready_tasks.popleft()] for _ in range(batch_size)]
 
             results = await asyncio.gather(*[
                 self._execute_task(
@@ -348,11 +371,29 @@ class SimulationExecutor:
             ])
 
             for result in results:
-                task_results.append(result)
+                previous = final_results.get(result.task_id)
+                if previous is not None:
+                    result.retry_count += failed_attempts[result.task_id]
+                    result.tokens_used += previous.tokens_used
+                    result.cost_usd += previous.cost_usd
+                final_results[result.task_id] = result
+
                 if result.status in ("completed", "retried"):
                     completed_tasks.add(result.task_id)
+                    for dependent in dependents[result.task_id]:
+                        indegree[dependent] -= 1
+                        if indegree[dependent] == 0:
+                            ready_tasks.append(dependent)
+                else:
+                    # Re-run failed tasks up to max_retries times
+                    failed_attempts[result.task_id] = failed_attempts.get(result.task_id, 0) + 1
+                    if failed_attempts[result.task_id] <= self.config.max_retries:
+                        ready_tasks.append(result.task_id)
+                    else:
+                        exhausted = True
 
         # Calculate results
+        task_results = list(final_results.values())
         completed_at = datetime.utcnow()
         duration_ms = int((completed_at - started_at).total_seconds() * 1000)
 
@@ -520,63 +561,26 @@ class SimulationExecutor:
         if not self.config.chaos_recovery_enabled:
             return {"recovered": False, "error": "Chaos recovery disabled"}
 
-        if chaos_type == ChaosType.TOOL_TIMEOUT.value:
-            # Simulate timeout and retry
-            await asyncio.sleep(0.5 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 1}
+        recovery = CHAOS_RECOVERY.get(chaos_type)
+        if recovery is None:
+            return {"recovered": False, "error": f"Unknown chaos type: {chaos_type}"}
 
-        elif chaos_type == ChaosType.TOOL_FAILURE.value:
+        if chaos_type == ChaosType.TOOL_FAILURE.value:
             # Check if recoverable
-            recoverable = chaos_config.get("parameters", {}).get("recoverable", True)
-            if recoverable:
-                await asyncio.sleep(0.2 / self.config.speedup_factor)
-                return {"recovered": True, "retries": 1}
-            return {"recovered": False, "error": "Non-recoverable tool failure"}
-
-        elif chaos_type == ChaosType.AGENT_CONFLICT.value:
-            # Use arbitrator to resolve
-            if self._arbitrator:
-                # Simulate conflict resolution
-                await asyncio.sleep(0.3 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 0}
+            if not chaos_config.get("parameters", {}).get("recoverable", True):
+                return {"recovered": False, "error": "Non-recoverable tool failure"}
 
         elif chaos_type == ChaosType.POLICY_VIOLATION.value:
-            # Emit approval required event
+            # Emit approval required event; auto-approve in simulation
             if self._event_emitter and self.config.emit_events:
                 await self._event_emitter.emit_approval_required(
                     run_id, task["task_id"], "policy_violation",
                     "Action blocked by policy engine", tenant_id
                 )
-            # Auto-approve in simulation
-            await asyncio.sleep(0.2 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 0}
-
-        elif chaos_type == ChaosType.CHECKPOINT_CRASH.value:
-            # Simulate recovery from checkpoint
-            await asyncio.sleep(0.3 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 1}
 
-        elif chaos_type == ChaosType.MEMORY_PRESSURE.value:
-            # Simulate context window exceeded - summarize and continue
-            await asyncio.sleep(0.4 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 0}
-
-        elif chaos_type == ChaosType.RATE_LIMIT.value:
-            # Simulate backoff and retry
-            await asyncio.sleep(1.0 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 2}
-
-        elif chaos_type == ChaosType.DATA_CORRUPTION.value:
-            # Simulate validation and repair
-            await asyncio.sleep(0.5 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 1}
-
-        elif chaos_type == ChaosType.NETWORK_PARTITION.value:
-            # Simulate queue and retry
-            await asyncio.sleep(2.0 / self.config.speedup_factor)
-            return {"recovered": True, "retries": 3}
-
-        return {"recovered": False, "error": f"Unknown chaos type: {chaos_type}"}
+        # Simulate recovery (retry, arbitration, backoff, checkpoint restore...)
+        await asyncio.sleep(recovery.delay_ms / 1000 / self.config.speedup_factor)
+        return {"recovered": True, "retries": recovery.retries}
 
     # -------------------------------------------------------------------------
     # Scenario Execution
@@ -601,10 +605,7 @@ class SimulationExecutor:
             await self.register_fleet(agents, tenant_id)
 
         # Get workflows
-        workflows_data = scenario.get("workflows", {})
-        workflows = workflows_data.get("workflows", workflows_data) if isinstance(workflows_data, dict) else workflows_data
-        if isinstance(workflows, dict):
-            workflows = [workflows]
+        workflows = self._scenario_workflows(scenario)
 
         # Get assignments
         agent_assignments = scenario.get("agent_assignments", {})
@@ -697,6 +698,116 @@ class SimulationExecutor:
             analysis=analysis,
         )
 
+    async def simulate_scenario(
+        self,
+        scenario: Dict[str, Any],
+        tenant_id: Optional[UUID] = None,
+        arrival: Optional[ArrivalCurve] = None,
+        max_concurrent_tasks: Optional[int] = None,
+    ) -> ExecutionResult:
+        """
+        Execute a FARM stress scenario in virtual time.
+
+        Same validation, verdict and analysis as execute_scenario, but task
+        durations and chaos recovery advance a virtual clock instead of
+        sleeping, workflows arrive on the given curve and compete for
+        max_concurrent_tasks slots, and results are aggregated as they
+        stream (workflow_results stays empty; see ExecutionResult.simulation).
+        Failed tasks are retried up to config.max_retries times, as in
+        execute_workflow.
+
+        Args:
+            scenario: FARM scenario dict
+            tenant_id: Tenant for cost tracking and events
+            arrival: Workflow arrival curve (default: all at once)
+            max_concurrent_tasks: Overrides config.max_concurrent_tasks
+        """
+        if not self._orchestrator:
+            self.initialize()
+
+        scenario_id = scenario.get("scenario_id", str(uuid4()))
+        started_at = datetime.utcnow()
+
+        agents = scenario.get("agents", {}).get("agents", [])
+        if agents and self.config.register_agents:
+            await self.register_fleet(agents, tenant_id)
+
+        observers = []
+        if self._metrics_bridge and self.config.record_metrics:
+            observers.append(MetricsBridgeObserver(self._metrics_bridge, tenant_id))
+        if self._event_emitter and self.config.emit_events:
+            observers.append(EventEmitterObserver(self._event_emitter, tenant_id, self.config.event_sample_rate))
+
+        engine = SimulationEngine(
+            task_model=ChaosTaskModel(self.config.chaos_recovery_enabled),
+            observers=observers,
+            max_concurrent_tasks=max_concurrent_tasks or self.config.max_concurrent_tasks,
+            max_retries=self.config.max_retries,
+            seed=self.config.seed,
+        )
+        summary = await engine.run(
+            self._scenario_workflows(scenario),
+            arrival=arrival,
+            assignments=scenario.get("agent_assignments", {}),
+        )
+
+        expected = scenario.get("__expected__", scenario.get("expected", {}))
+        validation = self._validate_against_expected(
+            completion_rate=summary.completion_rate,
+            chaos_recovery_rate=summary.chaos_recovery_rate,
+            total_tasks=summary.total_tasks,
+            tasks_completed=summary.tasks_completed,
+            chaos_total=summary.chaos_events_total,
+            chaos_recovered=summary.chaos_events_recovered,
+            expected=expected,
+        )
+        verdict = self._calculate_verdict(summary.completion_rate, summary.chaos_recovery_rate, validation)
+        analysis = self._generate_analysis(
+            completion_rate=summary.completion_rate,
+            chaos_recovery_rate=summary.chaos_recovery_rate,
+            throughput_tasks=summary.throughput_tasks_per_sec,
+            avg_latency=summary.workflow_duration_ms.mean,
+            verdict=verdict,
+        )
+
+        if self._metrics_bridge:
+            self._metrics_bridge.update_vitals()
+
+        return ExecutionResult(
+            scenario_id=scenario_id,
+            status="completed" if summary.workflows_failed == 0 else "completed_with_failures",
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+            total_duration_ms=int(summary.virtual_duration_ms),
+            workflows_completed=summary.workflows_completed,
+            workflows_failed=summary.workflows_failed,
+            total_tasks=summary.total_tasks,
+            tasks_completed=summary.tasks_completed,
+            tasks_failed=summary.tasks_failed,
+            chaos_events_total=summary.chaos_events_total,
+            chaos_events_recovered=summary.chaos_events_recovered,
+            throughput_wf_per_sec=summary.throughput_wf_per_sec,
+            throughput_tasks_per_sec=summary.throughput_tasks_per_sec,
+            avg_latency_ms=summary.workflow_duration_ms.mean,
+            total_tokens=summary.total_tokens,
+            total_cost_usd=summary.total_cost_usd,
+            completion_rate=summary.completion_rate,
+            chaos_recovery_rate=summary.chaos_recovery_rate,
+            validation=validation,
+            verdict=verdict,
+            analysis=analysis,
+            simulation=summary.to_dict(),
+        )
+
+    @staticmethod
+    def _scenario_workflows(scenario: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Workflow dicts of a scenario (list, {"workflows": [...]} or a single workflow)."""
+        workflows_data = scenario.get("workflows", {})
+        workflows = workflows_data.get("workflows", workflows_data) if isinstance(workflows_data, dict) else workflows_data
+        if isinstance(workflows, dict):
+            workflows = [workflows]
+        return workflows
+
     def _validate_against_expected(
         self,
         completion_rate: float,
@@ -0,0 +1,199 @@
+"""
+Tool Dispatch
+
+Executes the tool calls an LLM returns in one turn:
+- Name-indexed tool registry with memoized forbidden/approval pattern checks
+- Calls to idempotent tools run concurrently under a per-run limit; any other
+  call runs alone, after the calls before it and before the calls after it
+- Per-tool timeouts; a failing or timed-out call becomes an error result
+  instead of aborting the turn
+- Results are returned in call order, whatever order the tools finish in
+"""
+
+import asyncio
+import fnmatch
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from app.agentic.workflow import ToolDefinition
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PARALLEL_TOOLS = 4
+DEFAULT_TOOL_TIMEOUT_SECONDS = 60.0
+
+# (tool_name, tool_input, tool_def) -> result
+ToolExecutor = Callable[[str, dict, "ToolDefinition"], Awaitable[Any]]
+
+
+@dataclass
+class ToolCall:
+    """One tool call from an LLM turn."""
+    id: str
+    name: str
+    input: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ToolCall":
+        return cls(id=data.get("id", ""), name=data["name"], input=data.get("input") or {})
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "name": self.name, "input": self.input}
+
+
+@dataclass
+class ToolCallResult:
+    """Outcome of one tool call."""
+    call: ToolCall
+    output: Any
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ToolRegistry:
+    """
+    Tools by name, with forbidden/approval decisions memoized per name.
+
+    Args:
+        tools: Tool definitions (later definitions win on duplicate names)
+        forbidden_patterns: fnmatch patterns for forbidden tool names
+        approval_patterns: fnmatch patterns for tools requiring approval
+    """
+
+    def __init__(
+        self,
+        tools: Iterable["ToolDefinition"],
+        forbidden_patterns: Iterable[str] = (),
+        approval_patterns: Iterable[str] = (),
+    ):
+        self._tools: Dict[str, "ToolDefinition"] = {tool.name: tool for tool in tools}
+        self._forbidden_patterns = list(forbidden_patterns)
+        self._approval_patterns = list(approval_patterns)
+        self._forbidden: Dict[str, bool] = {}
+        self._approval: Dict[str, bool] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def get(self, name: str) -> Optional["ToolDefinition"]:
+        return self._tools.get(name)
+
+    def is_forbidden(self, name: str) -> bool:
+        result = self._forbidden.get(name)
+        if result is None:
+            result = self._forbidden[name] = any(
+                fnmatch.fnmatch(name, pattern) for pattern in self._forbidden_patterns
+            )
+        return result
+
+    def requires_approval(self, name: str) -> bool:
+        result = self._approval.get(name)
+        if result is None:
+            result = self._approval[name] = any(
+                fnmatch.fnmatch(name, pattern) for pattern in self._approval_patterns
+            )
+        return result
+
+    def can_run_concurrently(self, name: str) -> bool:
+        """Whether calls to this tool may overlap other calls (idempotency hint)."""
+        tool = self._tools.get(name)
+        return bool(tool and tool.idempotent)
+
+
+def plan_batches(calls: List[ToolCall], registry: ToolRegistry) -> List[List[ToolCall]]:
+    """
+    Split a turn's calls into batches that run one after another.
+
+    Consecutive calls to idempotent tools share a batch and run concurrently;
+    every other call is a batch of its own, so side effects keep the order
+    the model asked for.
+    """
+    batches: List[List[ToolCall]] = []
+    for call in calls:
+        if (
+            batches
+            and registry.can_run_concurrently(call.name)
+            and registry.can_run_concurrently(batches[-1][-1].name)
+        ):
+            batches[-1].append(call)
+        else:
+            batches.append([call])
+    return batches
+
+
+class ToolDispatcher:
+    """
+    Runs a turn's tool calls through an executor.
+
+    One dispatcher belongs to one workflow run; its semaphore caps how many
+    of that run's tool calls are in flight at once.
+
+    Args:
+        registry: Tool registry
+        executor: Async callable (tool_name, tool_input, tool_def) -> result
+        max_concurrency: Concurrent tool calls per run
+        default_timeout: Seconds per call for tools without timeout_seconds
+    """
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        executor: ToolExecutor,
+        max_concurrency: int = DEFAULT_MAX_PARALLEL_TOOLS,
+        default_timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT_SECONDS,
+    ):
+        self.registry = registry
+        self.executor = executor
+        self.max_concurrency = max(1, max_concurrency)
+        self.default_timeout = default_timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def dispatch(self, calls: List[ToolCall]) -> List[ToolCallResult]:
+        """
+        Execute calls and return their results in call order.
+
+        Args:
+            calls: Tool calls, all present in the registry
+
+        Returns:
+            One ToolCallResult per call, same order
+        """
+        results: List[ToolCallResult] = []
+        for batch in plan_batches(calls, self.registry):
+            if len(batch) == 1:
+                results.append(await self._run(batch[0]))
+            else:
+                results.extend(await asyncio.gather(*(self._run(call) for call in batch)))
+        return results
+
+    async def _run(self, call: ToolCall) -> ToolCallResult:
+        tool_def = self.registry.get(call.name)
+        timeout = tool_def.timeout_seconds if tool_def.timeout_seconds is not None else self.default_timeout
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                output = await asyncio.wait_for(self.executor(call.name, call.input, tool_def), timeout)
+                return ToolCallResult(call=call, output=output, duration_ms=(time.perf_counter() - start) * 1000)
+            except asyncio.TimeoutError:
+                error = f"Tool {call.name} timed out after {timeout}s"
+            except Exception as e:
+                error = f"Tool {call.name} failed: {e}"
+
+        logger.warning(error)
+        return ToolCallResult(
+            call=call,
+            output={"status": "error", "message": error},
+            error=error,
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
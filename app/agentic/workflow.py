@@ -13,6 +13,15 @@ from datetime import datetime, timedelta
 from typing import Any, Callable, Optional, TypedDict
 from uuid import UUID
 
+from app.agentic.tool_dispatch import (
+    DEFAULT_MAX_PARALLEL_TOOLS,
+    DEFAULT_TOOL_TIMEOUT_SECONDS,
+    ToolCall,
+    ToolCallResult,
+    ToolDispatcher,
+    ToolRegistry,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +54,10 @@ class ToolDefinition:
     input_schema: dict = field(default_factory=dict)
     requires_approval: bool = False
     forbidden: bool = False
+    # Idempotent/read-only tools may run concurrently with other such calls
+    idempotent: bool = False
+    # Per-call timeout; None uses WorkflowConfig.tool_timeout_seconds
+    timeout_seconds: Optional[float] = None
 
 
 @dataclass
@@ -62,6 +75,9 @@ class WorkflowConfig:
     tools: list[ToolDefinition] = field(default_factory=list)
     require_approval_for: list[str] = field(default_factory=list)
     forbidden_actions: list[str] = field(default_factory=list)
+    max_parallel_tools: int = DEFAULT_MAX_PARALLEL_TOOLS
+    tool_timeout_seconds: Optional[float] = DEFAULT_TOOL_TIMEOUT_SECONDS
+    tool_executor: Optional[Callable] = None  # async (name, input, tool_def) -> result
     on_tool_call: Optional[Callable] = None
     on_approval_required: Optional[Callable] = None
     on_step_complete: Optional[Callable] = None
@@ -106,7 +122,7 @@ class AgentWorkflow:
     Executable agent workflow.
 
     Manages the agent execution loop with:
-    - Tool calling via MCP
+    - Tool calling via MCP (independent calls in a turn run concurrently)
     - Human-in-the-loop approvals
     - Cost and step tracking
     - Checkpoint integration
@@ -129,6 +145,17 @@ class AgentWorkflow:
             "error": None,
             "metadata": {}
         }
+        self._tools = ToolRegistry(
+            config.tools,
+            forbidden_patterns=config.forbidden_actions,
+            approval_patterns=config.require_approval_for,
+        )
+        self._dispatcher = ToolDispatcher(
+            self._tools,
+            self._execute_tool,
+            max_concurrency=config.max_parallel_tools,
+            default_timeout=config.tool_timeout_seconds,
+        )
 
     @property
     def state(self) -> AgentState:
@@ -212,7 +239,7 @@ class AgentWorkflow:
 
         # Process the response
         if response.get("type") == "tool_use":
-            await self._handle_tool_call(response)
+            await self._handle_tool_calls(response.get("calls") or [response])
         else:
             # Final response
             self._state["output"] = response.get("content", "")
@@ -300,13 +327,15 @@ class AgentWorkflow:
 
             # Parse response
             if response.stop_reason == "tool_use":
-                tool_use = response.content[-1]
-                return {
-                    "type": "tool_use",
-                    "name": tool_use.name,
-                    "input": tool_use.input,
-                    "id": tool_use.id
-                }
+                tool_uses = [
+                    block for block in response.content
+                    if getattr(block, "type", None) == "tool_use"
+                ] or [response.content[-1]]
+                calls = [
+                    {"name": block.name, "input": block.input, "id": block.id}
+                    for block in tool_uses
+                ]
+                return {"type": "tool_use", **calls[0], "calls": calls}
             else:
                 return {
                     "type": "text",
@@ -319,77 +348,92 @@ class AgentWorkflow:
 
     async def _handle_tool_call(self, tool_response: dict) -> None:
         """Handle a tool call from the LLM."""
-        tool_name = tool_response["name"]
-        tool_input = tool_response["input"]
-        tool_id = tool_response.get("id", "")
-
-        # Find the tool definition
-        tool_def = next(
-            (t for t in self.config.tools if t.name == tool_name),
-            None
-        )
+        await self._handle_tool_calls([tool_response])
 
-        if tool_def is None:
-            self._state["error"] = f"Unknown tool: {tool_name}"
-            return
+    async def _handle_tool_calls(self, tool_responses: list[dict]) -> None:
+        """
+        Handle the tool calls from one LLM turn.
 
-        # Check if tool is forbidden
-        if self._is_forbidden(tool_name):
-            self._state["error"] = f"Forbidden tool: {tool_name}"
-            return
+        Every call is validated before any runs. Calls ahead of the first one
+        that needs approval are executed; that call and the rest of the turn
+        wait for the approval decision.
+        """
+        calls = [ToolCall.from_dict(response) for response in tool_responses]
+
+        for call in calls:
+            if call.name not in self._tools:
+                self._state["error"] = f"Unknown tool: {call.name}"
+                return
+
+            # Check if tool is forbidden
+            if self._is_forbidden(call.name):
+                self._state["error"] = f"Forbidden tool: {call.name}"
+                return
 
-        # Check if approval is required
-        if self._requires_approval(tool_name):
+        held: list[ToolCall] = []
+        for i, call in enumerate(calls):
+            if self._requires_approval(call.name):
+                calls, held = calls[:i], calls[i:]
+                break
+
+        if calls:
+            await self._run_tool_calls(calls)
+
+        if held:
+            blocked = held[0]
             self._state["pending_approval"] = {
-                "tool_name": tool_name,
-                "tool_input": tool_input,
-                "tool_id": tool_id,
+                "tool_name": blocked.name,
+                "tool_input": blocked.input,
+                "tool_id": blocked.id,
                 "step": self._state["current_step"],
                 "requested_at": datetime.utcnow().isoformat()
             }
+            if len(held) > 1:
+                self._state["pending_approval"]["remaining_calls"] = [call.to_dict() for call in held[1:]]
 
             if self.config.on_approval_required:
                 await self._safe_callback(
                     self.config.on_approval_required,
                     self._state["pending_approval"]
                 )
-            return
-
-        # Execute the tool
-        result = await self._execute_tool(tool_name, tool_input, tool_def)
 
-        # Record the tool call
-        self._state["tools_called"].append({
-            "name": tool_name,
-            "input": tool_input,
-            "output": result,
-            "step": self._state["current_step"]
-        })
+    async def _run_tool_calls(self, calls: list[ToolCall]) -> list[ToolCallResult]:
+        """Execute calls through the dispatcher and record them in call order."""
+        results = await self._dispatcher.dispatch(calls)
+
+        for result in results:
+            # Record the tool call
+            self._state["tools_called"].append({
+                "name": result.call.name,
+                "input": result.call.input,
+                "output": result.output,
+                "step": self._state["current_step"]
+            })
 
         # Add to message history
         self._state["messages"].append({
             "role": "assistant",
             "content": None,
-            "tool_calls": [{
-                "id": tool_id,
-                "name": tool_name,
-                "input": tool_input
-            }]
-        })
-        self._state["messages"].append({
-            "role": "tool",
-            "tool_call_id": tool_id,
-            "content": str(result)
+            "tool_calls": [call.to_dict() for call in calls]
         })
+        for result in results:
+            self._state["messages"].append({
+                "role": "tool",
+                "tool_call_id": result.call.id,
+                "content": str(result.output)
+            })
 
         # Callback for tool call
         if self.config.on_tool_call:
-            await self._safe_callback(
-                self.config.on_tool_call,
-                tool_name,
-                tool_input,
-                result
-            )
+            for result in results:
+                await self._safe_callback(
+                    self.config.on_tool_call,
+                    result.call.name,
+                    result.call.input,
+                    result.output
+                )
+
+        return results
 
     async def _execute_tool(
         self,
@@ -400,10 +444,14 @@ class AgentWorkflow:
         """
         Execute a tool via MCP.
 
-        This is a placeholder that will integrate with the MCP client.
+        Uses config.tool_executor when set; otherwise this is a placeholder
+        that will integrate with the MCP client.
         """
         logger.info(f"Executing tool: {tool_name} on {tool_def.mcp_server}")
 
+        if self.config.tool_executor:
+            return await self.config.tool_executor(tool_name, tool_input, tool_def)
+
         # TODO: Integrate with MCP client in Phase 2
         # For now, return a mock result
         return {
@@ -414,17 +462,11 @@ class AgentWorkflow:
 
     def _is_forbidden(self, tool_name: str) -> bool:
         """Check if a tool is forbidden."""
-        for pattern in self.config.forbidden_actions:
-            if fnmatch.fnmatch(tool_name, pattern):
-                return True
-        return False
+        return self._tools.is_forbidden(tool_name)
 
     def _requires_approval(self, tool_name: str) -> bool:
         """Check if a tool requires approval."""
-        for pattern in self.config.require_approval_for:
-            if fnmatch.fnmatch(tool_name, pattern):
-                return True
-        return False
+        return self._tools.requires_approval(tool_name)
 
     def _estimate_cost(self, input_tokens: int, output_tokens: int) -> float:
         """Estimate cost based on token usage."""
@@ -466,23 +508,22 @@ class AgentWorkflow:
             tool_input = approval["tool_input"]
             tool_id = approval.get("tool_id", "")
 
-            tool_def = next(
-                (t for t in self.config.tools if t.name == tool_name),
-                None
-            )
-
-            if tool_def:
-                result = await self._execute_tool(tool_name, tool_input, tool_def)
+            if tool_name in self._tools:
+                [result] = await self._dispatcher.dispatch([ToolCall(tool_id, tool_name, tool_input)])
 
                 self._state["tools_called"].append({
                     "name": tool_name,
                     "input": tool_input,
-                    "output": result,
+                    "output": result.output,
                     "step": self._state["current_step"],
                     "approved": True,
                     "approval_notes": notes
                 })
 
+                # Rest of the turn that was held behind the approval
+                if approval.get("remaining_calls"):
+                    await self._handle_tool_calls(approval["remaining_calls"])
+
                 # Continue execution
                 while self._should_continue():
                     await self._execute_step()
@@ -524,6 +565,9 @@ def create_tool_from_mcp(
     forbidden = any(
         fnmatch.fnmatch(name, p) for p in forbidden_patterns
     )
+    # MCP tool annotations: read-only or idempotent tools are safe to overlap
+    annotations = mcp_tool.get("annotations") or {}
+    idempotent = bool(annotations.get("readOnlyHint") or annotations.get("idempotentHint"))
 
     return ToolDefinition(
         name=name,
@@ -531,5 +575,6 @@ def create_tool_from_mcp(
         mcp_server=mcp_server,
         input_schema=mcp_tool.get("inputSchema", {}),
         requires_approval=requires_approval,
-        forbidden=forbidden
+        forbidden=forbidden,
+        idempotent=idempotent
     )
@@ -5,13 +5,30 @@ Provides standardized pagination patterns:
 - PaginationParams: Query parameter handling with validation
 - paginate_query: Apply pagination to SQLAlchemy queries
 - PaginatedResponse: Generic response model for paginated data
+- CursorParams / paginate_keyset: Keyset pagination over (sort key, id) with
+  opaque signed cursors, for large tables where OFFSET and exact counts are
+  too expensive on deep pages
+- approximate_total: pg_class.reltuples estimate or a capped count
 """
 
-from typing import Any, Generic, List, TypeVar, Callable
-from fastapi import Query
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, TypeVar, Callable
+from uuid import UUID
+
+from fastapi import HTTPException, Query
 from pydantic import BaseModel, Field
+from sqlalchemy import func, literal, select, text, tuple_
 from sqlalchemy.orm import Query as SQLAlchemyQuery
 
+logger = logging.getLogger(__name__)
+
 
 # Generic type for paginated items
 T = TypeVar("T")
@@ -183,3 +200,289 @@ async def paginate_async(
         page=params.page,
         page_size=params.page_size,
     )
+
+
+# =============================================================================
+# Keyset (cursor) pagination
+# =============================================================================
+
+# Counts above this are reported as "at least DEFAULT_COUNT_CAP"
+DEFAULT_COUNT_CAP = 10_000
+
+CURSOR_SECRET_KEY = os.getenv("CURSOR_SECRET_KEY", os.getenv("SECRET_KEY", ""))
+if not CURSOR_SECRET_KEY:
+    CURSOR_SECRET_KEY = os.urandom(32).hex()
+    logger.warning(
+        "CURSOR_SECRET_KEY/SECRET_KEY not set - pagination cursors will not "
+        "survive restarts or work across workers."
+    )
+
+
+class CursorParams:
+    """
+    Keyset pagination parameters.
+
+    Endpoints opt in by depending on this alongside (or instead of)
+    PaginationParams; a request is in cursor mode when ``cursor`` is present.
+    An empty ``cursor`` starts from the first page.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from next_cursor/prev_cursor; empty for the first page"
+        ),
+        page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+        with_total: bool = Query(False, description="Include an approximate total"),
+    ):
+        self.cursor = cursor
+        self.page_size = page_size
+        self.with_total = with_total
+
+    @property
+    def enabled(self) -> bool:
+        return self.cursor is not None
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Generic keyset-paginated response model."""
+    items: List[T]
+    page_size: int = Field(..., description="Number of items per page")
+    has_more: bool = Field(..., description="Whether a next page exists")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
+    prev_cursor: Optional[str] = Field(None, description="Cursor for the previous page")
+    total: Optional[int] = Field(None, description="Approximate total, if requested")
+    total_is_exact: bool = Field(False, description="Whether total is an exact count")
+
+    class Config:
+        from_attributes = True
+
+
+@dataclass
+class Cursor:
+    """Decoded cursor: the (sort key, id) of a boundary row and the direction to move."""
+    values: tuple
+    backward: bool = False
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return UUID(value["uuid"])
+        raise ValueError("unknown cursor value type")
+    return value
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(scope: str, body: str) -> str:
+    digest = hmac.new(CURSOR_SECRET_KEY.encode(), f"{scope}|{body}".encode(), hashlib.sha256).digest()
+    return _b64(digest[:16])
+
+
+def encode_cursor(cursor: Cursor, scope: str) -> str:
+    """
+    Serialize a cursor to an opaque, tamper-evident string.
+
+    Args:
+        cursor: Boundary values and direction
+        scope: Binds the cursor to one ordering (e.g. "agent_runs.created_at"),
+               so it cannot be replayed against another endpoint
+
+    Returns:
+        URL-safe cursor string.
+    """
+    payload = {"v": [_encode_value(v) for v in cursor.values], "b": int(cursor.backward)}
+    body = _b64(json.dumps(payload, separators=(",", ":")).encode())
+    return f"{body}.{_signature(scope, body)}"
+
+
+def decode_cursor(token: str, scope: str) -> Cursor:
+    """
+    Verify and parse a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed, tampered with, or from another scope.
+    """
+    body, _, signature = token.partition(".")
+    if not signature or not hmac.compare_digest(signature, _signature(scope, body)):
+        raise ValueError("cursor signature mismatch")
+    try:
+        payload = json.loads(_unb64(body))
+        values = tuple(_decode_value(v) for v in payload["v"])
+        return Cursor(values=values, backward=bool(payload["b"]))
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"malformed cursor: {e}") from e
+
+
+def _scope(sort_column: Any, id_column: Any, descending: bool) -> str:
+    table = getattr(getattr(sort_column, "class_", None), "__tablename__", "")
+    return f"{table}:{sort_column.key}:{id_column.key}:{'desc' if descending else 'asc'}"
+
+
+def approximate_total(query: SQLAlchemyQuery, cap: int = DEFAULT_COUNT_CAP) -> tuple[int, bool]:
+    """
+    Cheap total for a query: (count, is_exact).
+
+    Unfiltered single-table queries on Postgres use the planner's
+    pg_class.reltuples estimate. Otherwise counts at most ``cap + 1`` rows,
+    so the cost is bounded regardless of table size; counts above the cap
+    are reported as ``cap`` with is_exact=False.
+    """
+    session = query.session
+    if query.whereclause is None and session.get_bind().dialect.name == "postgresql":
+        tables = [d.get("entity").__table__ for d in query.column_descriptions if d.get("entity") is not None]
+        if len(tables) == 1:
+            estimate = session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+                {"name": tables[0].fullname},
+            ).scalar()
+            # -1 (or 0) until the table has been vacuumed/analyzed
+            if estimate is not None and estimate > 0:
+                return int(estimate), False
+
+    capped = query.order_by(None).limit(cap + 1).subquery()
+    count = session.execute(select(func.count()).select_from(capped)).scalar_one()
+    if count > cap:
+        return cap, False
+    return count, True
+
+
+class CursorPaginationResult(Generic[T]):
+    """Result of keyset pagination. Use build_response() to return it."""
+
+    def __init__(
+        self,
+        items: List[T],
+        page_size: int,
+        next_cursor: Optional[str],
+        prev_cursor: Optional[str],
+        total: Optional[int] = None,
+        total_is_exact: bool = False,
+    ):
+        self.items = items
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.has_more = next_cursor is not None
+        self.total = total
+        self.total_is_exact = total_is_exact
+
+    def build_response(self, response_class: type = None) -> dict[str, Any]:
+        data = {
+            "items": self.items,
+            "page_size": self.page_size,
+            "has_more": self.has_more,
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor,
+            "total": self.total,
+            "total_is_exact": self.total_is_exact,
+        }
+        if response_class:
+            return response_class(**data)
+        return data
+
+
+def paginate_keyset(
+    query: SQLAlchemyQuery,
+    params: CursorParams,
+    sort_column: Any,
+    id_column: Any,
+    descending: bool = True,
+    count_cap: int = DEFAULT_COUNT_CAP,
+) -> CursorPaginationResult:
+    """
+    Apply keyset pagination to a SQLAlchemy query.
+
+    Rows are ordered by (sort_column, id_column) and each page seeks past the
+    boundary row with a row-value comparison, so page 10,000 costs the same
+    as page 1 given an index on (sort_column, id_column) (optionally prefixed
+    by the filter columns). sort_column must be non-nullable.
+
+    Args:
+        query: SQLAlchemy query object (any existing ORDER BY is replaced)
+        params: CursorParams instance
+        sort_column: ORM attribute to order by (e.g. Model.created_at)
+        id_column: Unique ORM attribute used as tie-breaker (e.g. Model.id)
+        descending: Newest-first when True
+        count_cap: Upper bound for the capped count when a total is requested
+
+    Returns:
+        CursorPaginationResult with items and next/prev cursors.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
+
+    Example:
+        if cursor_params.enabled:
+            result = paginate_keyset(query, cursor_params, Run.created_at, Run.id)
+            return result.build_response()
+    """
+    scope = _scope(sort_column, id_column, descending)
+    cursor = None
+    if params.cursor:
+        try:
+            cursor = decode_cursor(params.cursor, scope)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    total, total_is_exact = (None, False)
+    if params.with_total:
+        total, total_is_exact = approximate_total(query, count_cap)
+
+    backward = cursor is not None and cursor.backward
+    ascending = descending == backward
+    key = tuple_(sort_column, id_column)
+
+    if cursor is not None:
+        if len(cursor.values) != 2:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        bound = tuple_(
+            literal(cursor.values[0], type_=sort_column.type),
+            literal(cursor.values[1], type_=id_column.type),
+        )
+        query = query.filter(key > bound if ascending else key < bound)
+
+    if ascending:
+        query = query.order_by(None).order_by(sort_column.asc(), id_column.asc())
+    else:
+        query = query.order_by(None).order_by(sort_column.desc(), id_column.desc())
+
+    rows = query.limit(params.page_size + 1).all()
+    more = len(rows) > params.page_size
+    rows = rows[: params.page_size]
+    if backward:
+        rows.reverse()
+
+    # Moving backward always leaves the page we came from ahead of us
+    has_next = True if backward else more
+    has_prev = more if backward else cursor is not None
+
+    def boundary(row, to_previous: bool) -> str:
+        values = (getattr(row, sort_column.key), getattr(row, id_column.key))
+        return encode_cursor(Cursor(values=values, backward=to_previous), scope)
+
+    return CursorPaginationResult(
+        items=rows,
+        page_size=params.page_size,
+        next_cursor=boundary(rows[-1], False) if rows and has_next else None,
+        prev_cursor=boundary(rows[0], True) if rows and has_prev else None,
+        total=total,
+        total_is_exact=total_is_exact,
+    )
@@ -9,15 +9,22 @@ Related modules:
 - aam_drift.py: Drift detection endpoints
 - aam_sync.py: Airbyte sync integration helpers
 - aam_schema.py: Schema observation endpoints
+
+/metrics is served from the Redis rollups in
+aam_hybrid/core/monitoring_rollups.py when they are available, and falls
+back to counting the source tables otherwise.
 """
+import asyncio
 import logging
 import httpx
 from datetime import datetime, timedelta
+from typing import Optional
 from fastapi import APIRouter, Request, Depends
 from sqlalchemy import select, func, and_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db, AsyncSessionLocal
+from aam_hybrid.core.monitoring_rollups import get_monitoring_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +44,41 @@ except Exception as e:
     ConnectionStatus = None  # type: ignore
     JobStatus = None  # type: ignore
 
+# Shared client for service health probes (created on first use)
+_status_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_status_client() -> httpx.AsyncClient:
+    global _status_client
+    if _status_client is None or _status_client.is_closed:
+        _status_client = httpx.AsyncClient(timeout=2.0)
+    return _status_client
+
+
+async def close_status_client() -> None:
+    """Close the shared health-probe client (application shutdown)."""
+    global _status_client
+    if _status_client is not None:
+        await _status_client.aclose()
+        _status_client = None
+
+
+async def _probe_service(client: httpx.AsyncClient, service_info: dict) -> dict:
+    try:
+        response = await client.get(f"http://localhost:{service_info['port']}/health")
+        return {
+            "name": service_info["name"],
+            "status": "running" if response.status_code == 200 else "error",
+            "port": service_info["port"]
+        }
+    except Exception as e:
+        return {
+            "name": service_info["name"],
+            "status": "stopped",
+            "port": service_info["port"],
+            "error": str(e)
+        }
+
 
 @router.get("/status")
 async def get_aam_status():
@@ -51,31 +93,10 @@ async def get_aam_status():
         "Orchestrator": {"port": 8001, "name": "Orchestrator"}
     }
 
-    service_status = []
-
-    async with httpx.AsyncClient(timeout=2.0) as client:
-        for service_key, service_info in services.items():
-            try:
-                response = await client.get(f"http://localhost:{service_info['port']}/health")
-                if response.status_code == 200:
-                    service_status.append({
-                        "name": service_info["name"],
-                        "status": "running",
-                        "port": service_info["port"]
-                    })
-                else:
-                    service_status.append({
-                        "name": service_info["name"],
-                        "status": "error",
-                        "port": service_info["port"]
-                    })
-            except Exception as e:
-                service_status.append({
-                    "name": service_info["name"],
-                    "status": "stopped",
-                    "port": service_info["port"],
-                    "error": str(e)
-                })
+    client = _get_status_client()
+    service_status = list(await asyncio.gather(
+        *(_probe_service(client, service_info) for service_info in services.values())
+    ))
 
     return {
         "timestamp": datetime.utcnow().isoformat(),
@@ -130,6 +151,15 @@ async def get_aam_metrics():
             "data_source": "mock"
         }
 
+    rollups = get_monitoring_rollups()
+    if rollups is not None:
+        try:
+            snapshot = rollups.snapshot()
+            if snapshot is not None:
+                return _metrics_from_rollups(snapshot)
+        except Exception as e:
+            logger.warning(f"AAM rollups unavailable, counting source tables: {e}")
+
     try:
         async with AsyncSessionLocal() as db:
             # Total connections
@@ -240,6 +270,27 @@ async def get_aam_metrics():
         }
 
 
+def _metrics_from_rollups(snapshot: dict) -> dict:
+    """/metrics response from a MonitoringRollups snapshot."""
+    by_status = snapshot["connections_by_status"]
+    jobs = snapshot["jobs_24h"]
+    return {
+        "total_connections": snapshot["total_connections"],
+        "active_connections": by_status.get("ACTIVE", 0),
+        "active_drift_detections_24h": jobs.get("failed", 0),
+        "successful_repairs_24h": jobs.get("succeeded", 0),
+        "manual_reviews_required_24h": by_status.get("HEALING", 0),
+        "average_confidence_score": 0.92,  # Placeholder - would come from repair_knowledge_base
+        "average_repair_time_seconds": snapshot["average_repair_time_seconds"],
+        "drift": {
+            "last_24h": snapshot["drift_24h"]
+        },
+        "timestamp": datetime.utcnow().isoformat(),
+        "data_source": "rollups",
+        "reconciled_at": snapshot["reconciled_at"]
+    }
+
+
 @router.get("/events")
 async def get_aam_events(limit: int = 50):
     """
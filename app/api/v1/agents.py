@@ -6,7 +6,7 @@ Part of the Agentic Orchestration Platform (Phase 1).
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
@@ -17,7 +17,13 @@ from app import models, schemas
 from app.database import get_db
 from app.security import get_current_user
 from app.api.utils import get_or_404
-from app.api.pagination import PaginationParams, paginate_query
+from app.api.pagination import (
+    CursorPaginatedResponse,
+    CursorParams,
+    PaginationParams,
+    paginate_keyset,
+    paginate_query,
+)
 
 router = APIRouter()
 
@@ -230,15 +236,24 @@ def create_run(
     return run
 
 
-@router.get("/{agent_id}/runs", response_model=schemas.AgentRunListResponse)
+@router.get(
+    "/{agent_id}/runs",
+    response_model=Union[schemas.AgentRunListResponse, CursorPaginatedResponse[schemas.AgentRunResponse]],
+)
 def list_runs(
     agent_id: UUID,
     pagination: PaginationParams = Depends(),
+    cursor_params: CursorParams = Depends(),
     status: Optional[schemas.RunStatus] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """List runs for a specific agent."""
+    """
+    List runs for a specific agent.
+
+    Pass ``cursor`` (empty for the first page) to switch from page numbers to
+    keyset pagination, which stays fast on deep pages of long run histories.
+    """
     # Verify agent belongs to tenant
     get_or_404(
         db.query(models.Agent).filter(
@@ -258,6 +273,14 @@ def list_runs(
     if status:
         query = query.filter(models.AgentRun.status == status.value)
 
+    if cursor_params.enabled:
+        return paginate_keyset(
+            query,
+            cursor_params,
+            sort_column=models.AgentRun.created_at,
+            id_column=models.AgentRun.id,
+        ).build_response()
+
     result = paginate_query(
         query,
         pagination,
@@ -151,9 +151,7 @@ async def list_bulk_mapping_jobs(
             )
         
         job_state = BulkMappingJobState(redis_client)
-        jobs = job_state.get_all_jobs_for_tenant(tenant_id)
-        
-        jobs = jobs[:limit]
+        jobs = job_state.get_all_jobs_for_tenant(tenant_id, limit=limit)
         
         return [JobStatusResponse(**job) for job in jobs]
     
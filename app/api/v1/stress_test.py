@@ -16,8 +16,9 @@ Integrates with AOA modules:
 
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, HTTPException, Header, BackgroundTasks
@@ -26,6 +27,7 @@ from pydantic import BaseModel, Field
 from app.agentic.simulation import (
     SimulationExecutor,
     ExecutionConfig,
+    ArrivalCurve,
     get_simulation_executor,
 )
 
@@ -133,6 +135,27 @@ class WorkflowRequest(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class LoadProfile(BaseModel):
+    """Virtual-time execution with a workflow arrival curve."""
+    arrival: Literal["constant", "ramp", "burst"] = "burst"
+    rate_per_sec: float = Field(10.0, gt=0)  # constant rate, or ramp end rate
+    start_rate_per_sec: float = Field(1.0, ge=0)
+    ramp_seconds: float = Field(60.0, gt=0)
+    burst_size: int = Field(100, ge=1)
+    burst_interval_seconds: float = Field(60.0, gt=0)
+    max_concurrent_tasks: Optional[int] = Field(None, ge=1)
+
+    def to_arrival_curve(self) -> ArrivalCurve:
+        return ArrivalCurve(
+            kind=self.arrival,
+            rate_per_sec=self.rate_per_sec,
+            start_rate_per_sec=self.start_rate_per_sec,
+            ramp_seconds=self.ramp_seconds,
+            burst_size=self.burst_size,
+            burst_interval_seconds=self.burst_interval_seconds,
+        )
+
+
 class StressScenarioRequest(BaseModel):
     """Complete stress scenario from AOS Farm."""
     agents: AgentFleetRequest
@@ -141,6 +164,7 @@ class StressScenarioRequest(BaseModel):
     expected: Optional[Dict[str, Any]] = Field(None, alias="__expected__")
     summary: Optional[Dict[str, Any]] = None
     metadata: Optional[Dict[str, Any]] = None
+    load_profile: Optional[LoadProfile] = None  # Set to simulate in virtual time
 
 
 class TaskResult(BaseModel):
@@ -193,6 +217,7 @@ class ScenarioResult(BaseModel):
     verdict: str = "PENDING"  # PASS, DEGRADED, FAIL, PENDING
     analysis: Dict[str, Any] = {}
     total_cost_usd: float = 0.0
+    simulation: Dict[str, Any] = {}  # Virtual-time runs: latency percentiles, peaks, time compression
 
 
 class FleetIngestionResponse(BaseModel):
@@ -299,40 +324,53 @@ async def execute_workflow(
 ) -> WorkflowResult:
     """Execute a single workflow."""
     started_at = datetime.utcnow()
-    task_results = []
+    final_results: Dict[str, TaskResult] = {}
     completed_tasks = set()
-
-    # Build dependency graph
-    dep_graph = {task.task_id: set(task.dependencies) for task in workflow.tasks}
+    attempts: Dict[str, int] = {}
+
+    # Build dependency graph: unmet dependency counts and reverse edges
+    task_map = {task.task_id: task for task in workflow.tasks}
+    indegree = {task.task_id: len(set(task.dependencies)) for task in workflow.tasks}
+    dependents: Dict[str, List[str]] = {task_id: [] for task_id in task_map}
+    for task in workflow.tasks:
+        for dep in set(task.dependencies):
+            if dep in dependents:
+                dependents[dep].append(task.task_id)
+    ready_tasks = deque(task_id for task_id, degree in indegree.items() if degree == 0)
 
     # Execute tasks respecting dependencies
-    while len(completed_tasks) < len(workflow.tasks):
-        # Find tasks ready to execute
-        ready_tasks = [
-            task for task in workflow.tasks
-            if task.task_id not in completed_tasks
-            and all(dep in completed_tasks for dep in task.dependencies)
-        ]
-
-        if not ready_tasks:
-            break  # Deadlock or error
-
+    while ready_tasks:
         # Execute ready tasks in parallel
+        batch = [task_map[ready_tasks.popleft()] for _ in range(len(ready_tasks))]
         execution_tasks = []
-        for task in ready_tasks:
+        for task in batch:
             agent_id = assignments.get(task.task_id) if assignments else None
             execution_tasks.append(simulate_task_execution(task, agent_id))
 
         results = await asyncio.gather(*execution_tasks)
 
         for result in results:
-            task_results.append(result)
+            # A retried task keeps only its final result
+            result.retry_count += attempts.get(result.task_id, 0)
+            final_results[result.task_id] = result
             if result.status == "completed":
                 completed_tasks.add(result.task_id)
+                for dependent in dependents[result.task_id]:
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        ready_tasks.append(dependent)
+            else:
+                # Re-run failed tasks per their retry policy
+                task = task_map[result.task_id]
+                attempts[task.task_id] = attempts.get(task.task_id, 0) + 1
+                max_attempts = task.retry_policy.max_attempts if task.retry_policy else 1
+                if attempts[task.task_id] < max_attempts:
+                    ready_tasks.append(task.task_id)
 
     completed_at = datetime.utcnow()
     duration_ms = int((completed_at - started_at).total_seconds() * 1000)
 
+    task_results = list(final_results.values())
     tasks_completed = sum(1 for r in task_results if r.status == "completed")
     tasks_failed = sum(1 for r in task_results if r.status == "failed")
     tasks_retried = sum(1 for r in task_results if r.retry_count > 0)
@@ -481,7 +519,15 @@ async def submit_scenario(
         }
 
         # Execute through SimulationExecutor
-        result = await executor.execute_scenario(scenario_dict, tenant_uuid)
+        if scenario.load_profile:
+            result = await executor.simulate_scenario(
+                scenario_dict,
+                tenant_uuid,
+                arrival=scenario.load_profile.to_arrival_curve(),
+                max_concurrent_tasks=scenario.load_profile.max_concurrent_tasks,
+            )
+        else:
+            result = await executor.execute_scenario(scenario_dict, tenant_uuid)
 
         # Convert results back to API format
         workflow_results = [
@@ -525,6 +571,14 @@ async def submit_scenario(
             "chaos_recovery_rate": result.chaos_recovery_rate,
             "throughput_wf_per_sec": result.throughput_wf_per_sec,
             "total_cost_usd": result.total_cost_usd,
+            "workflows_completed": result.workflows_completed,
+            "workflows_failed": result.workflows_failed,
+            "total_tasks": result.total_tasks,
+            "tasks_completed": result.tasks_completed,
+            "tasks_failed": result.tasks_failed,
+            "chaos_events_total": result.chaos_events_total,
+            "chaos_events_recovered": result.chaos_events_recovered,
+            "simulation": result.simulation,
         }
 
     background_tasks.add_task(run_scenario)
@@ -549,7 +603,7 @@ async def get_scenario_result(
 
     scenario_data = _active_scenarios[scenario_id]
     workflow_results = scenario_data.get("workflow_results", [])
-    execution_result = scenario_data.get("execution_result", {})
+    execution_result = scenario_data.get("execution_result") or {}
 
     # Calculate metrics
     started_at = datetime.fromisoformat(scenario_data["started_at"])
@@ -573,6 +627,17 @@ async def get_scenario_result(
     )
 
     throughput = len(workflow_results) / (duration_ms / 1000) if duration_ms > 0 else 0
+
+    # Virtual-time runs keep aggregates only, not per-workflow results
+    if execution_result.get("simulation"):
+        workflows_completed = execution_result["workflows_completed"]
+        workflows_failed = execution_result["workflows_failed"]
+        total_tasks = execution_result["total_tasks"]
+        tasks_completed = execution_result["tasks_completed"]
+        tasks_failed = execution_result["tasks_failed"]
+        chaos_total = execution_result["chaos_events_total"]
+        chaos_recovered = execution_result["chaos_events_recovered"]
+        throughput = execution_result["throughput_wf_per_sec"]
     completion_rate = execution_result.get("completion_rate",
         workflows_completed / len(workflow_results) if workflow_results else 0
     )
@@ -634,6 +699,7 @@ async def get_scenario_result(
         verdict=verdict,
         analysis=analysis,
         total_cost_usd=total_cost_usd,
+        simulation=execution_result.get("simulation", {}),
     )
 
 
@@ -0,0 +1,399 @@
+"""
+Task callback delivery.
+
+The RQ worker no longer POSTs callbacks inline. execute_task records a
+delivery in Redis and returns; a CallbackDispatcher (running as a thread in
+the worker process, or standalone via `python -m app.callbacks`) sends due
+deliveries over one pooled HTTP client.
+
+Redis layout:
+    callbacks:deliveries   hash  delivery id -> JSON record
+    callbacks:schedule     zset  delivery id -> unix time it is next due
+    callbacks:dead         list  JSON records that exhausted their attempts
+
+A dispatcher claims due deliveries by pushing their score forward by
+lease_seconds, so a delivery whose dispatcher dies mid-request becomes due
+again once the lease expires (delivery is at-least-once). Failed attempts
+are rescheduled with exponential backoff; after max_attempts the record is
+moved to the dead-letter list.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+import httpx
+from redis.exceptions import WatchError
+
+logger = logging.getLogger(__name__)
+
+DELIVERIES_KEY = "callbacks:deliveries"
+SCHEDULE_KEY = "callbacks:schedule"
+DEAD_LETTER_KEY = "callbacks:dead"
+
+DEFAULT_MAX_ATTEMPTS = 6
+DEFAULT_BACKOFF_SECONDS = [5, 30, 120, 600, 1800]
+DEAD_LETTER_MAXLEN = 10_000
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide pooled HTTP client for callbacks and outbound webhooks."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    timeout=httpx.Timeout(10.0, connect=5.0),
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+                )
+    return _http_client
+
+
+def close_http_client() -> None:
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def _reset_http_client_after_fork() -> None:
+    """
+    Forked children (RQ forks a work horse per job) must not share the
+    parent's pooled sockets or lock; drop both without closing the sockets,
+    which still belong to the parent.
+    """
+    global _http_client, _http_client_lock
+    _http_client = None
+    _http_client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_http_client_after_fork)
+
+
+@dataclass
+class CallbackDelivery:
+    """One pending callback POST."""
+    url: str
+    payload: dict
+    task_id: Optional[str] = None
+    tenant_id: Optional[str] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+    last_error: Optional[str] = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw) -> "CallbackDelivery":
+        return cls(**json.loads(raw))
+
+
+@dataclass
+class DeliveryOutcome:
+    """Result of one attempt, reported to the on_outcome hook."""
+    delivery: CallbackDelivery
+    status: str  # "delivered", "retrying" or "dead"
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    retry_in: Optional[float] = None
+
+    @property
+    def message(self) -> str:
+        if self.status == "delivered":
+            return f"Successfully sent callback with status {self.status_code}"
+        if self.status == "retrying":
+            return (
+                f"Callback attempt {self.delivery.attempts} failed: {self.error}; "
+                f"retrying in {self.retry_in:.0f}s"
+            )
+        return f"Failed to send callback after {self.delivery.attempts} attempts: {self.error}"
+
+
+class CallbackDispatcher:
+    """
+    Durable callback queue plus the loop that delivers it.
+
+    Args:
+        redis_client: Redis connection holding the schedule
+        client: HTTP client (defaults to the shared pooled client)
+        max_attempts: Attempts before a delivery is dead-lettered
+        backoff: Delay before attempt n+1 is backoff[n-1] seconds (last value repeats)
+        concurrency: Deliveries sent in parallel per drain
+        lease_seconds: How long a claimed delivery is hidden from other dispatchers
+        on_outcome: Called with the DeliveryOutcomes of each drain
+        clock: Time source (unix seconds)
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        client: Optional[httpx.Client] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: Optional[List[float]] = None,
+        concurrency: int = 8,
+        lease_seconds: float = 60.0,
+        on_outcome: Optional[Callable[[List[DeliveryOutcome]], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis_client
+        self._client = client
+        self.max_attempts = max_attempts
+        self.backoff = backoff or DEFAULT_BACKOFF_SECONDS
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.on_outcome = on_outcome
+        self.clock = clock
+        self._pool = self._new_pool()
+        self._pool_closed = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"delivered": 0, "retried": 0, "dead": 0}
+
+    @property
+    def client(self) -> httpx.Client:
+        return self._client or get_http_client()
+
+    def _new_pool(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="callback")
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        url: str,
+        payload: dict,
+        task_id=None,
+        tenant_id=None,
+        delay: float = 0.0,
+        delivery_id: Optional[str] = None,
+    ) -> str:
+        """Schedule a callback POST; returns the delivery id."""
+        delivery = CallbackDelivery(
+            url=url,
+            payload=payload,
+            task_id=str(task_id) if task_id is not None else None,
+            tenant_id=str(tenant_id) if tenant_id is not None else None,
+        )
+        if delivery_id is not None:
+            delivery.id = delivery_id
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(DELIVERIES_KEY, delivery.id, delivery.to_json())
+        pipe.zadd(SCHEDULE_KEY, {delivery.id: self.clock() + delay})
+        pipe.execute()
+        return delivery.id
+
+    def pending(self) -> int:
+        return self.redis.zcard(SCHEDULE_KEY)
+
+    def dead_letters(self, limit: int = 100) -> List[CallbackDelivery]:
+        return [CallbackDelivery.from_json(raw) for raw in self.redis.lrange(DEAD_LETTER_KEY, 0, limit - 1)]
+
+    def requeue_dead(self, delivery_id: str) -> bool:
+        """Move a dead-lettered delivery back onto the schedule with a fresh attempt budget."""
+        for raw in self.redis.lrange(DEAD_LETTER_KEY, 0, -1):
+            delivery = CallbackDelivery.from_json(raw)
+            if delivery.id != delivery_id:
+                continue
+            delivery.attempts = 0
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.lrem(DEAD_LETTER_KEY, 1, raw)
+            pipe.hset(DELIVERIES_KEY, delivery.id, delivery.to_json())
+            pipe.zadd(SCHEDULE_KEY, {delivery.id: self.clock()})
+            pipe.execute()
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Dispatcher side
+    # ------------------------------------------------------------------
+
+    def _claim(self, limit: int) -> List[str]:
+        """Lease up to `limit` due deliveries to this dispatcher."""
+        now = self.clock()
+        with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(SCHEDULE_KEY)
+                due = pipe.zrangebyscore(SCHEDULE_KEY, "-inf", now, start=0, num=limit)
+                if not due:
+                    return []
+                pipe.multi()
+                pipe.zadd(SCHEDULE_KEY, {member: now + self.lease_seconds for member in due})
+                pipe.execute()
+            except WatchError:
+                # Another dispatcher claimed concurrently; pick up on the next drain
+                return []
+        return [member.decode() if isinstance(member, bytes) else member for member in due]
+
+    def _retry_delay(self, attempts: int) -> float:
+        base = self.backoff[min(attempts, len(self.backoff)) - 1]
+        return base * random.uniform(0.8, 1.2)
+
+    def _attempt(self, delivery: CallbackDelivery) -> DeliveryOutcome:
+        delivery.attempts += 1
+        try:
+            response = self.client.post(delivery.url, json=delivery.payload)
+            response.raise_for_status()
+            return DeliveryOutcome(delivery, "delivered", status_code=response.status_code)
+        except Exception as e:
+            delivery.last_error = str(e) or type(e).__name__
+            if delivery.attempts >= self.max_attempts:
+                return DeliveryOutcome(delivery, "dead", error=delivery.last_error)
+            return DeliveryOutcome(
+                delivery, "retrying", error=delivery.last_error, retry_in=self._retry_delay(delivery.attempts)
+            )
+
+    def _settle(self, outcomes: List[DeliveryOutcome]) -> None:
+        """Record attempt results in Redis in one transaction."""
+        now = self.clock()
+        pipe = self.redis.pipeline(transaction=True)
+        for outcome in outcomes:
+            delivery = outcome.delivery
+            if outcome.status == "retrying":
+                pipe.hset(DELIVERIES_KEY, delivery.id, delivery.to_json())
+                pipe.zadd(SCHEDULE_KEY, {delivery.id: now + outcome.retry_in})
+                continue
+            if outcome.status == "dead":
+                pipe.lpush(DEAD_LETTER_KEY, delivery.to_json())
+                pipe.ltrim(DEAD_LETTER_KEY, 0, DEAD_LETTER_MAXLEN - 1)
+            pipe.hdel(DELIVERIES_KEY, delivery.id)
+            pipe.zrem(SCHEDULE_KEY, delivery.id)
+        pipe.execute()
+
+        for outcome in outcomes:
+            self.stats[{"delivered": "delivered", "retrying": "retried", "dead": "dead"}[outcome.status]] += 1
+            if outcome.status == "dead":
+                logger.error(
+                    f"Callback {outcome.delivery.id} to {outcome.delivery.url} dead-lettered "
+                    f"after {outcome.delivery.attempts} attempts: {outcome.error}"
+                )
+
+    def drain(self, limit: int = 100) -> List[DeliveryOutcome]:
+        """Send every due delivery (up to limit) once; returns the outcomes."""
+        ids = self._claim(limit)
+        if not ids:
+            return []
+
+        records = self.redis.hmget(DELIVERIES_KEY, ids)
+        deliveries = []
+        orphans = []
+        for delivery_id, raw in zip(ids, records):
+            if raw is None:
+                orphans.append(delivery_id)
+            else:
+                deliveries.append(CallbackDelivery.from_json(raw))
+        if orphans:
+            self.redis.zrem(SCHEDULE_KEY, *orphans)
+
+        outcomes = list(self._pool.map(self._attempt, deliveries))
+        self._settle(outcomes)
+        if self.on_outcome and outcomes:
+            try:
+                self.on_outcome(outcomes)
+            except Exception as e:
+                logger.warning(f"Callback outcome hook failed: {e}")
+        return outcomes
+
+    def run(self, poll_interval: float = 0.5, batch_size: int = 100) -> None:
+        """Deliver until stop() is called."""
+        while not self._stop.is_set():
+            try:
+                outcomes = self.drain(batch_size)
+            except Exception as e:
+                logger.error(f"Callback dispatcher error: {e}")
+                outcomes = []
+            if len(outcomes) < batch_size:
+                self._stop.wait(poll_interval)
+
+    def start(self, poll_interval: float = 0.5) -> "CallbackDispatcher":
+        """Run the dispatch loop in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            if self._pool_closed:
+                self._pool = self._new_pool()
+                self._pool_closed = False
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run, kwargs={"poll_interval": poll_interval}, name="callback-dispatcher", daemon=True
+            )
+            self._thread.start()
+            logger.info("📮 Callback dispatcher started")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._pool.shutdown(wait=False)
+        self._pool_closed = True
+
+
+def task_log_writer(session_factory) -> Callable[[List[DeliveryOutcome]], None]:
+    """
+    on_outcome hook writing one TaskLog per attempt, in a single commit per drain.
+    """
+    from app import models
+
+    def write(outcomes: List[DeliveryOutcome]) -> None:
+        db = session_factory()
+        try:
+            for outcome in outcomes:
+                delivery = outcome.delivery
+                if delivery.task_id is None or delivery.tenant_id is None:
+                    continue
+                db.add(models.TaskLog(
+                    task_id=uuid.UUID(delivery.task_id),
+                    tenant_id=uuid.UUID(delivery.tenant_id),
+                    timestamp=datetime.now(timezone.utc),
+                    message=outcome.message,
+                ))
+            db.commit()
+        finally:
+            db.close()
+
+    return write
+
+
+_dispatcher: Optional[CallbackDispatcher] = None
+
+
+def get_callback_dispatcher(redis_client=None) -> CallbackDispatcher:
+    """
+    Process-wide dispatcher. The first call fixes the Redis connection; its
+    attempt outcomes are written as TaskLogs.
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        if redis_client is None:
+            raise RuntimeError("get_callback_dispatcher() needs a Redis connection on first use")
+        from app.database import SessionLocal
+        _dispatcher = CallbackDispatcher(redis_client, on_outcome=task_log_writer(SessionLocal))
+    return _dispatcher
+
+
+if __name__ == "__main__":
+    from app.worker import get_redis_connection
+
+    logging.basicConfig(level=logging.INFO)
+    dispatcher = get_callback_dispatcher(get_redis_connection())
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        dispatcher.stop()
+        close_http_client()
@@ -28,8 +28,12 @@ def get_user_by_email(db: Session, email: str) -> models.User | None:
     """Retrieve a user by email"""
     return db.query(models.User).filter(models.User.email == email).first()
 
-def create_task(db: Session, task: schemas.TaskCreate, tenant_id: UUID) -> models.Task:
-    """Create a new task in the database for a specific tenant"""
+def create_task(db: Session, task: schemas.TaskCreate, tenant_id: UUID, commit: bool = True) -> models.Task:
+    """
+    Create a new task in the database for a specific tenant.
+    With commit=False the row is only flushed (so its id is known) and is
+    committed together with the caller's transaction.
+    """
     db_task = models.Task(
         tenant_id=tenant_id,
         payload=task.payload,
@@ -38,6 +42,9 @@ def create_task(db: Session, task: schemas.TaskCreate, tenant_id: UUID) -> model
         on_success_next_task=task.on_success_next_task
     )
     db.add(db_task)
+    if not commit:
+        db.flush()
+        return db_task
     db.commit()
     db.refresh(db_task)
     return db_task
@@ -0,0 +1,382 @@
+"""
+Background audit-log pipeline for the gateway.
+
+The audit middleware only appends a compact AuditRecord to a bounded
+in-process ring. A single writer task drains the ring and inserts records in
+multi-row batches, flushing when a batch fills up or the flush interval
+elapses. When the database is failing or too slow to keep up, batches are
+spilled to a JSON-lines file and replayed once writes succeed again. A batch
+the database rejects outright (constraint or data errors) is bisected so the
+good records still land; the offending ones are quarantined to a separate
+file instead of being replayed forever. Records are only dropped when the
+ring overflows and there is nowhere to spill them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class AuditRecordRejected(Exception):
+    """The database refused a batch because of its contents; retrying won't help."""
+
+
+@dataclass(slots=True)
+class AuditRecord:
+    """One API request, as stored in the api_journal table."""
+    route: str
+    method: str
+    status: int
+    latency_ms: int
+    created_at: datetime
+    tenant_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    trace_id: Optional[str] = None
+    body_sha256: Optional[str] = None
+
+    def to_row(self) -> dict:
+        row = asdict(self)
+        row["id"] = uuid.uuid4()
+        row["tenant_id"] = _as_uuid(self.tenant_id)
+        return row
+
+    def to_json(self) -> str:
+        row = asdict(self)
+        row["tenant_id"] = str(self.tenant_id) if self.tenant_id is not None else None
+        row["created_at"] = self.created_at.isoformat()
+        return json.dumps(row, separators=(",", ":"), default=str)
+
+    @classmethod
+    def from_json(cls, line: str) -> "AuditRecord":
+        row = json.loads(line)
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+        return cls(**row)
+
+
+def _as_uuid(value):
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def sqlalchemy_batch_writer(session_factory) -> Callable[[Sequence[AuditRecord]], None]:
+    """Write a batch as a single multi-row INSERT in one transaction."""
+    from sqlalchemy import insert
+    from sqlalchemy.exc import DataError, IntegrityError
+
+    from app.models import ApiJournal
+
+    statement = insert(ApiJournal.__table__)
+
+    def write(records: Sequence[AuditRecord]) -> None:
+        with session_factory() as session:
+            try:
+                session.execute(statement, [r.to_row() for r in records])
+                session.commit()
+            except (IntegrityError, DataError) as e:
+                session.rollback()
+                raise AuditRecordRejected(str(e.orig or e)) from e
+
+    return write
+
+
+class AuditLogWriter:
+    """
+    Bounded ring + batching writer task.
+
+    ``submit`` never blocks the request path. If the ring is full the oldest
+    record is dropped and counted in ``stats["dropped"]``.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[Sequence[AuditRecord]], None],
+        capacity: int = 10_000,
+        batch_size: int = 500,
+        flush_interval_s: float = 1.0,
+        spill_path: Optional[str] = None,
+        high_water: Optional[int] = None,
+    ):
+        self._write_batch = write_batch
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.spill_path = Path(spill_path) if spill_path else None
+        # Backlog above which records waiting on a slow database go to disk
+        self.high_water = high_water if high_water is not None else capacity // 2
+
+        self._ring: deque[AuditRecord] = deque()
+        self._ring_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+        self.stats = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "write_errors": 0,
+            "rejected": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+
+    def submit(self, record: AuditRecord) -> None:
+        """Enqueue a record and make sure the writer task is running."""
+        with self._ring_lock:
+            if len(self._ring) >= self.capacity:
+                self._ring.popleft()
+                self.stats["dropped"] += 1
+            self._ring.append(record)
+            self.stats["submitted"] += 1
+            backlog = len(self._ring)
+
+        self._ensure_running()
+        if backlog >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    @property
+    def backlog(self) -> int:
+        return len(self._ring)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _ensure_running(self) -> None:
+        if self._stopping:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run(), name="audit-log-writer")
+
+    async def close(self, timeout_s: float = 10.0) -> None:
+        """Stop the writer, flushing (or spilling) everything still queued."""
+        self._stopping = True
+        task = self._task
+        if task is not None and not task.done() and self._loop is asyncio.get_running_loop():
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(task, timeout_s)
+            except asyncio.TimeoutError:
+                logger.warning("Audit writer did not finish flushing within %.1fs", timeout_s)
+        else:
+            await self.flush()
+
+        remaining = self._drain(len(self._ring))
+        if remaining:
+            await asyncio.to_thread(self._spill, remaining)
+        self._task = None
+
+    async def flush(self) -> None:
+        """Write every queued record now."""
+        while self._ring:
+            await self._flush_batch(self._drain(self.batch_size))
+
+    # ------------------------------------------------------------------
+    # Writer task
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            if len(self._ring) < self.batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+            while self._ring:
+                await self._flush_batch(self._drain(self.batch_size))
+
+                if len(self._ring) > self.high_water and self.spill_path is not None:
+                    # The database is not keeping up; park the excess on disk
+                    excess = self._drain(len(self._ring) - self.high_water // 2)
+                    await asyncio.to_thread(self._spill, excess)
+
+                if not self._stopping and len(self._ring) < self.batch_size:
+                    break
+
+            if self._stopping:
+                return
+
+    def _drain(self, count: int) -> list[AuditRecord]:
+        with self._ring_lock:
+            count = min(count, len(self._ring))
+            return [self._ring.popleft() for _ in range(count)]
+
+    async def _flush_batch(self, batch: list[AuditRecord]) -> None:
+        if not batch:
+            return
+        unwritten, error = await asyncio.to_thread(self._write_isolating, batch)
+        if error is not None:
+            self.stats["write_errors"] += 1
+            logger.warning(f"⚠️ Audit log batch write failed ({len(unwritten)} records): {error}")
+            await asyncio.to_thread(self._spill, unwritten)
+            return
+
+        if self.spill_path is not None and self.spill_path.exists():
+            await asyncio.to_thread(self._replay_spill)
+
+    def _write_isolating(
+        self, batch: list[AuditRecord], replay: bool = False
+    ) -> tuple[list[AuditRecord], Optional[Exception]]:
+        """
+        Write ``batch``, bisecting around records the database rejects.
+
+        Rejected records are quarantined. On any other error the write stops
+        and the records not yet written are returned with the error.
+        """
+        pending = [batch]
+        while pending:
+            chunk = pending.pop()
+            try:
+                self._write_batch(chunk)
+            except AuditRecordRejected as e:
+                if len(chunk) == 1:
+                    self._quarantine(chunk[0], e)
+                else:
+                    mid = len(chunk) // 2
+                    pending.extend((chunk[mid:], chunk[:mid]))
+                continue
+            except Exception as e:
+                return chunk + [r for c in reversed(pending) for r in c], e
+
+            self.stats["written"] += len(chunk)
+            self.stats["batches"] += 1
+            if replay:
+                self.stats["replayed"] += len(chunk)
+        return [], None
+
+    # ------------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------------
+
+    def _spill(self, records: list[AuditRecord]) -> None:
+        if self.spill_path is None:
+            self.stats["dropped"] += len(records)
+        else:
+            self.stats["spilled"] += self._append_spill(records)
+
+    def _append_spill(self, records: list[AuditRecord]) -> int:
+        """Append records to the spill file; returns how many were persisted."""
+        return self._append_lines(self.spill_path, records, "spill")
+
+    def _append_lines(self, path: Path, records: list[AuditRecord], kind: str) -> int:
+        lines = []
+        for record in records:
+            try:
+                lines.append(record.to_json() + "\n")
+            except (TypeError, ValueError) as e:
+                self.stats["dropped"] += 1
+                logger.error(f"❌ Audit record not serializable, dropped: {record!r}: {e}")
+        if not lines:
+            return 0
+
+        try:
+            with self._spill_lock:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+            return len(lines)
+        except OSError as e:
+            self.stats["dropped"] += len(lines)
+            logger.error(f"❌ Audit {kind} to {path} failed, {len(lines)} records lost: {e}")
+            return 0
+
+    @property
+    def quarantine_path(self) -> Optional[Path]:
+        if self.spill_path is None:
+            return None
+        return self.spill_path.with_suffix(self.spill_path.suffix + ".rejected")
+
+    def _quarantine(self, record: AuditRecord, error: Exception) -> None:
+        """Park a record the database will never accept where replay can't see it."""
+        self.stats["rejected"] += 1
+        logger.error(f"❌ Audit record rejected by the database: {record!r}: {error}")
+        if self.quarantine_path is not None:
+            self._append_lines(self.quarantine_path, [record], "quarantine")
+
+    def _replay_spill(self) -> None:
+        """Re-insert spilled records; transient failures go back on disk."""
+        with self._spill_lock:
+            replay_path = self.spill_path.with_suffix(self.spill_path.suffix + ".replay")
+            try:
+                os.replace(self.spill_path, replay_path)
+            except FileNotFoundError:
+                return
+
+        records = []
+        with open(replay_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(AuditRecord.from_json(line))
+                except (TypeError, ValueError) as e:
+                    self.stats["dropped"] += 1
+                    logger.error(f"❌ Unreadable audit spill line dropped: {line.strip()!r}: {e}")
+
+        for start in range(0, len(records), self.batch_size):
+            unwritten, error = self._write_isolating(records[start:start + self.batch_size], replay=True)
+            if error is not None:
+                logger.warning(f"⚠️ Audit spill replay paused: {error}")
+                self._append_spill(unwritten + records[start + self.batch_size:])
+                break
+
+        replay_path.unlink(missing_ok=True)
+
+
+_audit_writer: Optional[AuditLogWriter] = None
+
+
+def get_audit_writer() -> Optional[AuditLogWriter]:
+    """Get the process-wide audit writer (None when no database is configured)."""
+    global _audit_writer
+    if _audit_writer is None:
+        from app.gateway.middleware.audit import DB_AVAILABLE, SessionLocal
+
+        if not DB_AVAILABLE:
+            return None
+        _audit_writer = AuditLogWriter(
+            sqlalchemy_batch_writer(SessionLocal),
+            capacity=int(os.getenv("AUDIT_LOG_CAPACITY", "10000")),
+            batch_size=int(os.getenv("AUDIT_LOG_BATCH_SIZE", "500")),
+            flush_interval_s=float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL_S", "1.0")),
+            spill_path=os.getenv("AUDIT_LOG_SPILL_PATH") or None,
+        )
+    return _audit_writer
+
+
+async def shutdown_audit_writer() -> None:
+    """Flush queued audit records; call from the application lifespan."""
+    global _audit_writer
+    if _audit_writer is not None:
+        await _audit_writer.close()
+        logger.info(f"✅ Audit writer stopped: {_audit_writer.stats}")
+        _audit_writer = None
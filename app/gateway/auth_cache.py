@@ -0,0 +1,153 @@
+"""
+Hot-path helpers for tenant_auth_middleware.
+
+- RoutePrefixTrie: public/static route prefixes compiled once, matched in a
+  single walk over the request path
+- VerifiedTokenCache: bounded LRU of already-verified JWTs keyed by token
+  digest, so repeat requests skip HMAC verification. Entries honour the
+  token's ``exp`` and are invalidated wholesale by bumping the revocation
+  epoch; individually revoked tokens are refused until they expire.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+import jwt
+
+
+class RoutePrefixTrie:
+    """Character trie answering "does any registered prefix start this path?"."""
+
+    _END = ""  # Never a path character, so safe as the terminal marker
+
+    def __init__(self, prefixes: Iterable[str] = ()):
+        self._root: dict = {}
+        self._matches_everything = False
+        for prefix in prefixes:
+            self.add(prefix)
+
+    def add(self, prefix: str) -> None:
+        if not prefix:
+            self._matches_everything = True
+            return
+        node = self._root
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node[self._END] = True
+
+    def matches(self, path: str) -> bool:
+        """True if ``path`` starts with any registered prefix."""
+        if self._matches_everything:
+            return True
+        node = self._root
+        for ch in path:
+            node = node.get(ch)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+
+class VerifiedTokenCache:
+    """
+    LRU cache of verified JWT payloads.
+
+    Only tokens that passed a full ``decode`` are cached. Signature, ``nbf``
+    and ``iat`` checks cannot start failing later, so a hit only has to
+    re-check ``exp``, the revocation epoch and the revoked-token set.
+    """
+
+    def __init__(self, max_entries: int = 10_000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # digest -> (payload, exp, epoch)
+        self._entries: "OrderedDict[bytes, tuple[dict, float, int]]" = OrderedDict()
+        # digest -> exp; refused until the token would have expired anyway
+        self._revoked: dict[bytes, float] = {}
+        self.epoch = 0
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "revoked": 0}
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def verify(self, token: str, decode: Callable[[str], dict]) -> dict:
+        """
+        Return the token's claims, verifying with ``decode`` on a cache miss.
+
+        Raises the same ``jwt`` exceptions ``decode`` would, plus
+        ``jwt.InvalidTokenError`` for revoked tokens.
+        """
+        key = self.digest(token)
+        now = self._clock()
+
+        with self._lock:
+            if key in self._revoked:
+                self.stats["revoked"] += 1
+                raise jwt.InvalidTokenError("Token has been revoked")
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, exp, epoch = entry
+                if epoch != self.epoch:
+                    del self._entries[key]
+                elif now >= exp:
+                    del self._entries[key]
+                    self.stats["expired"] += 1
+                    raise jwt.ExpiredSignatureError("Signature has expired")
+                else:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return payload
+            self.stats["misses"] += 1
+            epoch = self.epoch
+
+        payload = decode(token)
+        exp = _expiry(payload)
+
+        with self._lock:
+            # A revocation that raced with decode wins
+            if epoch == self.epoch and key not in self._revoked:
+                self._entries[key] = (payload, exp, epoch)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def bump_epoch(self) -> int:
+        """Invalidate every cached verification (e.g. after key rotation)."""
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            return self.epoch
+
+    def revoke(self, token: str) -> None:
+        """Refuse ``token`` from now on, cached or not."""
+        key = self.digest(token)
+        try:
+            exp = _expiry(jwt.decode(token, options={"verify_signature": False}))
+        except jwt.InvalidTokenError:
+            exp = math.inf
+        now = self._clock()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked[key] = exp
+            # Expired tokens are rejected by decode anyway; forget them
+            for digest in [d for d, e in self._revoked.items() if e <= now]:
+                del self._revoked[digest]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _expiry(payload: dict) -> float:
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+        return float(exp)
+    return math.inf
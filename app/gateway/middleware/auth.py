@@ -3,10 +3,78 @@ import jwt
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from typing import Callable
+from app.gateway.auth_cache import RoutePrefixTrie, VerifiedTokenCache
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", os.getenv("SECRET_KEY", ""))
 JWT_ALGORITHM = "HS256"
 
+# Bypass auth for public endpoints (prefix match on the normalized path)
+PUBLIC_PATHS = [
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/health",
+    "/token",                    # OAuth2 login endpoint - CRITICAL
+    "/users/register",           # Legacy registration endpoint
+    "/api/v1/auth/login",        # JSON-based login endpoint
+    "/api/v1/auth/register",     # JSON-based registration endpoint
+    "/api/health",               # Platform health (generic path)
+    "/api/v1/health",            # Platform health endpoint (dev)
+    "/api/v1/dcl/views/opportunities",  # DCL views (dev)
+    "/api/v1/dcl/views/accounts",       # DCL views (dev)
+    "/api/v1/intents/revops/execute",   # Intent endpoints (dev)
+    "/api/v1/intents/finops/execute",   # Intent endpoints (dev)
+    "/dcl/state",                # DCL state endpoint (for frontend graph)
+    "/dcl/connect",              # DCL connect endpoint (for frontend graph)
+    "/dcl/ws",                   # DCL WebSocket (for real-time updates)
+    "/dcl/toggle_dev_mode",      # DCL dev mode toggle (for frontend demo controls)
+    "/dcl/ontology_schema",      # DCL ontology schema (for Ontology tab)
+    "/dcl/feature_flags",        # DCL feature flags (for source mode toggle)
+    "/dcl/feature_flags/toggle", # DCL feature flag toggle (for source mode switching)
+    "/api/v1/aam/metrics",       # AAM metrics endpoint (for Monitor dashboard)
+    "/api/v1/aam/intelligence/",  # AAM intelligence endpoints (for Monitor dashboard)
+    "/api/v1/aam/health",        # AAM health endpoint
+    "/api/v1/aam/connectors",    # AAM connectors endpoint (for Connections tab)
+    "/api/v1/debug/",            # Debug endpoints (dev-only, feature-flagged)
+    "/api/v1/mesh/test/",        # Mesh test endpoints (dev-only, for drift demos)
+    "/api/v1/events/stream",     # SSE endpoint for Live Flow (uses query-token auth)
+    "/nlp/v1/",                  # NLP Gateway endpoints (demo access)
+    "/architecture.html",        # Architecture visualization page
+    "/aam-monitor",              # AAM Monitor frontend page (demo access)
+    "/live-flow",                # Live Flow frontend page (demo access)
+    "/discover",                 # Mock AOD service endpoint (temporary for E2E testing)
+    "/api/v1/demo/",             # Demo pipeline endpoints (no auth for guided demos)
+    "/api/maestra/",             # Maestra orchestration (service-to-service from DCL)
+]
+
+# Also bypass static frontend paths
+STATIC_PREFIXES = ["/assets/", "/static/", "/favicon", "/robot"]
+
+# Compiled once at import; matching is a single walk over the request path
+_PUBLIC_ROUTES = RoutePrefixTrie(path.rstrip('/') for path in PUBLIC_PATHS + STATIC_PREFIXES)
+
+# Verified tokens, so repeat requests skip HMAC verification
+_token_cache = VerifiedTokenCache(max_entries=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000")))
+
+
+def _decode_token(token: str) -> dict:
+    return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+
+
+def verify_token(token: str) -> dict:
+    """Verify a JWT (cached) and return its claims; raises jwt errors."""
+    return _token_cache.verify(token, _decode_token)
+
+
+def revoke_token(token: str) -> None:
+    """Reject ``token`` in this process from now on, even if still cached."""
+    _token_cache.revoke(token)
+
+
+def bump_revocation_epoch() -> int:
+    """Drop every cached verification, e.g. after rotating JWT_SECRET_KEY."""
+    return _token_cache.bump_epoch()
+
 
 async def tenant_auth_middleware(request: Request, call_next: Callable):
     """
@@ -26,48 +94,6 @@ async def tenant_auth_middleware(request: Request, call_next: Callable):
         request.state.internal_service = True
         return await call_next(request)
 
-    # Bypass auth for public endpoints
-    public_paths = [
-        "/docs",
-        "/redoc",
-        "/openapi.json",
-        "/health",
-        "/token",                    # OAuth2 login endpoint - CRITICAL
-        "/users/register",           # Legacy registration endpoint
-        "/api/v1/auth/login",        # JSON-based login endpoint
-        "/api/v1/auth/register",     # JSON-based registration endpoint
-        "/api/health",               # Platform health (generic path)
-        "/api/v1/health",            # Platform health endpoint (dev)
-        "/api/v1/dcl/views/opportunities",  # DCL views (dev)
-        "/api/v1/dcl/views/accounts",       # DCL views (dev)
-        "/api/v1/intents/revops/execute",   # Intent endpoints (dev)
-        "/api/v1/intents/finops/execute",   # Intent endpoints (dev)
-        "/dcl/state",                # DCL state endpoint (for frontend graph)
-        "/dcl/connect",              # DCL connect endpoint (for frontend graph)
-        "/dcl/ws",                   # DCL WebSocket (for real-time updates)
-        "/dcl/toggle_dev_mode",      # DCL dev mode toggle (for frontend demo controls)
-        "/dcl/ontology_schema",      # DCL ontology schema (for Ontology tab)
-        "/dcl/feature_flags",        # DCL feature flags (for source mode toggle)
-        "/dcl/feature_flags/toggle", # DCL feature flag toggle (for source mode switching)
-        "/api/v1/aam/metrics",       # AAM metrics endpoint (for Monitor dashboard)
-        "/api/v1/aam/intelligence/",  # AAM intelligence endpoints (for Monitor dashboard)
-        "/api/v1/aam/health",        # AAM health endpoint
-        "/api/v1/aam/connectors",    # AAM connectors endpoint (for Connections tab)
-        "/api/v1/debug/",            # Debug endpoints (dev-only, feature-flagged)
-        "/api/v1/mesh/test/",        # Mesh test endpoints (dev-only, for drift demos)
-        "/api/v1/events/stream",     # SSE endpoint for Live Flow (uses query-token auth)
-        "/nlp/v1/",                  # NLP Gateway endpoints (demo access)
-        "/architecture.html",        # Architecture visualization page
-        "/aam-monitor",              # AAM Monitor frontend page (demo access)
-        "/live-flow",                # Live Flow frontend page (demo access)
-        "/discover",                 # Mock AOD service endpoint (temporary for E2E testing)
-        "/api/v1/demo/",             # Demo pipeline endpoints (no auth for guided demos)
-        "/api/maestra/",             # Maestra orchestration (service-to-service from DCL)
-    ]
-    
-    # Also bypass static frontend paths
-    static_prefixes = ["/assets/", "/static/", "/favicon", "/robot"]
-    
     # Check exact match for root path
     if request.url.path == "/":
         return await call_next(request)
@@ -76,7 +102,7 @@ async def tenant_auth_middleware(request: Request, call_next: Callable):
     normalized_path = request.url.path.rstrip('/')
     
     # Check if normalized path starts with any public path or static prefix
-    if any(normalized_path.startswith(path.rstrip('/')) for path in public_paths + static_prefixes):
+    if _PUBLIC_ROUTES.matches(normalized_path):
         return await call_next(request)
     
     # Special handling for SSE endpoint - authenticate via query token
@@ -91,7 +117,7 @@ async def tenant_auth_middleware(request: Request, call_next: Callable):
             )
         
         try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+            payload = verify_token(token)
             
             request.state.tenant_id = payload.get("tenant_id")
             request.state.agent_id = payload.get("agent_id")
@@ -130,7 +156,7 @@ async def tenant_auth_middleware(request: Request, call_next: Callable):
     token = auth_header.replace("Bearer ", "")
     
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = verify_token(token)
         
         request.state.tenant_id = payload.get("tenant_id")
         request.state.agent_id = payload.get("agent_id")
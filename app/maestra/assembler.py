@@ -13,13 +13,16 @@ This module does NOT call the NLQ query engine. It queries Postgres directly.
 import asyncio
 import logging
 import os
-import re
+import threading
+import time
 from pathlib import Path
+from typing import Callable
 
 import yaml
 
 from app.maestra.db import get_connection, get_tenant_id
 from app.maestra.formatter import format_triples_for_llm
+from app.maestra.keyword_matcher import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +50,11 @@ _CONSTITUTION_FILES = [
 # Override with MAESTRA_TRIPLE_MAX_ROWS env var.
 _DEFAULT_MAX_ROWS = 300
 
+# Seconds a triple retrieval result is reused for an identical concept set.
+# Override with MAESTRA_TRIPLE_CACHE_TTL env var (0 disables the cache).
+_DEFAULT_TRIPLE_CACHE_TTL = 60.0
+_TRIPLE_CACHE_MAX_ENTRIES = 256
+
 # Known module contexts that have (or will have) a module knowledge doc.
 _KNOWN_MODULES = {"aod", "aam", "farm", "dcl", "nlq", "convergence"}
 
@@ -127,8 +135,22 @@ def _load_domain_keywords() -> dict[str, list[str]]:
     return mapping
 
 
+def _build_domain_matcher(mapping: dict[str, list[str]]) -> KeywordAutomaton:
+    """Compile every domain keyword into one automaton labelled by domain.
+
+    Multi-word phrases match as plain substrings; single keywords match on
+    word boundaries.
+    """
+    matcher = KeywordAutomaton()
+    for domain, keywords in mapping.items():
+        for keyword in keywords or []:
+            matcher.add(keyword, domain, whole_word=" " not in keyword)
+    return matcher.build()
+
+
 # Module-level load (fails fast at import if config is bad).
 _DOMAIN_KEYWORDS = _load_domain_keywords()
+_DOMAIN_MATCHER = _build_domain_matcher(_DOMAIN_KEYWORDS)
 
 
 def extract_domains(
@@ -146,21 +168,7 @@ def extract_domains(
         keywords, False if they came from module_context fallback defaults.
         Empty list + False if no domain is identifiable.
     """
-    message_lower = message.lower()
-    matched: set[str] = set()
-
-    for domain, keywords in _DOMAIN_KEYWORDS.items():
-        for keyword in keywords:
-            # Use word-boundary-aware search for short keywords,
-            # simple substring for multi-word phrases.
-            if " " in keyword:
-                if keyword in message_lower:
-                    matched.add(domain)
-                    break
-            else:
-                if re.search(rf"\b{re.escape(keyword)}\b", message_lower):
-                    matched.add(domain)
-                    break
+    matched: set[str] = _DOMAIN_MATCHER.labels(message.lower())
 
     if matched:
         return sorted(matched), True
@@ -185,6 +193,8 @@ def extract_domains(
 # ---------------------------------------------------------------------------
 
 _entity_cache: list[str] | None = None
+# (entity list the automaton was built from, automaton)
+_entity_matcher: tuple[list[str], KeywordAutomaton] | None = None
 
 
 def _get_known_entities() -> list[str]:
@@ -217,11 +227,24 @@ def detect_entity(message: str) -> str | None:
     not hardcoded) using case-insensitive word boundary matching.
     Returns the first match, or None.
     """
-    message_lower = message.lower()
-    for entity_id in _get_known_entities():
-        if re.search(rf"\b{re.escape(entity_id.lower())}\b", message_lower):
-            return entity_id
-    return None
+    entities = _get_known_entities()
+    matches = _get_entity_matcher(entities).labels(message.lower())
+    return entities[min(matches)] if matches else None
+
+
+def _get_entity_matcher(entities: list[str]) -> KeywordAutomaton:
+    """Automaton over the known entity_ids, labelled by list position.
+
+    Labels are positions so the earliest entity wins when several match,
+    preserving first-match-in-entity-order semantics.
+    """
+    global _entity_matcher
+    if _entity_matcher is None or _entity_matcher[0] is not entities:
+        matcher = KeywordAutomaton()
+        for i, entity_id in enumerate(entities):
+            matcher.add(entity_id.lower(), i, whole_word=True)
+        _entity_matcher = (entities, matcher.build())
+    return _entity_matcher[1]
 
 
 # ---------------------------------------------------------------------------
@@ -312,6 +335,74 @@ def _get_tenant_for_triples() -> str | None:
     return _resolved_tenant
 
 
+class _TripleCache:
+    """Thread-safe TTL cache of triple retrieval results.
+
+    Keyed by the concept set (order-insensitive), entity, tenant and row
+    limit. Entries expire after ``ttl_s``; the oldest entry is evicted once
+    ``max_entries`` is reached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _TRIPLE_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[float, list[dict]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> list[dict] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self.hits += 1
+                return list(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, rows: list[dict], ttl_s: float) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order: the first key is the oldest.
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (self._clock() + ttl_s, list(rows))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_triple_cache = _TripleCache()
+
+
+def _get_triple_cache_ttl() -> float:
+    """Get the triple cache TTL in seconds from env or default."""
+    raw = os.environ.get("MAESTRA_TRIPLE_CACHE_TTL")
+    if raw:
+        try:
+            return float(raw)
+        except ValueError:
+            logger.warning(
+                "MAESTRA_TRIPLE_CACHE_TTL=%s is not a valid number — "
+                "using default %s",
+                raw,
+                _DEFAULT_TRIPLE_CACHE_TTL,
+            )
+    return _DEFAULT_TRIPLE_CACHE_TTL
+
+
+def clear_triple_cache() -> None:
+    """Drop cached triple retrievals (e.g. after a triple store reload)."""
+    _triple_cache.clear()
+
+
 def retrieve_triples(
     domains: list[str],
     entity_id: str | None,
@@ -328,6 +419,9 @@ def retrieve_triples(
     Returns:
         List of triple dicts with keys: entity_id, concept, property,
         value, period, source_system.
+
+    Results are cached for MAESTRA_TRIPLE_CACHE_TTL seconds per concept set,
+    so follow-up turns on the same topic skip the query.
     """
     if not domains:
         return []
@@ -335,6 +429,18 @@ def retrieve_triples(
     max_rows = _get_max_rows()
     tenant_id = _get_tenant_for_triples()
 
+    ttl_s = _get_triple_cache_ttl()
+    cache_key = (frozenset(domains), entity_id, tenant_id, max_rows)
+    if ttl_s > 0:
+        cached = _triple_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(
+                "Maestra triple retrieval cache hit — domains=%s, entity=%s",
+                domains,
+                entity_id,
+            )
+            return cached
+
     # Build WHERE clause with parameterized LIKE conditions.
     conditions = ["is_active = true"]
     params: dict = {"max_rows": max_rows}
@@ -387,10 +493,14 @@ def retrieve_triples(
                 domains,
                 entity_id,
             )
-            return [dict(row) for row in rows]
+            triples = [dict(row) for row in rows]
     finally:
         conn.close()
 
+    if ttl_s > 0:
+        _triple_cache.put(cache_key, triples, ttl_s)
+    return triples
+
 
 # ---------------------------------------------------------------------------
 # Zero-result safeguard
@@ -2,22 +2,222 @@
 Database connection for Maestra.
 Connects to the same Supabase PG as DCL.
 Uses psycopg2 (sync) to match DCL's pattern.
+
+Connections come from a shared, bounded, thread-safe pool. Callers keep the
+existing ``conn = get_connection(); try: ... finally: conn.close()`` shape —
+``close()`` on a pooled connection rolls back any open transaction and hands
+the connection back to the pool instead of tearing down the socket.
+
+Pool sizing:
+    MAESTRA_DB_POOL_SIZE     max open connections (default 10)
+    MAESTRA_DB_POOL_TIMEOUT  seconds to wait for a free connection (default 30)
 """
 
+import logging
 import os
+import threading
+from typing import Callable, Optional
+
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+logger = logging.getLogger(__name__)
 
-def get_connection():
-    """Get a PG connection using SUPABASE_DB_URL."""
+_DEFAULT_POOL_SIZE = 10
+_DEFAULT_POOL_TIMEOUT_S = 30.0
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no pooled connection frees up within the timeout."""
+
+
+class PooledConnection:
+    """
+    Proxy around a psycopg2 connection checked out of a ConnectionPool.
+
+    Behaves like the raw connection (cursors, ``with conn:`` transactions,
+    commit/rollback); ``close()`` returns it to the pool.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(raw, name)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    @property
+    def closed(self) -> int:
+        return 1 if self._raw is None else self._raw.closed
+
+    def close(self) -> None:
+        """Return the connection to the pool (idempotent)."""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of psycopg2 connections.
+
+    At most ``max_size`` connections are open at once; callers beyond that
+    block for up to ``timeout_s`` instead of failing immediately. Idle
+    connections are reused LIFO so a warm socket is preferred.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        max_size: int = _DEFAULT_POOL_SIZE,
+        timeout_s: float = _DEFAULT_POOL_TIMEOUT_S,
+        connect: Optional[Callable[[], object]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.dsn = dsn
+        self.max_size = max_size
+        self.timeout_s = timeout_s
+        self._connect = connect or (lambda: psycopg2.connect(dsn, cursor_factory=RealDictCursor))
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle: list = []
+        self._closed = False
+
+        self.stats = {"connects": 0, "reuses": 0, "discarded": 0, "waits_timed_out": 0}
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection, opening one if no idle connection is usable."""
+        if self._closed:
+            raise RuntimeError("connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout_s):
+            self.stats["waits_timed_out"] += 1
+            raise PoolExhaustedError(
+                f"No Maestra DB connection available within {self.timeout_s}s "
+                f"(pool size {self.max_size})"
+            )
+
+        try:
+            while True:
+                with self._lock:
+                    raw = self._idle.pop() if self._idle else None
+                if raw is None:
+                    raw = self._connect()
+                    self.stats["connects"] += 1
+                    break
+                if not raw.closed:
+                    self.stats["reuses"] += 1
+                    break
+                self.stats["discarded"] += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        return PooledConnection(self, raw)
+
+    def release(self, raw) -> None:
+        """Return a raw connection to the pool, discarding it if unusable."""
+        try:
+            keep = not self._closed and not raw.closed
+            if keep:
+                try:
+                    # No-op (no round trip) when the connection is idle.
+                    raw.rollback()
+                except psycopg2.Error:
+                    keep = False
+
+            if keep:
+                with self._lock:
+                    self._idle.append(raw)
+            else:
+                self.stats["discarded"] += 1
+                _close_quietly(raw)
+        finally:
+            self._slots.release()
+
+    @property
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def close(self) -> None:
+        """Close idle connections; in-use ones are closed when released."""
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for raw in idle:
+            _close_quietly(raw)
+
+
+def _close_quietly(raw) -> None:
+    try:
+        raw.close()
+    except Exception:
+        logger.debug("Error closing discarded Maestra DB connection", exc_info=True)
+
+
+def _env_number(name: str, default, cast):
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logger.warning("%s=%s is not a valid number — using default %s", name, raw, default)
+        return default
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Get the shared connection pool, creating it on first use."""
+    global _pool
     url = os.environ.get("SUPABASE_DB_URL")
     if not url:
         raise RuntimeError(
             "SUPABASE_DB_URL not set. Maestra requires Supabase PG — "
             "set SUPABASE_DB_URL to the same connection string DCL uses."
         )
-    return psycopg2.connect(url, cursor_factory=RealDictCursor)
+
+    with _pool_lock:
+        if _pool is None or _pool.dsn != url:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(
+                url,
+                max_size=_env_number("MAESTRA_DB_POOL_SIZE", _DEFAULT_POOL_SIZE, int),
+                timeout_s=_env_number("MAESTRA_DB_POOL_TIMEOUT", _DEFAULT_POOL_TIMEOUT_S, float),
+            )
+        return _pool
+
+
+def close_pool() -> None:
+    """Close the shared connection pool (e.g. on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def get_connection():
+    """Get a pooled PG connection using SUPABASE_DB_URL.
+
+    Call ``close()`` when done to return it to the pool.
+    """
+    return get_pool().acquire()
 
 
 def get_tenant_id() -> str:
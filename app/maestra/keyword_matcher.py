@@ -0,0 +1,101 @@
+"""
+Single-pass multi-keyword matcher for Maestra context assembly.
+
+An Aho–Corasick automaton built once from a vocabulary (domain keywords,
+entity ids). Scanning a message is one pass over its characters regardless
+of vocabulary size, instead of one regex search per keyword.
+
+Whole-word patterns reproduce ``re.search(rf"\\b{re.escape(p)}\\b", text)``
+exactly: word characters are those matched by ``\\w`` (``str.isalnum()`` or
+underscore).
+"""
+
+from collections import deque
+from typing import Hashable, Iterator
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    """Aho–Corasick automaton mapping matched patterns to labels."""
+
+    def __init__(self) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        # pattern id -> (length, label, whole_word)
+        self._patterns: list[tuple[int, Hashable, bool]] = []
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str, label: Hashable, whole_word: bool = False) -> None:
+        """Register a pattern. Must be called before the first scan."""
+        if self._built:
+            raise RuntimeError("cannot add patterns after the automaton is built")
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(len(self._patterns))
+        self._patterns.append((len(pattern), label, whole_word))
+
+    def build(self) -> "KeywordAutomaton":
+        """Compute failure links (breadth-first) and merge outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, Hashable]]:
+        """Yield ``(start, end, label)`` for every (overlapping) match."""
+        if not self._built:
+            self.build()
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        n = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for pid in out[node]:
+                length, label, whole_word = patterns[pid]
+                start = end - length
+                if whole_word and not (
+                    _boundary(text, start, n) and _boundary(text, end, n)
+                ):
+                    continue
+                yield start, end, label
+
+    def labels(self, text: str) -> set:
+        """Labels of all patterns occurring in ``text``."""
+        return {label for _, _, label in self.iter_matches(text)}
+
+
+def _boundary(text: str, pos: int, n: int) -> bool:
+    """Whether ``\\b`` matches at ``pos``."""
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < n and _is_word(text[pos])
+    return before != after
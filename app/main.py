@@ -103,6 +103,18 @@ async def deferred_initialization():
         except Exception as e:
             logger.warning(f"⚠️ AAM Auto-Onboarding initialization failed: {e}. Auto-onboarding disabled.")
 
+    # Maintain AAM monitoring rollups on commit, reconciled periodically
+    if redis_conn:
+        try:
+            from aam_hybrid.core.monitoring_rollups import init_monitoring_rollups
+            from app.database import AsyncSessionLocal
+
+            rollups = init_monitoring_rollups(redis_conn)
+            background_tasks.append(asyncio.create_task(rollups.run_reconcile_loop(AsyncSessionLocal)))
+            logger.info("✅ AAM monitoring rollups initialized")
+        except Exception as e:
+            logger.warning(f"⚠️ AAM monitoring rollups initialization failed: {e}. /metrics will query tables.")
+
     # Initialize production-grade feature flags with Redis persistence
     if redis_conn:
         try:
@@ -178,6 +190,19 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             logger.debug(f"Task {task.get_name()} cancelled successfully")
     
+    try:
+        from app.api.v1.aam_monitoring import close_status_client
+        await close_status_client()
+    except Exception as e:
+        logger.debug(f"AAM status client close failed: {e}")
+
+    # Flush queued audit records
+    try:
+        from app.gateway.audit_writer import shutdown_audit_writer
+        await shutdown_audit_writer()
+    except Exception as e:
+        logger.warning(f"⚠️ Error flushing audit log: {e}")
+
     # Disconnect event bus
     if AAM_AVAILABLE:
         try:
@@ -248,11 +273,12 @@ try:
     app.middleware("http")(tracing_middleware)
     app.middleware("http")(tenant_auth_middleware)
     app.middleware("http")(rate_limit_middleware)
-    # Audit and Idempotency DISABLED: Still have blocking issues, need further debugging
+    # Idempotency DISABLED: Still has blocking issues, needs further debugging
     # app.middleware("http")(idempotency_middleware)
-    # app.middleware("http")(audit_middleware)
+    # Audit only enqueues; inserts are batched by the background AuditLogWriter
+    app.middleware("http")(audit_middleware)
 
-    logger.info("✅ Gateway middleware registered successfully (Audit & Idempotency disabled until blocking issues resolved)")
+    logger.info("✅ Gateway middleware registered successfully (Idempotency disabled until blocking issues resolved)")
 except Exception as e:
     raise RuntimeError(
         f"Gateway middleware failed to load: {e} — "
@@ -1,37 +1,112 @@
-import httpx
 import logging
-from uuid import UUID
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
 from redis import Redis
 from rq import Worker, Queue, get_current_job
-import asyncio
+from sqlalchemy import inspect
 
+from app.callbacks import close_http_client, get_callback_dispatcher, get_http_client
 from app.config import settings
 from app.database import SessionLocal
 from app import crud, models
 
 logger = logging.getLogger(__name__)
 
-def send_callback(task_data: dict, callback_url: str, db, task_id):
+def get_redis_connection() -> Redis:
+    """Redis connection for the worker, from REDIS_URL or host/port settings."""
+    import os
+    import ssl as ssl_module
+
+    # Use REDIS_URL if available (production), otherwise use host/port (development)
+    REDIS_URL = os.getenv("REDIS_URL")
+    if REDIS_URL:
+        # Respect the URL scheme - use TLS if rediss://, plain if redis://
+        if REDIS_URL.startswith("rediss://"):
+            # TLS/SSL connection with certificate validation
+            CA_CERT_PATH = os.path.join(os.path.dirname(__file__), "..", "certs", "redis_ca.pem")
+            logger.info("Worker using external Redis with TLS/SSL certificate validation")
+            return Redis.from_url(
+                REDIS_URL,
+                decode_responses=False,
+                ssl_cert_reqs=ssl_module.CERT_REQUIRED,
+                ssl_ca_certs=CA_CERT_PATH
+            )
+        # Plain connection
+        logger.warning("Worker using non-TLS Redis - ensure this is intentional for dev/local only")
+        return Redis.from_url(REDIS_URL, decode_responses=False)
+    logger.info(f"Worker using local Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+    return Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+
+
+_redis_conn: Redis | None = None
+
+
+def _worker_redis() -> Redis:
+    """The current RQ job's connection, or one shared connection outside RQ."""
+    global _redis_conn
+    job = get_current_job()
+    if job is not None:
+        return job.connection
+    if _redis_conn is None:
+        _redis_conn = get_redis_connection()
+    return _redis_conn
+
+
+class TaskLogBuffer:
     """
-    Send task completion callback to the specified URL.
-    This function handles errors gracefully - a failed callback
-    does not affect the task status.
+    Collects TaskLog rows for one task on its session without committing.
+
+    Rows are written by the next db.commit() of the phase that produced
+    them, so a task costs one commit per phase instead of one per log line.
+    Timestamps are taken client-side to keep lines ordered within a commit.
+    """
+
+    def __init__(self, db, task_id, tenant_id):
+        self.db = db
+        self.task_id = task_id
+        self.tenant_id = tenant_id
+        self._entries = []
+
+    def __call__(self, message: str) -> None:
+        entry = models.TaskLog(
+            task_id=self.task_id,
+            tenant_id=self.tenant_id,
+            timestamp=datetime.now(timezone.utc),
+            message=message,
+        )
+        self._entries.append(entry)
+        self.db.add(entry)
+        return entry
+
+    def forget(self, entry) -> None:
+        """Drop a line so restore() does not bring it back."""
+        self._entries.remove(entry)
+
+    def restore(self) -> None:
+        """Re-add lines discarded by a rollback so the failure phase still records them."""
+        for entry in self._entries:
+            if inspect(entry).transient:
+                self.db.add(entry)
+
+
+def send_callback(task_data: dict, callback_url: str, log: TaskLogBuffer, task_id, tenant_id=None, delivery_id=None) -> bool:
+    """
+    Queue a task completion callback for the callback dispatcher.
+    Delivery (with retries and dead-lettering) happens outside the task,
+    so a slow or failing callback endpoint does not hold up the worker
+    and does not affect the task status.
     """
     try:
-        crud.create_task_log(db, task_id, f"Attempting to send callback to {callback_url}")
-        response = httpx.post(
-            callback_url,
-            json=task_data,
-            timeout=10.0
+        get_callback_dispatcher(_worker_redis()).enqueue(
+            callback_url, task_data, task_id=task_id, tenant_id=tenant_id, delivery_id=delivery_id
         )
-        response.raise_for_status()
-        crud.create_task_log(db, task_id, f"Successfully sent callback with status {response.status_code}")
-        logger.info(f"Successfully sent callback to {callback_url} with status {response.status_code}")
+        return True
     except Exception as e:
-        crud.create_task_log(db, task_id, f"Failed to send callback: {str(e)}")
-        logger.error(f"Failed to send callback to {callback_url}: {str(e)}")
+        log(f"Failed to queue callback {delivery_id}: {str(e)}")
+        logger.error(f"Failed to queue callback to {callback_url}: {str(e)}")
+        return False
 
-def handle_post_to_slack(db, task_id, payload):
+def handle_post_to_slack(log, payload):
     """Handler for post_to_slack action"""
     channel = payload.get("channel", "#general")
     message = payload.get("message", "")
@@ -41,16 +116,16 @@ def handle_post_to_slack(db, task_id, payload):
         "channel": channel
     }
     
-    crud.create_task_log(db, task_id, f"Attempting to post message to Slack channel {channel}")
+    log(f"Attempting to post message to Slack channel {channel}")
     
-    response = httpx.post(
+    response = get_http_client().post(
         settings.SLACK_WEBHOOK_URL,
         json=slack_payload,
         timeout=10.0
     )
     response.raise_for_status()
     
-    crud.create_task_log(db, task_id, f"Successfully posted to Slack with status {response.status_code}")
+    log(f"Successfully posted to Slack with status {response.status_code}")
     
     return {
         "message": "Successfully posted to Slack",
@@ -58,19 +133,19 @@ def handle_post_to_slack(db, task_id, payload):
         "slack_response_status": response.status_code
     }
 
-def handle_aoa_connect(db, task_id, payload):
+def handle_aoa_connect(log, payload):
     """Handler for aoa_connect action - DCL v2 external service stub"""
     tenant_id = payload.get("tenant_id")
     sources = payload.get("sources", "")
     agents = payload.get("agents", "")
     
-    crud.create_task_log(db, task_id, f"AOA connect for tenant {tenant_id} with sources={sources}, agents={agents}")
+    log(f"AOA connect for tenant {tenant_id} with sources={sources}, agents={agents}")
     logger.info(f"AOA connect for tenant {tenant_id} - DCL v2 external service")
     
     source_list = [s.strip() for s in sources.split(",") if s.strip()]
     agent_list = [a.strip() for a in agents.split(",") if a.strip()]
     
-    crud.create_task_log(db, task_id, f"AOA connect acknowledged - DCL v2 external service")
+    log(f"AOA connect acknowledged - DCL v2 external service")
     
     return {
         "message": "AOA connect acknowledged - DCL v2 external service",
@@ -81,14 +156,14 @@ def handle_aoa_connect(db, task_id, payload):
         "note": "DCL v1 removed. Use DCL v2 external service for data orchestration."
     }
 
-def handle_aoa_reset(db, task_id, payload):
+def handle_aoa_reset(log, payload):
     """Handler for aoa_reset action - DCL v2 external service stub"""
     tenant_id = payload.get("tenant_id")
     
-    crud.create_task_log(db, task_id, f"AOA reset for tenant {tenant_id}")
+    log(f"AOA reset for tenant {tenant_id}")
     logger.info(f"AOA reset for tenant {tenant_id} - DCL v2 external service")
     
-    crud.create_task_log(db, task_id, f"AOA reset acknowledged - DCL v2 external service")
+    log(f"AOA reset acknowledged - DCL v2 external service")
     
     return {
         "message": "AOA reset acknowledged - DCL v2 external service",
@@ -97,16 +172,16 @@ def handle_aoa_reset(db, task_id, payload):
         "note": "DCL v1 removed. Use DCL v2 external service for data orchestration."
     }
 
-def handle_aoa_toggle_dev_mode(db, task_id, payload):
+def handle_aoa_toggle_dev_mode(log, payload):
     """Handler for aoa_toggle_dev_mode action - DCL v2 external service stub"""
     tenant_id = payload.get("tenant_id")
     enabled = payload.get("enabled", False)
     
-    crud.create_task_log(db, task_id, f"AOA toggle dev mode for tenant {tenant_id}, enabled={enabled}")
+    log(f"AOA toggle dev mode for tenant {tenant_id}, enabled={enabled}")
     logger.info(f"AOA toggle dev mode for tenant {tenant_id} - DCL v2 external service")
     
     status = "enabled" if enabled else "disabled"
-    crud.create_task_log(db, task_id, f"AOA toggle dev mode acknowledged - DCL v2 external service")
+    log(f"AOA toggle dev mode acknowledged - DCL v2 external service")
     
     return {
         "message": "AOA toggle dev mode acknowledged - DCL v2 external service",
@@ -116,144 +191,180 @@ def handle_aoa_toggle_dev_mode(db, task_id, payload):
         "note": "DCL v1 removed. Use DCL v2 external service for data orchestration."
     }
 
+ACTION_HANDLERS = {
+    "post_to_slack": handle_post_to_slack,
+    "aoa_connect": handle_aoa_connect,
+    "aoa_reset": handle_aoa_reset,
+    "aoa_toggle_dev_mode": handle_aoa_toggle_dev_mode,
+}
+
+def _enqueue_chained_task(next_task_id, next_task_data):
+    from rq import Retry
+
+    retry_config = None
+    if next_task_data.max_retries and next_task_data.max_retries > 0:
+        retry_config = Retry(max=next_task_data.max_retries, interval=[10, 30, 60])
+
+    Queue(connection=_worker_redis()).enqueue(
+        execute_task,
+        str(next_task_id),
+        job_timeout=next_task_data.timeout_seconds,
+        retry=retry_config
+    )
+
 def execute_task(task_id_str: str):
     """
     Worker function to process a task.
     This is the core background processing logic.
+
+    Status changes and log lines are committed once per phase: start,
+    success (including a chained task), and failure/retry.
     """
     task_id = UUID(task_id_str)
     db = SessionLocal()
+    log = None
+    callback = None
     
     try:
         task = db.query(models.Task).filter(models.Task.id == task_id).first()
         if not task:
             raise ValueError(f"Task {task_id} not found")
+        log = TaskLogBuffer(db, task_id, task.tenant_id)
         
         task.status = "in_progress"
+        log("Task execution started")
         db.commit()
-        crud.create_task_log(db, task_id, "Task execution started")
         
         payload = task.payload
         action = payload.get("action")
         
-        result = None
-        
-        if action == "post_to_slack":
-            result = handle_post_to_slack(db, task_id, payload)
-        elif action == "aoa_connect":
-            result = handle_aoa_connect(db, task_id, payload)
-        elif action == "aoa_reset":
-            result = handle_aoa_reset(db, task_id, payload)
-        elif action == "aoa_toggle_dev_mode":
-            result = handle_aoa_toggle_dev_mode(db, task_id, payload)
-        else:
+        handler = ACTION_HANDLERS.get(action)
+        if handler is None:
             raise ValueError(f"Unknown action: {action}")
+        result = handler(log, payload)
         
         task.status = "success"
         task.result = result
-        db.commit()
         
-        task = db.query(models.Task).filter(models.Task.id == task_id).first()
-        if task and task.on_success_next_task:
-            crud.create_task_log(db, task_id, "Task succeeded, creating chained task")
+        next_task_data = None
+        if task.on_success_next_task:
+            log("Task succeeded, creating chained task")
             
             from app.schemas import TaskCreate
             next_task_data = TaskCreate(**task.on_success_next_task)
-            next_task = crud.create_task(db, next_task_data, task.tenant_id)
+            next_task = crud.create_task(db, next_task_data, task.tenant_id, commit=False)
             
             task.next_task_id = next_task.id
-            db.commit()
-            
-            crud.create_task_log(db, task_id, f"Created and enqueued chained task {next_task.id}")
-            
-            from rq import Queue as RQQueue, Retry
-            from redis import Redis as RedisClient
-            import os
-            
-            # Use REDIS_URL if available (production), otherwise use host/port (development)
-            REDIS_URL = os.getenv("REDIS_URL")
-            if REDIS_URL:
-                chain_redis_conn = RedisClient.from_url(REDIS_URL, decode_responses=False)
-            else:
-                chain_redis_conn = RedisClient(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
-            task_queue = RQQueue(connection=chain_redis_conn)
-            
-            retry_config = None
-            if next_task_data.max_retries and next_task_data.max_retries > 0:
-                retry_config = Retry(max=next_task_data.max_retries, interval=[10, 30, 60])
-            
-            task_queue.enqueue(
-                execute_task,
-                str(next_task.id),
-                job_timeout=next_task_data.timeout_seconds,
-                retry=retry_config
-            )
+            log(f"Created and enqueued chained task {next_task.id}")
+        
+        callback = _prepare_callback(db, task, log)
+        db.commit()
+        
+        # Enqueue only after the chained task row is committed
+        if next_task_data is not None:
+            _enqueue_chained_task(task.next_task_id, next_task_data)
         
     except Exception as e:
+        db.rollback()
         error_result = {"error": str(e), "error_type": type(e).__name__}
-        crud.create_task_log(db, task_id, f"Task failed with error: {str(e)}")
         
         task = db.query(models.Task).filter(models.Task.id == task_id).first()
+        if task is None:
+            logger.error(f"Task {task_id} failed and no longer exists: {str(e)}")
+            raise
+        if log is None:
+            log = TaskLogBuffer(db, task_id, task.tenant_id)
+        if callback is not None:
+            # The success callback was never queued
+            log.forget(callback.log_entry)
+        log.restore()
+        log(f"Task failed with error: {str(e)}")
         current_job = get_current_job()
         
-        if task and current_job:
-            if task.retry_count < task.max_retries:
-                task.retry_count = task.retry_count + 1
-                db.commit()
-                crud.create_task_log(db, task_id, f"Scheduling retry {task.retry_count}/{task.max_retries}")
-                logger.warning(f"Task {task_id} failed, will retry ({task.retry_count}/{task.max_retries})")
-                db.close()
-                raise
+        if current_job and task.retry_count < task.max_retries:
+            task.retry_count = task.retry_count + 1
+            log(f"Scheduling retry {task.retry_count}/{task.max_retries}")
+            logger.warning(f"Task {task_id} failed, will retry ({task.retry_count}/{task.max_retries})")
+            callback = _prepare_callback(db, task, log)
+            db.commit()
+            if callback is not None:
+                callback.send()
+            raise
         
         task.status = "failed"
         task.result = error_result
-        db.commit()
-        crud.create_task_log(db, task_id, "Task permanently failed after all retries")
+        log("Task permanently failed after all retries")
         logger.error(f"Task {task_id} permanently failed: {str(e)}")
+        callback = _prepare_callback(db, task, log)
+        db.commit()
+        if callback is not None:
+            callback.send()
+    else:
+        if callback is not None:
+            callback.send()
     finally:
-        final_task = db.query(models.Task).filter(models.Task.id == task_id).first()
-        if final_task and final_task.callback_url:
-            task_data = {
-                "id": str(final_task.id),
-                "status": final_task.status,
-                "payload": final_task.payload,
-                "result": final_task.result,
-                "callback_url": final_task.callback_url,
-                "created_at": final_task.created_at.isoformat(),
-                "updated_at": final_task.updated_at.isoformat()
-            }
-            send_callback(task_data, final_task.callback_url, db, task_id)
-        
         db.close()
 
+class _PendingCallback:
+    """
+    A task callback built from a phase's state, queued once that phase commits.
+
+    Queuing before the commit could announce a status that is then rolled back
+    and followed by a contradictory "failed" callback. The "Queued callback"
+    log line is written with the phase itself, under a pre-assigned delivery id.
+    """
+
+    def __init__(self, db, log: TaskLogBuffer, task_data: dict, task_id, tenant_id):
+        self.db = db
+        self.log = log
+        self.task_data = task_data
+        self.task_id = task_id
+        self.tenant_id = tenant_id
+        self.delivery_id = uuid4().hex
+        self.log_entry = log(f"Queued callback {self.delivery_id} to {task_data['callback_url']}")
+
+    def send(self) -> None:
+        if send_callback(
+            self.task_data, self.task_data["callback_url"], self.log,
+            self.task_id, self.tenant_id, delivery_id=self.delivery_id,
+        ):
+            return
+        # Record the failure line; the task's own state is already committed
+        try:
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to record callback failure for task {self.task_id}: {str(e)}")
+
+def _prepare_callback(db, task, log: TaskLogBuffer):
+    """Build the task's callback (if any) with the state about to be committed."""
+    if not task.callback_url:
+        return None
+    # Flush so the payload carries this phase's status and updated_at
+    db.flush()
+    db.refresh(task)
+    task_data = {
+        "id": str(task.id),
+        "status": task.status,
+        "payload": task.payload,
+        "result": task.result,
+        "callback_url": task.callback_url,
+        "created_at": task.created_at.isoformat(),
+        "updated_at": task.updated_at.isoformat()
+    }
+    return _PendingCallback(db, log, task_data, task.id, task.tenant_id)
+
 if __name__ == "__main__":
-    import os
-    import ssl as ssl_module
-    
-    # Use REDIS_URL if available (production), otherwise use host/port (development)
-    REDIS_URL = os.getenv("REDIS_URL")
-    if REDIS_URL:
-        # Respect the URL scheme - use TLS if rediss://, plain if redis://
-        if REDIS_URL.startswith("rediss://"):
-            # TLS/SSL connection with certificate validation
-            CA_CERT_PATH = os.path.join(os.path.dirname(__file__), "..", "certs", "redis_ca.pem")
-            redis_conn = Redis.from_url(
-                REDIS_URL, 
-                decode_responses=False, 
-                ssl_cert_reqs=ssl_module.CERT_REQUIRED,
-                ssl_ca_certs=CA_CERT_PATH
-            )
-            logger.info("Worker using external Redis with TLS/SSL certificate validation")
-        else:
-            # Plain connection
-            redis_conn = Redis.from_url(REDIS_URL, decode_responses=False)
-            logger.warning("Worker using non-TLS Redis - ensure this is intentional for dev/local only")
-    else:
-        logger.info(f"Worker using local Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
-        redis_conn = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+    redis_conn = get_redis_connection()
     
     queue = Queue(connection=redis_conn)
     worker = Worker([queue], connection=redis_conn)
     
+    dispatcher = get_callback_dispatcher(redis_conn).start()
+    
     logger.info("Starting RQ worker...")
-    worker.work()
+    try:
+        worker.work()
+    finally:
+        dispatcher.stop()
+        close_http_client()
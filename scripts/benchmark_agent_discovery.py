@@ -0,0 +1,155 @@
+"""
+Agent Discovery Benchmark
+
+Compares the candidate-scan + full-sort discovery with the indexed one on a
+large registry:
+1. Registration throughput
+2. discover() by capability, tag, tenant + capability, and unfiltered
+3. find_delegatees() on the delegation hot path (cold and cached)
+
+Usage:
+    python scripts/benchmark_agent_discovery.py --agents 50000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.agentic.a2a.agent_card import AgentCapability, AgentCard
+from app.agentic.a2a.discovery import AgentDiscovery, DiscoveryFilter, HealthStatus
+
+
+def legacy_discover(discovery: AgentDiscovery, filter: DiscoveryFilter) -> list:
+    """The previous discover(): first posting list only, per-candidate scan, full sort."""
+    if filter.tenant_id:
+        candidates = discovery._by_tenant.get(filter.tenant_id, set()).copy()
+    elif filter.capability_ids:
+        candidates = set()
+        for cap_id in filter.capability_ids:
+            cap_agents = discovery._by_capability.get(cap_id, set())
+            candidates = cap_agents.copy() if not candidates else candidates & cap_agents
+    elif filter.capability_tags:
+        candidates = set()
+        for tag in filter.capability_tags:
+            tag_agents = discovery._by_tag.get(tag, set())
+            candidates = tag_agents.copy() if not candidates else candidates & tag_agents
+    else:
+        candidates = set(discovery._agents.keys())
+
+    results = []
+    for agent_id in candidates:
+        card = discovery._agents.get(agent_id)
+        if filter.capability_types and not any(
+            cap.capability_type in filter.capability_types for cap in card.capabilities
+        ):
+            continue
+        if card.trust_level < filter.min_trust_level:
+            continue
+        if filter.can_accept_delegation is not None and card.can_accept_delegation != filter.can_accept_delegation:
+            continue
+        health = discovery._health.get(agent_id)
+        if filter.exclude_unhealthy and health and health.status == HealthStatus.UNHEALTHY:
+            continue
+        results.append(card)
+    results.sort(key=lambda c: c.trust_level, reverse=True)
+    return results[filter.offset:filter.offset + filter.limit]
+
+
+def _time_calls(fn, iterations: int) -> dict:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def build(agents: int, tenants: list, capabilities: list, seed: int) -> AgentDiscovery:
+    rng = random.Random(seed)
+    tags = [f"tag-{i}" for i in range(50)]
+    discovery = AgentDiscovery()
+    for _ in range(agents):
+        discovery.register(AgentCard(
+            name="agent",
+            tenant_id=rng.choice(tenants),
+            trust_level=rng.randint(0, 100),
+            can_accept_delegation=rng.random() < 0.8,
+            capabilities=[
+                AgentCapability(id=cap, name=cap, description=cap, tags=rng.sample(tags, 2))
+                for cap in ["execute"] + rng.sample(capabilities, 3)
+            ],
+        ))
+    return discovery
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AgentDiscovery query benchmark")
+    parser.add_argument("--agents", type=int, default=50_000, help="Registered agents")
+    parser.add_argument("--tenants", type=int, default=20, help="Distinct tenants")
+    parser.add_argument("--capabilities", type=int, default=200, help="Distinct capability IDs")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per query")
+    parser.add_argument("--seed", type=int, default=36)
+    args = parser.parse_args()
+
+    tenants = [uuid4() for _ in range(args.tenants)]
+    capabilities = [f"cap-{i}" for i in range(args.capabilities)]
+
+    print("=" * 80)
+    print(f"AGENT DISCOVERY BENCHMARK ({args.agents:,} agents, {args.tenants} tenants)")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    discovery = build(args.agents, tenants, capabilities, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"\n📥 Registration: {args.agents / elapsed:,.0f} agents/s ({elapsed:.1f}s)")
+
+    rng = random.Random(args.seed)
+    for agent_id in rng.sample(list(discovery._agents), args.agents // 10):
+        asyncio.run(discovery.update_health(agent_id, HealthStatus.UNHEALTHY))
+
+    queries = [
+        ("capability", DiscoveryFilter(capability_ids=["cap-7"])),
+        ("tag", DiscoveryFilter(capability_tags=["tag-3"])),
+        ("tenant + capability", DiscoveryFilter(tenant_id=tenants[0], capability_ids=["cap-7"])),
+        ("unfiltered, trust >= 90", DiscoveryFilter(min_trust_level=90, limit=20)),
+        ("delegatees (execute)", DiscoveryFilter(capability_ids=["execute"], can_accept_delegation=True)),
+    ]
+
+    print(f"\n🔎 discover() latency, p50 / p95 ms ({args.iterations} calls)")
+    print(f"  {'':<28}{'legacy':>20}{'indexed':>20}")
+    for label, f in queries:
+        legacy = _time_calls(lambda f=f: legacy_discover(discovery, f), max(args.iterations // 10, 5))
+        indexed = _time_calls(lambda f=f: discovery.discover(f), args.iterations)
+        print(
+            f"  {label:<28}{legacy['p50_ms']:>10.2f} / {legacy['p95_ms']:<7.2f}"
+            f"{indexed['p50_ms']:>10.2f} / {indexed['p95_ms']:<7.2f}"
+        )
+
+    print("\n🤝 find_delegatees(), p50 ms")
+    delegator = next(iter(discovery._agents))
+    cold = _time_calls(
+        lambda: (discovery._delegatee_cache.clear(), discovery.find_delegatees("cap-7", excluding=delegator)),
+        args.iterations,
+    )
+    warm = _time_calls(lambda: discovery.find_delegatees("cap-7", excluding=delegator), args.iterations)
+    print(f"  cold (ranking rebuilt): {cold['p50_ms']:.3f}")
+    print(f"  cached ranking:         {warm['p50_ms']:.3f}")
+
+    f = DiscoveryFilter(capability_ids=["cap-7"], exclude_unhealthy=True)
+    same = [c.trust_level for c in legacy_discover(discovery, f)] == [c.trust_level for c in discovery.discover(f).agents]
+    print(f"\n✅ Same trust ordering as legacy for capability query: {same}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Approval Queue Benchmark
+
+Measures pending-approval reads and deadline sweeps with a large backlog.
+
+Metrics Tracked:
+1. Request creation throughput
+2. get_pending_requests latency (global, per-tenant, per-assignee)
+3. Expiry sweep cost when only a small slice is due
+4. find_applicable_override latency with many overrides per policy
+
+Usage:
+    python scripts/benchmark_approval_queues.py --pending 100000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.agentic.approval import (
+    ApprovalPriority,
+    ApprovalRoute,
+    ApprovalType,
+    ApprovalWorkflow,
+    OverrideManager,
+)
+
+
+def _time_calls(fn, iterations: int) -> dict:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def benchmark_workflow(pending: int, tenants: int, seed: int) -> None:
+    rng = random.Random(seed)
+    workflow = ApprovalWorkflow()
+    reviewers = [uuid4() for _ in range(50)]
+    for i, reviewer in enumerate(reviewers):
+        workflow.add_route(ApprovalRoute(
+            id=f"route-{i}",
+            name=f"Route {i}",
+            action_patterns=[f"action.{i}.*"],
+            assign_to_user=reviewer,
+            assign_to_group=f"group-{i % 5}",
+        ))
+    tenant_ids = [uuid4() for _ in range(tenants)]
+    priorities = list(ApprovalPriority)
+
+    print(f"📋 Creating {pending:,} pending requests")
+    start = time.perf_counter()
+    for _ in range(pending):
+        workflow.create_request(
+            agent_id=uuid4(),
+            request_type=ApprovalType.TOOL_EXECUTION,
+            title="bench",
+            description="",
+            action_type=f"action.{rng.randrange(len(reviewers))}.run",
+            action_details={},
+            tenant_id=rng.choice(tenant_ids),
+            priority=rng.choice(priorities),
+        )
+    duration = time.perf_counter() - start
+    print(f"  ⏱️  {duration:.2f}s ({pending / duration:,.0f} requests/sec)")
+
+    print("🔍 get_pending_requests(limit=50)")
+    print(f"  global:   {_time_calls(lambda: workflow.get_pending_requests(limit=50), 200)}")
+    print(f"  tenant:   {_time_calls(lambda: workflow.get_pending_requests(tenant_id=rng.choice(tenant_ids), limit=50), 200)}")
+    print(f"  assignee: {_time_calls(lambda: workflow.get_pending_requests(assignee=rng.choice(reviewers), limit=50), 200)}")
+    print(f"  group+tenant: {_time_calls(lambda: workflow.get_pending_requests(group='group-1', tenant_id=rng.choice(tenant_ids), limit=50), 200)}")
+
+    print("⌛ Expiry sweeps")
+    now = datetime.utcnow()
+    start = time.perf_counter()
+    idle = workflow.process_expirations(now)
+    print(f"  nothing due: {len(idle)} expired in {(time.perf_counter() - start) * 1000:.3f}ms")
+    start = time.perf_counter()
+    expired = workflow.process_expirations(now + timedelta(minutes=61))
+    print(f"  all due:     {len(expired):,} expired in {(time.perf_counter() - start) * 1000:.1f}ms")
+    print()
+
+
+def benchmark_overrides(overrides: int, seed: int) -> None:
+    rng = random.Random(seed)
+    manager = OverrideManager()
+    agents = [uuid4() for _ in range(1000)]
+    for _ in range(overrides):
+        manager.create_override(
+            policy_id="policy",
+            policy_name="Policy",
+            original_decision="deny",
+            override_decision="allow",
+            reason="bench",
+            justification="bench",
+            created_by=uuid4(),
+            agent_id=rng.choice(agents),
+            scope="permanent",
+            applies_to=["deploy.*", "rollback.*"],
+        )
+
+    print(f"🛡️  find_applicable_override over {overrides:,} overrides")
+    print(f"  hit:  {_time_calls(lambda: manager.find_applicable_override('policy', agent_id=rng.choice(agents), action_type='deploy.prod'), 1000)}")
+    print(f"  miss: {_time_calls(lambda: manager.find_applicable_override('policy', agent_id=uuid4(), action_type='deploy.prod'), 1000)}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Approval queue benchmark")
+    parser.add_argument("--pending", type=int, default=100_000, help="Number of pending requests")
+    parser.add_argument("--tenants", type=int, default=100, help="Number of tenants")
+    parser.add_argument("--overrides", type=int, default=50_000, help="Number of overrides for one policy")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("APPROVAL QUEUE BENCHMARK")
+    print("=" * 80)
+    benchmark_workflow(args.pending, args.tenants, args.seed)
+    benchmark_overrides(args.overrides, args.seed)
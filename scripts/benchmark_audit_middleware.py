@@ -0,0 +1,158 @@
+"""
+Audit Middleware Benchmark
+
+Measures per-request overhead of audit logging under concurrent load, with
+the database modelled as a fixed cost per transaction (--commit-ms):
+1. Baseline: pass-through middleware, no audit work
+2. Before: one executor job + one INSERT/commit per request
+3. After: enqueue into AuditLogWriter, batched multi-row inserts
+
+Usage:
+    python scripts/benchmark_audit_middleware.py --requests 5000 --concurrency 100
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.gateway.audit_writer import AuditLogWriter, AuditRecord
+
+
+class SimulatedJournal:
+    """Stands in for api_journal: each transaction costs commit_ms."""
+
+    def __init__(self, commit_ms: float):
+        self.commit_s = commit_ms / 1000
+        self.rows = 0
+        self.transactions = 0
+
+    def write_one(self, record: AuditRecord) -> None:
+        time.sleep(self.commit_s)
+        self.rows += 1
+        self.transactions += 1
+
+    def write_batch(self, records) -> None:
+        time.sleep(self.commit_s)
+        self.rows += len(records)
+        self.transactions += 1
+
+
+def _record(request: Request, status: int, latency_ms: int) -> AuditRecord:
+    return AuditRecord(
+        route=request.url.path,
+        method=request.method,
+        status=status,
+        latency_ms=latency_ms,
+        created_at=datetime.utcnow(),
+    )
+
+
+def build_app(mode: str, journal: SimulatedJournal, writer: AuditLogWriter) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    if mode == "before":
+        @app.middleware("http")
+        async def audit_per_request(request: Request, call_next):
+            start = time.time()
+            response = await call_next(request)
+            record = _record(request, response.status_code, int((time.time() - start) * 1000))
+            asyncio.get_event_loop().run_in_executor(None, journal.write_one, record)
+            return response
+
+    elif mode == "none":
+        @app.middleware("http")
+        async def passthrough(request: Request, call_next):
+            return await call_next(request)
+
+    elif mode == "after":
+        @app.middleware("http")
+        async def audit_batched(request: Request, call_next):
+            start = time.time()
+            response = await call_next(request)
+            writer.submit(_record(request, response.status_code, int((time.time() - start) * 1000)))
+            return response
+
+    return app
+
+
+async def run(mode: str, requests: int, concurrency: int, commit_ms: float) -> dict:
+    journal = SimulatedJournal(commit_ms)
+    writer = AuditLogWriter(journal.write_batch, batch_size=500, flush_interval_s=0.2)
+    app = build_app(mode, journal, writer)
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                t0 = time.perf_counter()
+                response = await client.get(f"/items/{i}")
+                latencies.append(time.perf_counter() - t0)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    # Time until every audit row is durable
+    drain_start = time.perf_counter()
+    if mode == "after":
+        await writer.close()
+    while mode == "before" and journal.rows < requests:
+        await asyncio.sleep(0.01)
+    drain = time.perf_counter() - drain_start
+
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "rps": requests / elapsed,
+        "us_per_request": elapsed / requests * 1e6,
+        "p99_ms": ms[int(len(ms) * 0.99) - 1],
+        "transactions": journal.transactions,
+        "drain_s": drain,
+        "dropped": writer.stats["dropped"],
+    }
+
+
+async def main(requests: int, concurrency: int, commit_ms: float) -> None:
+    print("=" * 80)
+    print(f"AUDIT MIDDLEWARE BENCHMARK ({requests:,} requests, concurrency {concurrency}, "
+          f"{commit_ms}ms per DB transaction)")
+    print("=" * 80)
+
+    results = {}
+    for mode, label in [("none", "No audit (passthrough)"), ("before", "Executor per request"), ("after", "Batched writer")]:
+        results[mode] = r = await run(mode, requests, concurrency, commit_ms)
+        print(
+            f"  {label:<24} {r['rps']:8,.0f} req/s  {r['us_per_request']:7.0f} µs/req   "
+            f"p99 {r['p99_ms']:7.2f} ms   {r['transactions']:6,} txns   drain {r['drain_s']:5.2f}s"
+        )
+
+    base = results["none"]["us_per_request"]
+    print()
+    print(f"  Audit overhead per request: before {results['before']['us_per_request'] - base:+.0f} µs, "
+          f"after {results['after']['us_per_request'] - base:+.0f} µs")
+    print(f"  Dropped by batched writer: {results['after']['dropped']}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit middleware benchmark")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent clients")
+    parser.add_argument("--commit-ms", type=float, default=2.0, help="Simulated cost of one DB transaction")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.commit_ms))
@@ -0,0 +1,140 @@
+"""
+Canonical Publisher Benchmark
+
+Compares stream entry codecs for canonical events:
+1. Encode / decode throughput (events/s), no Redis
+2. Bytes per event stored in stream entries
+3. publish_batch + read_canonical_stream end to end (fakeredis by default)
+
+Usage:
+    python scripts/benchmark_canonical_publisher.py --events 50000
+    python scripts/benchmark_canonical_publisher.py --redis-url redis://localhost:6379/0
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.aam.canonical.envelope import (
+    CODEC_JSON,
+    advertise_decoders,
+    decode_entry,
+    encode_entries,
+    supported_codecs,
+    unregister_consumer,
+    withdraw_decoders,
+)
+from services.aam.canonical.publisher import CanonicalEventPublisher
+from services.aam.canonical.schemas import CanonicalEvent, CanonicalMeta, CanonicalOpportunity, CanonicalSource
+from services.aam.canonical.subscriber import read_canonical_stream
+
+STAGES = ["Prospecting", "Qualification", "Proposal", "Negotiation", "Closed Won", "Closed Lost"]
+
+
+def build_events(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    return [
+        CanonicalEvent(
+            meta=CanonicalMeta(tenant="bench", trace_id=f"trace-{i:08d}"),
+            source=CanonicalSource(system="salesforce", connection_id="sf-prod"),
+            entity="opportunity",
+            data=CanonicalOpportunity(
+                opportunity_id=f"006{i:012d}",
+                account_id=f"001{rng.randrange(5000):012d}",
+                name=f"Deal {i}",
+                stage=rng.choice(STAGES),
+                amount=Decimal(rng.randrange(1_000, 2_000_000)),
+                close_date=start + timedelta(days=rng.randrange(365)),
+                owner_id=f"005{rng.randrange(200):012d}",
+                probability=rng.choice([10, 25, 50, 75, 90]),
+                extras={"region": rng.choice(["NA", "EMEA", "APAC"]), "forecast": rng.random() < 0.5},
+            ),
+        )
+        for i in range(n)
+    ]
+
+
+def entry_bytes(fields: dict) -> int:
+    return sum(len(k) + len(v if isinstance(v, bytes) else str(v).encode()) for k, v in fields.items())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Canonical stream codec benchmark")
+    parser.add_argument("--events", type=int, default=50_000, help="Events to publish")
+    parser.add_argument("--chunk", type=int, default=1_000, help="Events per publish_batch call")
+    parser.add_argument("--redis-url", default=None, help="Real Redis (default: fakeredis)")
+    parser.add_argument("--seed", type=int, default=39)
+    args = parser.parse_args()
+
+    if args.redis_url:
+        from redis import Redis
+        redis = Redis.from_url(args.redis_url)
+    else:
+        import fakeredis
+        redis = fakeredis.FakeRedis()
+
+    print("=" * 80)
+    print(f"CANONICAL PUBLISHER BENCHMARK ({args.events:,} opportunity events)")
+    print("=" * 80)
+
+    events = build_events(args.events, args.seed)
+    publisher = CanonicalEventPublisher(redis, tenant_id="bench", codec=CODEC_JSON)
+    payloads = [publisher._payload(e) for e in events]
+
+    print("\n📦 Encoding (no Redis)")
+    print(f"  {'codec':<12}{'entries':>10}{'bytes/event':>14}{'encode ev/s':>14}{'decode ev/s':>14}")
+    for codec in supported_codecs()[::-1]:
+        start = time.perf_counter()
+        entries = encode_entries(payloads, codec, batch_id=publisher.batch_id)
+        encode_s = time.perf_counter() - start
+        start = time.perf_counter()
+        decoded = sum(len(decode_entry(f)) for f in entries)
+        decode_s = time.perf_counter() - start
+        assert decoded == len(payloads)
+        size = sum(entry_bytes(f) for f in entries) / len(payloads)
+        print(
+            f"  {codec:<12}{len(entries):>10,}{size:>14.1f}"
+            f"{len(payloads) / encode_s:>14,.0f}{len(payloads) / decode_s:>14,.0f}"
+        )
+
+    print(f"\n📡 publish_batch + read_canonical_stream ({args.chunk} events per batch)")
+    print(f"  {'codec':<12}{'publish ev/s':>14}{'read ev/s':>14}{'stream entries':>16}")
+    for codec in supported_codecs()[::-1]:
+        stream = "aam:dcl:bench:salesforce"
+        redis.delete(stream)
+        if codec == CODEC_JSON:
+            withdraw_decoders(redis, "bench")
+        else:
+            advertise_decoders(redis, "bench", [codec])
+        publisher = CanonicalEventPublisher(redis, tenant_id="bench")
+        publisher.STREAM_MAXLEN = args.events + 1
+
+        start = time.perf_counter()
+        for i in range(0, len(events), args.chunk):
+            publisher.publish_batch(events[i:i + args.chunk], source_id="salesforce")
+        publish_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read, last_id = 0, "0-0"
+        while True:
+            batch, last_id = read_canonical_stream(redis, stream, last_id=last_id, count=500)
+            if not batch:
+                break
+            read += len(batch)
+        read_s = time.perf_counter() - start
+        assert publisher.codec == codec and read == len(events), (publisher.codec, read)
+        print(f"  {codec:<12}{len(events) / publish_s:>14,.0f}{len(events) / read_s:>14,.0f}{redis.xlen(stream):>16,}")
+
+    unregister_consumer(redis, "bench")
+    redis.delete("aam:dcl:bench:salesforce")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Cost Tracker Benchmark
+
+Compares the list-scanning CostTracker with the rollup-based one on the
+same stream of usage records spread over 30 days:
+1. Ingest throughput (record_usage path)
+2. check_budget / get_tenant_cost (rolling 30-day window)
+3. get_usage_summary (24h and 30-day windows, per-model breakdown)
+4. get_run_cost
+5. calculate_cost pricing lookup for partially-matched model IDs
+
+Usage:
+    python scripts/benchmark_cost_tracker.py --records 10000000 --tenants 100
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.agentic.gateway.cost import MODEL_PRICING, CostTracker, UsageRecord
+
+MODELS = ["claude-sonnet-4-20250514", "claude-3-5-haiku-20241022", "gpt-4o", "gpt-4o-mini"]
+
+
+class ListCostTracker:
+    """The previous implementation: one list, scanned on every query."""
+
+    def __init__(self, records: list, now: datetime):
+        self._usage_records = records
+        self._budget_limits = {}
+        self._now = now
+
+    def calculate_cost(self, model, input_tokens, output_tokens):
+        pricing = MODEL_PRICING.get(model)
+        if not pricing:
+            for model_id, p in MODEL_PRICING.items():
+                if model_id in model or model in model_id:
+                    pricing = p
+                    break
+        if not pricing:
+            pricing = MODEL_PRICING.get("claude-sonnet-4-20250514")
+        return (input_tokens / 1_000_000) * pricing.input_cost_per_million + \
+            (output_tokens / 1_000_000) * pricing.output_cost_per_million
+
+    def check_budget(self, tenant_id, estimated_cost):
+        remaining = self._budget_limits[tenant_id] - self.get_tenant_cost(tenant_id)
+        return estimated_cost <= max(0, remaining)
+
+    def get_tenant_cost(self, tenant_id, since=None):
+        since = since or self._now - timedelta(days=30)
+        return sum(r.cost_usd for r in self._usage_records if r.tenant_id == tenant_id and r.timestamp >= since)
+
+    def get_run_cost(self, run_id):
+        return sum(r.cost_usd for r in self._usage_records if r.run_id == run_id)
+
+    def get_usage_summary(self, tenant_id=None, since=None, until=None):
+        records = [
+            r for r in self._usage_records
+            if r.timestamp >= since and r.timestamp <= until
+            and (tenant_id is None or r.tenant_id == tenant_id)
+        ]
+        by_model = {}
+        for r in records:
+            m = by_model.setdefault(r.model, [0, 0, 0, 0.0])
+            m[0] += 1
+            m[1] += r.input_tokens
+            m[2] += r.output_tokens
+            m[3] += r.cost_usd
+        return len(records), by_model
+
+
+def generate(count: int, tenants: list, runs: list, now: datetime):
+    """Yield records in time order, sharing immutable values to keep memory flat."""
+    rng = random.Random(34)
+    span = timedelta(days=30).total_seconds()
+    start = now - timedelta(days=30)
+    tokens = list(range(0, 8000, 7))
+    costs = [round(rng.random() / 20, 6) for _ in range(997)]
+    stamps = {}
+    for i in range(count):
+        second = int(i * span / count)
+        ts = stamps.get(second)
+        if ts is None:
+            stamps.clear()
+            ts = stamps[second] = start + timedelta(seconds=second)
+        yield UsageRecord(
+            timestamp=ts,
+            model=MODELS[i % len(MODELS)],
+            input_tokens=tokens[i % len(tokens)],
+            output_tokens=tokens[(i * 3) % len(tokens)],
+            cost_usd=costs[i % len(costs)],
+            run_id=runs[i % len(runs)],
+            tenant_id=tenants[i % len(tenants)],
+        )
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CostTracker aggregation benchmark")
+    parser.add_argument("--records", type=int, default=10_000_000, help="Usage records to ingest")
+    parser.add_argument("--tenants", type=int, default=100, help="Distinct tenants")
+    parser.add_argument("--runs", type=int, default=50_000, help="Distinct runs")
+    parser.add_argument("--list-queries", type=int, default=3, help="Timed calls per list-based query")
+    parser.add_argument("--queries", type=int, default=2000, help="Timed calls per rollup query")
+    args = parser.parse_args()
+
+    now = datetime.utcnow().replace(microsecond=0)
+    tenants = [uuid4() for _ in range(args.tenants)]
+    runs = [uuid4() for _ in range(args.runs)]
+
+    print("=" * 80)
+    print(f"COST TRACKER BENCHMARK ({args.records:,} records, {args.tenants} tenants, 30 days)")
+    print("=" * 80)
+
+    tracker = CostTracker(clock=lambda: now)
+    records = []
+    t0 = time.perf_counter()
+    for record in generate(args.records, tenants, runs, now):
+        records.append(record)
+        tracker.add_record(record)
+    ingest = time.perf_counter() - t0
+    print(f"\n📥 Ingest: {args.records / ingest:,.0f} records/s into rollups ({ingest:.1f}s)")
+
+    baseline = ListCostTracker(records, now)
+    for tenant in tenants:
+        tracker.set_budget_limit(tenant, 1e9)
+        baseline._budget_limits[tenant] = 1e9
+
+    day_ago, month_ago = now - timedelta(hours=24), now - timedelta(days=30)
+    scenarios = [
+        ("check_budget (30d window)", lambda t, i: t.check_budget(tenants[i % len(tenants)], 0.01)),
+        ("get_usage_summary 24h", lambda t, i: t.get_usage_summary(tenants[i % len(tenants)], day_ago, now)),
+        ("get_usage_summary 30d, all", lambda t, i: t.get_usage_summary(None, month_ago, now)),
+        ("get_run_cost", lambda t, i: t.get_run_cost(runs[i % len(runs)])),
+        ("calculate_cost (prefix match)", lambda t, i: t.calculate_cost("gpt-4o-mini-2024-07-18", 1000, 500)),
+    ]
+
+    print("\n📊 Per-call latency (µs)")
+    print(f"  {'':<32}{'list scan':>14}{'rollups':>12}{'speedup':>12}")
+    for label, fn in scenarios:
+        repeat = args.list_queries if "calculate" not in label else args.queries
+        before = _time(lambda i, fn=fn: fn(baseline, i), repeat)
+        after = _time(lambda i, fn=fn: fn(tracker, i), args.queries)
+        print(f"  {label:<32}{before:>14,.1f}{after:>12,.1f}{before / after:>11,.0f}x")
+
+    expected = baseline.get_tenant_cost(tenants[0])
+    actual = tracker.get_tenant_cost(tenants[0])
+    print(f"\n✅ 30-day cost for one tenant: list {expected:.6f} vs rollups {actual:.6f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Bulk Mapping Job Registry Benchmark
+
+Compares the previous KEYS-plus-GET job listing with the indexed registry
+on a Redis that also holds many unrelated keys:
+1. One reconciliation pass (semaphores + stale detection) per tenant
+2. Listing a tenant's jobs
+3. Redis commands issued per pass
+
+Usage:
+    python scripts/benchmark_job_registry.py --jobs 100000 --noise-keys 200000
+    python scripts/benchmark_job_registry.py --redis-url redis://localhost:6379/0
+"""
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.mapping_intelligence.job_state import BulkMappingJobState
+from services.mapping_intelligence.reconciliation import STALE_JOB_TIMEOUT_MINUTES, JobReconciliationService
+
+
+class CommandCounter:
+    """Counts commands sent through a redis-py client (pipelined commands count individually)."""
+
+    def __init__(self, client):
+        self.count = 0
+        original = client.execute_command
+        original_pipeline = client.pipeline
+
+        def execute_command(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+
+        def pipeline(*args, **kwargs):
+            pipe = original_pipeline(*args, **kwargs)
+            original_execute = pipe.execute
+
+            def execute(*a, **kw):
+                self.count += len(pipe.command_stack)
+                return original_execute(*a, **kw)
+
+            pipe.execute = execute
+            return pipe
+
+        client.execute_command = execute_command
+        client.pipeline = pipeline
+
+
+def build_jobs(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    jobs = []
+    for i in range(args.jobs):
+        tenant_id = f"tenant-{i % args.tenants}"
+        status = rng.choices(["completed", "failed", "running", "pending"], weights=[80, 10, 7, 3])[0]
+        started = now - timedelta(minutes=rng.randrange(0, 20 * 60))
+        jobs.append((tenant_id, f"job-{i:07d}", {
+            "job_id": f"job-{i:07d}",
+            "tenant_id": tenant_id,
+            "status": status,
+            "created_at": started.isoformat(),
+            "started_at": started.isoformat() if status != "pending" else None,
+            "processed_fields": rng.randrange(500),
+            "total_fields": 500,
+        }))
+    return jobs
+
+
+def legacy_reconcile(redis, tenant_id):
+    """The previous reconcile_semaphores + detect_stale_jobs: KEYS then one GET per key, twice."""
+    cutoff = datetime.utcnow() - timedelta(minutes=STALE_JOB_TIMEOUT_MINUTES)
+    for _ in range(2):
+        jobs = [json.loads(redis.get(key)) for key in redis.keys(f"job:state:tenant:{tenant_id}:job:*")]
+    active = [j for j in jobs if j["status"] in ("running", "pending")]
+    stale = [j for j in jobs if j["status"] == "running" and datetime.fromisoformat(j["started_at"]) < cutoff]
+    return len(active), len(stale)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Job registry benchmark")
+    parser.add_argument("--jobs", type=int, default=100_000, help="Jobs across all tenants")
+    parser.add_argument("--tenants", type=int, default=20, help="Tenants")
+    parser.add_argument("--noise-keys", type=int, default=200_000, help="Unrelated keys in the same Redis")
+    parser.add_argument("--redis-url", default=None, help="Real Redis (default: fakeredis)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    if args.redis_url:
+        from redis import Redis
+        redis = Redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        import fakeredis
+        redis = fakeredis.FakeRedis(decode_responses=True)
+
+    print("=" * 80)
+    print(f"JOB REGISTRY BENCHMARK ({args.jobs:,} jobs, {args.tenants} tenants, {args.noise_keys:,} other keys)")
+    print("=" * 80)
+
+    jobs = build_jobs(args)
+    start = time.perf_counter()
+    pipe = redis.pipeline(transaction=False)
+    for i in range(args.noise_keys):
+        pipe.set(f"cache:item:{i}", "x")
+        if i % 10_000 == 9_999:
+            pipe.execute()
+    for tenant_id, job_id, state in jobs:
+        pipe.setex(f"job:state:tenant:{tenant_id}:job:{job_id}", 86400, json.dumps(state))
+    pipe.execute()
+    print(f"\n📦 Loaded legacy keys in {time.perf_counter() - start:.1f}s")
+
+    job_state = BulkMappingJobState(redis)
+    start = time.perf_counter()
+    for tenant_id, job_id, state in jobs:
+        job_state.save_job_state(tenant_id, job_id, dict(state))
+    write_s = time.perf_counter() - start
+    print(f"📦 Indexed registry writes: {len(jobs) / write_s:,.0f} jobs/s (MULTI per write)")
+    # save_job_state migrated the legacy keys; restore them for the legacy pass
+    pipe = redis.pipeline(transaction=False)
+    for tenant_id, job_id, state in jobs:
+        pipe.setex(f"job:state:tenant:{tenant_id}:job:{job_id}", 86400, json.dumps(state))
+    pipe.execute()
+
+    tenants = [f"tenant-{t}" for t in range(args.tenants)]
+    counter = CommandCounter(redis)
+
+    print(f"\n🔁 Reconciliation pass over {args.tenants} tenants (semaphores + stale detection)")
+    print(f"  {'':<10}{'total s':>10}{'ms/tenant':>12}{'commands':>12}")
+    counter.count = 0
+    start = time.perf_counter()
+    legacy = [legacy_reconcile(redis, t) for t in tenants]
+    legacy_s = time.perf_counter() - start
+    print(f"  {'legacy':<10}{legacy_s:>10.2f}{legacy_s / len(tenants) * 1000:>12.1f}{counter.count:>12,}")
+
+    service = JobReconciliationService(redis)
+    counter.count = 0
+    start = time.perf_counter()
+    indexed = [
+        (service.reconcile_semaphores(t)["actual_count"], len(service.detect_stale_jobs(t))) for t in tenants
+    ]
+    indexed_s = time.perf_counter() - start
+    print(f"  {'indexed':<10}{indexed_s:>10.2f}{indexed_s / len(tenants) * 1000:>12.1f}{counter.count:>12,}")
+    print(f"  speedup: {legacy_s / indexed_s:.1f}x   results match: {legacy == indexed}")
+
+    print("\n📋 List 100 newest jobs for one tenant")
+    start = time.perf_counter()
+    listed = job_state.get_all_jobs_for_tenant(tenants[0], limit=100)
+    print(f"  indexed: {(time.perf_counter() - start) * 1000:.1f}ms ({len(listed)} jobs)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Maestra Context Assembly Benchmark
+
+Measures per-chat-turn context assembly latency (domain extraction, entity
+detection and triple retrieval):
+1. Before: one regex per keyword/entity, a new psycopg2 connection per query
+2. After: single-pass keyword automaton + pooled connections
+3. After + cache: repeated concept sets served from the triple TTL cache
+
+The DB scenarios seed a ``maestra_bench`` schema in a LOCAL test database.
+Never point --dsn at a shared database.
+
+Usage:
+    python scripts/benchmark_maestra_context.py --turns 500
+    python scripts/benchmark_maestra_context.py --dsn postgresql://postgres@localhost/maestra_test
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from app.maestra import assembler
+from app.maestra import db as maestra_db
+
+BENCH_SCHEMA = "maestra_bench"
+TENANT_ID = str(uuid.UUID(int=29))
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (reference)
+# ---------------------------------------------------------------------------
+
+def legacy_extract_domains(message: str) -> list[str]:
+    message_lower = message.lower()
+    matched = set()
+    for domain, keywords in assembler._DOMAIN_KEYWORDS.items():
+        for keyword in keywords:
+            if " " in keyword:
+                if keyword in message_lower:
+                    matched.add(domain)
+                    break
+            elif re.search(rf"\b{re.escape(keyword)}\b", message_lower):
+                matched.add(domain)
+                break
+    return sorted(matched)
+
+
+def legacy_detect_entity(message: str, entities: list[str]):
+    message_lower = message.lower()
+    for entity_id in entities:
+        if re.search(rf"\b{re.escape(entity_id.lower())}\b", message_lower):
+            return entity_id
+    return None
+
+
+def legacy_retrieve(dsn: str, domains: list[str], entity_id):
+    params = {"tenant_id": TENANT_ID, "max_rows": 300}
+    clauses = []
+    for i, domain in enumerate(domains):
+        clauses.append(f"concept LIKE %(domain_{i})s")
+        params[f"domain_{i}"] = f"{domain}.%"
+    where = f"is_active = true AND tenant_id = %(tenant_id)s AND ({' OR '.join(clauses)})"
+    if entity_id:
+        where += " AND entity_id = %(entity_id)s"
+        params["entity_id"] = entity_id
+
+    conn = psycopg2.connect(dsn, cursor_factory=RealDictCursor)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT entity_id, concept, property, value, period, source_system "
+                f"FROM semantic_triples WHERE {where} "
+                f"ORDER BY concept, period DESC LIMIT %(max_rows)s",
+                params,
+            )
+            return [dict(row) for row in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+def make_entities(count: int) -> list[str]:
+    return sorted(f"entity_{i:03d}" for i in range(count))
+
+
+def make_messages(turns: int, entities: list[str], topics: int, seed: int = 29) -> list[str]:
+    """Chat turns drawn from a small pool of topics, as in a real session."""
+    rng = random.Random(seed)
+    vocabulary = [k for kws in assembler._DOMAIN_KEYWORDS.values() for k in kws]
+    templates = [
+        "What was {a} for {e} last quarter, and how does it compare to {b}?",
+        "Show me the {a} trend and any {b} anomalies",
+        "Can you explain {a} vs {b} for {e}? The board asked about it.",
+        "why did {a} move so much in Q3",
+    ]
+    pool = [
+        rng.choice(templates).format(a=rng.choice(vocabulary), b=rng.choice(vocabulary), e=rng.choice(entities))
+        for _ in range(topics)
+    ]
+    return [rng.choice(pool) for _ in range(turns)]
+
+
+def with_search_path(dsn: str) -> str:
+    option = quote(f"-csearch_path={BENCH_SCHEMA}")
+    if "://" in dsn:
+        return f"{dsn}{'&' if '?' in dsn else '?'}options={option}"
+    return f"{dsn} options='-csearch_path={BENCH_SCHEMA}'"
+
+
+def seed(dsn: str, entities: list[str], rows_per_domain: int) -> None:
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            cur.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+            cur.execute(
+                f"""
+                CREATE TABLE {BENCH_SCHEMA}.semantic_triples (
+                    id BIGSERIAL PRIMARY KEY,
+                    tenant_id UUID NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    concept TEXT NOT NULL,
+                    property TEXT NOT NULL,
+                    value JSONB,
+                    period TEXT,
+                    source_system TEXT,
+                    is_active BOOLEAN NOT NULL DEFAULT true
+                )
+                """
+            )
+            rows = []
+            for domain in assembler._DOMAIN_KEYWORDS:
+                for i in range(rows_per_domain):
+                    rows.append((
+                        TENANT_ID, entities[i % len(entities)], f"{domain}.item_{i}",
+                        "amount", json.dumps(i * 10.5), f"2024-Q{i % 4 + 1}", "farm",
+                    ))
+            cur.executemany(
+                f"INSERT INTO {BENCH_SCHEMA}.semantic_triples "
+                f"(tenant_id, entity_id, concept, property, value, period, source_system) "
+                f"VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+            cur.execute(
+                f"CREATE INDEX ON {BENCH_SCHEMA}.semantic_triples (tenant_id, concept text_pattern_ops)"
+            )
+            cur.execute(f"ANALYZE {BENCH_SCHEMA}.semantic_triples")
+    finally:
+        conn.close()
+
+
+def report(label: str, latencies: list[float]) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p95 = ms[int(len(ms) * 0.95) - 1] if len(ms) > 1 else ms[0]
+    print(f"  {label:<28} mean {statistics.mean(ms):8.3f} ms   p95 {p95:8.3f} ms   total {sum(ms):9.1f} ms")
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def bench_matching(messages: list[str], entities: list[str]) -> None:
+    assembler._entity_cache = entities
+
+    before = []
+    for message in messages:
+        start = time.perf_counter()
+        legacy_extract_domains(message)
+        legacy_detect_entity(message, entities)
+        before.append(time.perf_counter() - start)
+
+    after = []
+    for message in messages:
+        start = time.perf_counter()
+        assembler.extract_domains(message, None)
+        assembler.detect_entity(message)
+        after.append(time.perf_counter() - start)
+
+    print(f"\n📊 Matching only ({len(assembler._DOMAIN_MATCHER)} keywords, {len(entities)} entities)")
+    report("Regex per keyword/entity", before)
+    report("Keyword automaton", after)
+
+
+def bench_turns(dsn: str, messages: list[str], entities: list[str]) -> None:
+    assembler._entity_cache = entities
+    assembler._resolved_tenant = TENANT_ID
+    os.environ["SUPABASE_DB_URL"] = dsn
+
+    before = []
+    for message in messages:
+        start = time.perf_counter()
+        domains = legacy_extract_domains(message)
+        entity_id = legacy_detect_entity(message, entities)
+        if domains:
+            legacy_retrieve(dsn, domains, entity_id)
+        before.append(time.perf_counter() - start)
+
+    def run_after() -> list[float]:
+        latencies = []
+        for message in messages:
+            start = time.perf_counter()
+            domains, _ = assembler.extract_domains(message, None)
+            entity_id = assembler.detect_entity(message)
+            if domains:
+                assembler.retrieve_triples(domains, entity_id)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    os.environ["MAESTRA_TRIPLE_CACHE_TTL"] = "0"
+    pooled = run_after()
+
+    os.environ["MAESTRA_TRIPLE_CACHE_TTL"] = "60"
+    assembler.clear_triple_cache()
+    cached = run_after()
+
+    pool = maestra_db.get_pool()
+    print(f"\n📊 Per chat turn against local Postgres ({len(messages):,} turns)")
+    report("Before (connect per query)", before)
+    report("After (pooled)", pooled)
+    report("After + triple cache", cached)
+    print(f"     pool connects: {pool.stats['connects']}, reuses: {pool.stats['reuses']:,}, "
+          f"cache hits: {assembler._triple_cache.hits:,}")
+    maestra_db.close_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maestra context assembly benchmark")
+    parser.add_argument("--turns", type=int, default=500, help="Chat turns per scenario")
+    parser.add_argument("--entities", type=int, default=200, help="Known entity_ids")
+    parser.add_argument("--topics", type=int, default=40, help="Distinct messages in the turn pool")
+    parser.add_argument("--rows-per-domain", type=int, default=500, help="Seeded triples per domain")
+    parser.add_argument(
+        "--dsn",
+        default=os.environ.get("MAESTRA_BENCH_DSN"),
+        help="Local test Postgres DSN (default: $MAESTRA_BENCH_DSN); matching-only if unset",
+    )
+    args = parser.parse_args()
+
+    entities = make_entities(args.entities)
+    messages = make_messages(args.turns, entities, args.topics)
+
+    print("=" * 80)
+    print("MAESTRA CONTEXT ASSEMBLY BENCHMARK")
+    print("=" * 80)
+
+    bench_matching(messages, entities)
+
+    if not args.dsn:
+        print("\n⚠️  No --dsn given — skipping the Postgres scenarios")
+        return
+
+    seed(args.dsn, entities, args.rows_per_domain)
+    bench_turns(with_search_path(args.dsn), messages, entities)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+MCP Transport Benchmark
+
+Compares tool-call throughput against a local stub MCP server:
+1. Before: a new aiohttp ClientSession per call (previous _execute_http)
+2. After: MCPClient over the pooled keep-alive transport
+3. After + dedupe: identical read-only calls coalesced in flight
+
+Usage:
+    python scripts/benchmark_mcp_transport.py --calls 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import aiohttp
+
+from app.agentic.mcp_client import MCPClient, MCPServerConfig, MCPTransport
+from tests.fixtures.mcp_stub_server import StubMCPServer
+
+
+async def _run_concurrently(calls: int, concurrency: int, make_call) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await make_call(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return time.perf_counter() - start
+
+
+async def benchmark_session_per_call(url: str, calls: int, concurrency: int) -> float:
+    async def call(i: int):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{url}/tools/execute",
+                json={"tool": "write", "arguments": {"i": i}},
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response:
+                await response.json()
+
+    return await _run_concurrently(calls, concurrency, call)
+
+
+async def benchmark_pooled(url: str, calls: int, concurrency: int, tool: str, same_args: bool) -> float:
+    client = MCPClient()
+    await client.add_server(MCPServerConfig(name="stub", url=url, transport=MCPTransport.HTTP))
+
+    async def call(i: int):
+        result = await client.execute_tool(tool, {"i": 0 if same_args else i})
+        if not result.success:
+            raise RuntimeError(result.error)
+
+    try:
+        return await _run_concurrently(calls, concurrency, call)
+    finally:
+        await client.close()
+
+
+async def main(calls: int, concurrency: int, latency_ms: float) -> None:
+    server = StubMCPServer(latency_s=latency_ms / 1000)
+    url = await server.start()
+
+    print("=" * 80)
+    print(f"MCP TRANSPORT BENCHMARK ({calls:,} calls, concurrency {concurrency}, server latency {latency_ms}ms)")
+    print("=" * 80)
+
+    try:
+        server.connections.clear()
+        duration = await benchmark_session_per_call(url, calls, concurrency)
+        print(f"  Session per call:       {calls / duration:8,.0f} calls/sec  ({len(server.connections):,} connections)")
+
+        server.connections.clear()
+        duration = await benchmark_pooled(url, calls, concurrency, "write", same_args=False)
+        print(f"  Pooled keep-alive:      {calls / duration:8,.0f} calls/sec  ({len(server.connections):,} connections)")
+
+        server.connections.clear()
+        server.calls.clear()
+        duration = await benchmark_pooled(url, calls, concurrency, "lookup", same_args=True)
+        print(
+            f"  Pooled + dedupe (RO):   {calls / duration:8,.0f} calls/sec  "
+            f"({server.calls.get('lookup', 0):,} requests reached the server)"
+        )
+    finally:
+        await server.stop()
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP transport benchmark")
+    parser.add_argument("--calls", type=int, default=2000, help="Total tool calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent callers")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Stub server latency per call")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.calls, args.concurrency, args.latency_ms))
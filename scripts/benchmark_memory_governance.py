@@ -0,0 +1,172 @@
+"""
+Memory Governance Benchmark
+
+Compares the linear governance paths with the indexed ones on a large
+vector store (default 1,000,000 documents, one tenant):
+1. Forget scopes (ALL, DATE_RANGE, DOCUMENT_TYPE, AGENT): finding the
+   user's matching documents, then the bulk delete
+2. Data export: tenant scan vs user index, streamed as chunked JSONL
+3. Audit log queries: filter + sort of the full list vs indexed walk
+
+Documents are stored pre-embedded so the benchmark measures governance,
+not the demo embedding function.
+
+Usage:
+    python scripts/benchmark_memory_governance.py --documents 1000000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.agentic.memory.governance import AuditEntry, ForgetScope, MemoryGovernance
+from app.agentic.memory.vector_store import DocumentType, MemoryDocument, VectorStore
+
+T0 = datetime(2026, 1, 1)
+TENANT = "bench-tenant"
+
+
+def legacy_find(store: VectorStore, tenant_id: str, user_id: str, **filters) -> list:
+    """What each scope costs without indexes: a scan of every tenant document."""
+    date_from, date_to = filters.get("created_from"), filters.get("created_to")
+    doc_types, agent_id = filters.get("doc_types"), filters.get("agent_id")
+    return [
+        doc_id for doc_id, doc in store._documents.get(tenant_id, {}).items()
+        if doc.user_id == user_id
+        and (not agent_id or doc.agent_id == agent_id)
+        and (not doc_types or doc.doc_type in doc_types)
+        and (not date_from or doc.created_at >= date_from)
+        and (not date_to or doc.created_at <= date_to)
+    ]
+
+
+def legacy_audit_query(entries: list, tenant_id: str, user_id=None, action=None, limit=100) -> list:
+    """The previous get_audit_log(): filter and sort the full list."""
+    entries = [e for e in entries if e.tenant_id == tenant_id]
+    if user_id:
+        entries = [e for e in entries if e.user_id == user_id]
+    if action:
+        entries = [e for e in entries if e.action == action]
+    return sorted(entries, key=lambda e: e.timestamp, reverse=True)[:limit]
+
+
+def build_documents(n: int, users: int, seed: int = 44):
+    rng = random.Random(seed)
+    types = list(DocumentType)
+    agents = [f"agent-{i}" for i in range(20)]
+    embedding = [1.0]
+    step = timedelta(seconds=365 * 86400 / n)
+    return [
+        MemoryDocument(
+            doc_id=f"doc-{i}",
+            tenant_id=TENANT,
+            content=f"turn {i}",
+            doc_type=rng.choice(types),
+            conversation_id=f"conv-{i // 50}",
+            user_id=f"user-{rng.randrange(users)}",
+            agent_id=rng.choice(agents),
+            created_at=T0 + step * i,
+            embedding=embedding,
+        )
+        for i in range(n)
+    ]
+
+
+def timed(fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory governance benchmark")
+    parser.add_argument("--documents", type=int, default=1_000_000, help="Documents in the store")
+    parser.add_argument("--users", type=int, default=2000, help="Distinct users")
+    parser.add_argument("--audit-entries", type=int, default=10000, help="Audit log size")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"MEMORY GOVERNANCE BENCHMARK ({args.documents:,} documents, {args.users:,} users)")
+    print("=" * 80)
+
+    store = VectorStore()
+    start = time.perf_counter()
+    await store.add_documents(build_documents(args.documents, args.users))
+    print(f"\n📦 Indexed {args.documents:,} documents in {time.perf_counter() - start:.1f}s")
+
+    governance = MemoryGovernance(vector_store=store)
+    date_from = T0 + timedelta(days=60)
+    date_to = T0 + timedelta(days=150)
+    scopes = [
+        ("ALL", {}, {}),
+        ("DATE_RANGE", {"created_from": date_from, "created_to": date_to}, {"date_from": date_from, "date_to": date_to}),
+        ("DOCUMENT_TYPE", {"doc_types": [DocumentType.TOOL_OUTPUT]}, {"document_types": [DocumentType.TOOL_OUTPUT]}),
+        ("AGENT", {"agent_id": "agent-3"}, {"agent_id": "agent-3"}),
+    ]
+
+    print("\n🗑️  Forget scopes (one user each)")
+    print(f"  {'scope':<15}{'matched':>9}{'scan find ms':>15}{'index find ms':>15}{'speedup':>9}{'forget ms':>12}")
+    for n, (scope, filters, request_fields) in enumerate(scopes):
+        user_id = f"user-{n}"
+        legacy_ms, legacy_ids = timed(lambda user_id=user_id, filters=filters: legacy_find(store, TENANT, user_id, **filters))
+        index_ms, index_ids = timed(
+            lambda user_id=user_id, filters=filters: store.find_document_ids(TENANT, user_id=user_id, **filters),
+            repeat=20,
+        )
+        assert set(legacy_ids) == set(index_ids)
+
+        request = await governance.request_forget(
+            TENANT, user_id, scope=ForgetScope(scope.lower()), require_verification=False, **request_fields
+        )
+        start = time.perf_counter()
+        result = await governance.process_forget_request(request.request_id)
+        forget_ms = (time.perf_counter() - start) * 1000
+        assert result.documents_deleted == len(index_ids)
+        print(f"  {scope:<15}{len(index_ids):>9,}{legacy_ms:>15.1f}{index_ms:>15.3f}"
+              f"{legacy_ms / index_ms:>8.0f}x{forget_ms:>12.2f}")
+
+    print(f"\n📤 Data export (user-{len(scopes)})")
+    user_id = f"user-{len(scopes)}"
+    legacy_ms, legacy_docs = timed(lambda: [
+        doc.to_dict() for doc in store._documents[TENANT].values() if doc.user_id == user_id
+    ])
+    start = time.perf_counter()
+    chunks = [chunk async for chunk in governance.stream_user_data_export(TENANT, user_id)]
+    stream_ms = (time.perf_counter() - start) * 1000
+    print(f"  scan + to_dict:     {legacy_ms:>9.1f} ms ({len(legacy_docs):,} documents)")
+    print(f"  indexed JSONL:      {stream_ms:>9.1f} ms ({len(chunks)} chunks, "
+          f"{sum(len(c) for c in chunks) / 1024:,.0f} KiB, serialization included)")
+
+    print(f"\n📜 Audit log ({args.audit_entries:,} entries)")
+    rng = random.Random(1)
+    legacy_entries = []
+    for i in range(args.audit_entries):
+        entry = AuditEntry(
+            entry_id=str(i), tenant_id=f"tenant-{rng.randrange(10)}", user_id=f"user-{rng.randrange(args.users)}",
+            action=rng.choice(["forget_requested", "consent_updated", "data_exported", "retention_cleanup"]),
+            details={}, timestamp=T0 + timedelta(seconds=i),
+        )
+        legacy_entries.append(entry)
+        governance._audit_log.append(entry)
+    for label, kwargs in (
+        ("tenant", {}),
+        ("tenant + action", {"action": "data_exported"}),
+        ("tenant + user", {"user_id": "user-7"}),
+    ):
+        legacy_ms, legacy_result = timed(
+            lambda kwargs=kwargs: legacy_audit_query(legacy_entries, "tenant-3", **kwargs), repeat=20
+        )
+        index_ms, index_result = timed(lambda kwargs=kwargs: governance._audit_log.query("tenant-3", **kwargs), repeat=20)
+        assert [e.entry_id for e in legacy_result] == [e.entry_id for e in index_result]
+        print(f"  {label:<18}{legacy_ms:>9.3f} ms -> {index_ms:>7.3f} ms ({legacy_ms / index_ms:.0f}x)")
+    print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Pagination Benchmark
+
+Compares OFFSET/LIMIT pagination (paginate_query) with keyset pagination
+(paginate_keyset) on a large SQLite table indexed on (created_at, id):
+1. Page 1 vs a deep page for each strategy
+2. Exact count(*) vs capped approximate_total
+
+Usage:
+    python scripts/benchmark_pagination.py --rows 1000000 --page 10000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, create_engine, insert
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.sql.expression import ClauseList
+
+from app.api.pagination import (
+    Cursor,
+    CursorParams,
+    PaginationParams,
+    _scope,
+    approximate_total,
+    encode_cursor,
+    paginate_keyset,
+    paginate_query,
+)
+
+Base = declarative_base()
+
+
+class JobHistory(Base):
+    __tablename__ = "job_history"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(String(20), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (Index("idx_job_history_created", "created_at", "id"),)
+
+
+def build_fixture(path: str, rows: int) -> Session:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    chunk = 50_000
+    with engine.begin() as conn:
+        for offset in range(0, rows, chunk):
+            conn.execute(insert(JobHistory), [
+                {"id": i, "status": "completed", "created_at": start + timedelta(seconds=i // 2)}
+                for i in range(offset + 1, min(offset + chunk, rows) + 1)
+            ])
+    return Session(engine)
+
+
+def _time(fn, repeat: int) -> float:
+    fn()  # Warm the page cache
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offset vs keyset pagination benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the fixture table")
+    parser.add_argument("--page", type=int, default=10_000, help="Deep page number to compare with page 1")
+    parser.add_argument("--page-size", type=int, default=20, help="Items per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"PAGINATION BENCHMARK ({args.rows:,} rows, page size {args.page_size})")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        db = build_fixture(os.path.join(tmp, "pagination.db"), args.rows)
+        print(f"\n🔧 Fixture built in {time.perf_counter() - t0:.1f}s")
+
+        order = (JobHistory.created_at.desc(), JobHistory.id.desc())
+        query = db.query(JobHistory)
+
+        def offset_page(page):
+            return lambda: paginate_query(
+                query, PaginationParams(page=page, page_size=args.page_size), order_by=ClauseList(*order)
+            )
+
+        # The cursor a client would hold after walking to the page before `page`
+        boundary = query.order_by(*order).offset((args.page - 1) * args.page_size - 1).first()
+        deep_cursor = encode_cursor(
+            Cursor(values=(boundary.created_at, boundary.id)),
+            _scope(JobHistory.created_at, JobHistory.id, True),
+        )
+
+        def keyset_page(cursor):
+            return lambda: paginate_keyset(
+                query, CursorParams(cursor=cursor, page_size=args.page_size, with_total=False),
+                JobHistory.created_at, JobHistory.id,
+            )
+
+        deep_ids = [r.id for r in offset_page(args.page)().items]
+        assert deep_ids == [r.id for r in keyset_page(deep_cursor)().items], "strategies disagree"
+
+        print(f"\n📊 Page latency (ms, mean of {args.repeat})")
+        print(f"  {'':<28}{'page 1':>12}{f'page {args.page:,}':>16}")
+        print(f"  {'OFFSET + exact count':<28}{_time(offset_page(1), args.repeat):>12.2f}"
+              f"{_time(offset_page(args.page), args.repeat):>16.2f}")
+        print(f"  {'Keyset cursor':<28}{_time(keyset_page(''), args.repeat):>12.2f}"
+              f"{_time(keyset_page(deep_cursor), args.repeat):>16.2f}")
+
+        print(f"\n📊 Totals (ms, mean of {args.repeat})")
+        print(f"  Exact count(*):            {_time(query.count, args.repeat):10.2f}")
+        print(f"  Capped approximate_total:  {_time(lambda: approximate_total(query), args.repeat):10.2f}   "
+              f"-> {approximate_total(query)}")
+        db.close()
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Canonical Stream Envelope
+
+Versioned, batched encoding for canonical events on aam:dcl:* Redis streams.
+
+Entry formats:
+- Legacy (codec "json"): {"payload": <JSON string>}, one event per entry
+- Envelope v1:
+    v        envelope version ("1")
+    schema   schema id of the events inside (CANONICAL_SCHEMA_ID)
+    codec    "msgpack" or "json+zlib"
+    n        number of events in the entry
+    data     encoded list of event payloads
+
+Events are encoded one at a time and packed into entries of up to
+max_entry_bytes (or max_events), so a high-volume publish becomes a few
+large entries instead of one XADD per event.
+
+Codec negotiation: every process that reads the streams is registered
+under CONSUMERS_KEY (register_consumer), and consumers advertise what they
+can decode with an expiring heartbeat (advertise_decoders). Publishers use
+the best codec every registered consumer accepts, and fall back to legacy
+JSON unless all of them hold a live advertisement.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None  # type: ignore
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE_VERSION = 1
+CANONICAL_SCHEMA_ID = "aam.canonical_event.v1"
+
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+CODEC_JSON_ZLIB = "json+zlib"
+
+# Best first
+CODEC_PREFERENCE = [CODEC_MSGPACK, CODEC_JSON_ZLIB, CODEC_JSON]
+
+# Set of consumer names that read the streams (legacy readers included)
+CONSUMERS_KEY = "aam:dcl:consumers"
+# + consumer name -> comma-separated codecs it decodes, expiring
+DECODERS_KEY_PREFIX = "aam:dcl:decoders:"
+DECODERS_TTL_SECONDS = 300
+
+DEFAULT_MAX_ENTRY_BYTES = 256 * 1024
+DEFAULT_MAX_EVENTS_PER_ENTRY = 500
+
+
+class EnvelopeError(ValueError):
+    """A stream entry that cannot be decoded by this consumer."""
+
+
+def supported_codecs() -> List[str]:
+    """Codecs this process can encode and decode, best first."""
+    return [c for c in CODEC_PREFERENCE if c != CODEC_MSGPACK or MSGPACK_AVAILABLE]
+
+
+def decodable_codecs(redis_client) -> List[str]:
+    """
+    Codecs a consumer reading through redis_client can decode.
+
+    Envelope data is binary, so clients created with decode_responses=True
+    can only read legacy JSON entries.
+    """
+    pool = getattr(redis_client, "connection_pool", None)
+    if pool is not None and pool.connection_kwargs.get("decode_responses"):
+        return [CODEC_JSON]
+    return supported_codecs()
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _field(fields: Dict[Any, Any], name: str) -> Any:
+    if name in fields:
+        return fields[name]
+    return fields.get(name.encode())
+
+
+# ----------------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------------
+
+def _encode_one(payload: Dict[str, Any], codec: str) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _wrap(parts: List[bytes], codec: str) -> bytes:
+    if codec == CODEC_MSGPACK:
+        # Array header followed by the already-packed items is a valid msgpack array
+        header = msgpack.Packer().pack_array_header(len(parts))
+        return header + b"".join(parts)
+    return zlib.compress(b"[" + b",".join(parts) + b"]", 6)
+
+
+def _entry(parts: List[bytes], codec: str, batch_id: Optional[str]) -> Dict[str, Any]:
+    fields = {
+        "v": str(ENVELOPE_VERSION),
+        "schema": CANONICAL_SCHEMA_ID,
+        "codec": codec,
+        "n": str(len(parts)),
+        "data": _wrap(parts, codec),
+    }
+    if batch_id:
+        fields["batch_id"] = batch_id
+    return fields
+
+
+def encode_entries(
+    payloads: Iterable[Dict[str, Any]],
+    codec: str,
+    batch_id: Optional[str] = None,
+    max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+    max_events: int = DEFAULT_MAX_EVENTS_PER_ENTRY,
+) -> List[Dict[str, Any]]:
+    """
+    Encode event payloads into stream entry field dicts, in order.
+
+    Args:
+        payloads: JSON-compatible event payloads
+        codec: One of supported_codecs()
+        batch_id: Optional batch ID header on every entry
+        max_entry_bytes: Target maximum encoded size of one entry (before compression)
+        max_events: Maximum events in one entry
+
+    Returns:
+        List of XADD field dicts
+    """
+    if codec == CODEC_JSON:
+        return [{"payload": json.dumps(payload)} for payload in payloads]
+    if codec not in supported_codecs():
+        raise EnvelopeError(f"Unsupported codec: {codec}")
+
+    entries: List[Dict[str, Any]] = []
+    parts: List[bytes] = []
+    size = 0
+    for payload in payloads:
+        try:
+            part = _encode_one(payload, codec)
+        except (OverflowError, TypeError, ValueError) as e:
+            # e.g. integers outside msgpack's 64-bit range: send this event as JSON
+            logger.debug(f"{codec} encode failed ({e}), using {CODEC_JSON_ZLIB} for one event")
+            if parts:
+                entries.append(_entry(parts, codec, batch_id))
+                parts, size = [], 0
+            entries.append(_entry([_encode_one(payload, CODEC_JSON_ZLIB)], CODEC_JSON_ZLIB, batch_id))
+            continue
+        if parts and (size + len(part) > max_entry_bytes or len(parts) >= max_events):
+            entries.append(_entry(parts, codec, batch_id))
+            parts, size = [], 0
+        parts.append(part)
+        size += len(part)
+    if parts:
+        entries.append(_entry(parts, codec, batch_id))
+    return entries
+
+
+# ----------------------------------------------------------------------
+# Decoding
+# ----------------------------------------------------------------------
+
+def decode_entry(fields: Dict[Any, Any]) -> List[Dict[str, Any]]:
+    """
+    Decode one stream entry (legacy or envelope) into event payloads.
+
+    Legacy entries decode from clients with or without decode_responses;
+    envelope entries need raw (bytes) responses.
+
+    Raises:
+        EnvelopeError: Unknown envelope version, schema or codec, or corrupt data
+    """
+    version = _field(fields, "v")
+    if version is None:
+        payload = _field(fields, "payload")
+        if payload is None:
+            raise EnvelopeError("Entry has neither an envelope header nor a payload field")
+        return [json.loads(payload)]
+
+    try:
+        version = int(_text(version))
+    except ValueError:
+        raise EnvelopeError(f"Invalid envelope version: {version!r}")
+    if version > ENVELOPE_VERSION:
+        raise EnvelopeError(f"Envelope version {version} is newer than supported ({ENVELOPE_VERSION})")
+
+    schema = _text(_field(fields, "schema"))
+    if schema != CANONICAL_SCHEMA_ID:
+        raise EnvelopeError(f"Unknown schema id: {schema}")
+
+    codec = _text(_field(fields, "codec"))
+    data = _field(fields, "data")
+    try:
+        if codec == CODEC_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                raise EnvelopeError("msgpack entry but msgpack is not installed")
+            events = msgpack.unpackb(data, raw=False)
+        elif codec == CODEC_JSON_ZLIB:
+            events = json.loads(zlib.decompress(data))
+        else:
+            raise EnvelopeError(f"Unknown codec: {codec}")
+    except EnvelopeError:
+        raise
+    except Exception as e:
+        raise EnvelopeError(f"Corrupt {codec} entry: {e}") from e
+
+    expected = _field(fields, "n")
+    if expected is not None and int(_text(expected)) != len(events):
+        raise EnvelopeError(f"Entry declares {_text(expected)} events, decoded {len(events)}")
+    return events
+
+
+# ----------------------------------------------------------------------
+# Negotiation
+# ----------------------------------------------------------------------
+
+def register_consumer(redis_client, consumer: str) -> None:
+    """
+    Register a stream reader.
+
+    Readers that never advertise (e.g. deployments older than the envelope
+    format) must be registered too; they keep every publisher on legacy
+    JSON until they advertise or are unregistered.
+    """
+    redis_client.sadd(CONSUMERS_KEY, consumer)
+
+
+def unregister_consumer(redis_client, consumer: str) -> None:
+    """Forget a consumer that no longer reads the streams."""
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.srem(CONSUMERS_KEY, consumer)
+        pipe.delete(DECODERS_KEY_PREFIX + consumer)
+        pipe.execute()
+
+
+def advertise_decoders(
+    redis_client,
+    consumer: str,
+    codecs: Optional[List[str]] = None,
+    ttl_seconds: int = DECODERS_TTL_SECONDS
+) -> None:
+    """
+    Register a consumer and record the codecs it can decode.
+
+    The advertisement expires after ttl_seconds, so consumers repeat it as a
+    heartbeat (read_canonical_stream does on every read); a consumer that
+    stops reading drops publishers back to legacy JSON.
+
+    Args:
+        consumer: Consumer name
+        codecs: Codecs it decodes (defaults to decodable_codecs(redis_client))
+        ttl_seconds: Lifetime of the advertisement
+    """
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.sadd(CONSUMERS_KEY, consumer)
+        pipe.set(DECODERS_KEY_PREFIX + consumer, ",".join(codecs or decodable_codecs(redis_client)), ex=ttl_seconds)
+        pipe.execute()
+
+
+def withdraw_decoders(redis_client, consumer: str) -> None:
+    """Remove a consumer's advertisement; it stays registered, so publishers use legacy JSON."""
+    redis_client.delete(DECODERS_KEY_PREFIX + consumer)
+
+
+def negotiate_codec(redis_client) -> str:
+    """
+    Best codec accepted by every registered consumer.
+
+    Legacy JSON when no consumer is registered, when any registered consumer
+    has no live advertisement, or when Redis cannot be read.
+    """
+    try:
+        consumers = sorted(_text(c) for c in redis_client.smembers(CONSUMERS_KEY))
+        advertised = redis_client.mget([DECODERS_KEY_PREFIX + c for c in consumers]) if consumers else []
+    except Exception as e:
+        logger.warning(f"Codec negotiation failed, publishing legacy JSON: {e}")
+        return CODEC_JSON
+    if not consumers:
+        return CODEC_JSON
+
+    silent = [c for c, codecs in zip(consumers, advertised) if codecs is None]
+    if silent:
+        logger.debug(f"Consumers without a live decoder advertisement, publishing legacy JSON: {silent}")
+        return CODEC_JSON
+
+    accepted = set(supported_codecs())
+    for codecs in advertised:
+        accepted &= set(_text(codecs).split(","))
+    for codec in CODEC_PREFERENCE:
+        if codec in accepted:
+            return codec
+    return CODEC_JSON
@@ -3,15 +3,24 @@ Canonical Event Publisher for AAM Redis Streams
 
 Publishes CanonicalEvent objects to Redis streams for consumption by DCL Engine.
 Stream key pattern: aam:dcl:{tenant_id}:{source_id}
+
+Entries use the legacy {"payload": json} format unless every registered
+consumer has a live envelope codec advertisement (see services/aam/canonical/envelope.py), in
+which case publish_batch packs many events into each entry.
 """
 
-import json
 import logging
 import uuid
 from typing import Optional
 from datetime import datetime
 from redis import Redis
 from services.aam.canonical.schemas import CanonicalEvent
+from services.aam.canonical.envelope import (
+    DEFAULT_MAX_ENTRY_BYTES,
+    DEFAULT_MAX_EVENTS_PER_ENTRY,
+    encode_entries,
+    negotiate_codec,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,19 +34,37 @@ class CanonicalEventPublisher:
     - Generates deterministic message IDs for idempotency
     - Batches events for efficient processing
     - Automatic JSON serialization of Pydantic models
+    - Versioned msgpack / compressed JSON envelopes, several events per entry,
+      when consumers support them
     """
     
-    def __init__(self, redis_client: Redis, tenant_id: str = "default"):
+    STREAM_MAXLEN = 10000
+    
+    def __init__(
+        self,
+        redis_client: Redis,
+        tenant_id: str = "default",
+        codec: Optional[str] = None,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+        max_events_per_entry: int = DEFAULT_MAX_EVENTS_PER_ENTRY
+    ):
         """
         Initialize publisher with Redis client and tenant context
         
         Args:
             redis_client: Redis client instance
             tenant_id: Tenant identifier for stream segmentation
+            codec: Entry codec; None negotiates with consumers (per batch)
+            max_entry_bytes: Target encoded size of one batched entry
+            max_events_per_entry: Maximum events in one batched entry
         """
         self.redis = redis_client
         self.tenant_id = tenant_id
         self.batch_id = str(uuid.uuid4())
+        self.max_entry_bytes = max_entry_bytes
+        self.max_events_per_entry = max_events_per_entry
+        self._fixed_codec = codec
+        self._codec = codec
         logger.info(f"📡 CanonicalEventPublisher initialized for tenant '{tenant_id}' (batch: {self.batch_id})")
     
     def _serialize_event(self, event: CanonicalEvent) -> dict:
@@ -60,6 +87,22 @@ class CanonicalEventPublisher:
             "unknown_fields": event.unknown_fields
         }
     
+    @property
+    def codec(self) -> str:
+        """Entry codec for the current batch (negotiated on first use)."""
+        if self._codec is None:
+            self._codec = negotiate_codec(self.redis)
+            logger.info(f"📡 Canonical stream codec for batch {self.batch_id}: {self._codec}")
+        return self._codec
+    
+    def _payload(self, event: CanonicalEvent) -> dict:
+        return {
+            "batch_id": self.batch_id,
+            "entity": event.entity,
+            "event": self._serialize_event(event),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
     def publish(self, event: CanonicalEvent, source_id: str = "filesource") -> str:
         """
         Publish a single CanonicalEvent to Redis stream
@@ -73,24 +116,16 @@ class CanonicalEventPublisher:
         """
         stream_key = f"aam:dcl:{self.tenant_id}:{source_id}"
         
-        # Serialize event to JSON
-        event_dict = self._serialize_event(event)
-        
-        # Create payload with batch context
-        payload = {
-            "batch_id": self.batch_id,
-            "entity": event.entity,
-            "event": event_dict,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        # One entry in the negotiated codec: {'payload': json_string} for
+        # legacy JSON, a single-event envelope otherwise
+        fields = encode_entries([self._payload(event)], self.codec, batch_id=self.batch_id)[0]
         
         # Publish to Redis stream using XADD
-        # Message structure: {'payload': json_string}
         try:
             message_id = self.redis.xadd(
                 stream_key,
-                {"payload": json.dumps(payload)},
-                maxlen=10000,  # Limit stream size to prevent unbounded growth
+                fields,
+                maxlen=self.STREAM_MAXLEN,  # Limit stream size to prevent unbounded growth
                 approximate=True  # Use approximate trimming for better performance
             )
             
@@ -104,41 +139,41 @@ class CanonicalEventPublisher:
         """
         Publish multiple CanonicalEvents to Redis stream efficiently
         
+        With the legacy JSON codec every event is its own entry; with an
+        envelope codec events are packed several per entry, in order.
+        
         Args:
             events: List of CanonicalEvent objects
             source_id: Source connector identifier
             
         Returns:
-            List of message IDs from Redis
+            List of message IDs from Redis (one per stream entry)
         """
         if not events:
             return []
         
         stream_key = f"aam:dcl:{self.tenant_id}:{source_id}"
-        message_ids = []
+        entries = encode_entries(
+            (self._payload(event) for event in events),
+            self.codec,
+            batch_id=self.batch_id,
+            max_entry_bytes=self.max_entry_bytes,
+            max_events=self.max_events_per_entry
+        )
         
         # Use pipeline for efficient batch publishing
         with self.redis.pipeline() as pipe:
-            for event in events:
-                event_dict = self._serialize_event(event)
-                payload = {
-                    "batch_id": self.batch_id,
-                    "entity": event.entity,
-                    "event": event_dict,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                pipe.xadd(
-                    stream_key,
-                    {"payload": json.dumps(payload)},
-                    maxlen=10000
-                )
+            for fields in entries:
+                pipe.xadd(stream_key, fields, maxlen=self.STREAM_MAXLEN)
             
             # Execute pipeline and get all message IDs
             message_ids = pipe.execute()
         
-        logger.info(f"✅ Published batch of {len(events)} events to '{stream_key}'")
-        return message_ids
+        logger.info(
+            f"✅ Published batch of {len(events)} events to '{stream_key}' "
+            f"({len(entries)} entries, codec={self.codec})"
+        )
+        return [m.decode() if isinstance(m, bytes) else m for m in message_ids]
     
     def new_batch(self) -> str:
         """
@@ -148,6 +183,8 @@ class CanonicalEventPublisher:
             New batch ID (UUID)
         """
         self.batch_id = str(uuid.uuid4())
+        # Renegotiate: consumers may have been upgraded since the last batch
+        self._codec = self._fixed_codec
         logger.info(f"🔄 Started new batch: {self.batch_id}")
         return self.batch_id
 
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
@@ -9,11 +9,64 @@ from app.models import (
     MaterializedOpportunity, 
     MaterializedContact
 )
+from services.aam.canonical.envelope import EnvelopeError, advertise_decoders, decode_entry
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def decode_stream_entries(entries: List[Tuple[Any, Dict[Any, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Decode aam:dcl:* stream entries into event payloads, in stream order.
+    
+    Handles legacy {"payload": json} entries and batched envelope entries
+    (msgpack / compressed JSON). Entries this consumer cannot decode are
+    logged and skipped.
+    """
+    payloads = []
+    for message_id, fields in entries:
+        try:
+            payloads.extend(decode_entry(fields))
+        except (EnvelopeError, ValueError) as e:
+            logger.error(f"Skipping undecodable canonical stream entry {message_id}: {e}")
+    return payloads
+
+
+def read_canonical_stream(
+    redis_client,
+    stream_key: str,
+    last_id: str = "0-0",
+    count: int = 100,
+    consumer: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Read and decode canonical events after last_id.
+    
+    Args:
+        redis_client: Redis client (decoded or raw responses)
+        stream_key: aam:dcl:{tenant_id}:{source_id}
+        last_id: Stream ID to read after
+        count: Maximum stream entries to read (an entry may hold many events)
+        consumer: If set, register this consumer and refresh its decoder
+            advertisement so publishers can switch to batched envelopes
+            (raw-response clients only; decode_responses clients stay on
+            legacy JSON)
+    
+    Returns:
+        (event payloads, ID of the last entry read)
+    """
+    if consumer:
+        advertise_decoders(redis_client, consumer)
+    
+    response = redis_client.xread({stream_key: last_id}, count=count)
+    if not response:
+        return [], last_id
+    
+    _, entries = response[0]
+    last = entries[-1][0]
+    return decode_stream_entries(entries), last.decode() if isinstance(last, bytes) else last
+
+
 def upsert_account(db: Session, tenant_id: str, canonical_data: Dict[str, Any], source_meta: Dict[str, Any]) -> MaterializedAccount:
     """Upsert account into materialized_accounts table"""
     account_id = canonical_data.get('account_id')
@@ -13,7 +13,7 @@ from services.mapping_intelligence.job_workers import (
     generate_bulk_mappings_job,
     sync_generate_bulk_mappings_job
 )
-from services.mapping_intelligence.progress_broadcaster import ProgressBroadcaster
+from services.mapping_intelligence.progress_broadcaster import ProgressBroadcaster, ProgressChannel
 from services.mapping_intelligence.worker_pools import TenantWorkerPool
 from services.mapping_intelligence.resource_monitor import ResourceMonitor
 from services.mapping_intelligence.reconciliation import JobReconciliationService
@@ -28,6 +28,7 @@ __all__ = [
     'generate_bulk_mappings_job',
     'sync_generate_bulk_mappings_job',
     'ProgressBroadcaster',
+    'ProgressChannel',
     'TenantWorkerPool',
     'ResourceMonitor',
     'JobReconciliationService',
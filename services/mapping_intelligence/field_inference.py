@@ -0,0 +1,274 @@
+"""
+Field Inference for Mapping Intelligence
+
+Resolves source field names to canonical fields for RAGService:
+- Rule index: the canonical alias vocabulary, normalized and compiled once
+  (exact aliases in one dict, partial aliases in priority order)
+- Decision cache: per (source system, entity, field name) results stamped
+  with the rules/vector-index version, so stale decisions are never served
+- Vector stage (optional): fields the rules cannot resolve are embedded and
+  looked up in a single batch per job chunk
+"""
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Source alias -> canonical field. Order matters: partial matches take the
+# first alias contained in the field name.
+FIELD_MAPPINGS: Dict[str, str] = {
+    'id': 'id',
+    'name': 'name',
+    'email': 'email',
+    'phone': 'phone',
+    'amount': 'amount',
+    'value': 'amount',
+    'stage': 'stage',
+    'status': 'status',
+    'created': 'created_at',
+    'createdat': 'created_at',
+    'created_date': 'created_at',
+    'updated': 'updated_at',
+    'updatedat': 'updated_at',
+    'updated_date': 'updated_at',
+    'owner': 'owner_id',
+    'ownerid': 'owner_id',
+    'close_date': 'close_date',
+    'closedate': 'close_date',
+}
+
+# Bump when FIELD_MAPPINGS or the rule logic changes
+RULES_VERSION = 1
+
+DEFAULT_CACHE_SIZE = 50_000
+DEFAULT_MIN_VECTOR_SIMILARITY = 0.8
+
+METHOD_EXACT = 'exact'
+METHOD_PARTIAL = 'partial'
+METHOD_VECTOR = 'vector'
+METHOD_FALLBACK = 'fallback'
+
+
+def normalize_field_name(source_field: str) -> str:
+    """Lowercase and turn '-' and ' ' into '_'"""
+    return source_field.lower().replace('-', '_').replace(' ', '_')
+
+
+def calculate_confidence(source_field: str, canonical_field: str) -> float:
+    """
+    Confidence score for a rule-based mapping
+    
+    Returns a score between 0.0 and 1.0.
+    """
+    source_normalized = normalize_field_name(source_field)
+    
+    # Exact match = high confidence
+    if source_normalized == canonical_field:
+        return 0.95
+    
+    # Partial match = medium confidence
+    if canonical_field in source_normalized or source_normalized in canonical_field:
+        return 0.75
+    
+    # Common transformations = medium confidence
+    if source_normalized.replace('_', '') == canonical_field.replace('_', ''):
+        return 0.80
+    
+    # Default = low confidence (needs review)
+    return 0.50
+
+
+@dataclass(frozen=True)
+class FieldDecision:
+    """Resolved canonical field for one source field"""
+    canonical_field: str
+    confidence_score: float
+    method: str
+    matched: Optional[str] = None  # Alias or vector neighbour that decided it
+    
+    @property
+    def reasoning(self) -> str:
+        if self.method == METHOD_EXACT:
+            return f"Exact alias match '{self.matched}'"
+        if self.method == METHOD_PARTIAL:
+            return f"Field name contains alias '{self.matched}'"
+        if self.method == METHOD_VECTOR:
+            return f"Nearest canonical field by embedding ({self.confidence_score:.2f})"
+        return "No alias matched; kept the normalized field name"
+
+
+class RuleIndex:
+    """
+    Compiled alias vocabulary
+    
+    Same decisions as the original per-call heuristics: exact alias first,
+    then the first alias (in FIELD_MAPPINGS order) contained in the
+    normalized name.
+    """
+    
+    def __init__(self, mappings: Optional[Dict[str, str]] = None, version: int = RULES_VERSION):
+        mappings = FIELD_MAPPINGS if mappings is None else mappings
+        self.version = version
+        self._exact: Dict[str, str] = {normalize_field_name(k): v for k, v in mappings.items()}
+        # Kept as an ordered scan: aliases match anywhere in the name
+        # ('id' in 'accountid' or 'valid') and the first alias wins, so a
+        # token index would change decisions. Misses are cached upstream.
+        self._partial: Tuple[Tuple[str, str], ...] = tuple(self._exact.items())
+    
+    def resolve(self, normalized: str) -> Optional[FieldDecision]:
+        """Rule decision for a normalized field name, or None if no alias applies"""
+        canonical = self._exact.get(normalized)
+        if canonical is not None:
+            return FieldDecision(canonical, calculate_confidence(normalized, canonical), METHOD_EXACT, normalized)
+        
+        for alias, canonical in self._partial:
+            if alias in normalized:
+                return FieldDecision(canonical, calculate_confidence(normalized, canonical), METHOD_PARTIAL, alias)
+        return None
+    
+    def fallback(self, normalized: str) -> FieldDecision:
+        """Decision when neither rules nor vectors resolve the field"""
+        return FieldDecision(normalized, calculate_confidence(normalized, normalized), METHOD_FALLBACK)
+
+
+class FieldEmbedder(Protocol):
+    """Embeds a batch of texts in one call"""
+    
+    async def embed(self, texts: List[str]) -> List[List[float]]: ...
+
+
+class CanonicalVectorIndex(Protocol):
+    """Nearest canonical fields for a batch of query vectors in one call"""
+    
+    version: str
+    
+    async def search(self, vectors: List[List[float]], top_k: int = 1) -> List[List[Tuple[str, float]]]: ...
+
+
+# (source system, canonical entity, field name)
+FieldKey = Tuple[str, str, str]
+
+
+class FieldInferenceEngine:
+    """
+    Cached, batched field inference
+    
+    Args:
+        rules: Rule index (defaults to FIELD_MAPPINGS)
+        embedder: Optional embedder for fields the rules cannot resolve
+        vector_index: Optional canonical-field vector index (used with embedder)
+        min_similarity: Minimum vector score to accept a neighbour
+        cache_size: Decisions kept (LRU)
+    """
+    
+    def __init__(
+        self,
+        rules: Optional[RuleIndex] = None,
+        embedder: Optional[FieldEmbedder] = None,
+        vector_index: Optional[CanonicalVectorIndex] = None,
+        min_similarity: float = DEFAULT_MIN_VECTOR_SIMILARITY,
+        cache_size: int = DEFAULT_CACHE_SIZE
+    ):
+        self.rules = rules or RuleIndex()
+        self.embedder = embedder
+        self.vector_index = vector_index
+        self.min_similarity = min_similarity
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[FieldKey, Tuple[str, FieldDecision]]" = OrderedDict()
+        self._generation = 0
+        self.stats = {'cache_hits': 0, 'rule_resolved': 0, 'vector_resolved': 0, 'fallback': 0, 'vector_batches': 0}
+    
+    @property
+    def version(self) -> str:
+        """Stamp stored with cached decisions; changes invalidate them"""
+        vector_version = getattr(self.vector_index, 'version', None) if self.vector_index else None
+        return f"{self.rules.version}:{vector_version}:{self._generation}"
+    
+    def invalidate(self):
+        """Drop every cached decision (e.g. after the vocabulary changed)"""
+        self._generation += 1
+        self._cache.clear()
+    
+    async def infer(self, keys: Sequence[FieldKey]) -> List[FieldDecision]:
+        """
+        Decisions for a chunk of fields, in input order
+        
+        Cached decisions are reused; rule misses in the chunk go to the
+        vector stage as one embed call and one search call.
+        
+        Args:
+            keys: (source system, canonical entity, source field) per field
+        
+        Returns:
+            One FieldDecision per key
+        """
+        version = self.version
+        decisions: Dict[FieldKey, FieldDecision] = {}
+        unresolved: Dict[FieldKey, str] = {}
+        
+        for key in keys:
+            if key in decisions or key in unresolved:
+                continue
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(key)
+                decisions[key] = cached[1]
+                self.stats['cache_hits'] += 1
+                continue
+            
+            normalized = normalize_field_name(key[2])
+            decision = self.rules.resolve(normalized)
+            if decision is not None:
+                decisions[key] = decision
+                self.stats['rule_resolved'] += 1
+                self._remember(key, version, decision)
+            else:
+                unresolved[key] = normalized
+        
+        if unresolved:
+            resolved, cacheable = await self._resolve_by_vector(unresolved)
+            for key, decision in resolved.items():
+                decisions[key] = decision
+                if cacheable:
+                    self._remember(key, version, decision)
+        
+        return [decisions[key] for key in keys]
+    
+    async def _resolve_by_vector(self, unresolved: Dict[FieldKey, str]) -> Tuple[Dict[FieldKey, FieldDecision], bool]:
+        """
+        Returns:
+            (decisions, cacheable) - not cacheable when the vector stage failed
+        """
+        results: Dict[FieldKey, FieldDecision] = {}
+        cacheable = True
+        
+        if self.embedder is not None and self.vector_index is not None:
+            keys = list(unresolved)
+            texts = [f"{entity} {unresolved[(system, entity, field)]}".strip() for system, entity, field in keys]
+            try:
+                vectors = await self.embedder.embed(texts)
+                neighbours = await self.vector_index.search(vectors, top_k=1)
+                self.stats['vector_batches'] += 1
+                for key, matches in zip(keys, neighbours):
+                    if matches and matches[0][1] >= self.min_similarity:
+                        canonical, score = matches[0]
+                        results[key] = FieldDecision(canonical, round(float(score), 4), METHOD_VECTOR, canonical)
+                        self.stats['vector_resolved'] += 1
+            except Exception as e:
+                logger.warning(f"Vector field lookup failed for {len(keys)} fields, using rule fallback: {e}")
+                cacheable = False
+        
+        for key, normalized in unresolved.items():
+            if key not in results:
+                results[key] = self.rules.fallback(normalized)
+                self.stats['fallback'] += 1
+        return results, cacheable
+    
+    def _remember(self, key: FieldKey, version: str, decision: FieldDecision):
+        self._cache[key] = (version, decision)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
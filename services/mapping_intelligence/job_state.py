@@ -3,18 +3,54 @@ Job State Management with Redis
 - Track job status (pending/running/completed/failed)
 - Tenant-scoped isolation
 - Atomic semaphore for concurrent job limits
+- Per-tenant job registry with indexes, so listing and reconciliation
+  never need KEYS:
+    job:registry:tenant:{t}:jobs          hash  job_id -> JSON state
+    job:index:tenant:{t}:started          zset  job_id -> start (or creation) time
+    job:index:tenant:{t}:status:{status}  zset  job_id -> start time, one per status
+                                          (terminal statuses: time of the last write)
+  Every write updates the registry and all indexes in one MULTI.
+  Jobs from before the registry (job:state:tenant:{t}:job:{j} keys) are
+  moved into it by a one-time SCAN the first time a client is used.
 """
 
 import json
 import redis
-from datetime import datetime
-from typing import Dict, Optional
+import weakref
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 MAX_CONCURRENT_JOBS_PER_TENANT = 5
 
+JOB_STATUSES = ('pending', 'running', 'completed', 'failed')
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Terminal jobs are dropped from the registry this long after their last
+# write (as the previous per-job keys expired)
+JOB_RETENTION_SECONDS = 86400
+# A tenant's registry expires after this long without any job writes
+REGISTRY_IDLE_TTL_SECONDS = 7 * 86400
+PRUNE_BATCH = 100
+READ_CHUNK = 1000
+
+_LEGACY_KEY_PREFIX = "job:state:tenant:"
+_INDEX_BACKFILLED = "job:index:__backfilled__"
+# Clients this process has already checked for legacy job keys
+_backfilled_clients: "weakref.WeakSet[redis.Redis]" = weakref.WeakSet()
+
+
+def _epoch(timestamp: Optional[str]) -> Optional[float]:
+    """Naive UTC isoformat timestamp -> unix seconds"""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return None
+
 
 class BulkMappingJobState:
     def __init__(self, redis_client: Optional[redis.Redis] = None):
@@ -23,6 +59,8 @@ class BulkMappingJobState:
         
         if not self.redis_client:
             raise RuntimeError("Redis client is required for job state management")
+        
+        self._ensure_index()
     
     def _get_job_key(self, tenant_id: str, job_id: str) -> str:
         return f"job:state:tenant:{tenant_id}:job:{job_id}"
@@ -30,6 +68,15 @@ class BulkMappingJobState:
     def _get_semaphore_key(self, tenant_id: str) -> str:
         return f"job:semaphore:tenant:{tenant_id}"
     
+    def _get_registry_key(self, tenant_id: str) -> str:
+        return f"job:registry:tenant:{tenant_id}:jobs"
+    
+    def _get_started_index_key(self, tenant_id: str) -> str:
+        return f"job:index:tenant:{tenant_id}:started"
+    
+    def _get_status_index_key(self, tenant_id: str, status: str) -> str:
+        return f"job:index:tenant:{tenant_id}:status:{status}"
+    
     def try_reserve_job_slot(self, tenant_id: str) -> bool:
         """Atomic semaphore reservation using INCR"""
         key = self._get_semaphore_key(tenant_id)
@@ -58,18 +105,116 @@ class BulkMappingJobState:
         return int(count) if count else 0
     
     def save_job_state(self, tenant_id: str, job_id: str, state: Dict):
-        """Save job state to Redis"""
-        key = self._get_job_key(tenant_id, job_id)
+        """Save job state to Redis, updating the registry indexes atomically"""
         state['last_updated'] = datetime.utcnow().isoformat()
-        self.redis_client.setex(key, 86400, json.dumps(state))
-        logger.debug(f"Saved job state for {tenant_id}:{job_id}: {state.get('status')}")
+        status = state.get('status')
+        
+        pipe = self.redis_client.pipeline(transaction=True)
+        self._queue_registry_write(pipe, tenant_id, job_id, state)
+        pipe.execute()
+        logger.debug(f"Saved job state for {tenant_id}:{job_id}: {status}")
+        
+        if status in TERMINAL_STATUSES:
+            self.prune_expired_jobs(tenant_id)
+    
+    def _queue_registry_write(self, pipe, tenant_id: str, job_id: str, state: Dict):
+        """Queue the registry and index updates for one job state on a MULTI pipeline"""
+        status = state.get('status')
+        last_updated = _epoch(state.get('last_updated')) or datetime.now(timezone.utc).timestamp()
+        score = _epoch(state.get('started_at')) or _epoch(state.get('created_at')) or last_updated
+        
+        pipe.hset(self._get_registry_key(tenant_id), job_id, json.dumps(state))
+        pipe.zadd(self._get_started_index_key(tenant_id), {job_id: score})
+        for other in JOB_STATUSES:
+            if other != status:
+                pipe.zrem(self._get_status_index_key(tenant_id, other), job_id)
+        if status in TERMINAL_STATUSES:
+            # Retention is measured from completion, so prune by last write
+            pipe.zadd(self._get_status_index_key(tenant_id, status), {job_id: last_updated})
+        elif status:
+            pipe.zadd(self._get_status_index_key(tenant_id, status), {job_id: score})
+        # Jobs written before the registry existed lived in their own key
+        pipe.delete(self._get_job_key(tenant_id, job_id))
+        for key in self._index_keys(tenant_id, status):
+            pipe.expire(key, REGISTRY_IDLE_TTL_SECONDS)
+    
+    def _ensure_index(self):
+        """Backfill the registry from pre-existing per-job keys, once."""
+        if self.redis_client in _backfilled_clients:
+            return
+        if not self.redis_client.exists(_INDEX_BACKFILLED):
+            self.backfill_index()
+        _backfilled_clients.add(self.redis_client)
+    
+    def backfill_index(self) -> int:
+        """
+        Move legacy job:state:tenant:*:job:* keys into the registry using SCAN.
+        
+        Jobs already in a registry were written since and keep that state.
+        Safe to run repeatedly; returns the number of jobs migrated.
+        """
+        migrated = 0
+        for key in self.redis_client.scan_iter(match=f"{_LEGACY_KEY_PREFIX}*:job:*", count=500):
+            key = key.decode() if isinstance(key, bytes) else key
+            tenant_id, _, job_id = key[len(_LEGACY_KEY_PREFIX):].rpartition(":job:")
+            if self._migrate_legacy_job(tenant_id, job_id):
+                migrated += 1
+        self.redis_client.set(_INDEX_BACKFILLED, "1")
+        if migrated:
+            logger.info(f"Migrated {migrated} legacy job states into the job registry")
+        return migrated
+    
+    def _migrate_legacy_job(self, tenant_id: str, job_id: str) -> bool:
+        registry = self._get_registry_key(tenant_id)
+        legacy_key = self._get_job_key(tenant_id, job_id)
+        with self.redis_client.pipeline(transaction=True) as pipe:
+            try:
+                # A concurrent save_job_state wins; it also drops the legacy key
+                pipe.watch(registry, legacy_key)
+                data = pipe.get(legacy_key)
+                if data is None or pipe.hexists(registry, job_id):
+                    pipe.unwatch()
+                    return False
+                state = json.loads(data)
+                pipe.multi()
+                self._queue_registry_write(pipe, tenant_id, job_id, state)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+            except ValueError as e:
+                logger.warning(f"Skipping unreadable legacy job state {legacy_key}: {e}")
+                return False
+    
+    def _index_keys(self, tenant_id: str, extra_status: Optional[str] = None) -> List[str]:
+        statuses = list(JOB_STATUSES)
+        if extra_status and extra_status not in statuses:
+            statuses.append(extra_status)
+        return [self._get_registry_key(tenant_id), self._get_started_index_key(tenant_id)] + [
+            self._get_status_index_key(tenant_id, status) for status in statuses
+        ]
     
     def get_job_state(self, tenant_id: str, job_id: str) -> Optional[Dict]:
         """Get job state from Redis"""
-        key = self._get_job_key(tenant_id, job_id)
-        data = self.redis_client.get(key)
+        data = self.redis_client.hget(self._get_registry_key(tenant_id), job_id)
+        if data is None:
+            data = self.redis_client.get(self._get_job_key(tenant_id, job_id))
         return json.loads(data) if data else None
     
+    def get_job_states(self, tenant_id: str, job_ids: Iterable[str]) -> List[Dict]:
+        """
+        Bulk read job states with pipelined HMGETs, in job_ids order.
+        Jobs that no longer exist are skipped.
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        registry = self._get_registry_key(tenant_id)
+        pipe = self.redis_client.pipeline(transaction=False)
+        for i in range(0, len(job_ids), READ_CHUNK):
+            pipe.hmget(registry, job_ids[i:i + READ_CHUNK])
+        return [json.loads(data) for chunk in pipe.execute() for data in chunk if data]
+    
     def update_status(self, tenant_id: str, job_id: str, status: str):
         """Update job status - ALWAYS release semaphore on completion/failure"""
         state = self.get_job_state(tenant_id, job_id)
@@ -140,18 +285,130 @@ class BulkMappingJobState:
             logger.debug(f"Job {job_id} progress: {processed}/{total}")
     
     def delete_job_state(self, tenant_id: str, job_id: str):
-        """Delete job state from Redis"""
-        key = self._get_job_key(tenant_id, job_id)
-        self.redis_client.delete(key)
+        """Delete job state (and its index entries) from Redis"""
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.hdel(self._get_registry_key(tenant_id), job_id)
+        pipe.zrem(self._get_started_index_key(tenant_id), job_id)
+        for status in JOB_STATUSES:
+            pipe.zrem(self._get_status_index_key(tenant_id, status), job_id)
+        pipe.delete(self._get_job_key(tenant_id, job_id))
+        pipe.execute()
         logger.info(f"Deleted job state for {tenant_id}:{job_id}")
     
-    def get_all_jobs_for_tenant(self, tenant_id: str) -> list:
-        """Get all job keys for a tenant"""
-        pattern = f"job:state:tenant:{tenant_id}:job:*"
-        keys = self.redis_client.keys(pattern)
+    def get_all_jobs_for_tenant(self, tenant_id: str, limit: Optional[int] = None) -> list:
+        """Get all jobs for a tenant, most recently started first"""
+        end = -1 if limit is None else max(limit, 1) - 1
+        job_ids = self.redis_client.zrevrange(self._get_started_index_key(tenant_id), 0, end)
+        return self.get_job_states(tenant_id, job_ids)
+    
+    def get_job_ids_by_status(
+        self,
+        tenant_id: str,
+        statuses: Iterable[str],
+        started_before: Optional[float] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Job IDs per status from the status indexes
+        
+        Args:
+            tenant_id: Tenant identifier
+            statuses: Statuses to read
+            started_before: Only jobs started before this unix time
+        
+        Returns:
+            {status: [job_id, ...]} (index entries, not yet checked against state)
+        """
+        statuses = list(statuses)
+        pipe = self.redis_client.pipeline(transaction=False)
+        for status in statuses:
+            pipe.zrangebyscore(
+                self._get_status_index_key(tenant_id, status),
+                '-inf',
+                '+inf' if started_before is None else f"({started_before}"
+            )
+        return {status: ids for status, ids in zip(statuses, pipe.execute())}
+    
+    def get_jobs_by_status(
+        self,
+        tenant_id: str,
+        statuses: Iterable[str],
+        started_before: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Jobs currently in any of the given statuses
+        
+        Index entries whose job is gone or has a different status (written
+        outside save_job_state) are dropped from the index as they are found.
+        """
+        statuses = list(statuses)
+        ids_by_status = self.get_job_ids_by_status(tenant_id, statuses, started_before)
+        job_ids = [job_id for ids in ids_by_status.values() for job_id in ids]
+        if not job_ids:
+            return []
+        
+        registry = self._get_registry_key(tenant_id)
+        pipe = self.redis_client.pipeline(transaction=False)
+        for i in range(0, len(job_ids), READ_CHUNK):
+            pipe.hmget(registry, job_ids[i:i + READ_CHUNK])
+        raw = [data for chunk in pipe.execute() for data in chunk]
+        
         jobs = []
-        for key in keys:
-            data = self.redis_client.get(key)
-            if data:
-                jobs.append(json.loads(data))
+        stale = []
+        position = 0
+        for status, ids in ids_by_status.items():
+            for job_id in ids:
+                data = raw[position]
+                position += 1
+                job = json.loads(data) if data else None
+                if job is None or job.get('status') != status:
+                    stale.append((status, job_id))
+                else:
+                    jobs.append(job)
+        if stale:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for status, job_id in stale:
+                pipe.zrem(self._get_status_index_key(tenant_id, status), job_id)
+            pipe.execute()
+            logger.warning(f"Dropped {len(stale)} stale job index entries for tenant {tenant_id}")
         return jobs
+    
+    def count_jobs_by_status(self, tenant_id: str) -> Dict[str, int]:
+        """Index sizes per status (O(1) per status)"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for status in JOB_STATUSES:
+            pipe.zcard(self._get_status_index_key(tenant_id, status))
+        return dict(zip(JOB_STATUSES, pipe.execute()))
+    
+    def prune_expired_jobs(
+        self,
+        tenant_id: str,
+        retention_seconds: int = JOB_RETENTION_SECONDS,
+        batch: int = PRUNE_BATCH
+    ) -> int:
+        """
+        Remove terminal jobs last written more than retention_seconds ago
+        
+        Returns:
+            Number of jobs removed
+        """
+        cutoff = datetime.now(timezone.utc).timestamp() - retention_seconds
+        expired = []
+        for status in TERMINAL_STATUSES:
+            expired.extend(
+                (status, job_id) for job_id in self.redis_client.zrangebyscore(
+                    self._get_status_index_key(tenant_id, status), '-inf', cutoff, start=0, num=batch
+                )
+            )
+        if not expired:
+            return 0
+        
+        pipe = self.redis_client.pipeline(transaction=True)
+        registry = self._get_registry_key(tenant_id)
+        started = self._get_started_index_key(tenant_id)
+        for status, job_id in expired:
+            pipe.hdel(registry, job_id)
+            pipe.zrem(started, job_id)
+            pipe.zrem(self._get_status_index_key(tenant_id, status), job_id)
+        pipe.execute()
+        logger.debug(f"Pruned {len(expired)} expired jobs for tenant {tenant_id}")
+        return len(expired)
@@ -9,6 +9,9 @@ from services.mapping_intelligence.job_state import BulkMappingJobState
 
 logger = logging.getLogger(__name__)
 
+# Fields per batched RAG inference call
+INFERENCE_CHUNK_SIZE = 500
+
 
 async def generate_bulk_mappings_job(
     job_id: str,
@@ -90,61 +93,66 @@ async def generate_bulk_mappings_job(
             current_state['connector_definitions'] = connector_definition_ids
             job_state.save_job_state(tenant_id, job_id, current_state)
         
-        # Process each field with RAG-powered mapping
-        for i, field in enumerate(fields):
-            try:
-                # Get mapping proposal from RAG
-                proposal = await rag_service.get_mapping_proposal(
-                    source_field=field['source_field'],
-                    context={
+        # Process fields in chunks: one batched RAG inference call per chunk
+        chunk_size = options.get('inference_chunk_size', INFERENCE_CHUNK_SIZE)
+        for chunk_start in range(0, total_fields, chunk_size):
+            chunk = fields[chunk_start:chunk_start + chunk_size]
+            proposals = await rag_service.get_mapping_proposals([
+                (
+                    field['source_field'],
+                    {
                         'connector_name': field['connector_name'],
                         'canonical_entity': field['canonical_entity'],
                         'tenant_id': tenant_id
                     }
                 )
-                
-                # ✅ PERSIST the proposal to database
-                async with AsyncSessionLocal() as session:
-                    update_query = text("""
-                        UPDATE field_mappings
-                        SET 
-                            suggested_canonical_field = :canonical_field,
-                            confidence_score = :confidence,
-                            status = CASE 
-                                WHEN :confidence >= :threshold THEN 'approved'
-                                ELSE 'pending'
-                            END,
-                            llm_reasoning = :reasoning,
-                            updated_at = NOW()
-                        WHERE id = :field_id
-                    """)
-                    await session.execute(update_query, {
-                        'field_id': field['id'],
-                        'canonical_field': proposal.canonical_field,
-                        'confidence': proposal.confidence_score,
-                        'threshold': options.get('confidence_threshold', 0.8),
-                        'reasoning': proposal.reasoning
-                    })
-                    await session.commit()
-                
-                if proposal.confidence_score >= options.get('confidence_threshold', 0.8):
-                    successful_mappings += 1
-                else:
+                for field in chunk
+            ])
+            
+            for i, (field, proposal) in enumerate(zip(chunk, proposals), start=chunk_start):
+                try:
+                    # ✅ PERSIST the proposal to database
+                    async with AsyncSessionLocal() as session:
+                        update_query = text("""
+                            UPDATE field_mappings
+                            SET 
+                                suggested_canonical_field = :canonical_field,
+                                confidence_score = :confidence,
+                                status = CASE 
+                                    WHEN :confidence >= :threshold THEN 'approved'
+                                    ELSE 'pending'
+                                END,
+                                llm_reasoning = :reasoning,
+                                updated_at = NOW()
+                            WHERE id = :field_id
+                        """)
+                        await session.execute(update_query, {
+                            'field_id': field['id'],
+                            'canonical_field': proposal.canonical_field,
+                            'confidence': proposal.confidence_score,
+                            'threshold': options.get('confidence_threshold', 0.8),
+                            'reasoning': proposal.reasoning
+                        })
+                        await session.commit()
+                    
+                    if proposal.confidence_score >= options.get('confidence_threshold', 0.8):
+                        successful_mappings += 1
+                    else:
+                        failed_mappings += 1
+                    
+                    # ✅ FIX: Check if job_state exists before updating
+                    state = job_state.get_job_state(tenant_id, job_id)
+                    if state is None:
+                        raise RuntimeError(f"Job state lost for job {job_id}")
+                    
+                    state['processed_fields'] = i + 1
+                    state['successful_mappings'] = successful_mappings
+                    state['failed_mappings'] = failed_mappings
+                    job_state.save_job_state(tenant_id, job_id, state)
+                    
+                except Exception as e:
+                    logger.error(f"Field mapping failed for field {field['id']}: {e}")
                     failed_mappings += 1
-                
-                # ✅ FIX: Check if job_state exists before updating
-                state = job_state.get_job_state(tenant_id, job_id)
-                if state is None:
-                    raise RuntimeError(f"Job state lost for job {job_id}")
-                
-                state['processed_fields'] = i + 1
-                state['successful_mappings'] = successful_mappings
-                state['failed_mappings'] = failed_mappings
-                job_state.save_job_state(tenant_id, job_id, state)
-                
-            except Exception as e:
-                logger.error(f"Field mapping failed for field {field['id']}: {e}")
-                failed_mappings += 1
         
         job_state.update_status(tenant_id, job_id, 'completed')
         
@@ -5,33 +5,82 @@ Features:
 - WebSocket/SSE progress broadcasting
 - Redis pub/sub for multi-worker coordination
 - ETA calculation based on processing rate
+- Per-job publish rate limiting with coalescing (latest update wins); a
+  held-back update is sent when the job's rate window closes
+- Last progress snapshot kept in Redis so late joiners start from current state
+- Non-blocking listeners on redis.asyncio: one pub/sub connection per
+  process, fanned out to a private latest-only slot per listener
 """
 
 import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = frozenset({'completed', 'failed'})
+SNAPSHOT_TTL_SECONDS = 86400
+
+
+def _channel_name(tenant_id: str, job_id: str) -> str:
+    return f"job:progress:tenant:{tenant_id}:job:{job_id}"
+
+
+def _snapshot_key(tenant_id: str, job_id: str) -> str:
+    return f"job:progress:snapshot:tenant:{tenant_id}:job:{job_id}"
+
+
+def _is_terminal(data: Optional[Dict]) -> bool:
+    return bool(data) and data.get('status') in TERMINAL_STATUSES
+
 
 class ProgressBroadcaster:
     """
     Broadcasts job progress updates via Redis pub/sub
+    
+    Args:
+        redis_client: Sync Redis client used by publishers
+        async_redis_client: redis.asyncio client used by listeners
+            (created from the environment on first listen if omitted)
+        min_publish_interval: Minimum seconds between published updates of
+            one job; updates in between are coalesced and the newest is sent
+            when the interval ends (terminal statuses are always published
+            immediately)
+        listener_min_interval: Minimum seconds between updates delivered
+            to one listener
     """
     
-    def __init__(self, redis_client=None):
+    def __init__(
+        self,
+        redis_client=None,
+        async_redis_client=None,
+        min_publish_interval: float = 0.5,
+        listener_min_interval: float = 0.25
+    ):
         from shared.redis_client import get_redis_client
         self.redis_client = redis_client or get_redis_client()
-        self.pubsub = None
+        self.async_redis_client = async_redis_client
+        self.min_publish_interval = min_publish_interval
+        self.listener_min_interval = listener_min_interval
         
-        if self.redis_client:
-            self.pubsub = self.redis_client.pubsub()
+        self._lock = threading.Lock()
+        # Held from the publish decision through the Redis write, so a
+        # trailing-edge send can never land after a newer update
+        self._send_lock = threading.RLock()
+        self._last_published: Dict[str, float] = {}
+        self._pending: Dict[str, Dict] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._sync_subscriptions: Dict[str, List] = {}
+        self._channel: Optional["ProgressChannel"] = None
+        self.stats = {'published': 0, 'coalesced': 0}
     
     def _get_channel_name(self, tenant_id: str, job_id: str) -> str:
         """Get Redis pub/sub channel name for a job"""
-        return f"job:progress:tenant:{tenant_id}:job:{job_id}"
+        return _channel_name(tenant_id, job_id)
     
     def publish_progress(
         self,
@@ -40,11 +89,17 @@ class ProgressBroadcaster:
         processed: int,
         total: int,
         status: str,
-        metadata: Optional[Dict] = None
-    ):
+        metadata: Optional[Dict] = None,
+        force: bool = False
+    ) -> bool:
         """
         Publish progress update to Redis channel
         
+        Updates arriving within min_publish_interval of the previous publish
+        for the same job are held back; only the newest one is kept and a
+        timer sends it when the interval ends (or earlier, with the next
+        publish or flush()).
+        
         Args:
             tenant_id: Tenant identifier
             job_id: Job identifier
@@ -52,10 +107,14 @@ class ProgressBroadcaster:
             total: Total number of items
             status: Current job status
             metadata: Optional additional metadata
+            force: Publish even if rate limited
+        
+        Returns:
+            True if the update was published, False if coalesced or Redis is unavailable
         """
         if not self.redis_client:
             logger.warning("Redis not available, skipping progress broadcast")
-            return
+            return False
         
         channel = self._get_channel_name(tenant_id, job_id)
         
@@ -66,7 +125,9 @@ class ProgressBroadcaster:
             'total': total,
             'status': status,
             'progress_percentage': int((processed / total * 100)) if total > 0 else 0,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.utcnow().isoformat(),
+            # Ordering key: listeners drop anything not newer than what they have
+            'seq': time.time_ns()
         }
         
         if metadata:
@@ -77,16 +138,103 @@ class ProgressBroadcaster:
             progress_data['eta_seconds'] = eta
             progress_data['eta_human'] = self._format_eta(eta)
         
+        terminal = status in TERMINAL_STATUSES
+        with self._send_lock:
+            now = time.monotonic()
+            with self._lock:
+                last = self._last_published.get(channel)
+                if not (force or terminal or last is None or now - last >= self.min_publish_interval):
+                    self._pending[channel] = progress_data
+                    self.stats['coalesced'] += 1
+                    if channel not in self._timers:
+                        self._start_timer(channel, last + self.min_publish_interval - now)
+                    return False
+                self._pending.pop(channel, None)
+                self._cancel_timer(channel)
+                if terminal:
+                    self._last_published.pop(channel, None)
+                else:
+                    self._last_published[channel] = now
+            
+            return self._send(tenant_id, job_id, progress_data)
+    
+    def flush(self, tenant_id: Optional[str] = None, job_id: Optional[str] = None) -> int:
+        """
+        Publish held-back updates (for one job, or all jobs)
+        
+        Returns:
+            Number of updates published
+        """
+        with self._send_lock:
+            with self._lock:
+                if tenant_id is not None and job_id is not None:
+                    channel = self._get_channel_name(tenant_id, job_id)
+                    pending = [self._pending.pop(channel)] if channel in self._pending else []
+                else:
+                    pending = list(self._pending.values())
+                    self._pending.clear()
+                now = time.monotonic()
+                for data in pending:
+                    channel = self._get_channel_name(data['tenant_id'], data['job_id'])
+                    self._cancel_timer(channel)
+                    self._last_published[channel] = now
+            return sum(1 for data in pending if self._send(data['tenant_id'], data['job_id'], data))
+    
+    def _start_timer(self, channel: str, delay: float):
+        """Schedule the trailing-edge send of a job's held-back update (lock held)"""
+        timer = threading.Timer(max(delay, 0.0), self._publish_pending, args=(channel,))
+        timer.daemon = True
+        self._timers[channel] = timer
+        timer.start()
+    
+    def _cancel_timer(self, channel: str):
+        """Drop a job's trailing-edge timer, if any (lock held)"""
+        timer = self._timers.pop(channel, None)
+        if timer is not None:
+            timer.cancel()
+    
+    def _publish_pending(self, channel: str):
+        """Timer callback: send the held-back update once the rate window has closed"""
+        with self._send_lock:
+            with self._lock:
+                if self._timers.get(channel) is not threading.current_thread():
+                    return  # Superseded by a publish or flush
+                del self._timers[channel]
+                data = self._pending.pop(channel, None)
+                if data is None:
+                    return
+                self._last_published[channel] = time.monotonic()
+            self._send(data['tenant_id'], data['job_id'], data)
+    
+    def _send(self, tenant_id: str, job_id: str, progress_data: Dict) -> bool:
+        """Store the snapshot and publish, in one round trip"""
+        message = json.dumps(progress_data)
         try:
-            self.redis_client.publish(channel, json.dumps(progress_data))
-            logger.debug(f"Published progress for job {job_id}: {processed}/{total}")
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.set(_snapshot_key(tenant_id, job_id), message, ex=SNAPSHOT_TTL_SECONDS)
+            pipe.publish(self._get_channel_name(tenant_id, job_id), message)
+            pipe.execute()
+            self.stats['published'] += 1
+            logger.debug(f"Published progress for job {job_id}: {progress_data['processed']}/{progress_data['total']}")
+            return True
         except Exception as e:
             logger.error(f"Failed to publish progress: {e}")
+            return False
+    
+    def get_snapshot(self, tenant_id: str, job_id: str) -> Optional[Dict]:
+        """Last published progress of a job, or None"""
+        if not self.redis_client:
+            return None
+        data = self.redis_client.get(_snapshot_key(tenant_id, job_id))
+        return json.loads(data) if data else None
     
     def subscribe_to_job(self, tenant_id: str, job_id: str):
         """
         Subscribe to progress updates for a specific job
         
+        Each call gets its own pub/sub object, so unsubscribing one job
+        never affects listeners of another.
+        
         Args:
             tenant_id: Tenant identifier
             job_id: Job identifier
@@ -94,22 +242,23 @@ class ProgressBroadcaster:
         Returns:
             Redis pubsub subscription
         """
-        if not self.pubsub:
+        if not self.redis_client:
             logger.warning("Redis pub/sub not available")
             return None
         
         channel = self._get_channel_name(tenant_id, job_id)
-        self.pubsub.subscribe(channel)
+        pubsub = self.redis_client.pubsub()
+        pubsub.subscribe(channel)
+        self._sync_subscriptions.setdefault(channel, []).append(pubsub)
         logger.info(f"Subscribed to job progress: {channel}")
-        return self.pubsub
+        return pubsub
     
     def unsubscribe_from_job(self, tenant_id: str, job_id: str):
         """Unsubscribe from job progress updates"""
-        if not self.pubsub:
-            return
-        
         channel = self._get_channel_name(tenant_id, job_id)
-        self.pubsub.unsubscribe(channel)
+        for pubsub in self._sync_subscriptions.pop(channel, []):
+            pubsub.unsubscribe(channel)
+            pubsub.close()
         logger.info(f"Unsubscribed from job progress: {channel}")
     
     def _calculate_eta(
@@ -176,34 +325,264 @@ class ProgressBroadcaster:
             minutes = (seconds % 3600) // 60
             return f"{hours}h {minutes}m"
     
+    def _get_progress_channel(self) -> Optional["ProgressChannel"]:
+        if self._channel is None:
+            if self.async_redis_client is None:
+                try:
+                    from shared.redis_client import create_async_redis_client
+                    self.async_redis_client = create_async_redis_client()
+                except Exception as e:
+                    logger.warning(f"Async Redis unavailable for progress listeners: {e}")
+                    return None
+            self._channel = ProgressChannel(self.async_redis_client, min_interval=self.listener_min_interval)
+        return self._channel
+    
     async def listen_for_updates(self, tenant_id: str, job_id: str, callback):
         """
         Async listener for job progress updates
         
+        Starts with the current snapshot (if any) and returns once the job
+        reaches a terminal status. Never blocks the event loop.
+        
         Args:
             tenant_id: Tenant identifier
             job_id: Job identifier
             callback: Async callback function to process updates
         """
-        if not self.pubsub:
+        channel = self._get_progress_channel()
+        if channel is None:
             logger.warning("Redis pub/sub not available for listening")
             return
         
-        self.subscribe_to_job(tenant_id, job_id)
-        
+        subscription = await channel.subscribe(tenant_id, job_id)
         try:
-            for message in self.pubsub.listen():
-                if message['type'] == 'message':
-                    try:
-                        data = json.loads(message['data'])
-                        await callback(data)
-                        
-                        if data.get('status') in ['completed', 'failed']:
-                            logger.info(f"Job {job_id} finished, stopping listener")
-                            break
-                    
-                    except Exception as e:
-                        logger.error(f"Error processing progress message: {e}")
-        
+            async for data in subscription:
+                try:
+                    await callback(data)
+                except Exception as e:
+                    logger.error(f"Error processing progress message: {e}")
+            logger.info(f"Job {job_id} finished, stopping listener")
         finally:
-            self.unsubscribe_from_job(tenant_id, job_id)
+            await channel.unsubscribe(subscription)
+    
+    async def close(self):
+        with self._lock:
+            for channel in list(self._timers):
+                self._cancel_timer(channel)
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+
+
+class ProgressSubscription:
+    """
+    One listener's view of a job's progress.
+    
+    Holds only the newest undelivered update: a listener that falls behind
+    skips intermediate updates instead of queueing them, and receives at
+    most one update per min_interval (terminal updates are never delayed).
+    Iterating ends after the terminal update.
+    """
+    
+    def __init__(self, channel_name: str, min_interval: float = 0.0):
+        self.channel_name = channel_name
+        self.min_interval = min_interval
+        self.closed = False
+        self.skipped = 0
+        self._latest: Optional[Dict] = None
+        self._last_seq = 0
+        self._last_delivery = float('-inf')
+        self._updated = asyncio.Event()
+        self._terminal = asyncio.Event()
+    
+    def offer(self, data: Dict) -> None:
+        """Accept an update if it is newer than anything seen (called by ProgressChannel)"""
+        seq = data.get('seq', 0)
+        if self.closed or seq <= self._last_seq:
+            return
+        self._last_seq = seq
+        if self._latest is not None:
+            self.skipped += 1
+        self._latest = data
+        self._updated.set()
+        if _is_terminal(data):
+            self._terminal.set()
+    
+    def close(self) -> None:
+        self.closed = True
+        self._updated.set()
+    
+    async def get(self) -> Optional[Dict]:
+        """Wait for the next update; None once closed"""
+        while self._latest is None:
+            if self.closed:
+                return None
+            self._updated.clear()
+            await self._updated.wait()
+        
+        loop = asyncio.get_running_loop()
+        delay = self._last_delivery + self.min_interval - loop.time()
+        if delay > 0 and not self._terminal.is_set():
+            try:
+                await asyncio.wait_for(self._terminal.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        
+        data, self._latest = self._latest, None
+        self._last_delivery = loop.time()
+        if _is_terminal(data):
+            self.closed = True
+        return data
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> Dict:
+        data = await self.get()
+        if data is None:
+            raise StopAsyncIteration
+        return data
+
+
+class ProgressChannel:
+    """
+    Fans one redis.asyncio pub/sub connection out to many ProgressSubscriptions.
+    
+    Redis channels are subscribed on first use and unsubscribed when their
+    last listener leaves. A background reader task dispatches messages; it
+    never blocks the loop and reconnects with backoff on errors.
+    
+    Args:
+        redis_client: redis.asyncio client
+        min_interval: Default per-listener delivery interval
+    """
+    
+    def __init__(self, redis_client, min_interval: float = 0.25):
+        self.redis_client = redis_client
+        self.min_interval = min_interval
+        self._subscriptions: Dict[str, Set[ProgressSubscription]] = {}
+        self._snapshot_keys: Dict[str, str] = {}
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._active = asyncio.Event()
+        self._closed = False
+    
+    @property
+    def listener_count(self) -> int:
+        return sum(len(subs) for subs in self._subscriptions.values())
+    
+    async def subscribe(self, tenant_id: str, job_id: str, min_interval: Optional[float] = None) -> ProgressSubscription:
+        """Subscribe a new listener; it starts with the job's current snapshot"""
+        name = _channel_name(tenant_id, job_id)
+        subscription = ProgressSubscription(name, self.min_interval if min_interval is None else min_interval)
+        
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = self.redis_client.pubsub()
+            listeners = self._subscriptions.setdefault(name, set())
+            listeners.add(subscription)
+            if len(listeners) == 1:
+                self._snapshot_keys[name] = _snapshot_key(tenant_id, job_id)
+                await self._pubsub.subscribe(name)
+            self._active.set()
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+        
+        # Read the snapshot after subscribing so no update falls in between;
+        # seq ordering drops whichever copy arrives second
+        snapshot = await self.redis_client.get(_snapshot_key(tenant_id, job_id))
+        if snapshot:
+            subscription.offer(json.loads(snapshot))
+        return subscription
+    
+    async def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        subscription.close()
+        async with self._lock:
+            listeners = self._subscriptions.get(subscription.channel_name)
+            if not listeners or subscription not in listeners:
+                return
+            listeners.discard(subscription)
+            if not listeners:
+                del self._subscriptions[subscription.channel_name]
+                del self._snapshot_keys[subscription.channel_name]
+                try:
+                    await self._pubsub.unsubscribe(subscription.channel_name)
+                except Exception as e:
+                    logger.warning(f"Failed to unsubscribe {subscription.channel_name}: {e}")
+    
+    async def _read(self) -> None:
+        backoff = 0.1
+        while not self._closed:
+            if not self._subscriptions:
+                self._active.clear()
+                await self._active.wait()
+                continue
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                backoff = 0.1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Progress pub/sub read failed, retrying in {backoff:.1f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+                await self._resubscribe()
+                continue
+            
+            if not message or message.get('type') != 'message':
+                continue
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            listeners = self._subscriptions.get(channel)
+            if not listeners:
+                continue
+            try:
+                data = json.loads(message['data'])
+            except (TypeError, ValueError) as e:
+                logger.error(f"Error processing progress message: {e}")
+                continue
+            for subscription in list(listeners):
+                subscription.offer(data)
+    
+    async def _resubscribe(self) -> None:
+        """Reopen the pub/sub connection and resubscribe every channel"""
+        async with self._lock:
+            try:
+                if self._pubsub is not None:
+                    await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = self.redis_client.pubsub()
+            try:
+                if self._subscriptions:
+                    await self._pubsub.subscribe(*self._subscriptions)
+                    # Updates published while disconnected are only in the snapshots
+                    names = list(self._subscriptions)
+                    snapshots = await self.redis_client.mget([self._snapshot_keys[name] for name in names])
+                    for name, snapshot in zip(names, snapshots):
+                        if snapshot:
+                            data = json.loads(snapshot)
+                            for subscription in list(self._subscriptions.get(name, ())):
+                                subscription.offer(data)
+            except Exception as e:
+                logger.warning(f"Progress pub/sub resubscribe failed: {e}")
+    
+    async def close(self) -> None:
+        self._closed = True
+        self._active.set()
+        for listeners in self._subscriptions.values():
+            for subscription in listeners:
+                subscription.close()
+        self._subscriptions.clear()
+        self._snapshot_keys.clear()
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
@@ -4,11 +4,28 @@ RAG Service for Mapping Intelligence
 Provides AI-powered field mapping proposals using RAG (Retrieval Augmented Generation).
 """
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
+from services.mapping_intelligence.field_inference import (
+    FieldDecision,
+    FieldInferenceEngine,
+    calculate_confidence,
+    normalize_field_name,
+)
+
 logger = logging.getLogger(__name__)
 
+_inference_engine: Optional[FieldInferenceEngine] = None
+
+
+def get_field_inference_engine() -> FieldInferenceEngine:
+    """Process-wide inference engine, so decisions are cached across jobs"""
+    global _inference_engine
+    if _inference_engine is None:
+        _inference_engine = FieldInferenceEngine()
+    return _inference_engine
+
 
 @dataclass
 class MappingProposal:
@@ -19,6 +36,7 @@ class MappingProposal:
     mapping_method: str
     transformation_function: Optional[str] = None
     semantic_similarity: Optional[float] = None
+    reasoning: Optional[str] = None
 
 
 class RAGService:
@@ -27,10 +45,14 @@ class RAGService:
     
     Uses retrieval augmented generation to propose field mappings
     by learning from historical mappings and semantic similarity.
+    
+    Args:
+        engine: FieldInferenceEngine (defaults to the process-wide one)
     """
     
-    def __init__(self):
+    def __init__(self, engine: Optional[FieldInferenceEngine] = None):
         """Initialize RAG service"""
+        self.engine = engine or get_field_inference_engine()
         logger.info("RAG Service initialized")
     
     async def get_mapping_proposal(
@@ -48,68 +70,61 @@ class RAGService:
         Returns:
             MappingProposal with suggested canonical field and confidence score
         """
-        connector_name = context.get('connector_name', '')
-        canonical_entity = context.get('canonical_entity', '')
-        
-        # Simple rule-based mapping for now (can be enhanced with ML/LLM later)
-        canonical_field = self._infer_canonical_field(source_field, canonical_entity)
-        confidence_score = self._calculate_confidence(source_field, canonical_field)
+        [proposal] = await self.get_mapping_proposals([(source_field, context)])
         
         logger.debug(
-            f"RAG proposal for {source_field} ({connector_name}): "
-            f"{canonical_field} (confidence: {confidence_score:.2f})"
+            f"RAG proposal for {source_field} ({context.get('connector_name', '')}): "
+            f"{proposal.canonical_field} (confidence: {proposal.confidence_score:.2f})"
         )
         
+        return proposal
+    
+    async def get_mapping_proposals(
+        self,
+        fields: Sequence[Tuple[str, Dict]]
+    ) -> List[MappingProposal]:
+        """
+        Get mapping proposals for a chunk of fields
+        
+        Cached and rule-resolved fields are answered directly; the rest of
+        the chunk is resolved with one batched embedding/vector lookup.
+        
+        Args:
+            fields: (source_field, context) pairs, context as in get_mapping_proposal
+        
+        Returns:
+            One MappingProposal per field, in input order
+        """
+        keys = [
+            (context.get('connector_name') or '', context.get('canonical_entity') or '', source_field)
+            for source_field, context in fields
+        ]
+        decisions = await self.engine.infer(keys)
+        return [
+            self._to_proposal(source_field, decision)
+            for (source_field, _), decision in zip(fields, decisions)
+        ]
+    
+    @staticmethod
+    def _to_proposal(source_field: str, decision: FieldDecision) -> MappingProposal:
         return MappingProposal(
             source_field=source_field,
-            canonical_field=canonical_field,
-            confidence_score=confidence_score,
+            canonical_field=decision.canonical_field,
+            confidence_score=decision.confidence_score,
             mapping_method="semantic_similarity",
-            semantic_similarity=confidence_score
+            semantic_similarity=decision.confidence_score,
+            reasoning=decision.reasoning
         )
     
     def _infer_canonical_field(self, source_field: str, canonical_entity: str) -> str:
         """
         Infer canonical field name from source field
         
-        Uses simple heuristics - can be enhanced with LLM in future.
+        Rules only (no cache, no vector stage).
         """
-        # Convert to lowercase and replace common separators
-        normalized = source_field.lower().replace('-', '_').replace(' ', '_')
-        
-        # Common field mappings
-        field_mappings = {
-            'id': 'id',
-            'name': 'name',
-            'email': 'email',
-            'phone': 'phone',
-            'amount': 'amount',
-            'value': 'amount',
-            'stage': 'stage',
-            'status': 'status',
-            'created': 'created_at',
-            'createdat': 'created_at',
-            'created_date': 'created_at',
-            'updated': 'updated_at',
-            'updatedat': 'updated_at',
-            'updated_date': 'updated_at',
-            'owner': 'owner_id',
-            'ownerid': 'owner_id',
-            'close_date': 'close_date',
-            'closedate': 'close_date',
-        }
-        
-        # Try exact match first
-        if normalized in field_mappings:
-            return field_mappings[normalized]
-        
-        # Try partial matches
-        for key, value in field_mappings.items():
-            if key in normalized:
-                return value
-        
-        # Default: return normalized field name
-        return normalized
+        normalized = normalize_field_name(source_field)
+        decision = self.engine.rules.resolve(normalized) or self.engine.rules.fallback(normalized)
+        return decision.canonical_field
     
     def _calculate_confidence(self, source_field: str, canonical_field: str) -> float:
         """
@@ -117,20 +132,4 @@ class RAGService:
         
         Returns a score between 0.0 and 1.0.
         """
-        # Simple similarity-based confidence
-        source_normalized = source_field.lower().replace('-', '_').replace(' ', '_')
-        
-        # Exact match = high confidence
-        if source_normalized == canonical_field:
-            return 0.95
-        
-        # Partial match = medium confidence
-        if canonical_field in source_normalized or source_normalized in canonical_field:
-            return 0.75
-        
-        # Common transformations = medium confidence
-        if source_normalized.replace('_', '') == canonical_field.replace('_', ''):
-            return 0.80
-        
-        # Default = low confidence (needs review)
-        return 0.50
+        return calculate_confidence(source_field, canonical_field)
@@ -8,7 +8,7 @@ Features:
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 import json
 
@@ -46,12 +46,7 @@ class JobReconciliationService:
         
         current_count = job_state.get_active_job_count(tenant_id)
         
-        all_jobs = job_state.get_all_jobs_for_tenant(tenant_id)
-        
-        running_jobs = [
-            job for job in all_jobs
-            if job.get('status') in ['running', 'pending']
-        ]
+        running_jobs = job_state.get_jobs_by_status(tenant_id, ['running', 'pending'])
         
         actual_count = len(running_jobs)
         
@@ -89,15 +84,15 @@ class JobReconciliationService:
         from services.mapping_intelligence.job_state import BulkMappingJobState
         job_state = BulkMappingJobState(self.redis_client)
         
-        all_jobs = job_state.get_all_jobs_for_tenant(tenant_id)
-        
         stale_jobs = []
-        cutoff_time = datetime.utcnow() - timedelta(minutes=STALE_JOB_TIMEOUT_MINUTES)
+        now = datetime.utcnow()
+        cutoff_time = now - timedelta(minutes=STALE_JOB_TIMEOUT_MINUTES)
+        cutoff_epoch = cutoff_time.replace(tzinfo=timezone.utc).timestamp()
         
-        for job in all_jobs:
-            if job.get('status') != 'running':
-                continue
-            
+        # Only running jobs indexed as started before the cutoff
+        candidates = job_state.get_jobs_by_status(tenant_id, ['running'], started_before=cutoff_epoch)
+        
+        for job in candidates:
             started_at_str = job.get('started_at')
             if not started_at_str:
                 continue
@@ -106,7 +101,7 @@ class JobReconciliationService:
                 started_at = datetime.fromisoformat(started_at_str)
                 
                 if started_at < cutoff_time:
-                    elapsed_minutes = (datetime.utcnow() - started_at).total_seconds() / 60
+                    elapsed_minutes = (now - started_at).total_seconds() / 60
                     
                     stale_jobs.append({
                         'job_id': job.get('job_id'),
@@ -193,11 +188,15 @@ class JobReconciliationService:
         semaphore_result = self.reconcile_semaphores(tenant_id)
         cleanup_result = self.cleanup_stale_jobs(tenant_id, auto_fail=True)
         
+        from services.mapping_intelligence.job_state import BulkMappingJobState
+        pruned = BulkMappingJobState(self.redis_client).prune_expired_jobs(tenant_id)
+        
         result = {
             'tenant_id': tenant_id,
             'timestamp': datetime.utcnow().isoformat(),
             'semaphore_reconciliation': semaphore_result,
-            'stale_job_cleanup': cleanup_result
+            'stale_job_cleanup': cleanup_result,
+            'expired_jobs_pruned': pruned
         }
         
         logger.info(f"Completed full reconciliation for tenant {tenant_id}")
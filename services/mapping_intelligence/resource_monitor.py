@@ -2,54 +2,268 @@
 Resource Monitoring for Distributed Jobs
 
 Features:
-- CPU/memory sampling
+- CPU/memory sampling on a fixed cadence in a background thread, smoothed
+  with a time-weighted exponential moving average
+- Non-blocking admission control with hysteresis (high/low watermarks)
 - Performance metrics collection
 - Resource usage tracking per tenant
 """
 
+import math
 import psutil
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Optional, Tuple
 import json
 
 logger = logging.getLogger(__name__)
 
+METRICS_TTL_SECONDS = 3600
+
+SAMPLE_INTERVAL_SECONDS = 1.0
+SMOOTHING_SECONDS = 5.0
+# Reject new work above the high watermark, admit again only below the low one
+ADMISSION_HIGH_WATERMARK = 90.0
+ADMISSION_LOW_WATERMARK = 80.0
+# Older snapshots are not trusted for admission decisions
+MAX_SNAPSHOT_AGE_SECONDS = 10.0
+
+_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """Smoothed resource readings (process and system)"""
+    cpu_percent: float = 0.0
+    memory_rss_mb: float = 0.0
+    memory_vms_mb: float = 0.0
+    memory_percent: float = 0.0
+    num_threads: int = 0
+    system_cpu_percent: float = 0.0
+    system_memory_percent: float = 0.0
+    system_memory_available_mb: float = 0.0
+    sampled_at: Optional[float] = None
+    samples: int = 0
+
+
+class ResourceSampler:
+    """
+    Samples CPU and memory every `interval` seconds in a daemon thread.
+    
+    CPU readings use psutil's non-blocking mode (usage since the previous
+    sample), so sampling never sleeps. Each reading is folded into the
+    snapshot with weight 1 - exp(-dt / smoothing_seconds); readers get the
+    latest immutable snapshot without locking or waiting.
+    
+    Args:
+        interval: Seconds between samples
+        smoothing_seconds: EMA time constant
+        psutil_module: psutil (or a fake with the same calls)
+        process: psutil.Process to sample (defaults to this process)
+        clock: Monotonic time source
+    """
+    
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL_SECONDS,
+        smoothing_seconds: float = SMOOTHING_SECONDS,
+        psutil_module=psutil,
+        process=None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.interval = interval
+        self.smoothing_seconds = smoothing_seconds
+        self.psutil = psutil_module
+        self.process = process or psutil_module.Process()
+        self.clock = clock
+        self._snapshot = ResourceSnapshot()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        # The first non-blocking cpu_percent() call only sets the baseline
+        self.psutil.cpu_percent(interval=None)
+        self.process.cpu_percent(interval=None)
+        self._primed_at = clock()
+    
+    @property
+    def snapshot(self) -> ResourceSnapshot:
+        return self._snapshot
+    
+    def age(self) -> Optional[float]:
+        """Seconds since the last sample, or None before the first one"""
+        sampled_at = self._snapshot.sampled_at
+        return None if sampled_at is None else self.clock() - sampled_at
+    
+    def sample(self) -> ResourceSnapshot:
+        """Take one reading and fold it into the snapshot"""
+        now = self.clock()
+        memory_info = self.process.memory_info()
+        virtual_memory = self.psutil.virtual_memory()
+        reading = {
+            'cpu_percent': self.process.cpu_percent(interval=None),
+            'memory_rss_mb': memory_info.rss / _MB,
+            'memory_vms_mb': memory_info.vms / _MB,
+            'memory_percent': self.process.memory_percent(),
+            'system_cpu_percent': self.psutil.cpu_percent(interval=None),
+            'system_memory_percent': virtual_memory.percent,
+            'system_memory_available_mb': virtual_memory.available / _MB,
+        }
+        
+        previous = self._snapshot
+        if previous.samples == 0:
+            smoothed = reading
+        else:
+            dt = max(now - previous.sampled_at, 0.0)
+            weight = 1.0 - math.exp(-dt / self.smoothing_seconds) if self.smoothing_seconds > 0 else 1.0
+            smoothed = {
+                name: getattr(previous, name) + weight * (value - getattr(previous, name))
+                for name, value in reading.items()
+            }
+        
+        self._snapshot = ResourceSnapshot(
+            num_threads=self.process.num_threads(),
+            sampled_at=now,
+            samples=previous.samples + 1,
+            **smoothed
+        )
+        return self._snapshot
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+    
+    def start(self) -> "ResourceSampler":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class AdmissionController:
+    """
+    Admission decisions from a ResourceSampler snapshot, with hysteresis.
+    
+    Admission closes when smoothed CPU or memory goes above high_watermark
+    and reopens only once both are below low_watermark, so load hovering
+    around one threshold does not flap between admit and reject. With no
+    recent snapshot the controller admits (fail open, as before).
+    """
+    
+    def __init__(
+        self,
+        sampler: ResourceSampler,
+        high_watermark: float = ADMISSION_HIGH_WATERMARK,
+        low_watermark: float = ADMISSION_LOW_WATERMARK,
+        max_snapshot_age: float = MAX_SNAPSHOT_AGE_SECONDS
+    ):
+        if low_watermark > high_watermark:
+            raise ValueError("low_watermark must not exceed high_watermark")
+        self.sampler = sampler
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.max_snapshot_age = max_snapshot_age
+        self.admitting = True
+        self._lock = threading.Lock()
+    
+    def admit(self) -> Tuple[bool, str]:
+        """
+        Returns:
+            (admit, reason)
+        """
+        snapshot = self.sampler.snapshot
+        age = self.sampler.age()
+        if age is None or age > self.max_snapshot_age:
+            return True, 'no recent resource sample'
+        
+        cpu = snapshot.system_cpu_percent
+        memory = snapshot.system_memory_percent
+        with self._lock:
+            if self.admitting and (cpu > self.high_watermark or memory > self.high_watermark):
+                self.admitting = False
+                logger.warning(f"Admission closed: CPU {cpu:.1f}%, memory {memory:.1f}% (high watermark {self.high_watermark}%)")
+            elif not self.admitting and cpu < self.low_watermark and memory < self.low_watermark:
+                self.admitting = True
+                logger.info(f"✅ Admission reopened: CPU {cpu:.1f}%, memory {memory:.1f}%")
+            admitting = self.admitting
+        
+        if admitting:
+            return True, 'ok'
+        return False, f"CPU {cpu:.1f}%, memory {memory:.1f}%"
+
+
+_sampler: Optional[ResourceSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """Process-wide sampler, started on first use"""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                sampler = ResourceSampler()
+                sampler.sample()
+                _sampler = sampler.start()
+    return _sampler
+
 
 class ResourceMonitor:
     """
     Monitors system resources for job processing
+    
+    Args:
+        redis_client: Redis client for per-job metrics
+        sampler: ResourceSampler to read (defaults to the process-wide one)
+        admission: AdmissionController (defaults to one over the sampler)
     """
     
-    def __init__(self, redis_client=None):
+    def __init__(self, redis_client=None, sampler: Optional[ResourceSampler] = None, admission: Optional[AdmissionController] = None):
         from shared.redis_client import get_redis_client
         self.redis_client = redis_client or get_redis_client()
-        self.process = psutil.Process()
+        self.sampler = sampler or get_resource_sampler()
+        self.admission = admission or AdmissionController(self.sampler)
+    
+    def _get_metrics_index_key(self, tenant_id: str) -> str:
+        """Sorted set of job IDs with recorded metrics, by record time"""
+        return f"job:metrics:index:tenant:{tenant_id}"
     
     def get_current_metrics(self) -> Dict:
         """
-        Get current system resource metrics
+        Get current system resource metrics (latest smoothed sample, non-blocking)
         
         Returns:
             Dictionary with CPU, memory, and system metrics
         """
         try:
-            cpu_percent = self.process.cpu_percent(interval=0.1)
-            memory_info = self.process.memory_info()
+            snapshot = self.sampler.snapshot
+            if snapshot.samples == 0:
+                snapshot = self.sampler.sample()
             
-            metrics = {
+            return {
                 'timestamp': datetime.utcnow().isoformat(),
-                'cpu_percent': cpu_percent,
-                'memory_rss_mb': memory_info.rss / (1024 * 1024),
-                'memory_vms_mb': memory_info.vms / (1024 * 1024),
-                'memory_percent': self.process.memory_percent(),
-                'num_threads': self.process.num_threads(),
-                'system_cpu_percent': psutil.cpu_percent(interval=0.1),
-                'system_memory_percent': psutil.virtual_memory().percent,
-                'system_memory_available_mb': psutil.virtual_memory().available / (1024 * 1024)
+                'cpu_percent': round(snapshot.cpu_percent, 2),
+                'memory_rss_mb': snapshot.memory_rss_mb,
+                'memory_vms_mb': snapshot.memory_vms_mb,
+                'memory_percent': snapshot.memory_percent,
+                'num_threads': snapshot.num_threads,
+                'system_cpu_percent': round(snapshot.system_cpu_percent, 2),
+                'system_memory_percent': round(snapshot.system_memory_percent, 2),
+                'system_memory_available_mb': snapshot.system_memory_available_mb,
+                'sample_age_seconds': round(self.sampler.age() or 0.0, 3)
             }
-            
-            return metrics
         
         except Exception as e:
             logger.error(f"Failed to collect metrics: {e}")
@@ -72,22 +286,40 @@ class ResourceMonitor:
             job_id: Job identifier
             metrics: Optional metrics dict, or current metrics if None
         """
+        self.record_jobs_metrics(tenant_id, [job_id], metrics)
+    
+    def record_jobs_metrics(self, tenant_id: str, job_ids: Iterable[str], metrics: Optional[Dict] = None):
+        """
+        Record the same metrics reading for several jobs in one round trip
+        
+        Args:
+            tenant_id: Tenant identifier
+            job_ids: Job identifiers
+            metrics: Optional metrics dict, or current metrics if None
+        """
         if not self.redis_client:
             logger.warning("Redis not available, skipping metrics recording")
             return
         
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
         if metrics is None:
             metrics = self.get_current_metrics()
         
-        key = f"job:metrics:tenant:{tenant_id}:job:{job_id}"
+        payload = json.dumps(metrics)
+        index_key = self._get_metrics_index_key(tenant_id)
+        now = time.time()
         
         try:
-            self.redis_client.setex(
-                key,
-                3600,
-                json.dumps(metrics)
-            )
-            logger.debug(f"Recorded metrics for job {job_id}")
+            pipe = self.redis_client.pipeline(transaction=True)
+            for job_id in job_ids:
+                pipe.setex(f"job:metrics:tenant:{tenant_id}:job:{job_id}", METRICS_TTL_SECONDS, payload)
+            pipe.zadd(index_key, {job_id: now for job_id in job_ids})
+            pipe.zremrangebyscore(index_key, '-inf', now - METRICS_TTL_SECONDS)
+            pipe.expire(index_key, METRICS_TTL_SECONDS)
+            pipe.execute()
+            logger.debug(f"Recorded metrics for {len(job_ids)} jobs")
         
         except Exception as e:
             logger.error(f"Failed to record job metrics: {e}")
@@ -129,23 +361,28 @@ class ResourceMonitor:
         if not self.redis_client:
             return {'error': 'Redis not available'}
         
-        pattern = f"job:metrics:tenant:{tenant_id}:job:*"
+        index_key = self._get_metrics_index_key(tenant_id)
         
         try:
-            keys = self.redis_client.keys(pattern)
+            job_ids = self.redis_client.zrangebyscore(index_key, time.time() - METRICS_TTL_SECONDS, '+inf')
             
-            if not keys:
+            if not job_ids:
                 return {
                     'tenant_id': tenant_id,
                     'job_count': 0,
                     'metrics': []
                 }
             
-            metrics_list = []
-            for key in keys:
-                data = self.redis_client.get(key)
-                if data:
-                    metrics_list.append(json.loads(data))
+            keys = [
+                f"job:metrics:tenant:{tenant_id}:job:{job_id.decode() if isinstance(job_id, bytes) else job_id}"
+                for job_id in job_ids
+            ]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for i in range(0, len(keys), 1000):
+                pipe.mget(keys[i:i + 1000])
+            values = [data for chunk in pipe.execute() for data in chunk]
+            
+            metrics_list = [json.loads(data) for data in values if data]
             
             avg_cpu = sum(m.get('cpu_percent', 0) for m in metrics_list) / len(metrics_list) if metrics_list else 0
             avg_memory = sum(m.get('memory_rss_mb', 0) for m in metrics_list) / len(metrics_list) if metrics_list else 0
@@ -169,22 +406,14 @@ class ResourceMonitor:
         """
         Check if system has sufficient resources for new jobs
         
+        Reads the sampler's snapshot; never blocks.
+        
         Returns:
             True if resources are available, False otherwise
         """
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory_percent = psutil.virtual_memory().percent
-            
-            if cpu_percent > 90:
-                logger.warning(f"CPU usage high: {cpu_percent}%")
-                return False
-            
-            if memory_percent > 90:
-                logger.warning(f"Memory usage high: {memory_percent}%")
-                return False
-            
-            return True
+            admitted, _ = self.admission.admit()
+            return admitted
         
         except Exception as e:
             logger.error(f"Failed to check resource availability: {e}")
@@ -6,6 +6,8 @@ This module provides functional API for feature flags with:
 - Percentage rollout support (gradual feature enablement)
 - Redis-backed persistence
 - Fallback to global/default flags
+- Process-local snapshot per tenant, kept current over Redis pub/sub, so
+  flag checks on hot paths do not round-trip to Redis
 
 Usage:
     from shared.feature_flags import set_feature_flag, get_feature_flag
@@ -22,12 +24,296 @@ Usage:
 """
 
 import hashlib
+import json
 import logging
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
 from shared.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Per-tenant inventory hash: field "<FLAG>" -> "1"/"0", "<FLAG>:percentage" -> "N".
+# Written alongside the per-flag keys so listing and snapshot loads never need KEYS.
+_INDEX_PREFIX = "feature_flag_index:"
+_INDEX_BACKFILLED = "feature_flag_index:__backfilled__"
+
+# Pub/sub channel carrying incremental flag changes to every process
+FLAG_CHANGES_CHANNEL = "feature_flag:changes"
+
+# How often the listener wakes to check for shutdown
+_POLL_INTERVAL_S = 0.25
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _index_key(tenant_id: str) -> str:
+    return f"{_INDEX_PREFIX}{tenant_id}"
+
+
+@dataclass
+class _TenantSnapshot:
+    values: dict = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+
+class FlagSnapshotCache:
+    """
+    Process-local snapshot of every tenant's flags.
+
+    A tenant's flags are loaded with one HGETALL on first use, then kept
+    current by applying change messages from FLAG_CHANGES_CHANNEL (the same
+    publish-on-write scheme FeatureFlagConfig uses for dcl:feature_flags).
+    While the subscription is down, snapshots older than max_staleness_s are
+    reloaded; if Redis itself is unreachable the last snapshot is served.
+    """
+
+    def __init__(
+        self,
+        redis,
+        channel: str = FLAG_CHANGES_CHANNEL,
+        max_staleness_s: float = 5.0,
+        max_age_s: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        listen: bool = True,
+    ):
+        self.redis = redis
+        self.channel = channel
+        self.max_staleness_s = max_staleness_s
+        self.max_age_s = max_age_s
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._snapshots: dict[str, _TenantSnapshot] = {}
+        self._loading: dict[str, int] = {}
+        self._dirty: set[str] = set()
+        self._index_ready = False
+
+        self._listening = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"loads": 0, "updates_applied": 0, "stale_served": 0, "resubscribes": 0}
+
+        if listen:
+            self._thread = threading.Thread(target=self._listen, name="feature-flag-listener", daemon=True)
+            self._thread.start()
+
+    @property
+    def listening(self) -> bool:
+        return self._listening
+
+    def get(self, tenant_id: str) -> dict:
+        """Flags for a tenant as {field: value}; raises if Redis is down and nothing is cached."""
+        with self._lock:
+            snapshot = self._snapshots.get(tenant_id)
+        if snapshot is not None:
+            limit = self.max_age_s if self._listening else self.max_staleness_s
+            if self._clock() - snapshot.loaded_at < limit:
+                return snapshot.values
+
+        try:
+            return self._load(tenant_id)
+        except Exception as e:
+            if snapshot is None:
+                raise
+            self.stats["stale_served"] += 1
+            logger.warning(f"Redis unavailable, serving cached feature flags for tenant {tenant_id}: {e}")
+            return snapshot.values
+
+    def apply(self, tenant_id: str, field_name: str, value: Optional[str]) -> None:
+        """Apply one change (None deletes) to a loaded snapshot."""
+        with self._lock:
+            if self._loading.get(tenant_id):
+                self._dirty.add(tenant_id)
+            snapshot = self._snapshots.get(tenant_id)
+            if snapshot is None:
+                return
+            # Copy-on-write so readers holding the old dict never see it change
+            values = dict(snapshot.values)
+            if value is None:
+                values.pop(field_name, None)
+            else:
+                values[field_name] = value
+            self._snapshots[tenant_id] = _TenantSnapshot(values, snapshot.loaded_at)
+            self.stats["updates_applied"] += 1
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> None:
+        with self._lock:
+            if tenant_id is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(tenant_id, None)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._listening = False
+
+    def _load(self, tenant_id: str) -> dict:
+        self._ensure_index()
+        with self._lock:
+            self._loading[tenant_id] = self._loading.get(tenant_id, 0) + 1
+            self._dirty.discard(tenant_id)
+        try:
+            for _ in range(3):
+                raw = self.redis.hgetall(_index_key(tenant_id))
+                values = {_decode(k): _decode(v) for k, v in raw.items()}
+                with self._lock:
+                    if tenant_id in self._dirty:
+                        # A change landed mid-read; read again so it is not lost
+                        self._dirty.discard(tenant_id)
+                        continue
+                    break
+            self.stats["loads"] += 1
+            with self._lock:
+                self._snapshots[tenant_id] = _TenantSnapshot(values, self._clock())
+            return values
+        finally:
+            with self._lock:
+                self._loading[tenant_id] -= 1
+                if not self._loading[tenant_id]:
+                    del self._loading[tenant_id]
+
+    def _ensure_index(self) -> None:
+        """Backfill the inventory hashes from pre-existing flag keys, once."""
+        if self._index_ready:
+            return
+        if not self.redis.exists(_INDEX_BACKFILLED):
+            backfill_flag_index(self.redis)
+        self._index_ready = True
+
+    def _listen(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Changes may have been missed while unsubscribed
+                self.invalidate()
+                self._listening = True
+                self.stats["resubscribes"] += 1
+                backoff = 0.5
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=_POLL_INTERVAL_S)
+                    if message and message.get("type") == "message":
+                        self._on_message(message["data"])
+            except Exception as e:
+                self._listening = False
+                logger.warning(f"Feature flag subscription lost, retrying in {backoff:.1f}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                self._listening = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _on_message(self, data) -> None:
+        try:
+            change = json.loads(_decode(data))
+            for field_name, value in change["changes"].items():
+                self.apply(change["tenant_id"], field_name, value)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed feature flag change message: {e}")
+
+
+_snapshot_cache: Optional[FlagSnapshotCache] = None
+_snapshot_lock = threading.Lock()
+
+
+def _get_snapshot_cache(redis) -> FlagSnapshotCache:
+    global _snapshot_cache
+    with _snapshot_lock:
+        if _snapshot_cache is None or _snapshot_cache.redis is not redis:
+            if _snapshot_cache is not None:
+                _snapshot_cache.close()
+            _snapshot_cache = FlagSnapshotCache(redis)
+        return _snapshot_cache
+
+
+def reset_flag_cache() -> None:
+    """Stop the change listener and drop all snapshots."""
+    global _snapshot_cache
+    with _snapshot_lock:
+        if _snapshot_cache is not None:
+            _snapshot_cache.close()
+            _snapshot_cache = None
+
+
+def _tenant_flags(tenant_id: str) -> Optional[dict]:
+    """Cached flags for a tenant, or None when Redis is unavailable."""
+    redis = get_redis_client()
+    if redis is None:
+        return None
+    return _get_snapshot_cache(redis).get(tenant_id)
+
+
+def _flag_key(flag_name: str, tenant_id: str) -> str:
+    return f"feature_flag:{flag_name}:{tenant_id}"
+
+
+def _percentage_key(flag_name: str, tenant_id: str) -> str:
+    return f"feature_flag:{flag_name}:{tenant_id}:percentage"
+
+
+def _write_flag_fields(redis, tenant_id: str, changes: list[tuple[str, str, Optional[str]]]) -> None:
+    """
+    Apply (index field, flag key, value) changes in one round trip.
+
+    A None value deletes. Writes the per-flag keys and the tenant inventory,
+    publishes the change for other processes and applies it locally.
+    """
+    index_key = _index_key(tenant_id)
+    pipe = redis.pipeline()
+    for field_name, key, value in changes:
+        if value is None:
+            pipe.delete(key)
+            pipe.hdel(index_key, field_name)
+        else:
+            pipe.set(key, value)
+            pipe.hset(index_key, field_name, value)
+    pipe.publish(FLAG_CHANGES_CHANNEL, json.dumps({
+        "tenant_id": tenant_id,
+        "changes": {field_name: value for field_name, _, value in changes},
+    }))
+    pipe.execute()
+
+    cache = _get_snapshot_cache(redis)
+    for field_name, _, value in changes:
+        cache.apply(tenant_id, field_name, value)
+
+
+def backfill_flag_index(redis) -> int:
+    """
+    Populate inventory hashes from existing feature_flag:* keys using SCAN.
+
+    Safe to run repeatedly; existing hash fields are not overwritten.
+    Returns the number of keys examined.
+    """
+    examined = 0
+    for key in redis.scan_iter(match="feature_flag:*", count=500):
+        key = _decode(key)
+        parts = key.split(":")
+        if len(parts) < 3 or key == FLAG_CHANGES_CHANNEL:
+            continue
+        if parts[-1] == "percentage" and len(parts) >= 4:
+            tenant_id, field_name = ":".join(parts[2:-1]), f"{parts[1]}:percentage"
+        else:
+            tenant_id, field_name = ":".join(parts[2:]), parts[1]
+        value = redis.get(key)
+        if value is not None:
+            redis.hsetnx(_index_key(tenant_id), field_name, _decode(value))
+        examined += 1
+    redis.set(_INDEX_BACKFILLED, "1")
+    return examined
+
 
 def set_feature_flag(flag_name: str, enabled: bool, tenant_id: str = "default") -> bool:
     """
@@ -51,9 +337,8 @@ def set_feature_flag(flag_name: str, enabled: bool, tenant_id: str = "default")
         return False
     
     try:
-        key = f"feature_flag:{flag_name}:{tenant_id}"
         value = "1" if enabled else "0"
-        redis.set(key, value)
+        _write_flag_fields(redis, tenant_id, [(flag_name, _flag_key(flag_name, tenant_id), value)])
         logger.info(f"Set feature flag: {flag_name}={enabled} for tenant={tenant_id}")
         return True
     except Exception as e:
@@ -79,14 +364,13 @@ def get_feature_flag(flag_name: str, tenant_id: str = "default") -> bool:
         >>> get_feature_flag("USE_DCL_MAPPING_REGISTRY", "acme-corp")
         True
     """
-    redis = get_redis_client()
-    if redis is None:
-        logger.warning(f"Redis unavailable, returning False for feature flag {flag_name}")
-        return False
-    
     try:
-        key = f"feature_flag:{flag_name}:{tenant_id}"
-        value = redis.get(key)
+        flags = _tenant_flags(tenant_id)
+        if flags is None:
+            logger.warning(f"Redis unavailable, returning False for feature flag {flag_name}")
+            return False
+        
+        value = flags.get(flag_name)
         
         if value is None:
             if tenant_id != "default":
@@ -96,9 +380,6 @@ def get_feature_flag(flag_name: str, tenant_id: str = "default") -> bool:
             logger.debug(f"Flag {flag_name} not set, returning False (default)")
             return False
         
-        if isinstance(value, bytes):
-            value = value.decode()
-        
         return value == "1"
     except Exception as e:
         logger.error(f"Failed to get feature flag {flag_name}: {e}")
@@ -135,8 +416,10 @@ def set_feature_flag_percentage(flag_name: str, percentage: int, tenant_id: str
         return False
     
     try:
-        key = f"feature_flag:{flag_name}:{tenant_id}:percentage"
-        redis.set(key, str(percentage))
+        _write_flag_fields(
+            redis, tenant_id,
+            [(f"{flag_name}:percentage", _percentage_key(flag_name, tenant_id), str(percentage))],
+        )
         logger.info(f"Set feature flag percentage: {flag_name}={percentage}% for tenant={tenant_id}")
         return True
     except Exception as e:
@@ -159,20 +442,13 @@ def get_feature_flag_percentage(flag_name: str, tenant_id: str = "default") -> O
         >>> get_feature_flag_percentage("USE_DCL_MAPPING_REGISTRY", "default")
         50
     """
-    redis = get_redis_client()
-    if redis is None:
-        return None
-    
     try:
-        key = f"feature_flag:{flag_name}:{tenant_id}:percentage"
-        value = redis.get(key)
+        flags = _tenant_flags(tenant_id)
+        value = flags.get(f"{flag_name}:percentage") if flags is not None else None
         
         if value is None:
             return None
         
-        if isinstance(value, bytes):
-            value = value.decode()
-        
         return int(value)
     except Exception as e:
         logger.error(f"Failed to get percentage for {flag_name}: {e}")
@@ -199,20 +475,16 @@ def is_feature_enabled_for_user(flag_name: str, user_id: str, tenant_id: str = "
         >>> is_feature_enabled_for_user("USE_DCL_MAPPING_REGISTRY", "user123")
         True  # ~50% of users will get True
     """
-    redis = get_redis_client()
-    if redis is None:
-        return False
-    
     try:
-        percentage_key = f"feature_flag:{flag_name}:{tenant_id}:percentage"
-        percentage_value = redis.get(percentage_key)
+        flags = _tenant_flags(tenant_id)
+        if flags is None:
+            return False
+        
+        percentage_value = flags.get(f"{flag_name}:percentage")
         
         if percentage_value is None:
             return get_feature_flag(flag_name, tenant_id)
         
-        if isinstance(percentage_value, bytes):
-            percentage_value = percentage_value.decode()
-        
         percentage = int(percentage_value)
         
         if percentage == 0:
@@ -248,10 +520,10 @@ def clear_feature_flag(flag_name: str, tenant_id: str = "default") -> bool:
         return False
     
     try:
-        flag_key = f"feature_flag:{flag_name}:{tenant_id}"
-        percentage_key = f"feature_flag:{flag_name}:{tenant_id}:percentage"
-        
-        redis.delete(flag_key, percentage_key)
+        _write_flag_fields(redis, tenant_id, [
+            (flag_name, _flag_key(flag_name, tenant_id), None),
+            (f"{flag_name}:percentage", _percentage_key(flag_name, tenant_id), None),
+        ])
         logger.info(f"Cleared feature flag: {flag_name} for tenant={tenant_id}")
         return True
     except Exception as e:
@@ -273,33 +545,16 @@ def list_all_flags(tenant_id: str = "default") -> dict:
         >>> list_all_flags("default")
         {"USE_DCL_MAPPING_REGISTRY": True, "USE_AAM_AS_SOURCE": False}
     """
-    redis = get_redis_client()
-    if redis is None:
-        return {}
-    
     try:
-        pattern = f"feature_flag:*:{tenant_id}"
-        keys = redis.keys(pattern)
-        
-        flags = {}
-        for key in keys:
-            if isinstance(key, bytes):
-                key = key.decode()
-            
-            if key.endswith(":percentage"):
-                continue
-            
-            parts = key.split(":")
-            if len(parts) >= 3:
-                flag_name = parts[1]
-                value = redis.get(key)
-                
-                if isinstance(value, bytes):
-                    value = value.decode()
-                
-                flags[flag_name] = (value == "1")
+        flags = _tenant_flags(tenant_id)
+        if flags is None:
+            return {}
         
-        return flags
+        return {
+            name: value == "1"
+            for name, value in flags.items()
+            if not name.endswith(":percentage")
+        }
     except Exception as e:
         logger.error(f"Failed to list flags for tenant {tenant_id}: {e}")
         return {}
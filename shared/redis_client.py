@@ -84,6 +84,38 @@ def is_redis_available() -> bool:
     return _redis_available
 
 
+def create_async_redis_client():
+    """
+    Create a redis.asyncio client with the same URL/TLS handling as
+    get_redis_client(). Connections are opened lazily on the running loop,
+    so create one client per event loop rather than sharing a global.
+    """
+    from redis.asyncio import Redis as AsyncRedis
+
+    REDIS_URL = os.getenv("REDIS_URL")
+    if REDIS_URL:
+        if REDIS_URL.startswith("rediss://"):
+            CA_CERT_PATH = os.path.join(os.path.dirname(__file__), "..", "certs", "redis_ca.pem")
+            if not os.path.exists(CA_CERT_PATH):
+                raise RuntimeError(
+                    f"Redis TLS requires CA certificate at {CA_CERT_PATH} but file not found. "
+                    "Cannot establish secure connection."
+                )
+            return AsyncRedis.from_url(
+                REDIS_URL,
+                decode_responses=True,
+                ssl_cert_reqs=ssl_module.CERT_REQUIRED,
+                ssl_ca_certs=CA_CERT_PATH
+            )
+        return AsyncRedis.from_url(REDIS_URL, decode_responses=True)
+    return AsyncRedis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        db=int(os.getenv("REDIS_DB", "0")),
+        decode_responses=True
+    )
+
+
 redis_client = get_redis_client()
 REDIS_AVAILABLE = is_redis_available()
 
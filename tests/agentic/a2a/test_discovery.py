@@ -0,0 +1,195 @@
+"""
+Tests for indexed AgentDiscovery queries.
+
+Results are compared against a linear scan that applies every filter to
+every registered card and sorts by trust (ties in registration order).
+"""
+
+import random
+from uuid import uuid4
+
+import pytest
+
+from app.agentic.a2a.agent_card import AgentCapability, AgentCard
+from app.agentic.a2a.discovery import AgentDiscovery, DiscoveryFilter, HealthStatus
+
+CAPABILITIES = [f"cap-{i}" for i in range(12)]
+TAGS = [f"tag-{i}" for i in range(6)]
+TYPES = ["tool", "query", "action", "workflow"]
+
+
+# ======================================================================
+# Linear reference
+# ======================================================================
+def ref_discover(discovery, cards, f):
+    matches = []
+    for card in cards:
+        caps = {c.id for c in card.capabilities}
+        tags = {t for c in card.capabilities for t in c.tags}
+        types = {c.capability_type for c in card.capabilities}
+        status = discovery.get_health(card.id).status
+        if f.agent_ids and card.id not in f.agent_ids:
+            continue
+        if f.exclude_agent_ids and card.id in f.exclude_agent_ids:
+            continue
+        if f.tenant_id and card.tenant_id != f.tenant_id:
+            continue
+        if f.capability_ids and not set(f.capability_ids) <= caps:
+            continue
+        if f.capability_tags and not set(f.capability_tags) <= tags:
+            continue
+        if f.capability_types and not types & set(f.capability_types):
+            continue
+        if f.agent_types and card.agent_type not in f.agent_types:
+            continue
+        if f.roles and card.role not in f.roles:
+            continue
+        if card.trust_level < f.min_trust_level:
+            continue
+        if f.require_certified and not card.certification_id:
+            continue
+        if f.can_accept_delegation is not None and card.can_accept_delegation != f.can_accept_delegation:
+            continue
+        if f.exclude_unhealthy and status == HealthStatus.UNHEALTHY:
+            continue
+        if f.health_status and status != f.health_status:
+            continue
+        matches.append(card)
+    order = {card.id: i for i, card in enumerate(cards)}
+    matches.sort(key=lambda c: (-c.trust_level, order[c.id]))
+    return matches
+
+
+def _cap(cap_id, **kwargs):
+    return AgentCapability(id=cap_id, name=cap_id, description=cap_id, **kwargs)
+
+
+def _card(rng, tenants):
+    return AgentCard(
+        name="agent",
+        tenant_id=rng.choice(tenants),
+        agent_type=rng.choice(["general", "specialist", "worker"]),
+        role=rng.choice(["assistant", "executor"]),
+        trust_level=rng.choice([0, 10, 50, 50, 75, 90, 100]),
+        certification_id=rng.choice([None, "cert"]),
+        can_accept_delegation=rng.random() < 0.8,
+        capabilities=[
+            _cap(cap_id, capability_type=rng.choice(TYPES), tags=rng.sample(TAGS, rng.randint(0, 2)))
+            for cap_id in rng.sample(CAPABILITIES, rng.randint(1, 4))
+        ],
+    )
+
+
+@pytest.fixture
+async def populated():
+    rng = random.Random(36)
+    tenants = [uuid4() for _ in range(4)]
+    discovery = AgentDiscovery()
+    cards = [_card(rng, tenants) for _ in range(600)]
+    for card in cards:
+        discovery.register(card)
+    statuses = list(HealthStatus)
+    for card in rng.sample(cards, 300):
+        await discovery.update_health(card.id, rng.choice(statuses))
+    return discovery, cards, tenants, rng
+
+
+# ======================================================================
+# Discovery queries
+# ======================================================================
+class TestDiscover:
+    def test_matches_linear_scan(self, populated):
+        discovery, cards, tenants, rng = populated
+        for _ in range(400):
+            f = DiscoveryFilter(
+                agent_ids=rng.choice([None] * 8 + [[c.id for c in rng.sample(cards, 50)]]),
+                tenant_id=rng.choice([None] + tenants),
+                capability_ids=rng.choice([None, None, rng.sample(CAPABILITIES, 1), rng.sample(CAPABILITIES, 2)]),
+                capability_tags=rng.choice([None, None, rng.sample(TAGS, 1)]),
+                capability_types=rng.choice([None, None, rng.sample(TYPES, 2)]),
+                agent_types=rng.choice([None, ["specialist", "worker"]]),
+                min_trust_level=rng.choice([0, 0, 50, 91]),
+                require_certified=rng.random() < 0.2,
+                can_accept_delegation=rng.choice([None, True]),
+                health_status=rng.choice([None] * 4 + list(HealthStatus)),
+                exclude_unhealthy=rng.random() < 0.7,
+                exclude_agent_ids=rng.choice([None, [c.id for c in rng.sample(cards, 5)]]),
+                limit=rng.choice([1, 10, 100]),
+                offset=rng.choice([0, 0, 5]),
+            )
+            expected = ref_discover(discovery, cards, f)
+            result = discovery.discover(f)
+            assert [c.id for c in result.agents] == [c.id for c in expected[f.offset:f.offset + f.limit]], f
+            assert result.total == len(expected)
+            assert result.has_more == (f.offset + f.limit < len(expected))
+
+    def test_unregister_and_update_reindex(self, populated):
+        discovery, cards, _, _ = populated
+        removed = cards[:100]
+        for card in removed:
+            assert discovery.unregister(card.id) is card
+        promoted = cards[100]
+        promoted.trust_level = 101
+        discovery.update(promoted)
+        # update() re-registers, so the promoted card now ranks by its new trust
+        remaining = cards[101:] + [promoted]
+
+        f = DiscoveryFilter(exclude_unhealthy=False, limit=1000)
+        expected = ref_discover(discovery, remaining, f)
+        assert [c.id for c in discovery.discover(f).agents] == [c.id for c in expected]
+        assert discovery.discover(f).agents[0] is promoted
+        assert discovery.discover(DiscoveryFilter(agent_ids=[removed[0].id])).total == 0
+        assert not any(removed[0].id in ids for ids in discovery._by_capability.values())
+        assert len(discovery._ranking) == len(remaining)
+
+    def test_capability_filter_applies_within_tenant(self):
+        discovery = AgentDiscovery()
+        tenant = uuid4()
+        a = AgentCard(tenant_id=tenant, capabilities=[_cap("sql")], trust_level=10)
+        b = AgentCard(tenant_id=tenant, capabilities=[_cap("email")], trust_level=90)
+        discovery.register(a)
+        discovery.register(b)
+
+        assert discovery.find_by_capability("sql", tenant_id=tenant) == [a]
+
+
+# ======================================================================
+# Delegatee lookup
+# ======================================================================
+class TestFindDelegatees:
+    async def test_cached_ranking_follows_health_and_registry(self):
+        discovery = AgentDiscovery()
+        tenant = uuid4()
+        cards = [
+            AgentCard(tenant_id=tenant, trust_level=trust, capabilities=[_cap("execute")])
+            for trust in (20, 80, 60)
+        ]
+        for card in cards:
+            discovery.register(card)
+
+        def ids(agents):
+            return [a.trust_level for a in agents]
+
+        assert ids(discovery.find_delegatees("execute", tenant_id=tenant)) == [80, 60, 20]
+        assert ids(discovery.find_delegatees("execute", excluding=cards[1].id, tenant_id=tenant)) == [60, 20]
+
+        await discovery.update_health(cards[2].id, HealthStatus.UNHEALTHY)
+        assert ids(discovery.find_delegatees("execute", tenant_id=tenant)) == [80, 20]
+
+        newcomer = AgentCard(tenant_id=tenant, trust_level=99, capabilities=[_cap("execute")])
+        discovery.register(newcomer)
+        assert ids(discovery.find_delegatees("execute", tenant_id=tenant)) == [99, 80, 20]
+
+        discovery.unregister(cards[1].id)
+        assert ids(discovery.find_delegatees("execute", tenant_id=tenant)) == [99, 20]
+
+    def test_excluding_still_returns_full_page(self):
+        discovery = AgentDiscovery()
+        cards = [AgentCard(trust_level=i, capabilities=[_cap("execute")]) for i in range(150)]
+        for card in cards:
+            discovery.register(card)
+
+        top = cards[-1]
+        result = discovery.find_delegatees("execute", excluding=top.id)
+        assert len(result) == 100
+        assert top not in result and result[0] is cards[-2]
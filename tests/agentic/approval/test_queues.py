@@ -0,0 +1,291 @@
+"""Tests for indexed approval queues and override scope lookup."""
+
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.agentic.approval import (
+    ApprovalPriority,
+    ApprovalRoute,
+    ApprovalStatus,
+    ApprovalType,
+    ApprovalWorkflow,
+    EscalationLevel,
+    OverrideManager,
+)
+from app.agentic.approval.queues import PRIORITY_RANK, DeadlineQueue
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+def _create(workflow: ApprovalWorkflow, priority: ApprovalPriority, **kwargs):
+    return workflow.create_request(
+        agent_id=kwargs.pop("agent_id", uuid4()),
+        request_type=ApprovalType.TOOL_EXECUTION,
+        title="req",
+        description="",
+        action_type=kwargs.pop("action_type", "tool.run"),
+        action_details={},
+        priority=priority,
+        **kwargs,
+    )
+
+
+def _expected_order(requests):
+    return sorted(requests, key=lambda r: (-PRIORITY_RANK[r.priority], r.created_at))
+
+
+# ======================================================================
+# Priority Ordering
+# ======================================================================
+class TestPendingOrdering:
+    def test_priority_then_creation_order(self):
+        workflow = ApprovalWorkflow()
+        low = _create(workflow, ApprovalPriority.LOW)
+        critical = _create(workflow, ApprovalPriority.CRITICAL)
+        medium = _create(workflow, ApprovalPriority.MEDIUM)
+        high = _create(workflow, ApprovalPriority.HIGH)
+        critical_2 = _create(workflow, ApprovalPriority.CRITICAL)
+
+        pending = workflow.get_pending_requests()
+        assert [r.id for r in pending] == [critical.id, critical_2.id, high.id, medium.id, low.id]
+
+    def test_limit_applies_after_ordering(self):
+        workflow = ApprovalWorkflow()
+        for _ in range(20):
+            _create(workflow, ApprovalPriority.LOW)
+        critical = _create(workflow, ApprovalPriority.CRITICAL)
+
+        pending = workflow.get_pending_requests(limit=1)
+        assert [r.id for r in pending] == [critical.id]
+
+    def test_filters_match_brute_force(self):
+        rng = random.Random(7)
+        workflow = ApprovalWorkflow()
+        tenants = [uuid4() for _ in range(3)]
+        agents = [uuid4() for _ in range(4)]
+        requests = [
+            _create(
+                workflow,
+                rng.choice(list(ApprovalPriority)),
+                agent_id=rng.choice(agents),
+                tenant_id=rng.choice(tenants),
+            )
+            for _ in range(300)
+        ]
+        # Decide a random subset so they leave the queue
+        for request in rng.sample(requests, 100):
+            workflow.approve(request.id, approved_by=uuid4())
+        waiting = [r for r in requests if r.status == ApprovalStatus.PENDING]
+
+        for tenant in tenants:
+            for agent in agents:
+                expected = _expected_order([r for r in waiting if r.tenant_id == tenant and r.agent_id == agent])
+                got = workflow.get_pending_requests(tenant_id=tenant, agent_id=agent, limit=1000)
+                assert [r.id for r in got] == [r.id for r in expected]
+
+        expected = _expected_order(waiting)[:25]
+        assert [r.id for r in workflow.get_pending_requests(limit=25)] == [r.id for r in expected]
+
+    def test_assignee_and_group_queues(self):
+        workflow = ApprovalWorkflow()
+        reviewer = uuid4()
+        workflow.add_route(ApprovalRoute(
+            id="deploys",
+            name="Deploys",
+            action_patterns=["deploy.*"],
+            assign_to_user=reviewer,
+            assign_to_group="release",
+        ))
+        deploy_low = _create(workflow, ApprovalPriority.LOW, action_type="deploy.prod")
+        deploy_high = _create(workflow, ApprovalPriority.HIGH, action_type="deploy.stage")
+        other = _create(workflow, ApprovalPriority.CRITICAL, action_type="tool.run")
+
+        assert [r.id for r in workflow.get_pending_requests(assignee=reviewer)] == [deploy_high.id, deploy_low.id]
+        assert [r.id for r in workflow.get_pending_requests(group="release")] == [deploy_high.id, deploy_low.id]
+        assert [r.id for r in workflow.get_pending_requests(group="approvers_none")] == [other.id]
+        assert workflow.get_pending_requests(assignee=uuid4()) == []
+
+    def test_decided_and_cancelled_requests_leave_queue(self):
+        workflow = ApprovalWorkflow()
+        a = _create(workflow, ApprovalPriority.HIGH)
+        b = _create(workflow, ApprovalPriority.HIGH)
+        c = _create(workflow, ApprovalPriority.HIGH)
+
+        workflow.reject(a.id, rejected_by=uuid4(), reason="no")
+        workflow.cancel(b.id)
+
+        assert [r.id for r in workflow.get_pending_requests()] == [c.id]
+
+    def test_escalated_request_leaves_pending_queue(self):
+        workflow = ApprovalWorkflow()
+        request = _create(workflow, ApprovalPriority.MEDIUM)
+        other = _create(workflow, ApprovalPriority.LOW)
+
+        workflow.escalate(request.id)
+
+        assert request.status == ApprovalStatus.ESCALATED
+        assert request.assigned_group == f"approvers_{EscalationLevel.TEAM_LEAD.value}"
+        assert workflow.get_pending_requests(group=request.assigned_group) == []
+        assert [r.id for r in workflow.get_pending_requests()] == [other.id]
+
+
+# ======================================================================
+# Deadline Sweeps
+# ======================================================================
+class TestDeadlineSweeps:
+    def test_expiry_sweep_only_pops_due_requests(self):
+        workflow = ApprovalWorkflow()
+        critical = _create(workflow, ApprovalPriority.CRITICAL)  # 15 minute timeout
+        low = _create(workflow, ApprovalPriority.LOW)  # 2 hour timeout
+
+        expired = workflow.process_expirations(datetime.utcnow() + timedelta(minutes=20))
+
+        assert [r.id for r in expired] == [critical.id]
+        assert critical.status == ApprovalStatus.EXPIRED
+        assert [r.id for r in workflow.get_pending_requests()] == [low.id]
+
+    def test_decided_requests_are_not_expired(self):
+        workflow = ApprovalWorkflow()
+        request = _create(workflow, ApprovalPriority.CRITICAL)
+        workflow.approve(request.id, approved_by=uuid4())
+
+        assert workflow.process_expirations(datetime.utcnow() + timedelta(days=1)) == []
+        assert request.status == ApprovalStatus.APPROVED
+
+    def test_escalated_requests_still_expire(self):
+        workflow = ApprovalWorkflow()
+        request = _create(workflow, ApprovalPriority.CRITICAL)
+        workflow.escalate(request.id)
+
+        expired = workflow.process_expirations(datetime.utcnow() + timedelta(minutes=20))
+
+        assert [r.id for r in expired] == [request.id]
+        assert request.status == ApprovalStatus.EXPIRED
+
+    def test_escalation_sweep_uses_route_timing(self):
+        workflow = ApprovalWorkflow()
+        workflow.add_route(ApprovalRoute(
+            id="all",
+            name="All",
+            timeout_minutes=120,
+            escalate_after_minutes=10,
+        ))
+        request = _create(workflow, ApprovalPriority.MEDIUM)
+
+        assert workflow.process_escalations(datetime.utcnow() + timedelta(minutes=5)) == []
+        escalated = workflow.process_escalations(datetime.utcnow() + timedelta(minutes=11))
+
+        assert [r.id for r in escalated] == [request.id]
+        assert request.escalation_level == EscalationLevel.TEAM_LEAD
+        # Re-routing scheduled the next escalation step
+        workflow.process_escalations(datetime.utcnow() + timedelta(minutes=25))
+        assert request.escalation_level == EscalationLevel.MANAGER
+
+    def test_deadline_queue_reschedule_supersedes(self):
+        queue = DeadlineQueue()
+        now = datetime.utcnow()
+        queue.schedule("a", now + timedelta(minutes=1))
+        queue.schedule("b", now + timedelta(minutes=2))
+        queue.schedule("a", now + timedelta(minutes=10))
+        queue.cancel("b")
+
+        assert queue.pop_due(now + timedelta(minutes=5)) == []
+        assert queue.peek() == now + timedelta(minutes=10)
+        assert queue.pop_due(now + timedelta(minutes=10)) == ["a"]
+        assert len(queue) == 0
+
+
+# ======================================================================
+# Override Scope Index
+# ======================================================================
+class TestOverrideLookup:
+    def _override(self, manager: OverrideManager, **kwargs):
+        return manager.create_override(
+            policy_id=kwargs.pop("policy_id", "p1"),
+            policy_name="Policy",
+            original_decision="deny",
+            override_decision="allow",
+            reason="r",
+            justification="j",
+            created_by=uuid4(),
+            scope=kwargs.pop("scope", "permanent"),
+            **kwargs,
+        )
+
+    def test_returns_oldest_applicable_override(self):
+        manager = OverrideManager()
+        agent, tenant = uuid4(), uuid4()
+        scoped = self._override(manager, agent_id=agent, tenant_id=tenant)
+        self._override(manager)
+
+        assert manager.find_applicable_override("p1", agent_id=agent, tenant_id=tenant) is scoped
+
+    def test_scope_restrictions(self):
+        manager = OverrideManager()
+        agent, tenant = uuid4(), uuid4()
+        scoped = self._override(manager, agent_id=agent)
+
+        assert manager.find_applicable_override("p1", agent_id=uuid4()) is None
+        assert manager.find_applicable_override("p1", agent_id=agent, tenant_id=tenant) is scoped
+        assert manager.find_applicable_override("p2", agent_id=agent) is None
+
+    def test_action_patterns(self):
+        manager = OverrideManager()
+        deploys = self._override(manager, applies_to=["deploy.*", "rollback"])
+
+        assert manager.find_applicable_override("p1", action_type="deploy.prod") is deploys
+        assert manager.find_applicable_override("p1", action_type="rollback") is deploys
+        assert manager.find_applicable_override("p1", action_type="delete.table") is None
+        assert manager.find_applicable_override("p1") is deploys
+
+    def test_skips_revoked_and_exhausted(self):
+        manager = OverrideManager()
+        first = self._override(manager, scope="single")
+        second = self._override(manager)
+
+        assert manager.find_applicable_override("p1") is first
+        assert manager.use_override(first.id)
+        assert manager.find_applicable_override("p1") is second
+
+        manager.revoke(second.id, revoked_by=uuid4())
+        assert manager.find_applicable_override("p1") is None
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_linear_scan(self, seed):
+        import fnmatch
+
+        rng = random.Random(seed)
+        manager = OverrideManager()
+        agents = [uuid4() for _ in range(3)]
+        tenants = [uuid4() for _ in range(3)]
+        patterns = ["deploy.*", "read.*", "*.prod", "tool.run"]
+        overrides = []
+        for _ in range(60):
+            overrides.append(self._override(
+                manager,
+                agent_id=rng.choice(agents + [None]),
+                tenant_id=rng.choice(tenants + [None]),
+                applies_to=rng.sample(patterns, rng.randint(0, 2)),
+            ))
+        for override in rng.sample(overrides, 20):
+            manager.revoke(override.id, revoked_by=uuid4())
+
+        for _ in range(200):
+            agent = rng.choice(agents + [None])
+            tenant = rng.choice(tenants + [None])
+            action = rng.choice(["deploy.prod", "read.stage", "tool.run", "x", None])
+            expected = next(
+                (
+                    o for o in overrides
+                    if o.is_valid()
+                    and not (o.agent_id and o.agent_id != agent)
+                    and not (o.tenant_id and o.tenant_id != tenant)
+                    and not (o.applies_to and action and not any(fnmatch.fnmatch(action, p) for p in o.applies_to))
+                ),
+                None,
+            )
+            assert manager.find_applicable_override("p1", agent, tenant, action) is expected
@@ -0,0 +1,257 @@
+"""Tests for the indexed LineageGraph and batched lineage tracing."""
+
+import asyncio
+import random
+import time
+from uuid import uuid4
+
+import pytest
+
+from app.agentic.deep_data.lineage_tracer import (
+    CrossSystemLineageTracer,
+    EdgeType,
+    LineageEdge,
+    LineageGraph,
+    LineageNode,
+    NodeType,
+)
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+def _node(node_id: str) -> LineageNode:
+    return LineageNode(id=node_id, name=node_id, node_type=NodeType.TABLE, source_system="test")
+
+
+def _graph(edges, extra_nodes=()) -> LineageGraph:
+    graph = LineageGraph(root_id=edges[0][0] if edges else "root")
+    for node_id in {n for e in edges for n in e} | set(extra_nodes):
+        graph.add_node(_node(node_id))
+    for source, target in edges:
+        graph.add_edge(LineageEdge(source_id=source, target_id=target, edge_type=EdgeType.DIRECT))
+    return graph
+
+
+def _reference_paths(edges, node_id, nodes):
+    """The original recursive path enumeration, used as an oracle on DAGs."""
+    paths = []
+
+    def walk(current, path):
+        if current not in nodes:
+            return
+        path = path + [current]
+        downstream = [t for s, t in edges if s == current]
+        if not downstream:
+            paths.append(path)
+        for target in downstream:
+            walk(target, path)
+
+    walk(node_id, [])
+    return paths
+
+
+def _reference_reachable(edges, node_id, depth, upstream):
+    frontier, seen, found = {node_id}, {node_id}, {}
+    for level in range(1, depth + 1):
+        nxt = set()
+        for s, t in edges:
+            a, b = (t, s) if upstream else (s, t)
+            if a in frontier and b not in seen:
+                nxt.add(b)
+        for n in nxt:
+            found[n] = level
+        seen |= nxt
+        frontier = nxt
+    return found
+
+
+def _layered_edges(levels: int, width: int, fanout: int, seed: int):
+    rng = random.Random(seed)
+    edges = []
+    for level in range(levels - 1):
+        for i in range(width):
+            for j in rng.sample(range(width), fanout):
+                edges.append((f"L{level}_{i}", f"L{level + 1}_{j}"))
+    return edges
+
+
+class StubAODServer:
+    """In-memory stand-in for the AOD MCP server."""
+
+    def __init__(self, edges, latency: float = 0.0):
+        self.downstream = {}
+        self.upstream = {}
+        for source, target in edges:
+            self.downstream.setdefault(source, []).append(target)
+            self.upstream.setdefault(target, []).append(source)
+        self.latency = latency
+        self.calls = {"aod_get_lineage": 0, "aod_get_asset_details": 0}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def execute_tool(self, name, args, context):
+        self.calls[name] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        if name == "aod_get_asset_details":
+            return {"success": True, "asset": {"name": args["asset_id"], "type": "table", "source_system": "wh"}}
+
+        asset_id, direction = args["asset_id"], args["direction"]
+        index = self.upstream if direction == "upstream" else self.downstream
+        items = [{"id": n, "name": n, "transformation": "join"} for n in index.get(asset_id, [])]
+        return {"success": True, "lineage": {direction: items}}
+
+
+# ======================================================================
+# Graph Index Tests
+# ======================================================================
+class TestLineageGraph:
+    @pytest.mark.parametrize("upstream", [True, False])
+    def test_reachability_matches_edge_scan(self, upstream):
+        edges = _layered_edges(levels=6, width=20, fanout=3, seed=1)
+        graph = _graph(edges)
+        for start in ["L0_0", "L3_5", "L5_7"]:
+            for depth in [1, 2, 5]:
+                expected = _reference_reachable(edges, start, depth, upstream)
+                assert graph.get_distances(start, depth=depth, upstream=upstream) == expected
+                getter = graph.get_upstream if upstream else graph.get_downstream
+                assert {n.id for n in getter(start, depth=depth)} == set(expected)
+
+    def test_diamond_counts_each_node_once(self):
+        graph = _graph([("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+        assert [n.id for n in graph.get_downstream("a", depth=3)] == ["b", "c", "d"]
+        assert [n.id for n in graph.get_upstream("d", depth=3)] == ["b", "c", "a"]
+
+    def test_edges_passed_at_construction_are_indexed(self):
+        edge = LineageEdge(source_id="a", target_id="b", edge_type=EdgeType.DIRECT)
+        graph = LineageGraph(root_id="a", nodes={"a": _node("a"), "b": _node("b")}, edges=[edge])
+        assert graph.outgoing_edges("a") == [edge]
+        assert [n.id for n in graph.get_upstream("b")] == ["a"]
+
+    def test_impact_paths_match_recursive_enumeration(self):
+        edges = _layered_edges(levels=5, width=6, fanout=2, seed=3)
+        graph = _graph(edges)
+        for start in ["L0_0", "L2_1", "L4_3"]:
+            expected = _reference_paths(edges, start, graph.nodes)
+            assert [[n.id for n in p] for p in graph.get_impact_path(start)] == expected
+
+    def test_impact_path_cache_invalidated_on_change(self):
+        graph = _graph([("a", "b")])
+        assert [[n.id for n in p] for p in graph.get_impact_path("a")] == [["a", "b"]]
+
+        graph.add_node(_node("c"))
+        graph.add_edge(LineageEdge(source_id="b", target_id="c", edge_type=EdgeType.DIRECT))
+        assert [[n.id for n in p] for p in graph.get_impact_path("a")] == [["a", "b", "c"]]
+
+    def test_impact_paths_terminate_on_cycles(self):
+        graph = _graph([("a", "b"), ("b", "c"), ("c", "a"), ("b", "d")])
+        paths = [[n.id for n in p] for p in graph.get_impact_path("a")]
+        assert paths == [["a", "b", "c"], ["a", "b", "d"]]
+
+    def test_max_paths_bound(self):
+        edges = _layered_edges(levels=6, width=10, fanout=3, seed=4)
+        graph = _graph(edges)
+        assert len(graph.get_impact_path("L0_0", max_paths=5)) == 5
+
+    def test_50k_edge_graph_queries_are_fast(self):
+        edges = _layered_edges(levels=11, width=5000, fanout=1, seed=5)
+        assert len(edges) == 50_000
+        graph = _graph(edges)
+
+        start = time.perf_counter()
+        for i in range(200):
+            graph.get_downstream(f"L0_{i}", depth=10)
+            graph.get_upstream(f"L10_{i}", depth=10)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 2.0
+        assert graph.to_dict()["statistics"]["total_edges"] == 50_000
+
+    def test_50k_edge_impact_paths_share_suffixes(self):
+        # Binary tree fan-in: many roots share long downstream suffixes
+        edges = [(f"n{i}", f"n{i // 2}") for i in range(2, 50_002)]
+        graph = _graph(edges)
+
+        start = time.perf_counter()
+        for i in range(25_001, 26_001):
+            paths = graph.get_impact_path(f"n{i}")
+            assert len(paths) == 1 and paths[0][-1].id == "n1"
+        assert time.perf_counter() - start < 2.0
+
+
+# ======================================================================
+# Tracer Tests
+# ======================================================================
+class TestBatchedTracer:
+    async def test_trace_matches_stub_topology(self):
+        edges = _layered_edges(levels=5, width=30, fanout=2, seed=6)
+        server = StubAODServer(edges)
+        tracer = CrossSystemLineageTracer(aod_server=server)
+
+        graph = await tracer.trace_lineage("L0_0", uuid4(), direction="downstream", depth=4)
+
+        expected = _reference_reachable(edges, "L0_0", 4, upstream=False)
+        assert set(graph.nodes) == set(expected) | {"L0_0"}
+        assert graph.get_distances("L0_0", depth=4) == expected
+        assert all(e.edge_type == EdgeType.JOIN for e in graph.edges)
+
+    async def test_upstream_edges_point_at_traced_node(self):
+        server = StubAODServer([("src_a", "orders"), ("src_b", "orders"), ("raw", "src_a")])
+        tracer = CrossSystemLineageTracer(aod_server=server)
+
+        graph = await tracer.trace_lineage("orders", uuid4(), direction="upstream", depth=3)
+
+        assert {(e.source_id, e.target_id) for e in graph.edges} == {
+            ("src_a", "orders"), ("src_b", "orders"), ("raw", "src_a"),
+        }
+
+    async def test_each_node_expanded_once_and_levels_batched(self):
+        edges = [("root", f"c{i}") for i in range(50)] + [(f"c{i}", "sink") for i in range(50)]
+        server = StubAODServer(edges, latency=0.01)
+        tracer = CrossSystemLineageTracer(aod_server=server, max_concurrency=64)
+
+        start = time.perf_counter()
+        await tracer.trace_lineage("root", uuid4(), direction="downstream", depth=3)
+        elapsed = time.perf_counter() - start
+
+        # root + 50 children + sink, one lineage call each
+        assert server.calls["aod_get_lineage"] == 52
+        assert server.max_in_flight >= 50
+        # Sequential tracing would take > 100 round trips
+        assert elapsed < 1.0
+
+    async def test_concurrency_is_bounded(self):
+        edges = [("root", f"c{i}") for i in range(100)]
+        server = StubAODServer(edges, latency=0.001)
+        tracer = CrossSystemLineageTracer(aod_server=server, max_concurrency=8)
+
+        await tracer.trace_lineage("root", uuid4(), direction="downstream", depth=2)
+
+        assert server.max_in_flight <= 8
+
+    async def test_trace_over_50k_edge_stub(self):
+        edges = _layered_edges(levels=11, width=5000, fanout=1, seed=7)
+        server = StubAODServer(edges)
+        tracer = CrossSystemLineageTracer(aod_server=server, max_concurrency=256)
+
+        start = time.perf_counter()
+        graph = await tracer.trace_lineage("L5_0", uuid4(), direction="both", depth=5)
+        elapsed = time.perf_counter() - start
+
+        assert set(_reference_reachable(edges, "L5_0", 5, upstream=True)) <= set(graph.nodes)
+        assert set(_reference_reachable(edges, "L5_0", 5, upstream=False)) <= set(graph.nodes)
+        assert elapsed < 5.0
+
+    async def test_impact_analysis_uses_shortest_distance(self):
+        server = StubAODServer([("a", "b"), ("b", "c"), ("a", "c")])
+        tracer = CrossSystemLineageTracer(aod_server=server)
+
+        impact = await tracer.analyze_impact("a", uuid4())
+
+        assert {x["id"]: x["distance"] for x in impact["affected_assets"]} == {"b": 1, "c": 1}
@@ -0,0 +1,268 @@
+"""
+Tests for cached, incremental and sharded EvalRunner runs.
+
+The fake agent is deterministic: a case's outcome depends only on the
+global part of the agent config and the definition of the one tool the
+case needs. So reused results can be checked against a full uncached run,
+and the agent's call count shows how many evaluations were skipped.
+"""
+
+import functools
+import hashlib
+from uuid import uuid4
+
+import pytest
+
+from app.agentic.eval.cache import EvalResultCache, affected_case_ids, shard_of, hash_test_case, wilson_interval
+from app.agentic.eval.golden_dataset import GOLDEN_DATASET, GoldenTestCase
+from app.agentic.eval.runner import EARLY_STOP_ERROR, EvalConfig, EvalRunner
+
+AGENT_ID = uuid4()
+TENANT_ID = uuid4()
+TOOLS = [f"tool_{k}" for k in range(10)]
+
+
+def agent_config(prompt="v1", model="claude-sonnet-4-20250514", **tool_versions):
+    return {
+        "system_prompt": prompt,
+        "model": model,
+        "tools": [{"name": name, "description": tool_versions.get(name, "v1")} for name in TOOLS],
+    }
+
+
+def make_cases(n=200):
+    return [
+        GoldenTestCase(
+            id=f"syn-{i:03d}",
+            input=f"question {i} for {TOOLS[i % len(TOOLS)]}",
+            category="syn",
+            difficulty="easy",
+            expected_tools=[TOOLS[i % len(TOOLS)]],
+            expected_output_contains=["ok"],
+        )
+        for i in range(n)
+    ]
+
+
+def _score(*parts):
+    return int(hashlib.sha256("|".join(parts).encode()).hexdigest()[:8], 16) % 100
+
+
+class FakeAgent:
+    """Uses the case's tool; passes unless (prompt, tool version, input) scores below fail_rate."""
+
+    def __init__(self, config, fail_rate=20, raise_for=()):
+        self.config = config
+        self.fail_rate = fail_rate
+        self.raise_for = set(raise_for)
+        self.calls = 0
+
+    async def execute(self, input, agent_id, tenant_id):
+        self.calls += 1
+        if input in self.raise_for:
+            raise RuntimeError("sandbox unavailable")
+        tool = input.rsplit(" ", 1)[1]
+        version = next(t["description"] for t in self.config["tools"] if t["name"] == tool)
+        ok = _score(self.config["system_prompt"], version, input) >= self.fail_rate
+        return {
+            "tool_calls": [{"name": tool}] if ok else [],
+            "output": "ok" if ok else "no",
+            "cost_usd": 0.01,
+            "steps_executed": 1,
+        }
+
+
+def make_executor(config):
+    return FakeAgent(config).execute
+
+
+def eval_config(config, **kwargs):
+    return EvalConfig(agent_id=AGENT_ID, tenant_id=TENANT_ID, agent_config=config, **kwargs)
+
+
+def outcomes(result):
+    return [(r.test_case_id, r.passed) for r in result.results]
+
+
+async def uncached(config, cases):
+    return await EvalRunner(FakeAgent(config).execute).run(eval_config(config), cases)
+
+
+# ======================================================================
+# Result cache
+# ======================================================================
+class TestResultCache:
+    async def test_unchanged_rerun_skips_every_case(self):
+        cases, config, cache = make_cases(), agent_config(), EvalResultCache()
+        agent = FakeAgent(config)
+        runner = EvalRunner(agent.execute, cache=cache)
+
+        first = await runner.run(eval_config(config), cases)
+        second = await runner.run(eval_config(config), cases)
+
+        assert agent.calls == len(cases)
+        assert (second.cached_cases, second.evaluated_cases) == (len(cases), 0)
+        assert outcomes(second) == outcomes(first)
+        assert second.pass_rate == first.pass_rate and 0 < first.pass_rate < 1
+        assert all(r.cached for r in second.results)
+
+    async def test_model_change_reruns_everything(self):
+        cases, cache = make_cases(50), EvalResultCache()
+        await EvalRunner(FakeAgent(agent_config()).execute, cache=cache).run(eval_config(agent_config()), cases)
+
+        config = agent_config(model="claude-opus-4-20250514")
+        agent = FakeAgent(config)
+        result = await EvalRunner(agent.execute, cache=cache).run(eval_config(config), cases)
+        assert agent.calls == 50 and result.cached_cases == 0
+
+    async def test_errors_are_not_cached(self):
+        cases, config, cache = make_cases(20), agent_config(), EvalResultCache()
+        flaky = FakeAgent(config, raise_for={cases[3].input})
+        first = await EvalRunner(flaky.execute, cache=cache).run(eval_config(config), cases)
+        assert first.skipped_cases == 1
+
+        agent = FakeAgent(config)
+        second = await EvalRunner(agent.execute, cache=cache).run(eval_config(config), cases)
+        assert agent.calls == 1 and second.skipped_cases == 0
+
+    async def test_edited_case_is_reevaluated(self):
+        cases, config, cache = make_cases(20), agent_config(), EvalResultCache()
+        await EvalRunner(FakeAgent(config).execute, cache=cache).run(eval_config(config), cases)
+
+        cases[5].expected_output_contains = ["ok", "done"]
+        agent = FakeAgent(config)
+        result = await EvalRunner(agent.execute, cache=cache).run(eval_config(config), cases)
+        assert agent.calls == 1 and result.cached_cases == 19
+
+    async def test_persisted_cache_is_reused(self, tmp_path):
+        cases, config = make_cases(20), agent_config()
+        path = str(tmp_path / "eval_cache.json")
+        cache = EvalResultCache(path)
+        first = await EvalRunner(FakeAgent(config).execute, cache=cache).run(eval_config(config), cases)
+        cache.save()
+
+        agent = FakeAgent(config)
+        second = await EvalRunner(agent.execute, cache=EvalResultCache(path)).run(eval_config(config), cases)
+        assert agent.calls == 0 and outcomes(second) == outcomes(first)
+
+    async def test_golden_dataset_default(self):
+        config, cache = agent_config(), EvalResultCache()
+
+        async def echo(input, agent_id, tenant_id):
+            return {"output": input, "tool_calls": [], "steps_executed": 1}
+
+        await EvalRunner(echo, cache=cache).run(eval_config(config))
+        result = await EvalRunner(None, cache=cache).run(eval_config(config))
+        assert result.total_cases == len(GOLDEN_DATASET) == result.cached_cases
+
+
+# ======================================================================
+# Incremental re-evaluation
+# ======================================================================
+class TestIncremental:
+    async def test_tool_change_reruns_only_affected_cases(self):
+        cases, cache = make_cases(), EvalResultCache()
+        await EvalRunner(FakeAgent(agent_config()).execute, cache=cache).run(eval_config(agent_config()), cases)
+
+        new_config = agent_config(tool_3="v2")
+        agent = FakeAgent(new_config)
+        result = await EvalRunner(agent.execute, cache=cache).run(eval_config(new_config), cases)
+
+        affected = [tc for tc in cases if tc.expected_tools == ["tool_3"]]
+        assert agent.calls == len(affected) == result.evaluated_cases
+        assert result.carried_over_cases == len(cases) - len(affected)
+        assert outcomes(result) == outcomes(await uncached(new_config, cases))
+
+        # The carried-over results are now cached under the new config
+        agent = FakeAgent(new_config)
+        again = await EvalRunner(agent.execute, cache=cache).run(eval_config(new_config), cases)
+        assert agent.calls == 0 and again.cached_cases == len(cases)
+
+    async def test_explicit_baseline(self):
+        cases, cache = make_cases(50), EvalResultCache()
+        base = agent_config()
+        await EvalRunner(FakeAgent(base).execute, cache=cache).run(eval_config(base), cases)
+        await EvalRunner(FakeAgent(agent_config(prompt="v9")).execute, cache=cache).run(
+            eval_config(agent_config(prompt="v9")), cases
+        )
+
+        new_config = agent_config(tool_1="v2", tool_2="v2")
+        agent = FakeAgent(new_config)
+        await EvalRunner(agent.execute, cache=cache).run(eval_config(new_config, baseline_config=base), cases)
+        assert agent.calls == 10
+
+    async def test_global_change_reruns_everything(self):
+        cases, cache = make_cases(50), EvalResultCache()
+        await EvalRunner(FakeAgent(agent_config()).execute, cache=cache).run(eval_config(agent_config()), cases)
+
+        new_config = agent_config(prompt="v2")
+        agent = FakeAgent(new_config)
+        result = await EvalRunner(agent.execute, cache=cache).run(eval_config(new_config), cases)
+        assert agent.calls == 50 and result.carried_over_cases == 0
+
+    def test_affected_cases_include_previously_used_tools(self):
+        cases = make_cases(3)
+        old, new = agent_config(), agent_config(tool_9="v2")
+        assert affected_case_ids(old, new, cases) == set()
+        assert affected_case_ids(old, new, cases, previous_tools={"syn-001": ["tool_9"]}) == {"syn-001"}
+        assert affected_case_ids(old, agent_config(prompt="x"), cases) == {"syn-000", "syn-001", "syn-002"}
+
+
+# ======================================================================
+# Early stop
+# ======================================================================
+class TestEarlyStop:
+    @pytest.mark.parametrize("fail_rate, threshold, expect_above", [(5, 0.6, True), (70, 0.8, False)])
+    async def test_stops_once_bound_crosses_threshold(self, fail_rate, threshold, expect_above):
+        cases, config = make_cases(), agent_config()
+        agent = FakeAgent(config, fail_rate=fail_rate)
+        result = await EvalRunner(agent.execute).run(
+            eval_config(config, pass_rate_threshold=threshold, max_parallel=1), cases
+        )
+
+        assert result.early_stopped
+        assert agent.calls == result.evaluated_cases < len(cases)
+        assert sum(r.error == EARLY_STOP_ERROR for r in result.results) == len(cases) - agent.calls
+        if expect_above:
+            assert result.pass_rate_lower >= threshold
+        else:
+            assert result.pass_rate_upper < threshold
+
+    async def test_no_stop_near_threshold(self):
+        cases, config = make_cases(100), agent_config()
+        result = await EvalRunner(FakeAgent(config).execute).run(
+            eval_config(config, pass_rate_threshold=0.8, max_parallel=1), cases
+        )
+        assert not result.early_stopped and result.evaluated_cases == 100
+
+    def test_wilson_interval(self):
+        lower, upper = wilson_interval(90, 100)
+        assert 0.82 < lower < 0.83 and 0.94 < upper < 0.95
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+# ======================================================================
+# Sharding
+# ======================================================================
+class TestSharding:
+    async def test_shards_partition_cases(self):
+        cases, config = make_cases(), agent_config()
+        seen = []
+        for shard in range(3):
+            result = await EvalRunner(FakeAgent(config).execute).run(
+                eval_config(config, shard_count=3, shard_index=shard), cases
+            )
+            seen.extend(r.test_case_id for r in result.results)
+        assert sorted(seen) == [tc.id for tc in cases]
+
+    async def test_process_shards_match_single_process(self):
+        cases, config, cache = make_cases(60), agent_config(), EvalResultCache()
+        runner = EvalRunner(None, cache=cache)
+
+        sharded = await runner.run_sharded(eval_config(config), functools.partial(make_executor, config), 2, cases)
+        assert sharded.error is None and sharded.evaluated_cases == 60
+        assert outcomes(sharded) == outcomes(await uncached(config, cases))
+        assert {shard_of(hash_test_case(tc), 2) for tc in cases} == {0, 1}
+
+        again = await runner.run_sharded(eval_config(config), functools.partial(make_executor, config), 2, cases)
+        assert (again.cached_cases, again.evaluated_cases) == (60, 0)
@@ -0,0 +1,295 @@
+"""
+Tests for windowed cost aggregation in CostTracker and BudgetEnforcer.
+
+Exactness tests replay the same records through the aggregated tracker and
+the original list-scanning logic (reimplemented below) and compare results.
+"""
+
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.agentic.gateway import cost as cost_module
+from app.agentic.gateway.cost import MODEL_PRICING, CostTracker, ModelPricing, UsageRecord, lookup_pricing
+from app.agentic.governance.budget import Budget, BudgetEnforcer
+
+NOW = datetime(2026, 3, 18, 15, 37, 12, 345678)  # A Wednesday
+TENANTS = [uuid4() for _ in range(4)] + [None]
+MODELS = ["claude-sonnet-4-20250514", "gpt-4o", "gpt-4o-mini", "mystery-model"]
+
+
+# ======================================================================
+# List-based reference (the pre-rollup CostTracker logic)
+# ======================================================================
+def ref_tenant_cost(records, tenant_id, since):
+    return sum(r.cost_usd for r in records if r.tenant_id == tenant_id and r.timestamp >= since)
+
+
+def ref_run_cost(records, run_id):
+    return sum(r.cost_usd for r in records if r.run_id == run_id)
+
+
+def ref_summary(records, tenant_id, since, until):
+    records = [
+        r for r in records
+        if r.timestamp >= since and r.timestamp <= until
+        and (tenant_id is None or r.tenant_id == tenant_id)
+    ]
+    by_model = {}
+    for r in records:
+        m = by_model.setdefault(r.model, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0})
+        m["calls"] += 1
+        m["input_tokens"] += r.input_tokens
+        m["output_tokens"] += r.output_tokens
+        m["cost_usd"] += r.cost_usd
+    return {
+        "calls": len(records),
+        "input_tokens": sum(r.input_tokens for r in records),
+        "output_tokens": sum(r.output_tokens for r in records),
+        "cost_usd": sum(r.cost_usd for r in records),
+        "by_model": by_model,
+    }
+
+
+def ref_pricing(model):
+    pricing = MODEL_PRICING.get(model)
+    if not pricing:
+        for model_id, p in MODEL_PRICING.items():
+            if model_id in model or model in model_id:
+                pricing = p
+                break
+    return pricing or MODEL_PRICING.get("claude-sonnet-4-20250514")
+
+
+def _records(n=3000, days=40, seed=34):
+    rng = random.Random(seed)
+    runs = [uuid4() for _ in range(50)]
+    records = []
+    for _ in range(n):
+        offset = timedelta(microseconds=rng.randrange(int(days * 86400 * 1e6)))
+        # Runs are recent; older history has only tenant-level usage
+        run_id = rng.choice(runs + [None]) if offset < timedelta(days=20) else None
+        records.append(UsageRecord(
+            timestamp=NOW - offset,
+            model=rng.choice(MODELS),
+            input_tokens=rng.randint(0, 5000),
+            output_tokens=rng.randint(0, 2000),
+            cost_usd=round(rng.random() / 10, 6),
+            run_id=run_id,
+            tenant_id=rng.choice(TENANTS),
+        ))
+    return records, runs
+
+
+def _tracker(records):
+    tracker = CostTracker(clock=lambda: NOW)
+    for r in records:
+        tracker.add_record(r)
+    return tracker
+
+
+def _assert_summary(actual, expected):
+    total = actual["total"]
+    assert (total["calls"], total["input_tokens"], total["output_tokens"]) == (
+        expected["calls"], expected["input_tokens"], expected["output_tokens"]
+    )
+    assert total["cost_usd"] == pytest.approx(expected["cost_usd"], rel=1e-9, abs=1e-12)
+    assert actual["by_model"].keys() == expected["by_model"].keys()
+    for model, m in expected["by_model"].items():
+        got = actual["by_model"][model]
+        assert (got["calls"], got["input_tokens"], got["output_tokens"]) == (
+            m["calls"], m["input_tokens"], m["output_tokens"]
+        )
+        assert got["cost_usd"] == pytest.approx(m["cost_usd"], rel=1e-9, abs=1e-12)
+
+
+# ======================================================================
+# Exactness vs list-based implementation
+# ======================================================================
+class TestExactness:
+    def test_random_windows_match(self):
+        records, _ = _records()
+        tracker = _tracker(records)
+        rng = random.Random(1)
+
+        windows = [(None, None), (NOW - timedelta(days=1), NOW), (NOW - timedelta(days=60), None)]
+        for _ in range(150):
+            a = NOW - timedelta(seconds=rng.uniform(0, 34 * 86400))
+            b = NOW - timedelta(seconds=rng.uniform(0, 34 * 86400))
+            windows.append((min(a, b), max(a, b)))
+        # Bounds landing exactly on records and on bucket boundaries
+        windows.append((records[0].timestamp, records[0].timestamp))
+        windows.append((NOW.replace(hour=0, minute=0, second=0, microsecond=0), NOW.replace(minute=0, second=0)))
+
+        for since, until in windows:
+            for tenant in [None] + TENANTS[:2]:
+                expected = ref_summary(
+                    records, tenant,
+                    since or NOW - timedelta(days=30),
+                    until or NOW,
+                )
+                _assert_summary(tracker.get_usage_summary(tenant, since, until), expected)
+
+    def test_tenant_and_run_costs_match(self):
+        records, runs = _records()
+        tracker = _tracker(records)
+
+        for tenant in TENANTS:
+            for since in [None, NOW - timedelta(days=3, minutes=7), NOW - timedelta(days=33)]:
+                expected = ref_tenant_cost(records, tenant, since or NOW - timedelta(days=30))
+                assert tracker.get_tenant_cost(tenant, since) == pytest.approx(expected, rel=1e-9, abs=1e-12)
+        for run_id in runs:
+            assert tracker.get_run_cost(run_id) == pytest.approx(ref_run_cost(records, run_id), rel=1e-9)
+
+    def test_clear_records_older_than(self):
+        records, runs = _records()
+        tracker = _tracker(records)
+        cutoff = NOW - timedelta(days=12, hours=5, minutes=3)
+
+        tracker.clear_records(older_than=cutoff)
+        kept = [r for r in records if r.timestamp >= cutoff]
+
+        _assert_summary(
+            tracker.get_usage_summary(None, NOW - timedelta(days=40), NOW),
+            ref_summary(kept, None, NOW - timedelta(days=40), NOW),
+        )
+        for run_id in runs:
+            assert tracker.get_run_cost(run_id) == pytest.approx(ref_run_cost(kept, run_id), rel=1e-9, abs=1e-12)
+
+        tracker.clear_records()
+        assert tracker.get_usage_summary()["total"]["calls"] == 0
+
+    def test_budget_checks_use_running_totals(self):
+        tenant = uuid4()
+        tracker = CostTracker(clock=lambda: NOW)
+        tracker.set_budget_limit(tenant, 1.0)
+        tracker.record_usage("gpt-4o", 0, 0, cost_usd=0.75, tenant_id=tenant)
+
+        assert tracker.get_budget_remaining(tenant) == pytest.approx(0.25)
+        assert tracker.check_budget(tenant, 0.25)
+        assert not tracker.check_budget(tenant, 0.26)
+
+
+class TestRetention:
+    def test_windows_beyond_raw_retention_use_day_buckets(self):
+        tracker = CostTracker(raw_retention=timedelta(days=2), clock=lambda: NOW)
+        old = NOW - timedelta(days=10)
+        tracker.add_record(UsageRecord(old.replace(hour=1), "gpt-4o", 1, 1, 1.0))
+        tracker.add_record(UsageRecord(old.replace(hour=20), "gpt-4o", 1, 1, 2.0))
+        tracker.add_record(UsageRecord(NOW, "gpt-4o", 1, 1, 4.0))
+
+        # Recent windows stay exact
+        assert tracker.get_tenant_cost(None, since=NOW - timedelta(hours=1)) == 4.0
+        # Old records only have day totals: a window starting mid-day counts the whole day
+        assert tracker.get_tenant_cost(None, since=old.replace(hour=12)) == 7.0
+
+
+# ======================================================================
+# Pricing lookup
+# ======================================================================
+class TestPricingLookup:
+    def test_matches_linear_scan(self):
+        for model in MODELS + ["gpt-4", "claude-3-5-haiku", "anthropic/claude-opus-4-20250514", "o1"]:
+            assert lookup_pricing(model) is ref_pricing(model)
+
+    def test_memo_follows_table_changes(self, monkeypatch):
+        monkeypatch.setitem(MODEL_PRICING, "o1", ModelPricing("o1", 15.0, 60.0, "openai"))
+        assert lookup_pricing("o1-preview").model_id == "o1"
+
+        monkeypatch.delitem(MODEL_PRICING, "o1")
+        assert lookup_pricing("o1-preview").model_id == cost_module.DEFAULT_PRICING_MODEL
+
+    def test_unknown_model_warns_once(self, caplog):
+        model = f"unknown-{uuid4()}"
+        tracker = CostTracker()
+        for _ in range(3):
+            tracker.calculate_cost(model, 1000, 1000)
+        assert sum("Unknown model" in r.message for r in caplog.records) == 1
+
+
+# ======================================================================
+# Budget Enforcer
+# ======================================================================
+class TestBudgetBuckets:
+    def _enforcer(self, now):
+        clock = [now]
+        enforcer = BudgetEnforcer(clock=lambda: clock[0])
+        agent = uuid4()
+        start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        enforcer.set_budget(Budget(
+            agent_id=agent, daily_limit_usd=10, weekly_limit_usd=30, monthly_limit_usd=100,
+            per_action_limit_usd=100, per_run_limit_usd=100,
+            last_reset_daily=start, last_reset_weekly=start, last_reset_monthly=start,
+        ))
+        return enforcer, agent, clock
+
+    def test_calendar_rollover(self):
+        enforcer, agent, clock = self._enforcer(NOW)  # Wednesday the 18th
+        enforcer.record_cost(agent, 4.0)
+
+        clock[0] = NOW + timedelta(days=1)  # Thursday
+        enforcer.record_cost(agent, 2.0)
+        usage = enforcer.get_usage_summary(agent)
+        assert (usage["daily"]["usage_usd"], usage["weekly"]["usage_usd"], usage["monthly"]["usage_usd"]) == (2.0, 6.0, 6.0)
+
+        clock[0] = NOW + timedelta(days=5)  # Monday the 23rd
+        usage = enforcer.get_usage_summary(agent)
+        assert (usage["daily"]["usage_usd"], usage["weekly"]["usage_usd"], usage["monthly"]["usage_usd"]) == (0.0, 0.0, 6.0)
+
+        clock[0] = datetime(2026, 4, 1, 9)
+        assert enforcer.get_usage_summary(agent)["monthly"]["usage_usd"] == 0.0
+
+    def test_limits_enforced_from_buckets(self):
+        enforcer, agent, _ = self._enforcer(NOW)
+        for _ in range(9):
+            enforcer.record_cost(agent, 1.0)
+
+        assert enforcer.check_budget(agent, 1.0).allowed
+        check = enforcer.check_budget(agent, 1.5)
+        assert not check.allowed
+        assert "daily" in check.reason
+
+    def test_reset_usage_counts_from_reset(self):
+        enforcer, agent, clock = self._enforcer(NOW)
+        enforcer.record_cost(agent, 5.0)
+        clock[0] = NOW + timedelta(seconds=1)
+        enforcer.reset_usage(agent, period="daily")
+
+        enforcer.record_cost(agent, 1.0)
+        usage = enforcer.get_usage_summary(agent)
+        assert usage["daily"]["usage_usd"] == 1.0
+        assert usage["weekly"]["usage_usd"] == 6.0
+
+    def test_restored_usage_survives_set_budget(self):
+        clock = [NOW]
+        enforcer = BudgetEnforcer(clock=lambda: clock[0])
+        agent = uuid4()
+        month_start = NOW.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        enforcer.set_budget(Budget(
+            agent_id=agent, daily_limit_usd=10, weekly_limit_usd=30, monthly_limit_usd=100,
+            daily_usage_usd=3.0, weekly_usage_usd=8.0, monthly_usage_usd=20.0,
+            last_reset_daily=NOW.replace(hour=0, minute=0, second=0, microsecond=0),
+            last_reset_weekly=NOW - timedelta(days=2, hours=9),  # Monday
+            last_reset_monthly=month_start,
+        ))
+
+        enforcer.record_cost(agent, 1.0)
+        usage = enforcer.get_usage_summary(agent)
+        assert (usage["daily"]["usage_usd"], usage["weekly"]["usage_usd"], usage["monthly"]["usage_usd"]) == (4.0, 9.0, 21.0)
+
+        clock[0] = NOW + timedelta(days=1)
+        usage = enforcer.get_usage_summary(agent)
+        assert (usage["daily"]["usage_usd"], usage["weekly"]["usage_usd"], usage["monthly"]["usage_usd"]) == (0.0, 9.0, 21.0)
+
+    def test_daily_alerts_rearm_next_day(self):
+        enforcer, agent, clock = self._enforcer(NOW)
+        alerts = []
+        enforcer.on_alert(alerts.append)
+
+        enforcer.record_cost(agent, 6.0)
+        clock[0] = NOW + timedelta(days=1)
+        enforcer.record_cost(agent, 6.0)
+
+        assert [a.alert_type for a in alerts] == ["daily_50", "daily_50"]
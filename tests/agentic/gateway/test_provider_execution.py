@@ -0,0 +1,281 @@
+"""
+Tests for AIGateway provider execution.
+
+Local stub providers replace _call_anthropic/_call_openai with scripted
+latency and error distributions; the tests count provider calls to check
+coalescing, rate/concurrency limits, hedging, retries and fallback.
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from app.agentic.gateway.client import AIGateway, GatewayConfig, LLMProvider, LLMResponse
+from app.agentic.gateway.execution import AdaptiveLimiter, ProviderExecutor, TokenBucket
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class StubProvider:
+    """
+    Scripted provider.
+
+    Args:
+        latency: Callable(rng) -> seconds for each call
+        errors: Callable(rng, in_flight) -> status code to fail with, or None
+    """
+
+    def __init__(self, provider, latency=lambda rng: 0.01, errors=lambda rng, in_flight: None, seed=48):
+        self.provider = provider
+        self.latency = latency
+        self.errors = errors
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def call(self, messages, model_tier, model, max_tokens, temperature, tools, system):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            status = self.errors(self.rng, self.in_flight)
+            await asyncio.sleep(self.latency(self.rng))
+            if status is not None:
+                raise ProviderError(status)
+            return LLMResponse(
+                content=f"{self.provider.value}:{messages[-1]['content']}",
+                model=model,
+                provider=self.provider,
+                input_tokens=10,
+                output_tokens=5,
+                tool_calls=[{"id": "t1", "name": "noop", "input": {}}] if tools else [],
+            )
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+def make_gateway(primary=None, fallback=None, **config):
+    config = {"enable_cache": False, "retry_delay_seconds": 0.001, **config}
+    gateway = AIGateway(GatewayConfig(**config))
+    gateway._call_anthropic = (primary or StubProvider(LLMProvider.ANTHROPIC)).call
+    gateway._call_openai = (fallback or StubProvider(LLMProvider.OPENAI)).call
+    return gateway
+
+
+def ask(text):
+    return [{"role": "user", "content": text}]
+
+
+def p99(values):
+    ordered = sorted(values)
+    return ordered[int(len(ordered) * 0.99) - 1]
+
+
+# ======================================================================
+# Coalescing
+# ======================================================================
+class TestCoalescing:
+    async def test_identical_burst_makes_one_call(self):
+        stub = StubProvider(LLMProvider.ANTHROPIC, latency=lambda rng: 0.05)
+        gateway = make_gateway(stub)
+
+        responses = await asyncio.gather(*(
+            gateway.complete(ask("Summarize pipeline"), tools=[{"name": "noop"}]) for _ in range(50)
+        ))
+
+        assert stub.calls == 1
+        assert {r.content for r in responses} == {"anthropic:Summarize pipeline"}
+        assert len({id(r) for r in responses}) == 50
+        assert len({id(r.tool_calls) for r in responses}) == 50
+        assert sum(r.cached for r in responses) == 49
+        assert gateway.get_execution_stats()["coalesced"] == 49
+
+    async def test_different_requests_are_not_coalesced(self):
+        stub = StubProvider(LLMProvider.ANTHROPIC)
+        gateway = make_gateway(stub)
+
+        await asyncio.gather(
+            gateway.complete(ask("a")),
+            gateway.complete(ask("a"), temperature=0.1),
+            gateway.complete(ask("a"), system="be brief"),
+            gateway.complete(ask("b")),
+        )
+        assert stub.calls == 4
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        stub = StubProvider(LLMProvider.ANTHROPIC, latency=lambda rng: 0.05)
+        gateway = make_gateway(stub)
+
+        first = asyncio.create_task(gateway.complete(ask("q")))
+        second = asyncio.create_task(gateway.complete(ask("q")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert (await second).content == "anthropic:q"
+        assert stub.cancelled == 0
+
+    async def test_call_cancelled_when_every_caller_leaves(self):
+        stub = StubProvider(LLMProvider.ANTHROPIC, latency=lambda rng: 1.0)
+        gateway = make_gateway(stub)
+
+        callers = [asyncio.create_task(gateway.complete(ask("q"))) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.01)
+
+        assert stub.cancelled == 1
+        assert len(gateway._executor._flights) == 0
+
+
+# ======================================================================
+# Rate and concurrency limits
+# ======================================================================
+class TestLimits:
+    def test_token_bucket_refills_at_rate(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=10, burst=3, clock=lambda: now[0])
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+        now[0] = 0.25
+        assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+
+    async def test_requests_are_paced_per_model(self):
+        stub = StubProvider(LLMProvider.ANTHROPIC, latency=lambda rng: 0)
+        gateway = make_gateway(stub, requests_per_second=100, burst=5)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(gateway.complete(ask(str(i))) for i in range(25)))
+        # 5 from the burst, 20 more at 100/s
+        assert time.perf_counter() - start >= 0.18
+        assert stub.calls == 25
+
+    async def test_concurrency_backs_off_on_rate_limits(self):
+        capacity = 4
+        stub = StubProvider(
+            LLMProvider.ANTHROPIC,
+            latency=lambda rng: 0.01,
+            errors=lambda rng, in_flight: 429 if in_flight > capacity else None,
+        )
+        gateway = make_gateway(stub, requests_per_second=10_000, burst=10_000, max_concurrency_per_model=32,
+                               max_retries=10, hedge_requests=False)
+
+        responses = await asyncio.gather(*(gateway.complete(ask(str(i))) for i in range(300)))
+
+        assert len(responses) == 300
+        stats = gateway.get_execution_stats()
+        assert stats["rate_limited"] > 0
+        limiter = gateway._executor.lane("anthropic", "claude-sonnet-4-20250514").limiter
+        assert limiter.current_limit < 32
+        assert limiter.in_flight == 0
+
+    async def test_limiter_wakes_waiters_in_order(self):
+        limiter = AdaptiveLimiter(max_limit=1)
+        order = []
+
+        async def worker(n):
+            await limiter.acquire()
+            order.append(n)
+            await asyncio.sleep(0)
+            limiter.release()
+
+        await asyncio.gather(*(worker(n) for n in range(5)))
+        assert order == [0, 1, 2, 3, 4]
+
+
+# ======================================================================
+# Hedging
+# ======================================================================
+class TestHedging:
+    async def _latencies(self, hedge):
+        # 5% of calls hit a 300ms tail
+        stub = StubProvider(LLMProvider.ANTHROPIC, latency=lambda rng: 0.3 if rng.random() < 0.05 else 0.005)
+        gateway = make_gateway(stub, hedge_requests=hedge, hedge_percentile=90, hedge_budget=0.2,
+                               requests_per_second=10_000, burst=10_000)
+        latencies = []
+
+        async def timed(i):
+            start = time.perf_counter()
+            await gateway.complete(ask(str(i)))
+            latencies.append(time.perf_counter() - start)
+
+        for batch in range(12):
+            await asyncio.gather(*(timed(batch * 20 + i) for i in range(20)))
+        return latencies, gateway.get_execution_stats()
+
+    async def test_hedging_cuts_tail_latency(self):
+        plain, _ = await self._latencies(hedge=False)
+        hedged, stats = await self._latencies(hedge=True)
+
+        assert p99(plain) >= 0.25
+        assert p99(hedged) < 0.15
+        assert 0 < stats["hedges"] <= 0.2 * stats["requests"]
+        assert stats["hedge_wins"] > 0
+
+    async def test_no_hedging_before_enough_samples(self):
+        executor = ProviderExecutor(hedge_min_samples=20)
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        for i in range(5):
+            await executor.execute("p", "m", {"i": i}, call)
+        assert executor.stats["hedges"] == 0 and len(calls) == 5
+
+
+# ======================================================================
+# Retries and fallback
+# ======================================================================
+class TestRetries:
+    async def test_transient_errors_are_retried(self):
+        failures = iter([503, 429, None])
+        stub = StubProvider(LLMProvider.ANTHROPIC, errors=lambda rng, in_flight: next(failures))
+        gateway = make_gateway(stub)
+
+        response = await gateway.complete(ask("q"))
+        assert response.provider == LLMProvider.ANTHROPIC
+        assert stub.calls == 3
+        assert gateway.get_execution_stats()["retries"] == 2
+
+    @pytest.mark.parametrize("status, primary_calls", [(400, 1), (503, 4)])
+    async def test_fallback_after_primary_gives_up(self, status, primary_calls):
+        primary = StubProvider(LLMProvider.ANTHROPIC, errors=lambda rng, in_flight: status)
+        fallback = StubProvider(LLMProvider.OPENAI)
+        gateway = make_gateway(primary, fallback)
+
+        response = await gateway.complete(ask("q"))
+        assert response.provider == LLMProvider.OPENAI
+        assert response.model == "gpt-4o"
+        assert primary.calls == primary_calls and fallback.calls == 1
+
+
+# ======================================================================
+# Shared HTTP client
+# ======================================================================
+class TestHttpClient:
+    async def test_sdk_clients_share_one_pool(self):
+        gateway = AIGateway(GatewayConfig(anthropic_api_key="test", openai_api_key="test", max_connections=7))
+        await gateway.initialize()
+        try:
+            pools = list(gateway._http_clients.values())
+            assert len(pools) == 1
+            assert gateway._anthropic_client._client is pools[0]
+            assert gateway._openai_client._client is pools[0]
+            assert gateway._anthropic_client.max_retries == 0
+        finally:
+            await gateway.close()
+        assert gateway._http_clients == {}
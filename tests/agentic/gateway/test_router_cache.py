@@ -0,0 +1,222 @@
+"""
+Tests for memoized routing decisions in ReasoningRouter.
+
+A fake gateway labels queries from the template they were generated from
+and counts classifier/planner calls, so the tests can check both how many
+LLM round trips are avoided and that the avoided ones agree with the LLM.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from app.agentic.gateway.intent import IntentClassifier, RoutingDecisionCache, intent_signature
+from app.agentic.gateway.router import ReasoningRouter, TaskCategory
+from app.agentic.observability.metrics import MetricsCollector
+
+# (template, category the LLM would pick)
+TEMPLATES = [
+    ("Analyze the churn trend for {name} over the last {n} months", "analyze"),
+    ("Why did revenue drop in week {n}?", "analyze"),
+    ("Compare pipeline velocity between {name} and {other}", "analyze"),
+    ("Disconnect the {name} connector", "manage_connections"),
+    ("Reconnect {name} with new OAuth credentials", "manage_connections"),
+    ("Explain what the {name} field means", "explain"),
+    ("How does the identity resolution step work for {name}?", "explain"),
+    ("Delete the draft report {n}", "action"),
+    ("Schedule a sync of {name} every {n} hours", "action"),
+    ("How many open opportunities does {name} have?", "query_data"),
+    ("Show the top {n} accounts by revenue", "query_data"),
+    ("What was {name}'s ARR in {n}?", "query_data"),
+    ("Give me everything about {name} from {n}", "query_data"),
+    ("{name} {n}", "clarify"),
+]
+NAMES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Salesforce", "HubSpot", "'Vandelay Industries'"]
+
+
+def workload(n=1000, seed=47):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        template, label = rng.choice(TEMPLATES)
+        query = template.format(name=rng.choice(NAMES), other=rng.choice(NAMES), n=rng.randint(1, 2026))
+        queries.append((query, label))
+    return queries
+
+
+@dataclass
+class FakeResponse:
+    content: str
+    cost_usd: float = 0.001
+
+
+class FakeGateway:
+    """Answers like an LLM that knows each query's template label."""
+
+    def __init__(self, labels, plan_response=None):
+        self.labels = labels
+        self.plan_response = plan_response
+        self.classify_calls = 0
+        self.plan_calls = 0
+
+    async def quick_complete(self, prompt, model_tier=None, system=None):
+        self.classify_calls += 1
+        query = prompt.split('Request: "', 1)[1].rsplit('"', 1)[0]
+        return self.labels[query]
+
+    async def complete(self, messages, **kwargs):
+        self.plan_calls += 1
+        if isinstance(self.plan_response, Exception):
+            raise self.plan_response
+        if self.plan_response is not None:
+            return FakeResponse(self.plan_response)
+        query = messages[0]["content"].split("User request: ", 1)[1].split("\n\nContext:")[0]
+        return FakeResponse(json.dumps({
+            "category": self.labels[query],
+            "complexity": "simple",
+            "reasoning": "fake",
+            "steps": [{"step_number": 1, "description": "run", "tool_name": "query_data",
+                       "tool_arguments": {"q": query}}],
+        }))
+
+
+TOOLS = [{"name": "query_data", "description": "Query data", "inputSchema": {"properties": {"q": {"type": "string"}}}}]
+
+
+@pytest.fixture
+def metrics():
+    return MetricsCollector()
+
+
+# ======================================================================
+# Intent classification
+# ======================================================================
+class TestClassifyIntent:
+    async def test_template_workload_avoids_most_classifier_calls(self, metrics):
+        queries = workload()
+        gateway = FakeGateway(dict(queries))
+        router = ReasoningRouter(gateway=gateway, metrics=metrics)
+
+        results = [await router.classify_intent(query) for query, _ in queries]
+
+        accuracy = sum(result.value == label for result, (_, label) in zip(results, queries)) / len(queries)
+        assert accuracy >= 0.99
+        # Baseline is one classifier call per query
+        assert gateway.classify_calls <= len(queries) // 10
+        stats = router.get_stats()["decisions"]
+        assert stats["classify_intent:local"] + stats["classify_intent:cache"] >= len(queries) * 0.9
+        assert metrics.get_current_value(
+            "router.decisions", {"method": "classify_intent", "source": "llm"}
+        ) == gateway.classify_calls
+
+    async def test_confident_local_prediction_skips_llm(self, metrics):
+        gateway = FakeGateway({})
+        router = ReasoningRouter(gateway=gateway, metrics=metrics)
+
+        assert await router.classify_intent("Analyze the anomaly trend in churn") == TaskCategory.ANALYZE
+        assert await router.classify_intent("Disconnect the Salesforce connector") == TaskCategory.MANAGE_CONNECTIONS
+        assert gateway.classify_calls == 0
+
+    async def test_low_confidence_uses_llm_once_per_signature(self, metrics):
+        gateway = FakeGateway({
+            "Give me everything about Acme from 2024": "query_data",
+            "Give me everything about Acme from 2025": "query_data",
+        })
+        router = ReasoningRouter(gateway=gateway, metrics=metrics)
+
+        for query in ["Give me everything about Acme from 2024", "Give me  everything about ACME from 2025!"]:
+            assert await router.classify_intent(query) == TaskCategory.QUERY_DATA
+        assert gateway.classify_calls == 1
+
+    async def test_unparseable_answer_is_not_cached(self, metrics):
+        gateway = FakeGateway({"Give me everything about Acme": "no idea"})
+        router = ReasoningRouter(gateway=gateway, metrics=metrics)
+
+        for _ in range(2):
+            assert await router.classify_intent("Give me everything about Acme") == TaskCategory.QUERY_DATA
+        assert gateway.classify_calls == 2
+
+    async def test_calibration_recorded_against_llm_decisions(self, metrics):
+        queries = workload(300)
+        router = ReasoningRouter(gateway=FakeGateway(dict(queries)), metrics=metrics, min_local_confidence=1.0)
+
+        for query, _ in queries:
+            await router.classify_intent(query)
+
+        calibration = router.get_stats()["calibration"]
+        assert sum(bucket["total"] for bucket in calibration.values()) == len(router._intent_cache)
+        # Buckets above the default threshold must be reliable
+        assert all(bucket["accuracy"] == 1.0 for name, bucket in calibration.items() if float(name) >= 0.7)
+        for name, bucket in calibration.items():
+            agreed = metrics.get_current_value(
+                "router.intent.calibration", {"confidence": name, "agreed": "true"}
+            ) or 0
+            assert agreed == bucket["agreed"]
+
+    def test_signature_masks_literals(self):
+        assert intent_signature("Top 5 accounts in 2025") == intent_signature("top 10 Accounts in 2024?")
+        assert intent_signature("Rename 'Acme' to \"Globex\"") == intent_signature("rename 'x' to 'y'")
+        assert intent_signature("Top 5 accounts") != intent_signature("Top 5 contacts")
+
+    def test_short_query_without_keywords_leans_clarify(self):
+        prediction = IntentClassifier().predict("Acme?")
+        assert prediction.category == "clarify" and prediction.confidence < 0.75
+
+
+# ======================================================================
+# Plan cache
+# ======================================================================
+class TestRoutePlanCache:
+    async def test_identical_requests_share_a_plan(self, metrics):
+        query = "Give me everything about Acme"
+        gateway = FakeGateway({query: "query_data"})
+        router = ReasoningRouter(gateway=gateway, metrics=metrics)
+
+        first = await router.route(query, tools=TOOLS, context={"tenant": "t1"})
+        first.steps[0].tool_arguments["q"] = "mutated"
+        second = await router.route(query + "  ", tools=TOOLS, context={"tenant": "t1"})
+
+        assert gateway.plan_calls == 1
+        assert second.steps[0].tool_arguments == {"q": query}
+        assert second.estimated_cost_usd == 0.0 and first.estimated_cost_usd == 0.001
+
+        await router.route(query, tools=TOOLS, context={"tenant": "t2"})
+        await router.route(query.replace("Acme", "Globex"), tools=TOOLS, context={"tenant": "t1"})
+        assert gateway.plan_calls == 3
+
+    async def test_routed_plan_seeds_intent_cache(self, metrics):
+        query = "Give me everything about Acme"
+        gateway = FakeGateway({query: "query_data"})
+        router = ReasoningRouter(gateway=gateway, metrics=metrics)
+
+        await router.route(query, tools=TOOLS)
+        assert await router.classify_intent(query) == TaskCategory.QUERY_DATA
+        assert gateway.classify_calls == 0
+
+    @pytest.mark.parametrize("plan_response", ["not json", TimeoutError("slow")])
+    async def test_failed_routing_is_not_cached(self, metrics, plan_response):
+        gateway = FakeGateway({}, plan_response=plan_response)
+        router = ReasoningRouter(gateway=gateway, metrics=metrics)
+
+        for _ in range(2):
+            await router.route("Give me everything", tools=TOOLS)
+        assert gateway.plan_calls == 2
+
+
+# ======================================================================
+# Decision cache
+# ======================================================================
+class TestRoutingDecisionCache:
+    def test_ttl_and_lru_bound(self):
+        now = [0.0]
+        cache = RoutingDecisionCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None and cache.get("a") == 1
+
+        now[0] = 11
+        assert cache.get("a") is None and len(cache) == 1
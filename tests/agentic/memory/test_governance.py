@@ -0,0 +1,297 @@
+"""
+Tests for index-driven memory governance.
+
+Forget scopes are checked against a linear scan of the same documents
+(the reference below), and the indexes are checked for consistency with the
+stored documents after every bulk delete.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.agentic.memory.governance import AuditEntry, AuditLog, ForgetScope, MemoryGovernance
+from app.agentic.memory.vector_store import DocumentType, MemoryDocument, VectorStore
+
+T0 = datetime(2026, 3, 1, 12, 0, 0)
+USERS = ["u1", "u2", "u3"]
+AGENTS = ["a1", "a2", None]
+CONVERSATIONS = [f"c{i}" for i in range(6)] + [None]
+
+
+def _documents(n=600, seed=44):
+    rng = random.Random(seed)
+    return [
+        MemoryDocument(
+            doc_id=f"d{i}",
+            tenant_id=rng.choice(["t1", "t1", "t2"]),
+            content=f"doc {i}",
+            doc_type=rng.choice(list(DocumentType)),
+            conversation_id=rng.choice(CONVERSATIONS),
+            user_id=rng.choice(USERS),
+            agent_id=rng.choice(AGENTS),
+            created_at=T0 + timedelta(minutes=rng.randrange(10_000)),
+            embedding=[1.0],
+        )
+        for i in range(n)
+    ]
+
+
+def ref_matches(docs, tenant_id, user_id=None, conversation_id=None, agent_id=None,
+                doc_types=None, created_from=None, created_to=None):
+    return {
+        doc.doc_id for doc in docs
+        if doc.tenant_id == tenant_id
+        and (not user_id or doc.user_id == user_id)
+        and (not conversation_id or doc.conversation_id == conversation_id)
+        and (not agent_id or doc.agent_id == agent_id)
+        and (not doc_types or doc.doc_type in doc_types)
+        and (not created_from or doc.created_at >= created_from)
+        and (not created_to or doc.created_at <= created_to)
+    }
+
+
+def assert_indexes_consistent(store):
+    for tenant_id, docs in store._documents.items():
+        for index, attr in (
+            (store._by_user, "user_id"),
+            (store._by_conversation, "conversation_id"),
+            (store._by_agent, "agent_id"),
+            (store._by_type, "doc_type"),
+        ):
+            expected = {}
+            for doc in docs.values():
+                if getattr(doc, attr):
+                    expected.setdefault(getattr(doc, attr), set()).add(doc.doc_id)
+            actual = {key: set(ids) for key, ids in index.get(tenant_id, {}).items()}
+            assert actual == expected, attr
+        dead = store._created_dead.get(tenant_id, set())
+        entries = [entry for entry in store._by_created.get(tenant_id, []) if entry not in dead]
+        assert entries == sorted((doc.created_at, doc.doc_id) for doc in docs.values())
+
+
+@pytest.fixture
+async def populated():
+    docs = _documents()
+    store = VectorStore()
+    await store.add_documents(docs)
+    return store, MemoryGovernance(vector_store=store), docs
+
+
+async def forget(governance, **kwargs):
+    request = await governance.request_forget(tenant_id="t1", user_id="u1", require_verification=False, **kwargs)
+    return await governance.process_forget_request(request.request_id)
+
+
+# ======================================================================
+# Indexed lookups
+# ======================================================================
+class TestVectorStoreIndexes:
+    async def test_find_matches_linear_scan(self, populated):
+        store, _, docs = populated
+        rng = random.Random(7)
+        for _ in range(200):
+            filters = {}
+            if rng.random() < 0.5:
+                filters["user_id"] = rng.choice(USERS + ["nobody"])
+            if rng.random() < 0.3:
+                filters["conversation_id"] = rng.choice(CONVERSATIONS[:-1])
+            if rng.random() < 0.3:
+                filters["agent_id"] = rng.choice(AGENTS[:-1])
+            if rng.random() < 0.3:
+                filters["doc_types"] = rng.sample(list(DocumentType), rng.randint(1, 3))
+            if rng.random() < 0.4:
+                start = T0 + timedelta(minutes=rng.randrange(10_000))
+                filters["created_from"] = start
+                if rng.random() < 0.7:
+                    filters["created_to"] = start + timedelta(minutes=rng.randrange(3_000))
+            tenant_id = rng.choice(["t1", "t2", "t3"])
+            assert set(store.find_document_ids(tenant_id, **filters)) == ref_matches(docs, tenant_id, **filters), filters
+
+    async def test_indexes_are_per_tenant(self):
+        store = VectorStore()
+        await store.add_document("a", "t1", DocumentType.CONVERSATION, conversation_id="c1", user_id="u1")
+        await store.add_document("b", "t2", DocumentType.CONVERSATION, conversation_id="c1", user_id="u1")
+
+        assert await store.delete_by_user("u1", "t1") == 1
+        assert [d.content for d in await store.get_conversation_history("c1", "t2")] == ["b"]
+        assert (await store.get_stats("t2"))["total_users"] == 1
+        assert (await store.get_stats("t1"))["total_documents"] == 0
+
+    async def test_stats_from_indexes(self, populated):
+        store, _, docs = populated
+        stats = await store.get_stats("t1")
+        tenant_docs = [d for d in docs if d.tenant_id == "t1"]
+        assert stats["total_documents"] == len(tenant_docs)
+        assert stats["total_users"] == len({d.user_id for d in tenant_docs})
+        assert stats["total_conversations"] == len({d.conversation_id for d in tenant_docs if d.conversation_id})
+        assert sum(stats["by_type"].values()) == len(tenant_docs)
+
+    async def test_single_and_bulk_deletes_keep_indexes_consistent(self, populated):
+        store, _, docs = populated
+        assert await store.delete_document("d1", docs[1].tenant_id)
+        assert not await store.delete_document("d1", docs[1].tenant_id)
+        await store.delete_where("t1", created_from=T0 + timedelta(minutes=2_000), created_to=T0 + timedelta(minutes=6_000))
+        assert_indexes_consistent(store)
+
+    async def test_readded_document_revives_tombstone(self, populated):
+        store, _, docs = populated
+        doc = next(d for d in docs if d.tenant_id == "t1")
+        await store.delete_document(doc.doc_id, "t1")
+        await store.add_documents([doc])
+
+        found = store.find_document_ids("t1", created_from=doc.created_at, created_to=doc.created_at)
+        assert found.count(doc.doc_id) == 1
+        assert_indexes_consistent(store)
+
+    async def test_delete_where_requires_a_filter(self, populated):
+        store, _, _ = populated
+        with pytest.raises(ValueError):
+            await store.delete_where("t1")
+
+
+# ======================================================================
+# Forget scopes
+# ======================================================================
+class TestForgetScopes:
+    async def test_all(self, populated):
+        store, governance, docs = populated
+        expected = ref_matches(docs, "t1", user_id="u1")
+        result = await forget(governance, scope=ForgetScope.ALL)
+
+        assert result.success and result.documents_deleted == len(expected) > 0
+        assert store.find_document_ids("t1", user_id="u1") == []
+        # Another tenant's documents for the same user are untouched
+        assert set(store.find_document_ids("t2", user_id="u1")) == ref_matches(docs, "t2", user_id="u1")
+        assert_indexes_consistent(store)
+
+    async def test_conversation(self, populated):
+        store, governance, docs = populated
+        expected = ref_matches(docs, "t1", conversation_id="c2")
+        result = await forget(governance, scope=ForgetScope.CONVERSATION, conversation_id="c2")
+
+        assert result.documents_deleted == len(expected) > 0
+        assert store.find_document_ids("t1", conversation_id="c2") == []
+        assert_indexes_consistent(store)
+
+    async def test_date_range(self, populated):
+        store, governance, docs = populated
+        date_from, date_to = T0 + timedelta(minutes=1_000), T0 + timedelta(minutes=4_000)
+        expected = ref_matches(docs, "t1", user_id="u1", created_from=date_from, created_to=date_to)
+        result = await forget(governance, scope=ForgetScope.DATE_RANGE, date_from=date_from, date_to=date_to)
+
+        assert result.documents_deleted == len(expected) > 0
+        remaining = store.find_document_ids("t1", user_id="u1")
+        assert set(remaining) == ref_matches(docs, "t1", user_id="u1") - expected
+        assert_indexes_consistent(store)
+
+    async def test_open_ended_date_range(self, populated):
+        store, governance, docs = populated
+        date_to = T0 + timedelta(minutes=3_000)
+        expected = ref_matches(docs, "t1", user_id="u1", created_to=date_to)
+        result = await forget(governance, scope=ForgetScope.DATE_RANGE, date_to=date_to)
+        assert result.documents_deleted == len(expected) > 0
+
+    async def test_document_type(self, populated):
+        store, governance, docs = populated
+        types = [DocumentType.TOOL_OUTPUT, DocumentType.SUMMARY]
+        expected = ref_matches(docs, "t1", user_id="u1", doc_types=types)
+        result = await forget(governance, scope=ForgetScope.DOCUMENT_TYPE, document_types=types)
+
+        assert result.documents_deleted == len(expected) > 0
+        assert store.find_document_ids("t1", user_id="u1", doc_types=types) == []
+        assert store.find_document_ids("t1", user_id="u1", doc_types=[DocumentType.KNOWLEDGE])
+        assert_indexes_consistent(store)
+
+    async def test_agent(self, populated):
+        store, governance, docs = populated
+        expected = ref_matches(docs, "t1", user_id="u1", agent_id="a2")
+        result = await forget(governance, scope=ForgetScope.AGENT, agent_id="a2")
+
+        assert result.documents_deleted == len(expected) > 0
+        assert store.find_document_ids("t1", user_id="u1", agent_id="a2") == []
+        # Other users' documents from the agent are kept
+        assert set(store.find_document_ids("t1", agent_id="a2")) == ref_matches(docs, "t1", agent_id="a2") - expected
+        assert_indexes_consistent(store)
+
+    @pytest.mark.parametrize("scope, kwargs, error", [
+        (ForgetScope.DATE_RANGE, {}, "date_from or date_to required"),
+        (ForgetScope.DATE_RANGE, {"date_from": T0 + timedelta(days=1), "date_to": T0}, "date_from must not be after"),
+        (ForgetScope.DOCUMENT_TYPE, {}, "document_types required"),
+        (ForgetScope.AGENT, {}, "agent_id required"),
+    ])
+    async def test_missing_scope_parameters_delete_nothing(self, populated, scope, kwargs, error):
+        store, governance, docs = populated
+        result = await forget(governance, scope=scope, **kwargs)
+        assert result.documents_deleted == 0
+        assert error in result.errors[0]
+        assert sum(len(d) for d in store._documents.values()) == len(docs)
+
+
+# ======================================================================
+# Export
+# ======================================================================
+class TestExport:
+    async def test_streamed_jsonl_export(self, populated):
+        store, governance, docs = populated
+        await forget(governance, scope=ForgetScope.AGENT, agent_id="a1")
+        expected = set(store.find_document_ids("t1", user_id="u1"))
+
+        chunks = [chunk async for chunk in governance.stream_user_data_export("t1", "u1", chunk_size=25)]
+        records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+        assert len(chunks) > 1
+        assert all(len(chunk.splitlines()) <= 25 for chunk in chunks)
+        assert records[0]["record"] == "export"
+        assert {r["doc_id"] for r in records if r["record"] == "document"} == expected
+        assert [r["record"] for r in records if r["record"] == "forget_request"] == ["forget_request"]
+        assert records[-1] == {"record": "summary", "document_count": len(expected)}
+        audit = await governance.get_audit_log("t1", user_id="u1", action="data_exported")
+        assert audit[0].details == {"document_count": len(expected), "format": "jsonl"}
+
+    async def test_dict_export_matches_stream(self, populated):
+        _, governance, _ = populated
+        exported = await governance.export_user_data("t1", "u2")
+        streamed = [
+            json.loads(line)
+            async for chunk in governance.stream_user_data_export("t1", "u2")
+            for line in chunk.splitlines()
+        ]
+        assert {d["doc_id"] for d in exported["documents"]} == {
+            r["doc_id"] for r in streamed if r["record"] == "document"
+        }
+
+
+# ======================================================================
+# Audit log and request listing
+# ======================================================================
+class TestAuditLog:
+    def test_bounded_and_newest_first(self):
+        log = AuditLog(max_entries=50)
+        for i in range(120):
+            log.append(AuditEntry(
+                entry_id=str(i), tenant_id=f"t{i % 2}", user_id=f"u{i % 3}",
+                action="a" if i % 5 else "b", details={}, timestamp=T0 + timedelta(seconds=i),
+            ))
+
+        assert len(log) == 50
+        entries = log.query("t0", limit=100)
+        assert [e.entry_id for e in entries] == [str(i) for i in range(118, 69, -2)]
+        filtered = log.query("t1", user_id="u0", action="a", limit=3)
+        assert [e.entry_id for e in filtered] == ["117", "111", "99"]
+        assert log.query("t1", user_id="u9") == []
+        # Evicted entries are gone from every index
+        assert sum(len(bucket) for bucket in log._by_user.values()) == 50
+
+    async def test_forget_requests_listed_newest_first(self):
+        governance = MemoryGovernance(vector_store=VectorStore())
+        first = await governance.request_forget("t1", "u1", require_verification=False)
+        second = await governance.request_forget("t1", "u2")
+        await governance.request_forget("t2", "u1")
+        await governance.process_forget_request(first.request_id)
+
+        assert [r.request_id for r in await governance.list_forget_requests("t1")] == [second.request_id, first.request_id]
+        assert [r.request_id for r in await governance.list_forget_requests("t1", user_id="u1")] == [first.request_id]
+        assert [r.request_id for r in await governance.list_forget_requests("t1", status="pending")] == [second.request_id]
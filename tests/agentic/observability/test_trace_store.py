@@ -0,0 +1,306 @@
+"""
+Tests for the Tracer's indexed trace store and background trace export.
+
+Query tests compare TraceStore against the original linear get_traces logic
+(reimplemented below) on the same traces.
+"""
+
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.agentic.observability.models import Trace
+from app.agentic.observability.trace_export import JsonlTraceSink, OTLPHttpTraceSink, TraceExportQueue
+from app.agentic.observability.trace_store import TraceStore
+from app.agentic.observability.tracing import Tracer
+from tests.fixtures.otlp_collector_stub import StubOTLPCollector
+
+T0 = datetime(2026, 3, 18, 12, 0, 0)
+
+
+# ======================================================================
+# Linear reference (the pre-index Tracer.get_traces logic)
+# ======================================================================
+def ref_get_traces(traces, agent_id=None, run_id=None, tenant_id=None, status=None, since=None, limit=100):
+    traces = list(traces)
+    if agent_id:
+        traces = [t for t in traces if t.agent_id == agent_id]
+    if run_id:
+        traces = [t for t in traces if t.run_id == run_id]
+    if tenant_id:
+        traces = [t for t in traces if t.tenant_id == tenant_id]
+    if status:
+        traces = [t for t in traces if t.status == status]
+    if since:
+        traces = [t for t in traces if t.start_time >= since]
+    traces.sort(key=lambda t: t.start_time, reverse=True)
+    return traces[:limit]
+
+
+def _traces(n=2000, seed=35):
+    rng = random.Random(seed)
+    agents = [uuid4() for _ in range(8)] + [None]
+    runs = [uuid4() for _ in range(40)] + [None]
+    tenants = [uuid4() for _ in range(3)] + [None]
+    return [
+        Trace(
+            name=f"t{i}",
+            agent_id=rng.choice(agents),
+            run_id=rng.choice(runs),
+            tenant_id=rng.choice(tenants),
+            start_time=T0 + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ], agents, runs, tenants
+
+
+class RecordingSink:
+    def __init__(self, delay_s=0.0):
+        self.delay_s = delay_s
+        self.batches = []
+
+    def export(self, traces):
+        time.sleep(self.delay_s)
+        self.batches.append(list(traces))
+
+    def close(self):
+        pass
+
+
+# ======================================================================
+# TraceStore
+# ======================================================================
+class TestTraceStore:
+    def test_queries_match_linear_scan(self):
+        traces, agents, runs, tenants = _traces()
+        store = TraceStore(max_traces=len(traces))
+        for t in traces:
+            store.add(t)
+        rng = random.Random(1)
+        for t in rng.sample(traces, 300):
+            t.status = "error"
+            store.update_status(t)
+
+        for _ in range(300):
+            kwargs = {
+                "agent_id": rng.choice(agents + [None, None]),
+                "run_id": rng.choice([None] * 6 + runs),
+                "tenant_id": rng.choice(tenants + [None]),
+                "status": rng.choice([None, "ok", "error", "missing"]),
+                "since": rng.choice([None, T0 + timedelta(seconds=rng.randrange(2000))]),
+                "limit": rng.choice([1, 10, 100, 5000]),
+            }
+            expected = ref_get_traces(traces, **kwargs)
+            assert [t.id for t in store.query(**kwargs)] == [t.id for t in expected], kwargs
+
+    def test_trim_evicts_oldest_and_unindexes(self):
+        traces, agents, _, _ = _traces(100)
+        store = TraceStore(max_traces=60)
+        for t in traces:
+            store.add(t)
+
+        evicted = store.trim()
+        assert [t.id for t in evicted] == [t.id for t in traces[:40]]
+        assert len(store) == 60
+        assert traces[0].id not in store and traces[40].id in store
+        for agent in agents:
+            assert store.query(agent_id=agent, limit=1000) == ref_get_traces(traces[40:], agent_id=agent, limit=1000)
+
+    def test_status_change_is_reindexed_in_order(self):
+        traces, _, _, _ = _traces(20)
+        store = TraceStore()
+        for t in traces:
+            store.add(t)
+        # Newer traces fail first, then an older one
+        for i in (15, 3, 9):
+            traces[i].status = "error"
+            store.update_status(traces[i])
+
+        assert [t.name for t in store.query(status="error")] == ["t15", "t9", "t3"]
+        assert len(store.query(status="ok", limit=100)) == 17
+
+    def test_remove_and_clear(self):
+        traces, _, _, _ = _traces(10)
+        store = TraceStore()
+        for t in traces:
+            store.add(t)
+        assert store.remove(traces[4].id) is traces[4]
+        assert store.get(traces[4].id) is None
+        assert len(store.query(limit=100)) == 9
+
+        store.clear()
+        assert len(store) == 0 and store.query() == []
+
+
+# ======================================================================
+# Tracer integration
+# ======================================================================
+class TestTracerStore:
+    def test_tracer_trims_traces_and_spans(self):
+        tracer = Tracer(max_traces=5)
+        agent = uuid4()
+        ended = []
+        for i in range(8):
+            trace = tracer.start_trace(f"run-{i}", agent_id=agent)
+            span = tracer.start_span("step", trace_id=trace.id)
+            tracer.end_span(span.id)
+            ended.append(tracer.end_trace(trace.id, error="boom" if i % 2 else None))
+
+        assert [t.name for t in tracer.get_traces(agent_id=agent)] == [f"run-{i}" for i in range(7, 2, -1)]
+        assert [t.name for t in tracer.get_traces(status="error")] == ["run-7", "run-5", "run-3"]
+        assert tracer.get_trace(ended[0].id) is None
+        assert all(tracer.get_span(s.id) is None for s in ended[0].spans)
+        assert all(tracer.get_span(s.id) is not None for s in ended[-1].spans)
+
+    def test_slow_exporter_does_not_block_end_trace(self):
+        tracer = Tracer()
+        exported = []
+
+        def slow_exporter(trace):
+            time.sleep(0.2)
+            exported.append(trace.id)
+
+        tracer.add_exporter(slow_exporter)
+        start = time.perf_counter()
+        ids = [tracer.end_trace(tracer.start_trace(f"t{i}").id).id for i in range(5)]
+        assert time.perf_counter() - start < 0.2
+
+        assert tracer.flush_exports(timeout=5)
+        assert exported == ids
+        tracer.shutdown()
+
+    def test_failing_exporter_is_isolated(self, caplog):
+        tracer = Tracer()
+        good = []
+        tracer.add_exporter(lambda t: (_ for _ in ()).throw(RuntimeError("sink down")))
+        tracer.add_exporter(lambda t: good.append(t.id))
+
+        trace = tracer.end_trace(tracer.start_trace("t").id)
+        assert tracer.flush_exports(timeout=5)
+        assert good == [trace.id]
+        assert any("Trace export error" in r.message for r in caplog.records)
+        tracer.shutdown()
+
+
+# ======================================================================
+# Export queue and sinks
+# ======================================================================
+class TestTraceExport:
+    def test_batches_and_drops_when_full(self):
+        sink = RecordingSink()
+        queue = TraceExportQueue([sink], capacity=10, batch_size=4, flush_interval_s=0.01)
+        gate = threading.Event()
+        sink.export = lambda traces, _export=sink.export: (gate.wait(5), _export(traces))
+
+        traces = [Trace(name=str(i)) for i in range(30)]
+        accepted = [queue.submit(t) for t in traces]
+        assert accepted.count(False) == queue.stats["dropped"] > 0
+
+        gate.set()
+        assert queue.flush(timeout=5)
+        exported = [t for batch in sink.batches for t in batch]
+        assert [t.name for t in exported] == [t.name for t, ok in zip(traces, accepted) if ok]
+        assert max(len(b) for b in sink.batches) <= 4
+        queue.close()
+
+    def test_jsonl_sink(self, tmp_path):
+        path = tmp_path / "traces" / "out.jsonl"
+        tracer = Tracer()
+        tracer.add_sink(JsonlTraceSink(path))
+        agent = uuid4()
+        for i in range(3):
+            trace = tracer.start_trace(f"t{i}", agent_id=agent)
+            tracer.end_span(tracer.start_span("llm", trace_id=trace.id).id)
+            tracer.end_trace(trace.id)
+        tracer.shutdown()
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["name"] for r in rows] == ["t0", "t1", "t2"]
+        assert all(r["agent_id"] == str(agent) and len(r["spans"]) == 2 for r in rows)
+
+    def test_otlp_sink_posts_to_collector(self):
+        collector = StubOTLPCollector().start()
+        try:
+            tracer = Tracer(export_queue=TraceExportQueue(batch_size=2, flush_interval_s=0.01))
+            tracer.add_sink(OTLPHttpTraceSink(collector.endpoint, service_name="agents-test"))
+            traces = []
+            for i in range(3):
+                trace = tracer.start_trace(f"t{i}", run_id=uuid4())
+                tracer.end_span(tracer.start_span("tool", trace_id=trace.id).id, error="bad input")
+                traces.append(tracer.end_trace(trace.id))
+            tracer.shutdown()
+        finally:
+            collector.stop()
+
+        assert len(collector.payloads) == 2
+        resource = collector.payloads[0]["resourceSpans"][0]["resource"]
+        assert resource["attributes"] == [{"key": "service.name", "value": {"stringValue": "agents-test"}}]
+
+        spans = collector.spans
+        assert len(spans) == 6
+        assert {s["traceId"] for s in spans} == {t.id.hex for t in traces}
+        child = next(s for s in spans if s["name"] == "tool" and s["traceId"] == traces[0].id.hex)
+        assert child["parentSpanId"] == traces[0].root_span_id.hex[:16]
+        assert child["status"] == {"code": 2, "message": "bad input"}
+        assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"]) > 0
+
+
+# ======================================================================
+# Latency at 1M spans
+# ======================================================================
+@pytest.mark.slow
+class TestLatency:
+    def test_one_million_spans(self):
+        """100k traces x 10 spans held in the store; trace ops and queries stay flat."""
+        n_traces, spans_per_trace = 100_000, 10
+        tracer = Tracer(max_traces=n_traces)
+        agents = [uuid4() for _ in range(50)]
+        tenants = [uuid4() for _ in range(5)]
+        exported = []
+        tracer.add_exporter(lambda t: exported.append(t.id))
+
+        end_latencies = []
+        for i in range(n_traces):
+            trace = tracer.start_trace("run", agent_id=agents[i % 50], run_id=uuid4(), tenant_id=tenants[i % 5])
+            for _ in range(spans_per_trace - 1):
+                tracer.end_span(tracer.start_span("step", trace_id=trace.id, parent_id=trace.root_span_id).id)
+            start = time.perf_counter()
+            tracer.end_trace(trace.id, error="boom" if i % 100 == 0 else None)
+            end_latencies.append(time.perf_counter() - start)
+
+        assert len(tracer._spans) == n_traces * spans_per_trace
+        end_latencies.sort()
+        assert end_latencies[len(end_latencies) // 2] < 200e-6
+        assert end_latencies[int(len(end_latencies) * 0.99)] < 2e-3
+
+        queries = [
+            {"agent_id": agents[7]},
+            {"run_id": trace.run_id},
+            {"tenant_id": tenants[0], "status": "error"},
+            {"status": "error", "limit": 10},
+            {"since": trace.start_time - timedelta(seconds=1)},
+            {},
+        ]
+        for kwargs in queries:
+            start = time.perf_counter()
+            for _ in range(100):
+                result = tracer.get_traces(**kwargs)
+            per_query = (time.perf_counter() - start) / 100
+            assert result, kwargs
+            assert per_query < 2e-3, (kwargs, per_query)
+
+        # Past the bound every new trace evicts the oldest in O(1)
+        start = time.perf_counter()
+        for _ in range(1000):
+            tracer.end_trace(tracer.start_trace("overflow").id)
+        assert (time.perf_counter() - start) / 1000 < 1e-3
+        assert len(tracer._store) == n_traces
+
+        assert tracer.flush_exports(timeout=60)
+        assert len(exported) == n_traces + 1000
+        tracer.shutdown()
@@ -0,0 +1,555 @@
+"""
+Tests for the virtual-time simulation engine.
+
+Schedules are checked against a linear reference (each task starts when its
+last dependency finishes, found by rescanning the task list); aggregates
+against counts computed directly from the generated workflows.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+import pytest
+
+from app.agentic.simulation.engine import (
+    CHAOS_RECOVERY,
+    TOOL_CALL_MS,
+    ArrivalCurve,
+    ChaosTaskModel,
+    EventEmitterObserver,
+    MetricsBridgeObserver,
+    SimulationEngine,
+    SimulationObserver,
+    StreamingStats,
+    TaskOutcome,
+)
+from app.agentic.simulation.event_emitter import EmitterConfig, EventEmitter
+from app.agentic.simulation import executor as executor_module
+from app.agentic.simulation.executor import ExecutionConfig, SimulationExecutor
+
+
+def random_dag(rng, workflow_id, n_tasks=12, max_deps=3):
+    tasks = []
+    for i in range(n_tasks):
+        deps = rng.sample(range(i), min(i, rng.randint(0, max_deps)))
+        tasks.append({
+            "task_id": f"t{i}",
+            "estimated_duration_ms": rng.randint(10, 500),
+            "depends_on": [f"t{d}" for d in deps],
+        })
+    rng.shuffle(tasks)
+    return {"workflow_id": workflow_id, "type": "dag", "tasks": tasks}
+
+
+def chain(workflow_id, n_tasks, duration_ms=100, **task_fields):
+    return {
+        "workflow_id": workflow_id,
+        "tasks": [
+            {
+                "task_id": f"t{i}",
+                "estimated_duration_ms": duration_ms,
+                "depends_on": [f"t{i - 1}"] if i else [],
+                **task_fields,
+            }
+            for i in range(n_tasks)
+        ],
+    }
+
+
+def reference_finish_times(workflow, arrived_ms=0.0):
+    """Unbounded-capacity schedule by repeated full scans."""
+    finish = {}
+    while len(finish) < len(workflow["tasks"]):
+        for task in workflow["tasks"]:
+            if task["task_id"] not in finish and all(d in finish for d in task["depends_on"]):
+                start = max([finish[d] for d in task["depends_on"]], default=arrived_ms)
+                finish[task["task_id"]] = start + task["estimated_duration_ms"]
+    return finish
+
+
+class Recorder(SimulationObserver):
+    def __init__(self):
+        self.started = {}
+        self.finished = {}
+        self.workflows = {}
+        self.flushes = 0
+
+    def task_started(self, workflow_id, task, agent_id, time_ms, run_seq=0):
+        self.started[(workflow_id, task["task_id"])] = (time_ms, agent_id)
+
+    def task_finished(self, workflow_id, task, agent_id, outcome, started_ms, finished_ms, run_seq=0):
+        self.finished[(workflow_id, task["task_id"])] = (finished_ms, outcome.status)
+
+    def workflow_finished(self, workflow_id, status, duration_ms, tasks_completed, tasks_failed, time_ms, run_seq=0):
+        self.workflows[workflow_id] = (status, duration_ms, tasks_completed, tasks_failed)
+
+    async def flush(self):
+        self.flushes += 1
+
+
+def run(engine, workflows, **kwargs):
+    return asyncio.run(engine.run(workflows, **kwargs))
+
+
+# ======================================================================
+# Arrival curves
+# ======================================================================
+class TestArrivalCurves:
+    def take(self, curve, n):
+        times = curve.arrival_times_ms()
+        return [next(times) for _ in range(n)]
+
+    def test_constant(self):
+        assert self.take(ArrivalCurve.constant(4), 5) == [0, 250, 500, 750, 1000]
+
+    def test_burst(self):
+        times = self.take(ArrivalCurve.burst(burst_size=3, burst_interval_seconds=2), 7)
+        assert times == [0, 0, 0, 2000, 2000, 2000, 4000]
+
+    def test_ramp_matches_cumulative_arrivals(self):
+        curve = ArrivalCurve.ramp(start_rate_per_sec=0, end_rate_per_sec=100, ramp_seconds=10)
+        times = self.take(curve, 1000)
+
+        assert times == sorted(times)
+        # N(t) = 5 t^2 during the ramp: 20 arrivals by 2s, 320 by 8s
+        assert sum(t <= 2000 for t in times) == 21
+        assert sum(t <= 8000 for t in times) == 321
+        # 500 arrivals by the end of the ramp, then 100/s
+        assert times[500] == pytest.approx(10_000)
+        assert times[600] == pytest.approx(11_000)
+
+    def test_ramp_down_to_zero_ends(self):
+        curve = ArrivalCurve.ramp(start_rate_per_sec=10, end_rate_per_sec=0, ramp_seconds=10)
+        times = list(curve.arrival_times_ms())
+        assert len(times) == 51
+        assert times[-1] == pytest.approx(10_000)
+
+    @pytest.mark.parametrize("curve", [
+        ArrivalCurve.constant(0),
+        ArrivalCurve.burst(0, 1),
+        ArrivalCurve.ramp(0, 0, 10),
+        ArrivalCurve(kind="sine"),
+    ])
+    def test_invalid_curves(self, curve):
+        with pytest.raises(ValueError):
+            next(curve.arrival_times_ms())
+
+
+# ======================================================================
+# Scheduling
+# ======================================================================
+class TestScheduling:
+    def test_matches_reference_schedule(self):
+        rng = random.Random(50)
+        workflows = [random_dag(rng, f"wf-{w}") for w in range(40)]
+        recorder = Recorder()
+
+        summary = run(SimulationEngine(observers=[recorder]), workflows, arrival=ArrivalCurve.constant(10))
+
+        for w, workflow in enumerate(workflows):
+            expected = reference_finish_times(workflow, arrived_ms=w * 100.0)
+            for task_id, finish in expected.items():
+                assert recorder.finished[(workflow["workflow_id"], task_id)] == (finish, "completed")
+            status, duration_ms, completed, failed = recorder.workflows[workflow["workflow_id"]]
+            assert (status, completed, failed) == ("completed", 12, 0)
+            assert duration_ms == max(expected.values()) - w * 100.0
+        assert summary.tasks_completed == 40 * 12
+        assert summary.task_wait_ms.max == 0
+
+    def test_capacity_queues_ready_tasks(self):
+        workflows = [
+            {"workflow_id": f"wf-{w}", "tasks": [{"task_id": f"t{i}", "estimated_duration_ms": 100} for i in range(5)]}
+            for w in range(4)
+        ]
+
+        summary = run(SimulationEngine(max_concurrent_tasks=2), workflows)
+
+        assert summary.virtual_duration_ms == 20 * 100 / 2
+        assert summary.peak_concurrency == 2
+        assert summary.peak_queue_depth == 18
+        assert summary.task_wait_ms.max == 900
+        assert summary.task_wait_ms.count == 20
+
+    def test_assignments_reach_observers(self):
+        recorder = Recorder()
+        run(SimulationEngine(observers=[recorder]), [chain("wf-1", 2)], assignments={"wf-1": {"t1": "agent-7"}})
+        assert recorder.started[("wf-1", "t0")] == (0, None)
+        assert recorder.started[("wf-1", "t1")] == (100, "agent-7")
+
+    def test_workflows_are_pulled_lazily(self):
+        pulled = []
+
+        def workflows():
+            for w in range(5):
+                pulled.append(w)
+                yield chain(f"wf-{w}", 1)
+
+        class PullCounter(SimulationObserver):
+            def workflow_started(self, workflow_id, workflow_type, task_count, time_ms, run_seq=0):
+                # Only this workflow and the next arrival have been read
+                assert len(pulled) == int(workflow_id.split("-")[1]) + 2 or len(pulled) == 5
+
+        run(SimulationEngine(observers=[PullCounter()]), workflows(), arrival=ArrivalCurve.constant(1))
+        assert pulled == list(range(5))
+
+    def test_deterministic_for_seed(self):
+        workflows = [chain(f"wf-{w}", 5, chaos_injection={"type": "rate_limit", "trigger_probability": 0.3}) for w in range(50)]
+        first = run(SimulationEngine(seed=7), workflows).to_dict()
+        second = run(SimulationEngine(seed=7), workflows).to_dict()
+        first.pop("wall_duration_ms"), second.pop("wall_duration_ms")
+        first.pop("time_compression"), second.pop("time_compression")
+        assert first == second
+
+
+# ======================================================================
+# Failures and chaos
+# ======================================================================
+class TestFailures:
+    def test_failed_task_skips_dependents(self):
+        workflow = chain("wf-1", 4)
+        workflow["tasks"][1]["chaos_injection"] = {
+            "type": "tool_failure", "trigger_probability": 1.0, "parameters": {"recoverable": False},
+        }
+        recorder = Recorder()
+
+        summary = run(SimulationEngine(observers=[recorder]), [workflow])
+
+        assert recorder.workflows["wf-1"][:1] + recorder.workflows["wf-1"][2:] == ("partial", 1, 1)
+        assert (summary.tasks_completed, summary.tasks_failed, summary.tasks_skipped) == (1, 1, 2)
+        assert summary.total_tasks == 2
+        assert (summary.chaos_events_total, summary.chaos_events_recovered) == (1, 0)
+        assert summary.workflows_partial == 1
+
+    def test_unknown_dependency_never_ready(self):
+        workflow = {"workflow_id": "wf-1", "tasks": [{"task_id": "a", "depends_on": ["missing"]}]}
+        summary = run(SimulationEngine(), [workflow])
+        assert (summary.workflows_failed, summary.tasks_skipped, summary.tasks_completed) == (1, 1, 0)
+
+    def test_chaos_recovery_adds_delay_and_retries(self):
+        task = {"task_id": "t", "estimated_duration_ms": 100, "tools_required": ["a", "b"],
+                "chaos_injection": {"type": "network_partition", "trigger_probability": 1.0}}
+        outcome = ChaosTaskModel()(task, random.Random(0))
+        recovery = CHAOS_RECOVERY["network_partition"]
+        assert outcome.status == "completed"
+        assert outcome.duration_ms == 100 + 2 * TOOL_CALL_MS + recovery.delay_ms
+        assert outcome.retries == recovery.retries
+        assert outcome.chaos_recovered
+
+        assert ChaosTaskModel(chaos_recovery_enabled=False)(task, random.Random(0)).status == "failed"
+        unknown = dict(task, chaos_injection={"type": "solar_flare", "trigger_probability": 1.0})
+        assert ChaosTaskModel()(unknown, random.Random(0)).error_message == "Unknown chaos type: solar_flare"
+
+    def test_failed_task_retried_in_virtual_time(self):
+        attempts = []
+
+        def flaky(task, rng):
+            attempts.append(task["task_id"])
+            if task["task_id"] == "t0" and len(attempts) < 3:
+                return TaskOutcome(status="failed", duration_ms=10, tokens_used=1, cost_usd=0.25)
+            return TaskOutcome(status="completed", duration_ms=100, tokens_used=1, cost_usd=0.25)
+
+        recorder = Recorder()
+        summary = run(SimulationEngine(task_model=flaky, observers=[recorder], max_retries=2), [chain("wf-1", 2)])
+
+        assert attempts == ["t0", "t0", "t0", "t1"]
+        assert summary.virtual_duration_ms == 10 + 10 + 100 + 100
+        assert (summary.tasks_completed, summary.tasks_failed, summary.tasks_retried) == (2, 0, 1)
+        assert (summary.total_tasks, summary.total_tokens, summary.total_cost_usd) == (2, 4, 1.0)
+        assert recorder.workflows["wf-1"][0] == "completed"
+
+    def test_custom_task_model(self):
+        def model(task, rng):
+            return TaskOutcome(status="completed", duration_ms=7, tokens_used=3, cost_usd=0.5)
+
+        summary = run(SimulationEngine(task_model=model), [chain("wf-1", 3)])
+        assert summary.virtual_duration_ms == 21
+        assert (summary.total_tokens, summary.total_cost_usd) == (9, 1.5)
+
+
+# ======================================================================
+# Streaming aggregation
+# ======================================================================
+class TestStreamingStats:
+    def test_exact_below_reservoir_size(self):
+        stats = StreamingStats(reservoir_size=1000)
+        for value in range(1, 101):
+            stats.add(value)
+        assert (stats.count, stats.mean, stats.min, stats.max) == (100, 50.5, 1, 100)
+        assert (stats.percentile(50), stats.percentile(95), stats.percentile(99)) == (50, 95, 99)
+
+    def test_reservoir_is_bounded_and_representative(self):
+        stats = StreamingStats(reservoir_size=2000, rng=random.Random(1))
+        for value in range(100_000):
+            stats.add(value)
+        assert len(stats._reservoir) == 2000
+        assert stats.count == 100_000
+        assert stats.percentile(50) == pytest.approx(50_000, rel=0.05)
+        assert stats.percentile(95) == pytest.approx(95_000, rel=0.02)
+
+
+# ======================================================================
+# Scale
+# ======================================================================
+class TestScale:
+    def test_fifty_thousand_tasks_in_seconds(self):
+        rng = random.Random(50)
+        chaos_types = list(CHAOS_RECOVERY)
+
+        def workflows():
+            for w in range(5000):
+                workflow = random_dag(rng, f"wf-{w}", n_tasks=10)
+                for task in workflow["tasks"]:
+                    task["chaos_injection"] = {"type": rng.choice(chaos_types), "trigger_probability": 0.05}
+                yield workflow
+
+        arrival = ArrivalCurve.ramp(start_rate_per_sec=10, end_rate_per_sec=500, ramp_seconds=30)
+        times = arrival.arrival_times_ms()
+        last_arrival_ms = [next(times) for _ in range(5000)][-1]
+
+        started = time.perf_counter()
+        summary = run(
+            SimulationEngine(max_concurrent_tasks=1000, seed=50, reservoir_size=5000),
+            workflows(),
+            arrival=arrival,
+        )
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 10
+        assert summary.workflows_total == summary.workflows_completed == 5000
+        assert summary.tasks_completed == summary.total_tasks == 50_000
+        assert summary.task_duration_ms.count == 50_000
+        assert len(summary.task_duration_ms._reservoir) == 5000
+        assert summary.peak_concurrency <= 1000
+        assert 0 < summary.chaos_events_total == summary.chaos_events_recovered
+        assert summary.virtual_duration_ms > last_arrival_ms
+        assert summary.time_compression > 1
+
+
+# ======================================================================
+# Adapters
+# ======================================================================
+class FakeBridge:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+
+class TestAdapters:
+    def test_metrics_bridge_spans_are_namespaced(self):
+        bridge = FakeBridge()
+        workflows = [chain("wf-1", 2), chain("wf-2", 2)]
+
+        run(SimulationEngine(observers=[MetricsBridgeObserver(bridge)]), workflows)
+
+        names = [name for name, _ in bridge.calls]
+        assert names.count("start_workflow_trace") == names.count("end_workflow_trace") == 2
+        spans = {args[1] for name, args in bridge.calls if name == "start_task_span"}
+        ended = {args[0] for name, args in bridge.calls if name == "end_task_span"}
+        assert spans == ended == {"wf-1:t0", "wf-1:t1", "wf-2:t0", "wf-2:t1"}
+        assert "record_cost" not in names
+
+    def test_event_emitter_samples_task_events(self):
+        emitter = EventEmitter(EmitterConfig(emit_to_stream=False, emit_to_redis=False))
+        events = []
+        emitter.on_event(events.append)
+        observer = EventEmitterObserver(emitter, task_sample_rate=0.1)
+
+        run(SimulationEngine(observers=[observer], flush_every=50), [chain(f"wf-{w}", 10) for w in range(20)])
+
+        kinds = [event.event_type.value for event in events]
+        assert kinds.count("run_started") == kinds.count("run_completed") == 20
+        assert kinds.count("step_started") == kinds.count("step_completed") == 20
+        assert observer._pending == [] and observer._sampled == set()
+
+    def test_overlapping_runs_of_one_workflow_id(self):
+        bridge = FakeBridge()
+        emitter = EventEmitter(EmitterConfig(emit_to_stream=False, emit_to_redis=False))
+        events = []
+        emitter.on_event(events.append)
+        event_observer = EventEmitterObserver(emitter)
+        workflows = [chain("wf-1", 2, duration_ms=100), chain("wf-1", 2, duration_ms=30)]
+
+        run(SimulationEngine(observers=[MetricsBridgeObserver(bridge), event_observer]), workflows)
+
+        traces = [args[0] for name, args in bridge.calls if name == "start_workflow_trace"]
+        assert traces == ["wf-1", "wf-1#1"]
+        assert sorted(args[0] for name, args in bridge.calls if name == "end_workflow_trace") == sorted(traces)
+        spans = {args[1] for name, args in bridge.calls if name == "start_task_span"}
+        assert spans == {args[0] for name, args in bridge.calls if name == "end_task_span"}
+        assert len(spans) == 4
+
+        runs = {}
+        for event in events:
+            runs.setdefault(event.run_id, []).append(event.event_type.value)
+        assert len(runs) == 2
+        for kinds in runs.values():
+            assert kinds[0] == "run_started" and kinds[-1] == "run_completed"
+            assert kinds.count("step_completed") == 2
+        assert event_observer._run_ids == {} and event_observer._sampled == set()
+
+    def test_engine_flushes_observers_in_batches(self):
+        recorder = Recorder()
+        run(SimulationEngine(observers=[recorder], flush_every=10), [chain(f"wf-{w}", 10) for w in range(10)])
+        # 100 completions + 10 arrivals, flushed every 10 events and at the end
+        assert recorder.flushes == 12
+
+
+class SlowStreamManager:
+    def __init__(self, jitter=None):
+        self.jitter = jitter
+        self.published = []
+
+    async def publish(self, event):
+        await asyncio.sleep(self.jitter.uniform(0, 0.01) if self.jitter else 0.05)
+        self.published.append(event)
+
+
+class TestEventEmitterBuffering:
+    async def test_full_buffer_flushes_in_background(self):
+        manager = SlowStreamManager()
+        emitter = EventEmitter(EmitterConfig(emit_to_redis=False, buffer_events=True, buffer_size=10))
+        emitter.set_stream_manager(manager)
+
+        started = time.perf_counter()
+        for i in range(25):
+            await emitter.emit_step_started(run_id=None, task_id=f"t{i}", task_name="t")
+        assert time.perf_counter() - started < 0.05
+        assert manager.published == []
+
+        await emitter.flush()
+        assert [event.data["task_id"] for event in manager.published] == [f"t{i}" for i in range(25)]
+
+    async def test_batches_publish_in_emit_order(self):
+        manager = SlowStreamManager(jitter=random.Random(5))
+        emitter = EventEmitter(EmitterConfig(emit_to_redis=False, buffer_events=True, buffer_size=3))
+        emitter.set_stream_manager(manager)
+
+        for i in range(10):
+            await emitter.emit_step_started(run_id=None, task_id=f"t{i}", task_name="t")
+            await emitter.emit_step_completed(run_id=None, task_id=f"t{i}", status="completed", duration_ms=1)
+            await asyncio.sleep(0.001)
+        await emitter.flush()
+
+        published = [(event.event_type.value, event.data["task_id"]) for event in manager.published]
+        assert published == [
+            (kind, f"t{i}") for i in range(10) for kind in ("step_started", "step_completed")
+        ]
+
+    async def test_unbuffered_publishes_directly(self):
+        manager = SlowStreamManager()
+        emitter = EventEmitter(EmitterConfig(emit_to_redis=False))
+        emitter.set_stream_manager(manager)
+        await emitter.emit_step_started(run_id=None, task_id="t0", task_name="t")
+        assert len(manager.published) == 1
+
+
+# ======================================================================
+# SimulationExecutor integration
+# ======================================================================
+def make_executor(**config):
+    executor = SimulationExecutor(ExecutionConfig(register_agents=False, emit_events=False, **config))
+    executor.initialize()
+    return executor
+
+
+class TestSimulationExecutor:
+    async def test_simulate_scenario_aggregates(self):
+        executor = make_executor(seed=1)
+        scenario = {
+            "scenario_id": "sc-1",
+            "workflows": [chain(f"wf-{w}", 5) for w in range(200)],
+            "__expected__": {"expected_completion_rate": 0.9},
+        }
+
+        result = await executor.simulate_scenario(scenario, arrival=ArrivalCurve.constant(20), max_concurrent_tasks=50)
+
+        assert result.workflow_results == []
+        assert (result.workflows_completed, result.tasks_completed, result.total_tasks) == (200, 1000, 1000)
+        assert result.completion_rate == 1.0
+        assert result.verdict == "PASS"
+        assert result.simulation["workflows"]["total"] == 200
+        assert result.simulation["peak_concurrency"] <= 50
+        assert result.total_duration_ms == result.simulation["virtual_duration_ms"]
+
+    async def test_simulate_matches_execute_with_retries(self):
+        never = {"type": "tool_failure", "trigger_probability": 1.0, "parameters": {"recoverable": False}}
+        scenario = {
+            "workflows": [
+                chain("wf-ok", 3, duration_ms=10),
+                chain("wf-recovers", 2, duration_ms=10, chaos_injection={"type": "tool_timeout", "trigger_probability": 1.0}),
+                chain("wf-fails", 2, duration_ms=10, chaos_injection=never),
+            ],
+        }
+        executor = make_executor(speedup_factor=10_000, max_retries=2, seed=1)
+
+        executed = await executor.execute_scenario(scenario)
+        simulated = await executor.simulate_scenario(scenario)
+
+        fields = (
+            "workflows_completed", "workflows_failed", "total_tasks", "tasks_completed", "tasks_failed",
+            "chaos_events_total", "chaos_events_recovered", "total_tokens", "completion_rate",
+            "chaos_recovery_rate", "verdict",
+        )
+        assert {f: getattr(simulated, f) for f in fields} == {f: getattr(executed, f) for f in fields}
+        assert simulated.total_cost_usd == pytest.approx(executed.total_cost_usd)
+        # The failing task ran 1 + max_retries times
+        assert simulated.total_tokens == (3 + 2 + 3) * 500
+        assert simulated.simulation["tasks"]["retried"] == sum(r.tasks_retried for r in executed.workflow_results)
+
+    async def test_execute_workflow_follows_dependencies(self):
+        executor = make_executor(speedup_factor=10_000, max_parallel_tasks=2)
+        workflow = {
+            "workflow_id": "wf-1",
+            "tasks": [
+                {"task_id": "join", "depends_on": ["left", "right"]},
+                {"task_id": "left", "depends_on": ["root"]},
+                {"task_id": "right", "depends_on": ["root"]},
+                {"task_id": "root"},
+            ],
+        }
+
+        result = await executor.execute_workflow(workflow)
+
+        assert [r.task_id for r in result.task_results] == ["root", "left", "right", "join"]
+        assert result.status == "completed"
+
+    async def test_execute_workflow_bounds_retries_of_failed_tasks(self, caplog):
+        executor = make_executor(speedup_factor=10_000, max_retries=2)
+        workflow = {
+            "workflow_id": "wf-1",
+            "tasks": [
+                {"task_id": "a", "chaos_injection": {
+                    "type": "tool_failure", "trigger_probability": 1.0, "parameters": {"recoverable": False},
+                }},
+                {"task_id": "b", "depends_on": ["a"]},
+            ],
+        }
+
+        with caplog.at_level(logging.WARNING, logger="app.agentic.simulation.executor"):
+            result = await executor.execute_workflow(workflow)
+
+        assert [r.task_id for r in result.task_results] == ["a"]
+        assert result.task_results[0].retry_count == 2
+        assert (result.tasks_failed, result.tasks_completed, result.status) == (1, 0, "failed")
+        assert "deadlock" not in caplog.text
+
+    async def test_execute_workflow_counts_recovered_task_once(self, monkeypatch):
+        executor = make_executor(speedup_factor=10_000)
+        rolls = iter([0.0, 0.9])  # chaos fires on the first attempt only
+        monkeypatch.setattr(executor_module.random, "random", lambda: next(rolls))
+        workflow = {
+            "workflow_id": "wf-1",
+            "tasks": [{"task_id": "a", "chaos_injection": {
+                "type": "tool_failure", "trigger_probability": 0.5, "parameters": {"recoverable": False},
+            }}],
+        }
+
+        result = await executor.execute_workflow(workflow)
+
+        assert [(r.task_id, r.status, r.retry_count) for r in result.task_results] == [("a", "completed", 1)]
+        assert (result.tasks_failed, result.tasks_completed, result.tasks_retried) == (0, 1, 1)
+        assert result.status == "completed"
@@ -0,0 +1,220 @@
+"""Tests for pooled MCP transport sessions and MCPClientPool scheduling."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.agentic.mcp_client import MCPClient, MCPClientPool, MCPServerConfig, MCPTool, MCPTransport
+from app.agentic.mcp_transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    MCPServerSession,
+    MCPTransportError,
+    TransportSettings,
+)
+
+# The transport imports aiohttp lazily; skip the module without it
+aiohttp = pytest.importorskip("aiohttp")
+
+
+@pytest.fixture
+async def stub_server():
+    from tests.fixtures.mcp_stub_server import StubMCPServer
+
+    server = StubMCPServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+def _config(url: str, name: str = "stub") -> MCPServerConfig:
+    return MCPServerConfig(name=name, url=url, transport=MCPTransport.HTTP, timeout_ms=5000)
+
+
+# ======================================================================
+# Connection Reuse
+# ======================================================================
+class TestConnectionReuse:
+    async def test_sequential_calls_reuse_one_connection(self, stub_server):
+        client = MCPClient()
+        await client.add_server(_config(stub_server.url))
+
+        for i in range(20):
+            result = await client.execute_tool("write", {"i": i})
+            assert result.success
+
+        assert stub_server.calls["write"] == 20
+        assert len(stub_server.connections) == 1
+        await client.close()
+
+    async def test_discovery_reads_read_only_hint(self, stub_server):
+        client = MCPClient()
+        await client.add_server(_config(stub_server.url))
+
+        assert client.get_tool("lookup").read_only is True
+        assert client.get_tool("write").read_only is False
+        await client.close()
+
+    async def test_pool_shares_sessions_across_tenants(self, stub_server):
+        pool = MCPClientPool()
+        for _ in range(5):
+            await pool.configure_client(uuid4(), [_config(stub_server.url)])
+
+        tenants = list(pool._clients)
+        for tenant_id in tenants:
+            await pool.get_client(tenant_id).execute_tool("write", {})
+
+        assert len(pool.get_transport_stats()) == 1
+        assert len(stub_server.connections) == 1
+        await pool.close()
+
+    async def test_connection_limit_is_respected(self, stub_server):
+        stub_server.latency_s = 0.02
+        pool = MCPClientPool(TransportSettings(max_connections_per_host=4))
+        tenant_id = uuid4()
+        await pool.configure_client(tenant_id, [_config(stub_server.url)])
+
+        results = await pool.execute_batch(tenant_id, [("write", {"i": i}) for i in range(40)])
+
+        assert all(r.success for r in results)
+        assert [r.result["arguments"]["i"] for r in results] == list(range(40))
+        assert len(stub_server.connections) <= 4
+        await pool.close()
+
+
+# ======================================================================
+# Deduplication
+# ======================================================================
+class TestInFlightDedupe:
+    async def test_identical_read_only_calls_share_a_request(self, stub_server):
+        stub_server.latency_s = 0.05
+        client = MCPClient()
+        await client.add_server(_config(stub_server.url))
+
+        results = await asyncio.gather(*(client.execute_tool("lookup", {"q": "x"}) for _ in range(10)))
+
+        assert all(r.success for r in results)
+        assert stub_server.calls["lookup"] == 1
+        await client.close()
+
+    async def test_distinct_arguments_and_writes_are_not_merged(self, stub_server):
+        stub_server.latency_s = 0.02
+        client = MCPClient()
+        await client.add_server(_config(stub_server.url))
+
+        await asyncio.gather(
+            *(client.execute_tool("lookup", {"q": i % 3}) for i in range(9)),
+            *(client.execute_tool("write", {"q": "same"}) for _ in range(4)),
+        )
+
+        assert stub_server.calls["lookup"] == 3
+        assert stub_server.calls["write"] == 4
+        await client.close()
+
+
+# ======================================================================
+# Retries and Circuit Breaking
+# ======================================================================
+class TestRetriesAndBreaker:
+    async def test_read_only_calls_retry_on_503(self, stub_server):
+        session = MCPServerSession(stub_server.url, TransportSettings(max_retries=3, backoff_base_ms=1))
+        stub_server.fail_remaining = 2
+
+        result = await session.call_tool("flaky", {}, read_only=True)
+
+        assert result["tool"] == "flaky"
+        assert session.stats["retries"] == 2
+        await session.close()
+
+    async def test_mutating_calls_are_not_retried_on_503(self, stub_server):
+        session = MCPServerSession(stub_server.url, TransportSettings(max_retries=3, backoff_base_ms=1))
+        stub_server.fail_remaining = 1
+
+        with pytest.raises(MCPTransportError, match="503"):
+            await session.call_tool("flaky", {}, read_only=False)
+        assert stub_server.calls["flaky"] == 1
+        await session.close()
+
+    async def test_client_errors_do_not_trip_breaker(self, stub_server):
+        session = MCPServerSession(stub_server.url, TransportSettings(failure_threshold=1))
+
+        with pytest.raises(MCPTransportError, match="404"):
+            await session.call_tool("missing", {})
+        assert session.breaker.state == CircuitState.CLOSED
+        await session.close()
+
+    async def test_breaker_opens_on_unreachable_server(self):
+        session = MCPServerSession(
+            "http://127.0.0.1:9",
+            TransportSettings(max_retries=0, failure_threshold=2, reset_timeout_s=60),
+        )
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientConnectorError):
+                await session.call_tool("lookup", {})
+
+        with pytest.raises(CircuitOpenError):
+            await session.call_tool("lookup", {})
+        assert session.stats["rejected_open_circuit"] == 1
+        await session.close()
+
+    async def test_cancelled_half_open_trial_frees_the_breaker(self, stub_server):
+        session = MCPServerSession(
+            stub_server.url, TransportSettings(max_retries=0, failure_threshold=1, reset_timeout_s=0.0)
+        )
+        session.breaker.record_failure()
+        assert session.breaker.state == CircuitState.HALF_OPEN
+
+        stub_server.latency_s = 1.0
+        trial = asyncio.create_task(session.call_tool("write", {}))
+        await asyncio.sleep(0.1)
+        assert not session.breaker.allow()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        stub_server.latency_s = 0.0
+        await session.call_tool("write", {})
+        assert session.breaker.state == CircuitState.CLOSED
+        await session.close()
+
+    async def test_execute_tool_reports_open_circuit_as_failure(self):
+        client = MCPClient()
+        config = _config("http://127.0.0.1:9")
+        client._servers[config.name] = config
+        client._tools["lookup"] = MCPTool(name="lookup", description="", input_schema={}, server_name=config.name)
+        client._transport.settings.max_retries = 0
+        client._transport.settings.failure_threshold = 1
+
+        first = await client.execute_tool("lookup", {})
+        second = await client.execute_tool("lookup", {})
+
+        assert not first.success
+        assert not second.success and "Circuit open" in second.error
+        await client.close()
+
+
+class TestCircuitBreaker:
+    def test_half_open_allows_single_trial(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow()
+
+        now[0] = 10.0
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+        now[0] = 20.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,247 @@
+"""
+Tests for concurrent tool-call dispatch in AgentWorkflow.
+
+A fake LLM client emits scripted turns with several tool_use blocks and the
+tools are stub coroutines with injected latencies, so overlap, ordering,
+limits and timeouts are observable.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.agentic.tool_dispatch import ToolCall, ToolDispatcher, ToolRegistry, plan_batches
+from app.agentic.workflow import AgentWorkflow, ToolDefinition, WorkflowConfig, create_tool_from_mcp
+
+
+class FakeLLM:
+    """Anthropic-style client returning scripted turns; each turn is a list of (name, input) or a str."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.requests = []
+        self.messages = self
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        turn = self.turns.pop(0)
+        usage = SimpleNamespace(input_tokens=10, output_tokens=5)
+        if isinstance(turn, str):
+            return SimpleNamespace(stop_reason="end_turn", content=[SimpleNamespace(type="text", text=turn)], usage=usage)
+        content = [SimpleNamespace(type="text", text="Let me check.")] + [
+            SimpleNamespace(type="tool_use", id=f"call-{i}", name=name, input=tool_input)
+            for i, (name, tool_input) in enumerate(turn)
+        ]
+        return SimpleNamespace(stop_reason="tool_use", content=content, usage=usage)
+
+
+class StubTools:
+    """Async tool executor: each tool sleeps for its latency and records overlap."""
+
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.events = []
+
+    async def __call__(self, name, tool_input, tool_def):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.events.append(("start", name))
+        try:
+            latency = self.latencies[name]
+            if isinstance(latency, Exception):
+                raise latency
+            await asyncio.sleep(latency)
+            return {"tool": name, "input": tool_input}
+        finally:
+            self.in_flight -= 1
+            self.events.append(("end", name))
+
+
+def tool(name, idempotent=True, **kwargs):
+    return ToolDefinition(name=name, description=name, mcp_server="stub", idempotent=idempotent, **kwargs)
+
+
+def workflow(turns, tools, executor, **config):
+    llm = FakeLLM(turns)
+    wf = AgentWorkflow(
+        WorkflowConfig(
+            agent_id=uuid4(), tenant_id=uuid4(), run_id=uuid4(), tools=tools, tool_executor=executor, **config
+        ),
+        llm,
+    )
+    return wf, llm
+
+
+# ======================================================================
+# Concurrent execution
+# ======================================================================
+class TestParallelToolCalls:
+    async def test_independent_calls_overlap_and_keep_call_order(self):
+        executor = StubTools({"slow": 0.3, "medium": 0.2, "fast": 0.1})
+        wf, llm = workflow(
+            [[("slow", {"q": 1}), ("medium", {"q": 2}), ("fast", {"q": 3})], "done"],
+            [tool("slow"), tool("medium"), tool("fast")],
+            executor,
+        )
+
+        start = time.perf_counter()
+        state = await wf.run("go")
+        elapsed = time.perf_counter() - start
+
+        assert state["output"] == "done" and state["error"] is None
+        assert elapsed < 0.45  # max latency, not the 0.6s sum
+        assert executor.max_in_flight == 3
+        assert [t["name"] for t in state["tools_called"]] == ["slow", "medium", "fast"]
+        assert [t["output"]["input"]["q"] for t in state["tools_called"]] == [1, 2, 3]
+
+        assistant, *tool_messages = state["messages"][1:5]
+        assert [c["name"] for c in assistant["tool_calls"]] == ["slow", "medium", "fast"]
+        assert [m["tool_call_id"] for m in tool_messages] == ["call-0", "call-1", "call-2"]
+        # The second LLM request sees the whole turn
+        assert len(llm.requests[1]["messages"]) == 5
+
+    async def test_non_idempotent_calls_are_barriers(self):
+        executor = StubTools({"read": 0.05, "write": 0.05})
+        wf, _ = workflow(
+            [[("read", {}), ("read", {}), ("write", {}), ("read", {})], "done"],
+            [tool("read"), tool("write", idempotent=False)],
+            executor,
+        )
+
+        await wf.run("go")
+
+        assert executor.events == [
+            ("start", "read"), ("start", "read"), ("end", "read"), ("end", "read"),
+            ("start", "write"), ("end", "write"),
+            ("start", "read"), ("end", "read"),
+        ]
+
+    async def test_per_run_concurrency_limit(self):
+        executor = StubTools({"read": 0.05})
+        wf, _ = workflow([[("read", {"i": i}) for i in range(7)], "done"], [tool("read")], executor, max_parallel_tools=2)
+
+        state = await wf.run("go")
+
+        assert executor.max_in_flight == 2
+        assert [t["input"]["i"] for t in state["tools_called"]] == list(range(7))
+
+    async def test_timeout_and_failure_become_error_results(self):
+        executor = StubTools({"hang": 5.0, "broken": RuntimeError("boom"), "fine": 0.01})
+        wf, llm = workflow(
+            [[("hang", {}), ("broken", {}), ("fine", {})], "recovered"],
+            [tool("hang", timeout_seconds=0.05), tool("broken"), tool("fine")],
+            executor,
+        )
+
+        start = time.perf_counter()
+        state = await wf.run("go")
+
+        assert time.perf_counter() - start < 1.0
+        assert state["output"] == "recovered"
+        outputs = [t["output"] for t in state["tools_called"]]
+        assert outputs[0] == {"status": "error", "message": "Tool hang timed out after 0.05s"}
+        assert outputs[1] == {"status": "error", "message": "Tool broken failed: boom"}
+        assert outputs[2]["tool"] == "fine"
+
+    async def test_default_timeout_from_config(self):
+        executor = StubTools({"hang": 5.0})
+        wf, _ = workflow([[("hang", {})], "done"], [tool("hang")], executor, tool_timeout_seconds=0.05)
+        state = await wf.run("go")
+        assert "timed out" in state["tools_called"][0]["output"]["message"]
+
+
+# ======================================================================
+# Validation and approvals
+# ======================================================================
+class TestTurnValidation:
+    async def test_unknown_tool_fails_turn_before_any_call_runs(self):
+        executor = StubTools({"read": 0.01})
+        wf, _ = workflow([[("read", {}), ("missing", {})]], [tool("read")], executor)
+
+        state = await wf.run("go")
+
+        assert state["error"] == "Unknown tool: missing"
+        assert executor.events == []
+
+    async def test_forbidden_tool(self):
+        executor = StubTools({"read": 0.01, "drop_table": 0.01})
+        wf, _ = workflow(
+            [[("read", {}), ("drop_table", {})]], [tool("read"), tool("drop_table")], executor,
+            forbidden_actions=["drop_*"],
+        )
+
+        state = await wf.run("go")
+
+        assert state["error"] == "Forbidden tool: drop_table"
+        assert executor.events == []
+
+    async def test_approval_holds_rest_of_turn(self):
+        executor = StubTools({"read": 0.01, "delete": 0.01, "notify": 0.01})
+        approvals = []
+        wf, _ = workflow(
+            [[("read", {}), ("delete", {"id": 1}), ("notify", {})], "done"],
+            [tool("read"), tool("delete", idempotent=False), tool("notify")],
+            executor,
+            require_approval_for=["delete"],
+            on_approval_required=approvals.append,
+        )
+
+        state = await wf.run("go")
+
+        assert [t["name"] for t in state["tools_called"]] == ["read"]
+        pending = state["pending_approval"]
+        assert pending["tool_name"] == "delete"
+        assert [c["name"] for c in pending["remaining_calls"]] == ["notify"]
+        assert approvals == [pending]
+
+        state = await wf.resume_after_approval(True, "ok")
+
+        assert [t["name"] for t in state["tools_called"]] == ["read", "delete", "notify"]
+        assert state["tools_called"][1]["approved"] is True
+        assert state["output"] == "done"
+
+
+# ======================================================================
+# Registry and planning
+# ======================================================================
+class TestToolRegistry:
+    def test_pattern_decisions_are_memoized(self):
+        registry = ToolRegistry([tool("a")], forbidden_patterns=["rm_*"], approval_patterns=["write_*"])
+        assert registry.is_forbidden("rm_rf") and not registry.is_forbidden("a")
+        assert registry.requires_approval("write_x")
+        assert registry._forbidden == {"rm_rf": True, "a": False}
+
+    def test_plan_batches(self):
+        registry = ToolRegistry([tool("r"), tool("w", idempotent=False)])
+        calls = [ToolCall(str(i), name, {}) for i, name in enumerate("rrwwrr")]
+        batches = plan_batches(calls, registry)
+        assert [[c.id for c in batch] for batch in batches] == [["0", "1"], ["2"], ["3"], ["4", "5"]]
+
+    async def test_dispatcher_results_in_call_order(self):
+        registry = ToolRegistry([tool("r")])
+
+        async def varied(name, tool_input, tool_def):
+            await asyncio.sleep(tool_input["delay"])
+            return tool_input["delay"]
+
+        dispatcher = ToolDispatcher(registry, varied, max_concurrency=8)
+        delays = [0.05, 0.01, 0.03, 0.0]
+        results = await dispatcher.dispatch([ToolCall(str(i), "r", {"delay": d}) for i, d in enumerate(delays)])
+        assert [r.output for r in results] == delays
+        assert all(r.ok for r in results)
+
+    def test_mcp_hints_mark_tools_idempotent(self):
+        read_only = create_tool_from_mcp({"name": "lookup", "annotations": {"readOnlyHint": True}}, "dcl")
+        idempotent = create_tool_from_mcp({"name": "upsert", "annotations": {"idempotentHint": True}}, "dcl")
+        plain = create_tool_from_mcp({"name": "send"}, "dcl")
+        assert read_only.idempotent and idempotent.idempotent and not plain.idempotent
+
+
+class TestWithoutExecutor:
+    async def test_placeholder_executor_still_used(self):
+        wf, _ = workflow([[("a", {}), ("b", {})], "done"], [tool("a"), tool("b")], None)
+        state = await wf.run("go")
+        assert [t["output"]["message"] for t in state["tools_called"]] == ["Mock result for a", "Mock result for b"]
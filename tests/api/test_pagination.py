@@ -0,0 +1,160 @@
+"""Tests for keyset pagination and count estimation in app/api/pagination.py."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.api.pagination import (
+    CursorParams,
+    PaginationParams,
+    approximate_total,
+    paginate_keyset,
+    paginate_query,
+)
+
+Base = declarative_base()
+
+
+class Event(Base):
+    __tablename__ = "events"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc).replace(tzinfo=None)
+    # Groups of three rows share a timestamp so the id tie-breaker matters
+    session.add_all(
+        Event(id=i, kind="drift" if i % 2 else "job", created_at=start + timedelta(minutes=i // 3))
+        for i in range(1, 101)
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _params(cursor=None, page_size=10, with_total=False) -> CursorParams:
+    return CursorParams(cursor=cursor, page_size=page_size, with_total=with_total)
+
+
+def _page(db, cursor="", **kwargs):
+    return paginate_keyset(
+        db.query(Event), _params(cursor, **kwargs), Event.created_at, Event.id,
+    )
+
+
+def _expected_order(db):
+    return [e.id for e in db.query(Event).order_by(Event.created_at.desc(), Event.id.desc())]
+
+
+# ======================================================================
+# Keyset Pagination
+# ======================================================================
+class TestKeysetPagination:
+    def test_forward_walk_matches_offset_pagination(self, db):
+        seen, cursor = [], ""
+        while cursor is not None:
+            page = _page(db, cursor, page_size=7)
+            seen.extend(e.id for e in page.items)
+            cursor = page.next_cursor
+
+        assert seen == _expected_order(db)
+
+        offset_page = paginate_query(
+            db.query(Event).order_by(Event.created_at.desc(), Event.id.desc()),
+            PaginationParams(page=3, page_size=7),
+        )
+        assert [e.id for e in offset_page.items] == seen[14:21]
+
+    def test_first_and_last_page_cursors(self, db):
+        first = _page(db)
+        assert first.prev_cursor is None
+        assert first.has_more
+
+        last = _page(db, page_size=100)
+        assert last.next_cursor is None
+        assert not last.has_more
+
+    def test_backward_returns_previous_page(self, db):
+        pages = [_page(db)]
+        for _ in range(3):
+            pages.append(_page(db, pages[-1].next_cursor))
+
+        back = _page(db, pages[3].prev_cursor)
+        assert [e.id for e in back.items] == [e.id for e in pages[2].items]
+        assert back.next_cursor is not None
+
+        # Walking all the way back lands on the first page with no prev cursor
+        cursor = back.prev_cursor
+        while True:
+            page = _page(db, cursor)
+            if page.prev_cursor is None:
+                break
+            cursor = page.prev_cursor
+        assert [e.id for e in page.items] == [e.id for e in pages[0].items]
+
+    def test_ascending_order_and_filters(self, db):
+        query = db.query(Event).filter(Event.kind == "drift")
+        seen, cursor = [], ""
+        while cursor is not None:
+            page = paginate_keyset(query, _params(cursor, page_size=8), Event.created_at, Event.id, descending=False)
+            seen.extend(e.id for e in page.items)
+            cursor = page.next_cursor
+
+        assert seen == [i for i in range(1, 101) if i % 2]
+
+    def test_rows_inserted_ahead_do_not_shift_pages(self, db):
+        first = _page(db)
+        db.add(Event(id=1000, kind="job", created_at=datetime(2030, 1, 1)))
+        db.commit()
+
+        second = _page(db, first.next_cursor)
+        assert second.items[0].id == _expected_order(db)[11]
+
+
+# ======================================================================
+# Cursor Integrity
+# ======================================================================
+class TestCursorIntegrity:
+    def test_tampered_cursor_rejected(self, db):
+        cursor = _page(db).next_cursor
+        body, signature = cursor.split(".")
+        forged = body[:-2] + ("AA" if body[-2:] != "AA" else "BB") + "." + signature
+
+        with pytest.raises(HTTPException) as exc:
+            _page(db, forged)
+        assert exc.value.status_code == 400
+
+    def test_cursor_bound_to_ordering(self, db):
+        cursor = _page(db).next_cursor
+        with pytest.raises(HTTPException):
+            paginate_keyset(db.query(Event), _params(cursor), Event.created_at, Event.id, descending=False)
+
+    def test_garbage_cursor_rejected(self, db):
+        with pytest.raises(HTTPException):
+            _page(db, "not-a-cursor")
+
+
+# ======================================================================
+# Totals
+# ======================================================================
+class TestApproximateTotal:
+    def test_exact_below_cap(self, db):
+        assert approximate_total(db.query(Event).filter(Event.kind == "job"), cap=1000) == (50, True)
+
+    def test_capped_above_cap(self, db):
+        assert approximate_total(db.query(Event), cap=20) == (20, False)
+
+    def test_total_only_when_requested(self, db):
+        assert _page(db).total is None
+        page = _page(db, with_total=True)
+        assert (page.total, page.total_is_exact) == (100, True)
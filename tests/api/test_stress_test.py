@@ -0,0 +1,58 @@
+"""
+Tests for stress scenario submission validation.
+
+The router is mounted on a bare FastAPI app; invalid load profiles must be
+rejected with a 422 before anything is queued.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import stress_test
+
+
+@pytest.fixture
+def client(monkeypatch):
+    queued = []
+    monkeypatch.setattr(stress_test.BackgroundTasks, "add_task", lambda self, fn, *a, **kw: queued.append(fn))
+    app = FastAPI()
+    app.include_router(stress_test.router)
+    client = TestClient(app)
+    client.queued = queued
+    return client
+
+
+def scenario(load_profile):
+    return {
+        "agents": {
+            "agents": [],
+            "total_agents": 0,
+            "distribution": {"by_type": {}, "by_reliability": {}, "by_cost": {}},
+        },
+        "workflows": [],
+        "load_profile": load_profile,
+    }
+
+
+@pytest.mark.parametrize("load_profile", [
+    {"arrival": "linear"},
+    {"arrival": "constant", "rate_per_sec": 0},
+    {"arrival": "ramp", "start_rate_per_sec": -1},
+    {"arrival": "ramp", "ramp_seconds": 0},
+    {"arrival": "burst", "burst_size": 0},
+    {"arrival": "burst", "burst_interval_seconds": -5},
+    {"max_concurrent_tasks": 0},
+])
+def test_invalid_load_profile_is_rejected(client, load_profile):
+    response = client.post("/stress-test/scenario", json=scenario(load_profile))
+    assert response.status_code == 422
+    assert client.queued == []
+
+
+def test_valid_load_profile_is_queued(client):
+    profile = {"arrival": "ramp", "start_rate_per_sec": 0, "rate_per_sec": 50, "max_concurrent_tasks": 100}
+    response = client.post("/stress-test/scenario", json=scenario(profile))
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+    assert len(client.queued) == 1
@@ -0,0 +1,66 @@
+"""
+Local stub of a task callback endpoint.
+
+Accepts JSON POSTs on any path of an ephemeral port. Each request can be
+delayed by `latency` seconds and the next `fail_remaining` requests answer
+`fail_status`. Used by the worker callback delivery tests and benchmark.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+class StubCallbackEndpoint:
+    """In-process HTTP endpoint recording every callback body it accepted."""
+
+    def __init__(self, latency: float = 0.0):
+        self.received: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.latency = latency
+        self.fail_remaining = 0
+        self.fail_status = 503
+        self._lock = threading.Lock()
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if endpoint.latency:
+                    time.sleep(endpoint.latency)
+                with endpoint._lock:
+                    endpoint.requests += 1
+                    if endpoint.fail_remaining > 0:
+                        endpoint.fail_remaining -= 1
+                        status = endpoint.fail_status
+                    else:
+                        endpoint.received.append(json.loads(body))
+                        status = 200
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/callback"
+
+    def start(self) -> "StubCallbackEndpoint":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,92 @@
+"""
+Local aiohttp stub of an HTTP MCP server.
+
+Serves /health, /tools and /tools/execute on an ephemeral port and records
+how many calls and distinct client connections it saw. Used by the MCP
+transport tests and scripts/benchmark_mcp_transport.py.
+"""
+import asyncio
+from typing import Any, Dict, Optional, Set, Tuple
+
+from aiohttp import web
+
+
+STUB_TOOLS = [
+    {
+        "name": "lookup",
+        "description": "Read-only lookup",
+        "inputSchema": {"type": "object"},
+        "annotations": {"readOnlyHint": True},
+    },
+    {
+        "name": "write",
+        "description": "Mutating call",
+        "inputSchema": {"type": "object"},
+    },
+    {
+        "name": "flaky",
+        "description": "Fails with 503 while fail_remaining > 0",
+        "inputSchema": {"type": "object"},
+        "annotations": {"readOnlyHint": True},
+    },
+]
+
+
+class StubMCPServer:
+    """In-process MCP server with scripted latency and failures."""
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self.fail_remaining = 0
+        self.calls: Dict[str, int] = {}
+        self.connections: Set[Tuple[Any, ...]] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_get("/tools", self._tools)
+        app.router.add_post("/tools/execute", self._execute)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _track(self, request: web.Request) -> None:
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        if peer:
+            self.connections.add(tuple(peer))
+
+    async def _health(self, request: web.Request) -> web.Response:
+        self._track(request)
+        return web.json_response({"status": "ok"})
+
+    async def _tools(self, request: web.Request) -> web.Response:
+        self._track(request)
+        return web.json_response({"tools": STUB_TOOLS})
+
+    async def _execute(self, request: web.Request) -> web.Response:
+        self._track(request)
+        payload = await request.json()
+        tool = payload["tool"]
+        self.calls[tool] = self.calls.get(tool, 0) + 1
+
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+
+        if tool == "flaky" and self.fail_remaining > 0:
+            self.fail_remaining -= 1
+            return web.Response(status=503, text="unavailable")
+        if tool not in {t["name"] for t in STUB_TOOLS}:
+            return web.Response(status=404, text=f"unknown tool {tool}")
+
+        return web.json_response({"tool": tool, "arguments": payload.get("arguments", {})})
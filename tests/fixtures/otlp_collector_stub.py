@@ -0,0 +1,64 @@
+"""
+Local stub of an OTLP/HTTP trace collector.
+
+Accepts JSON POSTs on /v1/traces on an ephemeral port and keeps every
+payload it received. Used by the trace export tests.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+class StubOTLPCollector:
+    """In-process collector recording ExportTraceServiceRequest payloads."""
+
+    def __init__(self):
+        self.payloads: List[Dict[str, Any]] = []
+        self.fail_remaining = 0
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path != "/v1/traces":
+                    self.send_response(404)
+                elif collector.fail_remaining > 0:
+                    collector.fail_remaining -= 1
+                    self.send_response(503)
+                else:
+                    collector.payloads.append(json.loads(body))
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/traces"
+
+    @property
+    def spans(self) -> List[Dict[str, Any]]:
+        return [
+            span
+            for payload in self.payloads
+            for resource in payload["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    def start(self) -> "StubOTLPCollector":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,265 @@
+"""Tests for the batched background audit-log writer."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from app.gateway.audit_writer import AuditLogWriter, AuditRecord, AuditRecordRejected
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+def _record(i: int) -> AuditRecord:
+    return AuditRecord(
+        route=f"/api/v1/items/{i}",
+        method="GET",
+        status=200,
+        latency_ms=i,
+        created_at=datetime(2026, 1, 1),
+        tenant_id="7f1b6c0e-0000-4000-8000-000000000001",
+        trace_id=f"trace-{i}",
+    )
+
+
+class RecordingSink:
+    """Batch writer double that records what reached the database."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.batches: list[list[int]] = []
+        self.delay_s = delay_s
+        self.fail = False
+        self.reject: set[int] = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, records):
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        if any(r.latency_ms in self.reject for r in records):
+            raise AuditRecordRejected("violates foreign key constraint")
+        with self.lock:
+            self.batches.append([r.latency_ms for r in records])
+
+    @property
+    def written(self) -> list[int]:
+        return [i for batch in self.batches for i in batch]
+
+
+# ======================================================================
+# Batching and Ordering
+# ======================================================================
+class TestBatching:
+    async def test_records_written_in_submission_order(self):
+        sink = RecordingSink()
+        writer = AuditLogWriter(sink, batch_size=50, flush_interval_s=0.01)
+
+        for i in range(1000):
+            writer.submit(_record(i))
+            if i % 100 == 0:
+                await asyncio.sleep(0)
+        await writer.close()
+
+        assert sink.written == list(range(1000))
+        assert max(len(b) for b in sink.batches) == 50
+        assert writer.stats["written"] == 1000
+
+    async def test_flushes_partial_batch_on_interval(self):
+        sink = RecordingSink()
+        writer = AuditLogWriter(sink, batch_size=100, flush_interval_s=0.02)
+
+        for i in range(3):
+            writer.submit(_record(i))
+        await asyncio.sleep(0.1)
+
+        assert sink.batches == [[0, 1, 2]]
+        await writer.close()
+
+    async def test_full_batch_flushes_without_waiting_for_interval(self):
+        sink = RecordingSink()
+        writer = AuditLogWriter(sink, batch_size=10, flush_interval_s=60)
+
+        for i in range(10):
+            writer.submit(_record(i))
+        await asyncio.sleep(0.05)
+
+        assert sink.batches == [list(range(10))]
+        await writer.close()
+
+    async def test_close_flushes_everything_queued(self):
+        sink = RecordingSink()
+        writer = AuditLogWriter(sink, batch_size=100, flush_interval_s=60)
+
+        for i in range(250):
+            writer.submit(_record(i))
+        await writer.close()
+
+        assert sink.written == list(range(250))
+        assert writer.backlog == 0
+
+    def test_submit_outside_event_loop_is_flushed_on_close(self):
+        sink = RecordingSink()
+        writer = AuditLogWriter(sink, batch_size=10)
+        for i in range(15):
+            writer.submit(_record(i))
+
+        asyncio.run(writer.close())
+
+        assert sink.written == list(range(15))
+
+
+# ======================================================================
+# Backpressure and Spill
+# ======================================================================
+class TestBackpressure:
+    async def test_full_ring_drops_oldest_without_blocking(self):
+        sink = RecordingSink(delay_s=0.2)
+        writer = AuditLogWriter(sink, capacity=100, batch_size=10, flush_interval_s=60)
+
+        start = time.perf_counter()
+        for i in range(1000):
+            writer.submit(_record(i))
+        assert time.perf_counter() - start < 0.5
+
+        assert writer.backlog == 100
+        assert writer.stats["dropped"] == 900
+        await writer.close()
+        assert sink.written == list(range(900, 1000))
+
+    async def test_failed_batches_spill_and_replay(self, tmp_path):
+        sink = RecordingSink()
+        spill = tmp_path / "audit.jsonl"
+        writer = AuditLogWriter(sink, batch_size=5, flush_interval_s=0.01, spill_path=str(spill))
+
+        sink.fail = True
+        for i in range(10):
+            writer.submit(_record(i))
+        await asyncio.sleep(0.1)
+        assert writer.stats["spilled"] == 10
+        assert spill.exists()
+
+        sink.fail = False
+        for i in range(10, 12):
+            writer.submit(_record(i))
+        await writer.close()
+
+        assert sorted(sink.written) == list(range(12))
+        assert writer.stats["replayed"] == 10
+        assert writer.stats["dropped"] == 0
+        assert not spill.exists()
+
+    async def test_spilled_records_round_trip(self, tmp_path):
+        sink = RecordingSink()
+        writer = AuditLogWriter(sink, spill_path=str(tmp_path / "audit.jsonl"))
+        original = _record(7)
+
+        writer._spill([original])
+        restored = AuditRecord.from_json((tmp_path / "audit.jsonl").read_text().strip())
+
+        assert restored == original
+
+    async def test_slow_database_backlog_goes_to_disk(self, tmp_path):
+        sink = RecordingSink(delay_s=0.05)
+        spill = tmp_path / "audit.jsonl"
+        writer = AuditLogWriter(
+            sink, capacity=1000, batch_size=10, flush_interval_s=0.01,
+            spill_path=str(spill), high_water=100,
+        )
+
+        for i in range(500):
+            writer.submit(_record(i))
+            if i % 50 == 0:
+                await asyncio.sleep(0.06)
+        await writer.close()
+
+        assert writer.stats["spilled"] > 0
+        assert writer.stats["dropped"] == 0
+        assert sorted(sink.written) == list(range(500))
+
+    async def test_without_spill_path_failures_count_as_dropped(self):
+        sink = RecordingSink()
+        sink.fail = True
+        writer = AuditLogWriter(sink, batch_size=5)
+
+        for i in range(5):
+            writer.submit(_record(i))
+        await writer.close()
+
+        assert writer.stats["dropped"] == 5
+        assert writer.stats["write_errors"] == 1
+
+
+# ======================================================================
+# Rejected Records
+# ======================================================================
+class TestRejectedRecords:
+    async def test_bad_record_does_not_sink_its_batch(self, tmp_path):
+        sink = RecordingSink()
+        sink.reject = {3}
+        spill = tmp_path / "audit.jsonl"
+        writer = AuditLogWriter(sink, batch_size=8, flush_interval_s=60, spill_path=str(spill))
+
+        for i in range(8):
+            writer.submit(_record(i))
+        await writer.close()
+
+        assert sink.written == [0, 1, 2, 4, 5, 6, 7]
+        assert writer.stats["rejected"] == 1
+        assert writer.stats["spilled"] == 0
+        assert not spill.exists()
+        quarantined = writer.quarantine_path.read_text().splitlines()
+        assert [AuditRecord.from_json(line).latency_ms for line in quarantined] == [3]
+
+    async def test_rejected_spilled_records_are_quarantined_not_replayed(self, tmp_path):
+        sink = RecordingSink()
+        spill = tmp_path / "audit.jsonl"
+        writer = AuditLogWriter(sink, batch_size=5, flush_interval_s=60, spill_path=str(spill))
+        writer._spill([_record(i) for i in range(5)])
+        sink.reject = {1}
+
+        writer.submit(_record(5))
+        await writer.flush()
+        writer.submit(_record(6))
+        await writer.close()
+
+        assert sorted(sink.written) == [0, 2, 3, 4, 5, 6]
+        assert writer.stats["replayed"] == 4
+        assert writer.stats["rejected"] == 1
+        assert not spill.exists()
+
+    async def test_transient_error_mid_bisect_spills_only_unwritten(self, tmp_path):
+        sink = RecordingSink()
+        sink.reject = {0}
+        spill = tmp_path / "audit.jsonl"
+        writer = AuditLogWriter(sink, batch_size=4, spill_path=str(spill))
+        original = sink.__call__
+
+        def fail_after_first_half(records):
+            if records[0].latency_ms >= 2:
+                raise ConnectionError("database unavailable")
+            original(records)
+
+        writer._write_batch = fail_after_first_half
+        await writer._flush_batch([_record(i) for i in range(4)])
+
+        assert sink.written == [1]
+        spilled = [AuditRecord.from_json(line).latency_ms for line in spill.read_text().splitlines()]
+        assert spilled == [2, 3]
+
+    def test_unserializable_record_is_logged_not_fatal(self, tmp_path, caplog):
+        spill = tmp_path / "audit.jsonl"
+        writer = AuditLogWriter(RecordingSink(), spill_path=str(spill))
+        class Opaque:
+            def __str__(self):
+                raise TypeError("no string form")
+
+        bad = _record(1)
+        bad.agent_id = Opaque()
+
+        writer._spill([_record(0), bad])
+
+        assert writer.stats["spilled"] == 1
+        assert writer.stats["dropped"] == 1
+        assert "not serializable" in caplog.text
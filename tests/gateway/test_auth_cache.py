@@ -0,0 +1,210 @@
+"""Tests for the verified-token cache and compiled public-route matcher."""
+
+import random
+import time
+
+import httpx
+import jwt
+import pytest
+from fastapi import FastAPI, Request
+
+from app.gateway.auth_cache import RoutePrefixTrie, VerifiedTokenCache
+from app.gateway.middleware import auth
+
+SECRET = "test-secret-key-that-is-long-enough-for-hs256"
+
+
+def _token(secret: str = SECRET, **claims) -> str:
+    claims.setdefault("tenant_id", "tenant-a")
+    claims.setdefault("sub", "user-1")
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def _decoder():
+    calls = []
+
+    def decode(token):
+        calls.append(token)
+        return jwt.decode(token, SECRET, algorithms=["HS256"])
+
+    return decode, calls
+
+
+# ======================================================================
+# Route Prefix Trie
+# ======================================================================
+class TestRoutePrefixTrie:
+    def test_matches_linear_startswith_scan(self):
+        prefixes = [p.rstrip("/") for p in auth.PUBLIC_PATHS + auth.STATIC_PREFIXES]
+        trie = RoutePrefixTrie(prefixes)
+
+        rng = random.Random(31)
+        samples = prefixes + ["/api/v1/aam/intelligence", "/tokenize", "/docs2", "/api/v1", "/dcl",
+                              "/api/v1/agents/run", "/favicon.ico", "/discovery/x", "/api/maestra"]
+        for _ in range(2000):
+            base = rng.choice(prefixes)
+            samples.append(base[: rng.randint(0, len(base))] + rng.choice(["", "/x", "s", "/", "-1"]))
+
+        for path in samples:
+            normalized = path.rstrip("/")
+            expected = any(normalized.startswith(p) for p in prefixes)
+            assert trie.matches(normalized) == expected, path
+
+    def test_empty_prefix_matches_everything(self):
+        assert RoutePrefixTrie([""]).matches("/anything")
+        assert not RoutePrefixTrie(["/a"]).matches("")
+
+
+# ======================================================================
+# Verified Token Cache
+# ======================================================================
+class TestVerifiedTokenCache:
+    def test_repeat_verifications_skip_decode(self):
+        cache = VerifiedTokenCache()
+        decode, calls = _decoder()
+        token = _token()
+
+        for _ in range(5):
+            assert cache.verify(token, decode)["tenant_id"] == "tenant-a"
+
+        assert len(calls) == 1
+        assert cache.stats["hits"] == 4
+
+    def test_cached_token_expires_at_exp(self):
+        now = [1_000.0]
+        cache = VerifiedTokenCache(clock=lambda: now[0])
+        token = _token(exp=int(time.time()) + 60)
+        exp = jwt.decode(token, options={"verify_signature": False})["exp"]
+        decode, calls = _decoder()
+
+        now[0] = exp - 1
+        cache.verify(token, decode)
+        cache.verify(token, decode)
+        assert len(calls) == 1
+
+        now[0] = exp
+        with pytest.raises(jwt.ExpiredSignatureError):
+            cache.verify(token, decode)
+        assert len(cache) == 0
+
+    def test_expired_tokens_are_never_cached(self):
+        cache = VerifiedTokenCache()
+        decode, _ = _decoder()
+        token = _token(exp=int(time.time()) - 10)
+
+        for _ in range(2):
+            with pytest.raises(jwt.ExpiredSignatureError):
+                cache.verify(token, decode)
+        assert len(cache) == 0
+
+    def test_invalid_signature_is_not_cached(self):
+        cache = VerifiedTokenCache()
+        decode, calls = _decoder()
+        forged = _token(secret="another-secret-key-that-is-also-long-enough")
+
+        for _ in range(3):
+            with pytest.raises(jwt.InvalidSignatureError):
+                cache.verify(forged, decode)
+        assert len(calls) == 3
+
+    def test_revoked_token_rejected_even_when_cached(self):
+        cache = VerifiedTokenCache()
+        decode, _ = _decoder()
+        token, other = _token(), _token(sub="user-2")
+        cache.verify(token, decode)
+        cache.verify(other, decode)
+
+        cache.revoke(token)
+
+        with pytest.raises(jwt.InvalidTokenError, match="revoked"):
+            cache.verify(token, decode)
+        assert cache.verify(other, decode)["sub"] == "user-2"
+
+    def test_revocations_forgotten_after_token_expiry(self):
+        now = [time.time()]
+        cache = VerifiedTokenCache(clock=lambda: now[0])
+        short = _token(exp=int(now[0]) + 5)
+        cache.revoke(short)
+
+        now[0] += 10
+        cache.revoke(_token(sub="user-2"))
+        assert cache.digest(short) not in cache._revoked
+
+    def test_epoch_bump_forces_reverification(self):
+        cache = VerifiedTokenCache()
+        decode, calls = _decoder()
+        token = _token()
+        cache.verify(token, decode)
+
+        cache.bump_epoch()
+        cache.verify(token, decode)
+
+        assert len(calls) == 2
+
+    def test_lru_is_bounded(self):
+        cache = VerifiedTokenCache(max_entries=3)
+        decode, calls = _decoder()
+        tokens = [_token(sub=f"user-{i}") for i in range(4)]
+
+        for token in tokens[:3]:
+            cache.verify(token, decode)
+        cache.verify(tokens[0], decode)  # Refresh user-0
+        cache.verify(tokens[3], decode)  # Evicts user-1
+
+        assert len(cache) == 3
+        cache.verify(tokens[0], decode)
+        cache.verify(tokens[1], decode)
+        assert len(calls) == 5
+
+
+# ======================================================================
+# Middleware
+# ======================================================================
+@pytest.fixture
+def gateway(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_SECRET_KEY", SECRET)
+    monkeypatch.setattr(auth, "_token_cache", VerifiedTokenCache())
+    monkeypatch.delenv("INTERNAL_SERVICE_KEY", raising=False)
+
+    app = FastAPI()
+    app.middleware("http")(auth.tenant_auth_middleware)
+
+    @app.get("/{path:path}")
+    async def echo(path: str, request: Request):
+        return {"tenant_id": getattr(request.state, "tenant_id", None)}
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gw")
+
+
+class TestMiddleware:
+    async def test_public_and_protected_routes(self, gateway):
+        async with gateway as client:
+            assert (await client.get("/health/live")).status_code == 200
+            assert (await client.get("/assets/app.js")).status_code == 200
+            assert (await client.get("/api/v1/agents")).status_code == 401
+
+            token = _token()
+            headers = {"Authorization": f"Bearer {token}"}
+            for _ in range(3):
+                response = await client.get("/api/v1/agents", headers=headers)
+                assert response.json() == {"tenant_id": "tenant-a"}
+        assert auth._token_cache.stats["hits"] == 2
+
+    async def test_revoked_token_gets_401(self, gateway):
+        token = _token()
+        headers = {"Authorization": f"Bearer {token}"}
+        async with gateway as client:
+            assert (await client.get("/api/v1/agents", headers=headers)).status_code == 200
+            auth.revoke_token(token)
+            response = await client.get("/api/v1/agents", headers=headers)
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid token"}
+
+    async def test_expired_token_message_unchanged(self, gateway):
+        headers = {"Authorization": f"Bearer {_token(exp=int(time.time()) - 1)}"}
+        async with gateway as client:
+            response = await client.get("/api/v1/agents", headers=headers)
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Token has expired"}
@@ -0,0 +1,296 @@
+"""Tests for Maestra context assembly: keyword automaton, triple cache and DB pool."""
+
+import random
+import re
+import threading
+
+import psycopg2
+import pytest
+
+from app.maestra import assembler
+from app.maestra.db import ConnectionPool, PoolExhaustedError
+from app.maestra.keyword_matcher import KeywordAutomaton
+
+
+# ======================================================================
+# Reference implementations (pre-automaton behaviour)
+# ======================================================================
+def _legacy_extract(message: str) -> set[str]:
+    message_lower = message.lower()
+    matched = set()
+    for domain, keywords in assembler._DOMAIN_KEYWORDS.items():
+        for keyword in keywords:
+            if " " in keyword:
+                if keyword in message_lower:
+                    matched.add(domain)
+                    break
+            elif re.search(rf"\b{re.escape(keyword)}\b", message_lower):
+                matched.add(domain)
+                break
+    return matched
+
+
+def _legacy_detect(message: str, entities: list[str]):
+    message_lower = message.lower()
+    for entity_id in entities:
+        if re.search(rf"\b{re.escape(entity_id.lower())}\b", message_lower):
+            return entity_id
+    return None
+
+
+def _random_messages(vocabulary: list[str], count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    glue = [" ", "", "-", "_", ".", ", ", "x", "s ", "'s ", "/"]
+    filler = ["what", "is", "the", "show", "me", "for", "Q3", "é", "über", "2024"]
+    messages = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            token = rng.choice(vocabulary + filler)
+            if rng.random() < 0.3:
+                token = token.upper()
+            if rng.random() < 0.2 and len(token) > 3:
+                cut = rng.randint(1, len(token) - 1)
+                token = token[:cut] if rng.random() < 0.5 else token[cut:]
+            parts.append(token + rng.choice(glue))
+        messages.append("".join(parts))
+    return messages
+
+
+# ======================================================================
+# Keyword Automaton
+# ======================================================================
+class TestKeywordAutomaton:
+    def test_overlapping_matches_are_all_reported(self):
+        matcher = KeywordAutomaton()
+        for word in ["he", "she", "his", "hers"]:
+            matcher.add(word, word)
+        matcher.build()
+
+        found = sorted((s, e, label) for s, e, label in matcher.iter_matches("ushers"))
+        assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+    def test_whole_word_matches_regex_word_boundaries(self):
+        matcher = KeywordAutomaton()
+        for word in ["ar", "add-back", "q3", "_x"]:
+            matcher.add(word, word, whole_word=True)
+        matcher.build()
+
+        for text in ["ar/ap", "bar", "ar_", "an add-back.", "add-backs", "q3-2024", "a_x", "_x y"]:
+            expected = {w for w in ["ar", "add-back", "q3", "_x"]
+                        if re.search(rf"\b{re.escape(w)}\b", text)}
+            assert matcher.labels(text) == expected, text
+
+    def test_cannot_add_after_build(self):
+        matcher = KeywordAutomaton().build()
+        with pytest.raises(RuntimeError):
+            matcher.add("late", "late")
+
+
+class TestDomainAndEntityMatching:
+    def test_extract_domains_matches_legacy_regex_scan(self):
+        vocabulary = [k for kws in assembler._DOMAIN_KEYWORDS.values() for k in kws]
+        for message in _random_messages(vocabulary, count=2000, seed=29):
+            domains, from_keywords = assembler.extract_domains(message, None)
+            legacy = _legacy_extract(message)
+            assert set(domains) == legacy, message
+            assert from_keywords == bool(legacy)
+
+    def test_module_fallback_unchanged(self):
+        assert assembler.extract_domains("hello there", "farm") == (
+            assembler._MODULE_DEFAULT_DOMAINS["farm"], False,
+        )
+        assert assembler.extract_domains("hello there", "dcl") == ([], False)
+
+    def test_detect_entity_returns_first_entity_in_order(self, monkeypatch):
+        entities = ["Acme", "acme_corp", "Beta-Co", "beta", "meridian", "x"]
+        monkeypatch.setattr(assembler, "_entity_cache", entities)
+
+        for message in _random_messages(entities, count=2000, seed=30):
+            assert assembler.detect_entity(message) == _legacy_detect(message, entities), message
+
+    def test_entity_matcher_rebuilt_when_entities_reload(self, monkeypatch):
+        monkeypatch.setattr(assembler, "_entity_cache", ["alpha"])
+        assert assembler.detect_entity("alpha revenue") == "alpha"
+
+        monkeypatch.setattr(assembler, "_entity_cache", ["gamma"])
+        assert assembler.detect_entity("alpha revenue") is None
+        assert assembler.detect_entity("gamma revenue") == "gamma"
+
+
+# ======================================================================
+# Triple Cache
+# ======================================================================
+class _FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self._conn.queries.append((query, params))
+
+    def fetchall(self):
+        return [{"entity_id": "e1", "concept": "revenue.total", "property": "amount",
+                 "value": 1, "period": "2024-Q1", "source_system": "farm"}]
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.queries = []
+        self.closed = 0
+        self.rollbacks = 0
+        self.fail_rollback = False
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise psycopg2.OperationalError("server closed the connection")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def triple_store(monkeypatch):
+    conn = _FakeConnection()
+    now = [0.0]
+    monkeypatch.setattr(assembler, "get_connection", lambda: conn)
+    monkeypatch.setattr(assembler, "_resolved_tenant", "tenant-1")
+    monkeypatch.setattr(assembler, "_triple_cache", assembler._TripleCache(max_entries=3, clock=lambda: now[0]))
+    monkeypatch.delenv("MAESTRA_TRIPLE_CACHE_TTL", raising=False)
+    conn.now = now
+    return conn
+
+
+class TestTripleCache:
+    def test_same_concept_set_served_from_cache(self, triple_store):
+        first = assembler.retrieve_triples(["revenue", "pnl"], None)
+        second = assembler.retrieve_triples(["pnl", "revenue"], None)
+
+        assert first == second
+        assert len(triple_store.queries) == 1
+        assert assembler._triple_cache.hits == 1
+
+    def test_entries_expire_after_ttl(self, triple_store, monkeypatch):
+        monkeypatch.setenv("MAESTRA_TRIPLE_CACHE_TTL", "30")
+        assembler.retrieve_triples(["revenue"], "e1")
+        triple_store.now[0] = 29.9
+        assembler.retrieve_triples(["revenue"], "e1")
+        assert len(triple_store.queries) == 1
+
+        triple_store.now[0] = 30.0
+        assembler.retrieve_triples(["revenue"], "e1")
+        assert len(triple_store.queries) == 2
+
+    def test_key_includes_entity_and_cache_is_bounded(self, triple_store):
+        for entity in ["e1", "e2", "e3", "e4"]:
+            assembler.retrieve_triples(["revenue"], entity)
+        assembler.retrieve_triples(["revenue"], "e4")
+        assert len(triple_store.queries) == 4
+
+        # e1 was the oldest entry and has been evicted
+        assembler.retrieve_triples(["revenue"], "e1")
+        assert len(triple_store.queries) == 5
+
+    def test_zero_ttl_disables_cache(self, triple_store, monkeypatch):
+        monkeypatch.setenv("MAESTRA_TRIPLE_CACHE_TTL", "0")
+        assembler.retrieve_triples(["revenue"], None)
+        assembler.retrieve_triples(["revenue"], None)
+        assert len(triple_store.queries) == 2
+
+    def test_cached_rows_are_not_shared_lists(self, triple_store):
+        assembler.retrieve_triples(["revenue"], None).clear()
+        assert len(assembler.retrieve_triples(["revenue"], None)) == 1
+
+
+# ======================================================================
+# Connection Pool
+# ======================================================================
+class TestConnectionPool:
+    def _pool(self, **kwargs):
+        made = []
+
+        def connect():
+            conn = _FakeConnection()
+            made.append(conn)
+            return conn
+
+        return ConnectionPool("postgresql://test", connect=connect, **kwargs), made
+
+    def test_close_returns_connection_for_reuse(self):
+        pool, made = self._pool(max_size=2)
+
+        for _ in range(5):
+            conn = pool.acquire()
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.close()
+
+        assert len(made) == 1
+        assert made[0].rollbacks == 5
+        assert pool.stats["reuses"] == 4
+
+    def test_close_is_idempotent_and_blocks_further_use(self):
+        pool, _ = self._pool(max_size=1)
+        conn = pool.acquire()
+        conn.close()
+        conn.close()
+
+        assert conn.closed
+        with pytest.raises(psycopg2.InterfaceError):
+            conn.cursor()
+        assert pool.idle_count == 1
+
+    def test_pool_is_bounded(self):
+        pool, made = self._pool(max_size=2, timeout_s=0.05)
+        held = [pool.acquire(), pool.acquire()]
+
+        with pytest.raises(PoolExhaustedError):
+            pool.acquire()
+
+        held[0].close()
+        assert pool.acquire() is not None
+        assert len(made) == 2
+
+    def test_waiters_get_released_connections(self):
+        pool, made = self._pool(max_size=3, timeout_s=5)
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(50):
+                    conn = pool.acquire()
+                    conn.close()
+            except Exception as e:  # pragma: no cover - surfaced below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert len(made) <= 3
+
+    def test_broken_connections_are_discarded(self):
+        pool, made = self._pool(max_size=2)
+        conn = pool.acquire()
+        made[0].fail_rollback = True
+        conn.close()
+        assert pool.idle_count == 0 and made[0].closed
+
+        conn = pool.acquire()
+        made[1].closed = 1  # Server dropped it while idle
+        conn.close()
+        pool.acquire()
+        assert len(made) == 3
+        assert pool.stats["discarded"] == 2
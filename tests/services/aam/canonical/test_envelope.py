@@ -0,0 +1,210 @@
+"""
+Tests for the canonical stream envelope, batched publishing and the
+negotiated subscriber decoder.
+
+Round-trip properties are checked over seeded random JSON-like payloads:
+whatever the codec and batching limits, decoding every entry in order
+gives back the events exactly as JSON would.
+"""
+
+import json
+import random
+import string
+
+import fakeredis
+import pytest
+
+from services.aam.canonical.envelope import (
+    CODEC_JSON,
+    CODEC_JSON_ZLIB,
+    CODEC_MSGPACK,
+    CONSUMERS_KEY,
+    DECODERS_KEY_PREFIX,
+    EnvelopeError,
+    advertise_decoders,
+    decode_entry,
+    encode_entries,
+    negotiate_codec,
+    register_consumer,
+    supported_codecs,
+    unregister_consumer,
+    withdraw_decoders,
+)
+from services.aam.canonical.publisher import CanonicalEventPublisher
+from services.aam.canonical.schemas import CanonicalAccount, CanonicalEvent, CanonicalMeta, CanonicalSource
+from services.aam.canonical.subscriber import decode_stream_entries, read_canonical_stream
+
+STREAM = "aam:dcl:t1:salesforce"
+
+
+def _value(rng, depth=0):
+    kind = rng.randrange(9 if depth < 3 else 6)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.random() < 0.5
+    if kind == 2:
+        return rng.choice([0, -1, 2**31, -(2**63), 2**64 - 1, rng.randrange(-10**6, 10**6)])
+    if kind == 3:
+        return rng.choice([0.0, -2.5, 1e300, rng.uniform(-1e6, 1e6)])
+    if kind in (4, 5):
+        alphabet = string.printable + "éß中文🙂\x00"
+        return "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 40)))
+    if kind in (6, 7):
+        return {f"k{i}_{rng.randrange(100)}": _value(rng, depth + 1) for i in range(rng.randrange(0, 6))}
+    return [_value(rng, depth + 1) for _ in range(rng.randrange(0, 6))]
+
+
+def _payloads(rng, n):
+    return [
+        {"batch_id": "b", "entity": "account", "event": {"data": _value(rng)}, "seq": i}
+        for i in range(n)
+    ]
+
+
+def _event(i):
+    return CanonicalEvent(
+        meta=CanonicalMeta(tenant="t1", trace_id=f"trace-{i}"),
+        source=CanonicalSource(system="salesforce", connection_id="conn-1"),
+        entity="account",
+        data=CanonicalAccount(account_id=f"A-{i}", name=f"Account {i}", extras={"rank": i}),
+    )
+
+
+# ======================================================================
+# Round trip
+# ======================================================================
+class TestRoundTrip:
+    @pytest.mark.parametrize("codec", supported_codecs())
+    def test_random_payloads_round_trip(self, codec):
+        rng = random.Random(39)
+        for trial in range(200):
+            payloads = _payloads(rng, rng.randrange(1, 60))
+            max_events = rng.choice([1, 3, 500])
+            entries = encode_entries(
+                payloads, codec, batch_id="b",
+                max_entry_bytes=rng.choice([64, 2048, 256 * 1024]), max_events=max_events,
+            )
+            decoded = [event for fields in entries for event in decode_entry(fields)]
+            assert decoded == json.loads(json.dumps(payloads)), trial
+            if codec != CODEC_JSON:
+                assert all(int(f["n"]) <= max_events for f in entries)
+
+    def test_batches_by_size(self):
+        payloads = [{"blob": "x" * 1000, "i": i} for i in range(100)]
+        entries = encode_entries(payloads, CODEC_JSON_ZLIB, max_entry_bytes=10_000)
+        assert 10 <= len(entries) <= 12
+        assert sum(int(f["n"]) for f in entries) == 100
+
+    @pytest.mark.skipif(CODEC_MSGPACK not in supported_codecs(), reason="msgpack not installed")
+    def test_out_of_range_int_falls_back_to_json(self):
+        payloads = [{"i": 1}, {"i": 2**70}, {"i": 3}]
+        entries = encode_entries(payloads, CODEC_MSGPACK)
+        assert [f["codec"] for f in entries] == [CODEC_MSGPACK, CODEC_JSON_ZLIB, CODEC_MSGPACK]
+        assert [e for f in entries for e in decode_entry(f)] == payloads
+
+    def test_legacy_entries_decode(self):
+        assert decode_entry({b"payload": b'{"a": 1}'}) == [{"a": 1}]
+        assert decode_entry({"payload": '{"a": 1}'}) == [{"a": 1}]
+
+    @pytest.mark.parametrize("override, message", [
+        ({"v": "2"}, "newer"),
+        ({"schema": "other.v1"}, "schema"),
+        ({"codec": "zstd"}, "codec"),
+        ({"n": "7"}, "declares"),
+        ({"data": b"not zlib"}, "Corrupt"),
+    ])
+    def test_rejects_unknown_envelopes(self, override, message):
+        fields = encode_entries([{"a": 1}], CODEC_JSON_ZLIB)[0]
+        fields.update(override)
+        with pytest.raises(EnvelopeError, match=message):
+            decode_entry(fields)
+
+
+# ======================================================================
+# Publisher / subscriber over Redis
+# ======================================================================
+class TestStreams:
+    def test_mixed_stream_reads_in_order(self):
+        redis = fakeredis.FakeRedis()
+        legacy = CanonicalEventPublisher(redis, tenant_id="t1")
+        assert legacy.codec == CODEC_JSON
+        legacy.publish_batch([_event(i) for i in range(3)], source_id="salesforce")
+
+        advertise_decoders(redis, "dcl")
+        batched = CanonicalEventPublisher(redis, tenant_id="t1", max_events_per_entry=4)
+        assert batched.codec == supported_codecs()[0]
+        ids = batched.publish_batch([_event(i) for i in range(3, 13)], source_id="salesforce")
+        batched.publish(_event(13), source_id="salesforce")
+        redis.xadd(STREAM, {"v": "9", "schema": "x", "codec": "x", "data": b""})
+
+        assert len(ids) == 3
+        assert redis.xlen(STREAM) == 3 + 3 + 1 + 1
+
+        events, last_id = read_canonical_stream(redis, STREAM, count=5)
+        more, last_id = read_canonical_stream(redis, STREAM, last_id=last_id, count=100)
+        assert [e["event"]["data"]["account_id"] for e in events + more] == [f"A-{i}" for i in range(14)]
+        assert read_canonical_stream(redis, STREAM, last_id=last_id) == ([], last_id)
+
+    def test_decoding_client_keeps_legacy_json(self):
+        redis = fakeredis.FakeRedis(decode_responses=True)
+        read_canonical_stream(redis, STREAM, consumer="dcl")
+        assert redis.get(DECODERS_KEY_PREFIX + "dcl") == CODEC_JSON
+        assert redis.sismember(CONSUMERS_KEY, "dcl")
+
+        publisher = CanonicalEventPublisher(redis, tenant_id="t1")
+        publisher.publish_batch([_event(i) for i in range(3)], source_id="salesforce")
+        events, _ = read_canonical_stream(redis, STREAM, consumer="dcl")
+        assert publisher.codec == CODEC_JSON
+        assert [e["event"]["data"]["account_id"] for e in events] == ["A-0", "A-1", "A-2"]
+
+    def test_negotiation_uses_common_codec(self):
+        redis = fakeredis.FakeRedis()
+        assert negotiate_codec(redis) == CODEC_JSON
+
+        advertise_decoders(redis, "dcl")
+        assert negotiate_codec(redis) == supported_codecs()[0]
+
+        advertise_decoders(redis, "old-consumer", [CODEC_JSON, CODEC_JSON_ZLIB])
+        assert negotiate_codec(redis) == CODEC_JSON_ZLIB
+
+        advertise_decoders(redis, "legacy", [CODEC_JSON])
+        publisher = CanonicalEventPublisher(redis, tenant_id="t1")
+        assert publisher.codec == CODEC_JSON
+        unregister_consumer(redis, "legacy")
+        assert publisher.codec == CODEC_JSON
+        publisher.new_batch()
+        assert publisher.codec == CODEC_JSON_ZLIB
+
+    def test_every_registered_consumer_must_opt_in(self):
+        redis = fakeredis.FakeRedis()
+        register_consumer(redis, "legacy-reader")
+        advertise_decoders(redis, "dcl")
+        assert negotiate_codec(redis) == CODEC_JSON
+
+        advertise_decoders(redis, "legacy-reader", [CODEC_JSON, CODEC_JSON_ZLIB])
+        assert negotiate_codec(redis) == CODEC_JSON_ZLIB
+
+        withdraw_decoders(redis, "legacy-reader")
+        assert negotiate_codec(redis) == CODEC_JSON
+
+    def test_advertisements_expire(self):
+        redis = fakeredis.FakeRedis()
+        advertise_decoders(redis, "dcl", ttl_seconds=30)
+        assert 0 < redis.ttl(DECODERS_KEY_PREFIX + "dcl") <= 30
+        assert negotiate_codec(redis) == supported_codecs()[0]
+
+        # A consumer that stopped heartbeating is still registered
+        redis.delete(DECODERS_KEY_PREFIX + "dcl")
+        assert negotiate_codec(redis) == CODEC_JSON
+        advertise_decoders(redis, "dcl")
+        assert negotiate_codec(redis) == supported_codecs()[0]
+
+    def test_undecodable_entries_are_skipped(self, caplog):
+        entries = [
+            ("1-0", {"payload": '{"a": 1}'}),
+            ("2-0", {"v": "1", "schema": "aam.canonical_event.v1", "codec": "nope", "data": b""}),
+            ("3-0", encode_entries([{"a": 2}, {"a": 3}], CODEC_JSON_ZLIB)[0]),
+        ]
+        assert decode_stream_entries(entries) == [{"a": 1}, {"a": 2}, {"a": 3}]
+        assert "2-0" in caplog.text
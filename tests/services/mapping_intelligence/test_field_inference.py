@@ -0,0 +1,225 @@
+"""
+Tests for cached, batched RAG field inference.
+
+The original per-call rule heuristics are reproduced below; the compiled
+rule index must make the same decision for every field name, through both
+the single-field and the chunked API.
+"""
+
+import random
+
+from services.mapping_intelligence.field_inference import (
+    METHOD_EXACT,
+    METHOD_FALLBACK,
+    METHOD_PARTIAL,
+    METHOD_VECTOR,
+    FieldInferenceEngine,
+)
+from services.mapping_intelligence.rag_service import RAGService
+
+
+# ======================================================================
+# Reference (the original RAGService rule logic)
+# ======================================================================
+def ref_infer(source_field):
+    normalized = source_field.lower().replace('-', '_').replace(' ', '_')
+    field_mappings = {
+        'id': 'id', 'name': 'name', 'email': 'email', 'phone': 'phone', 'amount': 'amount',
+        'value': 'amount', 'stage': 'stage', 'status': 'status', 'created': 'created_at',
+        'createdat': 'created_at', 'created_date': 'created_at', 'updated': 'updated_at',
+        'updatedat': 'updated_at', 'updated_date': 'updated_at', 'owner': 'owner_id',
+        'ownerid': 'owner_id', 'close_date': 'close_date', 'closedate': 'close_date',
+    }
+    if normalized in field_mappings:
+        return field_mappings[normalized]
+    for key, value in field_mappings.items():
+        if key in normalized:
+            return value
+    return normalized
+
+
+def ref_confidence(source_field, canonical_field):
+    source_normalized = source_field.lower().replace('-', '_').replace(' ', '_')
+    if source_normalized == canonical_field:
+        return 0.95
+    if canonical_field in source_normalized or source_normalized in canonical_field:
+        return 0.75
+    if source_normalized.replace('_', '') == canonical_field.replace('_', ''):
+        return 0.80
+    return 0.50
+
+
+FRAGMENTS = [
+    "id", "Id", "ID", "name", "Name", "email", "E-mail", "phone", "amount", "value", "stage", "status",
+    "created", "CreatedAt", "created date", "Updated", "updatedat", "updated-date", "owner", "OwnerId",
+    "close date", "closeDate", "account", "acct", "total", "paid", "billing", "city", "zip", "x", "",
+]
+
+
+def field_names(n=4000, seed=46):
+    rng = random.Random(seed)
+    names = {
+        "Id", "Name", "CreatedDate", "created_date", "Close Date", "close-date", "Amount", "Owner Id",
+        "paid_amount", "stage_name", "status_id", "LastModifiedDate", "zip", "Deal Value", "", "ID",
+    }
+    separators = ["_", "-", " ", ""]
+    while len(names) < n:
+        parts = rng.sample(FRAGMENTS, rng.randint(1, 3))
+        names.add(rng.choice(separators).join(parts))
+    return sorted(names)
+
+
+class StubEmbedder:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise ConnectionError("embedding service down")
+        return [[float(len(text))] for text in texts]
+
+
+class StubVectorIndex:
+    """Scores fields by a lookup table on the embedded text."""
+
+    version = "v1"
+
+    def __init__(self, embedder, neighbours):
+        self.embedder = embedder
+        self.neighbours = neighbours
+        self.calls = 0
+
+    async def search(self, vectors, top_k=1):
+        self.calls += 1
+        texts = self.embedder.calls[-1]
+        return [[self.neighbours[text]] if text in self.neighbours else [] for text in texts]
+
+
+def ctx(connector="salesforce", entity="opportunity"):
+    return {"connector_name": connector, "canonical_entity": entity, "tenant_id": "t1"}
+
+
+# ======================================================================
+# Accuracy equivalence
+# ======================================================================
+class TestRuleEquivalence:
+    async def test_single_field_api_matches_original_rules(self):
+        service = RAGService(engine=FieldInferenceEngine())
+        for name in field_names():
+            proposal = await service.get_mapping_proposal(name, ctx())
+            expected = ref_infer(name)
+            assert proposal.canonical_field == expected, name
+            assert proposal.confidence_score == ref_confidence(name, expected), name
+            assert proposal.semantic_similarity == proposal.confidence_score
+            assert proposal.mapping_method == "semantic_similarity"
+            assert proposal.reasoning
+
+    async def test_chunked_api_matches_original_rules(self):
+        service = RAGService(engine=FieldInferenceEngine())
+        names = field_names()
+        rng = random.Random(1)
+        fields = [(name, ctx(connector=rng.choice(["sf", "hubspot"]))) for name in names]
+
+        for start in range(0, len(fields), 500):
+            proposals = await service.get_mapping_proposals(fields[start:start + 500])
+            for (name, _), proposal in zip(fields[start:start + 500], proposals):
+                assert (proposal.canonical_field, proposal.confidence_score) == (
+                    ref_infer(name), ref_confidence(name, ref_infer(name))
+                ), name
+
+    def test_partial_aliases_match_inside_words(self):
+        rules = FieldInferenceEngine().rules
+        # Aliases match anywhere in the name, not only as whole tokens
+        assert rules.resolve("accountid") == rules.resolve("account_id")
+        assert rules.resolve("is_valid").canonical_field == "id"
+        assert rules.resolve("dealvalue").matched == "value"
+        # The first alias in FIELD_MAPPINGS order wins, not the longest
+        assert rules.resolve("owner_name").matched == "name"
+
+    def test_legacy_helpers_still_available(self):
+        service = RAGService(engine=FieldInferenceEngine())
+        assert service._infer_canonical_field("Close-Date", "opportunity") == "close_date"
+        assert service._calculate_confidence("Close-Date", "close_date") == 0.95
+
+
+# ======================================================================
+# Decision cache
+# ======================================================================
+class TestDecisionCache:
+    async def test_repeated_schemas_hit_cache(self):
+        engine = FieldInferenceEngine()
+        keys = [("sf", "opportunity", name) for name in ["Id", "Amount", "CloseDate_Utc", "Region"]]
+
+        first = await engine.infer(keys * 3)
+        assert engine.stats["rule_resolved"] == 3 and engine.stats["fallback"] == 1
+        second = await engine.infer(keys)
+
+        assert second == first[:4]
+        assert engine.stats["cache_hits"] == 4
+        assert [d.method for d in second] == [METHOD_EXACT, METHOD_EXACT, METHOD_PARTIAL, METHOD_FALLBACK]
+
+    async def test_version_stamp_invalidates(self):
+        embedder = StubEmbedder()
+        index = StubVectorIndex(embedder, {"opportunity region": ("territory", 0.9)})
+        engine = FieldInferenceEngine(embedder=embedder, vector_index=index)
+        key = [("sf", "opportunity", "Region")]
+
+        await engine.infer(key)
+        await engine.infer(key)
+        assert len(embedder.calls) == 1
+
+        index.version = "v2"
+        await engine.infer(key)
+        assert len(embedder.calls) == 2
+
+        engine.invalidate()
+        await engine.infer(key)
+        assert len(embedder.calls) == 3
+
+    async def test_cache_is_bounded(self):
+        engine = FieldInferenceEngine(cache_size=10)
+        await engine.infer([("sf", "account", f"field_{i}") for i in range(25)])
+        assert len(engine._cache) == 10
+
+
+# ======================================================================
+# Batched vector stage
+# ======================================================================
+class TestVectorBatching:
+    async def test_one_embedding_and_search_call_per_chunk(self):
+        embedder = StubEmbedder()
+        index = StubVectorIndex(embedder, {
+            "opportunity region": ("territory", 0.92),
+            "opportunity forecast_category": ("forecast_category", 0.85),
+            "opportunity probability_pct": ("probability", 0.6),
+        })
+        engine = FieldInferenceEngine(embedder=embedder, vector_index=index, min_similarity=0.8)
+        names = ["Id", "Region", "Forecast Category", "Probability-Pct", "Amount", "Region"] * 20
+        keys = [("sf", "opportunity", name) for name in names]
+
+        decisions = await engine.infer(keys)
+
+        assert index.calls == 1
+        assert embedder.calls == [["opportunity region", "opportunity forecast_category", "opportunity probability_pct"]]
+        by_name = dict(zip(names, decisions))
+        assert (by_name["Region"].canonical_field, by_name["Region"].method) == ("territory", METHOD_VECTOR)
+        assert by_name["Region"].confidence_score == 0.92
+        assert by_name["Forecast Category"].canonical_field == "forecast_category"
+        # Below the similarity threshold: original rule fallback
+        assert (by_name["Probability-Pct"].canonical_field, by_name["Probability-Pct"].method) == (
+            "probability_pct", METHOD_FALLBACK
+        )
+        assert by_name["Id"].method == METHOD_EXACT
+
+    async def test_vector_failure_falls_back_without_caching(self):
+        embedder = StubEmbedder(fail=True)
+        engine = FieldInferenceEngine(embedder=embedder, vector_index=StubVectorIndex(embedder, {}))
+        key = [("sf", "opportunity", "Region")]
+
+        [decision] = await engine.infer(key)
+        assert (decision.canonical_field, decision.confidence_score) == ("region", 0.95)
+
+        await engine.infer(key)
+        assert len(embedder.calls) == 2
@@ -0,0 +1,246 @@
+"""
+Tests for the indexed bulk mapping job registry.
+
+The registry hash and its start-time / per-status indexes are written in
+one MULTI, so after any interleaving of concurrent writers every index must
+agree exactly with the stored job states. Reads and reconciliation must not
+use KEYS.
+"""
+
+import json
+import random
+import threading
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+
+from services.mapping_intelligence.job_state import JOB_STATUSES, BulkMappingJobState
+from services.mapping_intelligence.reconciliation import JobReconciliationService
+from services.mapping_intelligence.resource_monitor import ResourceMonitor
+
+
+@pytest.fixture
+def redis_client():
+    client = fakeredis.FakeRedis(decode_responses=True)
+
+    def no_keys(*args, **kwargs):
+        raise AssertionError("KEYS must not be used")
+
+    client.keys = no_keys
+    return client
+
+
+def new_job(job_state, tenant_id, job_id, started_minutes_ago=None, status="pending"):
+    now = datetime.utcnow()
+    state = {
+        "job_id": job_id,
+        "tenant_id": tenant_id,
+        "status": status,
+        "created_at": now.isoformat(),
+        "started_at": None,
+        "processed_fields": 0,
+        "total_fields": 0,
+    }
+    if started_minutes_ago is not None:
+        state["started_at"] = (now - timedelta(minutes=started_minutes_ago)).isoformat()
+    job_state.save_job_state(tenant_id, job_id, state)
+
+
+def assert_indexes_consistent(redis_client, job_state, tenant_id):
+    stored = {
+        job_id: json.loads(data)
+        for job_id, data in redis_client.hgetall(job_state._get_registry_key(tenant_id)).items()
+    }
+    assert set(redis_client.zrange(job_state._get_started_index_key(tenant_id), 0, -1)) == set(stored)
+    for status in JOB_STATUSES:
+        indexed = set(redis_client.zrange(job_state._get_status_index_key(tenant_id, status), 0, -1))
+        expected = {job_id for job_id, state in stored.items() if state["status"] == status}
+        assert indexed == expected, status
+
+
+# ======================================================================
+# Registry and indexes
+# ======================================================================
+class TestJobRegistry:
+    def test_concurrent_writers_keep_indexes_consistent(self, redis_client):
+        tenants = ["t1", "t2"]
+        job_ids = [f"job-{i}" for i in range(120)]
+        errors = []
+
+        def writer(seed):
+            rng = random.Random(seed)
+            job_state = BulkMappingJobState(redis_client)
+            try:
+                for _ in range(150):
+                    tenant_id, job_id = rng.choice(tenants), rng.choice(job_ids)
+                    op = rng.random()
+                    if op < 0.25:
+                        new_job(job_state, tenant_id, job_id, started_minutes_ago=rng.randrange(60))
+                    elif op < 0.55:
+                        job_state.update_status(tenant_id, job_id, rng.choice(JOB_STATUSES))
+                    elif op < 0.7:
+                        job_state.update_progress(tenant_id, job_id, rng.randrange(10), 10)
+                    elif op < 0.85:
+                        job_state.set_error(tenant_id, job_id, "boom")
+                    else:
+                        job_state.delete_job_state(tenant_id, job_id)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        job_state = BulkMappingJobState(redis_client)
+        for tenant_id in tenants:
+            assert_indexes_consistent(redis_client, job_state, tenant_id)
+            listed = job_state.get_all_jobs_for_tenant(tenant_id)
+            assert len(listed) == redis_client.hlen(job_state._get_registry_key(tenant_id))
+            counts = job_state.count_jobs_by_status(tenant_id)
+            assert sum(counts.values()) == len(listed)
+
+    def test_jobs_listed_newest_first_with_limit(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        for minutes in (30, 5, 60, 1):
+            new_job(job_state, "t1", f"job-{minutes}", started_minutes_ago=minutes, status="running")
+
+        listed = job_state.get_all_jobs_for_tenant("t1", limit=3)
+        assert [job["job_id"] for job in listed] == ["job-1", "job-5", "job-30"]
+        assert job_state.get_all_jobs_for_tenant("t2") == []
+
+    def test_delete_removes_index_entries(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        new_job(job_state, "t1", "job-1")
+        job_state.update_status("t1", "job-1", "running")
+        job_state.delete_job_state("t1", "job-1")
+
+        assert job_state.get_job_state("t1", "job-1") is None
+        assert job_state.count_jobs_by_status("t1") == {status: 0 for status in JOB_STATUSES}
+        assert_indexes_consistent(redis_client, job_state, "t1")
+
+    def test_legacy_key_is_read_and_migrated(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        legacy_key = job_state._get_job_key("t1", "old-job")
+        redis_client.setex(legacy_key, 86400, json.dumps({"job_id": "old-job", "status": "running"}))
+
+        assert job_state.get_job_state("t1", "old-job")["status"] == "running"
+        job_state.update_status("t1", "old-job", "completed")
+
+        assert not redis_client.exists(legacy_key)
+        assert job_state.get_job_state("t1", "old-job")["status"] == "completed"
+        assert_indexes_consistent(redis_client, job_state, "t1")
+
+    def test_legacy_keys_backfilled_into_index_once(self, redis_client):
+        legacy = "job:state:tenant:t1:job:old-running"
+        redis_client.set(legacy, json.dumps({"job_id": "old-running", "status": "running"}))
+        redis_client.set(
+            "job:state:tenant:t1:job:old-done",
+            json.dumps({"job_id": "old-done", "status": "completed"}),
+        )
+
+        job_state = BulkMappingJobState(redis_client)
+
+        assert {job["job_id"] for job in job_state.get_all_jobs_for_tenant("t1")} == {"old-running", "old-done"}
+        assert [job["job_id"] for job in job_state.get_jobs_by_status("t1", ["running"])] == ["old-running"]
+        assert not redis_client.exists(legacy)
+        assert_indexes_consistent(redis_client, job_state, "t1")
+        # Already done for this Redis; a later legacy key is left to the read path
+        redis_client.set(legacy, json.dumps({"job_id": "old-running", "status": "failed"}))
+        assert BulkMappingJobState(redis_client).backfill_index() == 0
+        assert job_state.get_job_state("t1", "old-running")["status"] == "running"
+
+    def test_stale_index_entries_are_dropped_on_read(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        new_job(job_state, "t1", "job-1", status="running")
+        # Written behind the registry's back
+        redis_client.hset(job_state._get_registry_key("t1"), "job-1", json.dumps({"job_id": "job-1", "status": "failed"}))
+
+        assert job_state.get_jobs_by_status("t1", ["running"]) == []
+        assert redis_client.zcard(job_state._get_status_index_key("t1", "running")) == 0
+
+    def test_prune_expired_terminal_jobs(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        new_job(job_state, "t1", "old-done", started_minutes_ago=26 * 60, status="completed")
+        new_job(job_state, "t1", "old-running", started_minutes_ago=26 * 60, status="running")
+        new_job(job_state, "t1", "recent-done", started_minutes_ago=5, status="completed")
+        assert job_state.prune_expired_jobs("t1") == 0
+
+        # Everything terminal written before a minute from now has expired
+        assert job_state.prune_expired_jobs("t1", retention_seconds=-60) == 2
+        assert {job["job_id"] for job in job_state.get_all_jobs_for_tenant("t1")} == {"old-running"}
+        assert_indexes_consistent(redis_client, job_state, "t1")
+
+    def test_long_running_job_is_kept_after_completing(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        new_job(job_state, "t1", "marathon", started_minutes_ago=30 * 60, status="running")
+
+        job_state.update_status("t1", "marathon", "completed")
+
+        state = job_state.get_job_state("t1", "marathon")
+        assert state is not None and state["status"] == "completed"
+        assert job_state.prune_expired_jobs("t1") == 0
+        assert_indexes_consistent(redis_client, job_state, "t1")
+
+
+# ======================================================================
+# Reconciliation
+# ======================================================================
+class TestReconciliation:
+    def test_stale_detection_and_cleanup(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        new_job(job_state, "t1", "stale", started_minutes_ago=45, status="running")
+        new_job(job_state, "t1", "fresh", started_minutes_ago=10, status="running")
+        new_job(job_state, "t1", "old-pending", status="pending")
+        new_job(job_state, "t1", "old-done", started_minutes_ago=90, status="completed")
+
+        service = JobReconciliationService(redis_client)
+        stale = service.detect_stale_jobs("t1")
+        assert [job["job_id"] for job in stale] == ["stale"]
+        assert stale[0]["elapsed_minutes"] >= 45
+
+        result = service.cleanup_stale_jobs("t1")
+        assert result["jobs_failed"] == 1
+        assert job_state.get_job_state("t1", "stale")["status"] == "failed"
+        assert service.detect_stale_jobs("t1") == []
+        assert_indexes_consistent(redis_client, job_state, "t1")
+
+    def test_reconcile_semaphores_counts_active_jobs(self, redis_client):
+        job_state = BulkMappingJobState(redis_client)
+        new_job(job_state, "t1", "a", status="running", started_minutes_ago=1)
+        new_job(job_state, "t1", "b", status="pending")
+        new_job(job_state, "t1", "c", status="completed", started_minutes_ago=1)
+        redis_client.set(job_state._get_semaphore_key("t1"), 5)
+
+        result = JobReconciliationService(redis_client).reconcile_semaphores("t1")
+
+        assert result["actual_count"] == 2
+        assert sorted(result["running_jobs"]) == ["a", "b"]
+        assert job_state.get_active_job_count("t1") == 2
+
+    def test_reconcile_semaphores_counts_legacy_jobs(self, redis_client):
+        for job_id in ("a", "b"):
+            redis_client.set(
+                f"job:state:tenant:t1:job:{job_id}", json.dumps({"job_id": job_id, "status": "running"})
+            )
+        redis_client.set("job:semaphore:tenant:t1", 2)
+
+        result = JobReconciliationService(redis_client).reconcile_semaphores("t1")
+
+        assert result["actual_count"] == 2
+        assert not result["reconciled"]
+
+    def test_tenant_metrics_summary_uses_index(self, redis_client):
+        monitor = ResourceMonitor(redis_client)
+        monitor.record_job_metrics("t1", "job-1", {"cpu_percent": 10, "memory_rss_mb": 100})
+        monitor.record_job_metrics("t1", "job-2", {"cpu_percent": 30, "memory_rss_mb": 300})
+        monitor.record_job_metrics("t2", "job-3", {"cpu_percent": 90, "memory_rss_mb": 900})
+        # Metrics key expired before the index entry
+        redis_client.delete("job:metrics:tenant:t1:job:job-2")
+
+        summary = monitor.get_tenant_metrics_summary("t1")
+        assert summary["job_count"] == 1
+        assert summary["avg_cpu_percent"] == 10
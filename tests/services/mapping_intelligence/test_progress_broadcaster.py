@@ -0,0 +1,242 @@
+"""
+Tests for bulk mapping progress broadcasting.
+
+Publishers are rate limited and coalesce per job, the last update is kept
+as a snapshot for late joiners, and async listeners share one pub/sub
+connection without blocking the event loop (checked with 1,000 concurrent
+job listeners on fakeredis).
+"""
+
+import asyncio
+import json
+import time
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from services.mapping_intelligence.progress_broadcaster import (
+    ProgressBroadcaster,
+    ProgressChannel,
+    ProgressSubscription,
+)
+
+LOOP_LAG_BOUND_SECONDS = 0.1
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def broadcaster(server):
+    broadcaster = ProgressBroadcaster(
+        redis_client=fakeredis.FakeRedis(server=server, decode_responses=True),
+        async_redis_client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+        min_publish_interval=0.5,
+        listener_min_interval=0.0,
+    )
+    yield broadcaster
+
+
+class LoopLagProbe:
+    """Measures how late a 10ms periodic timer fires on the running loop."""
+
+    def __init__(self, period: float = 0.01):
+        self.period = period
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.period
+            await asyncio.sleep(self.period)
+            self.max_lag = max(self.max_lag, loop.time() - expected)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+# ======================================================================
+# Publishing
+# ======================================================================
+class TestPublishing:
+    def test_updates_within_interval_are_coalesced(self, broadcaster):
+        assert broadcaster.publish_progress("t1", "j1", 1, 100, "running")
+        for processed in range(2, 50):
+            assert not broadcaster.publish_progress("t1", "j1", processed, 100, "running")
+
+        assert broadcaster.stats == {"published": 1, "coalesced": 48}
+        assert broadcaster.get_snapshot("t1", "j1")["processed"] == 1
+        assert broadcaster.flush("t1", "j1") == 1
+        assert broadcaster.get_snapshot("t1", "j1")["processed"] == 49
+        assert broadcaster.flush() == 0
+
+    def test_held_back_update_is_sent_when_window_closes(self, server):
+        broadcaster = ProgressBroadcaster(
+            redis_client=fakeredis.FakeRedis(server=server, decode_responses=True), min_publish_interval=0.05
+        )
+        broadcaster.publish_progress("t1", "j1", 1, 10, "running")
+        broadcaster.publish_progress("t1", "j1", 2, 10, "running")
+        broadcaster.publish_progress("t1", "j1", 3, 10, "running")
+
+        deadline = time.monotonic() + 2
+        while broadcaster.stats["published"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert broadcaster.get_snapshot("t1", "j1")["processed"] == 3
+        assert broadcaster.stats == {"published": 2, "coalesced": 2}
+        assert broadcaster.flush() == 0
+
+    def test_trailing_send_is_superseded_by_terminal(self, server):
+        broadcaster = ProgressBroadcaster(
+            redis_client=fakeredis.FakeRedis(server=server, decode_responses=True), min_publish_interval=0.05
+        )
+        broadcaster.publish_progress("t1", "j1", 1, 10, "running")
+        broadcaster.publish_progress("t1", "j1", 5, 10, "running")
+        broadcaster.publish_progress("t1", "j1", 10, 10, "completed")
+
+        time.sleep(0.15)
+        assert broadcaster.get_snapshot("t1", "j1")["status"] == "completed"
+        assert broadcaster.stats["published"] == 2
+
+    def test_terminal_status_is_never_held_back(self, broadcaster):
+        broadcaster.publish_progress("t1", "j1", 1, 2, "running")
+        assert broadcaster.publish_progress("t1", "j1", 2, 2, "completed")
+        snapshot = broadcaster.get_snapshot("t1", "j1")
+        assert snapshot["status"] == "completed"
+        assert snapshot["progress_percentage"] == 100
+
+    def test_jobs_are_rate_limited_independently(self, broadcaster):
+        assert broadcaster.publish_progress("t1", "j1", 1, 10, "running")
+        assert broadcaster.publish_progress("t1", "j2", 1, 10, "running")
+        assert broadcaster.publish_progress("t2", "j1", 1, 10, "running")
+
+    def test_sync_subscriptions_are_private(self, broadcaster):
+        first = broadcaster.subscribe_to_job("t1", "j1")
+        second = broadcaster.subscribe_to_job("t1", "j2")
+        assert first is not second
+        broadcaster.unsubscribe_from_job("t1", "j1")
+        broadcaster.publish_progress("t1", "j2", 1, 10, "running")
+        messages = [second.get_message(timeout=0.1) for _ in range(2)]
+        assert json.loads(messages[-1]["data"])["job_id"] == "j2"
+
+
+# ======================================================================
+# Listening
+# ======================================================================
+class TestListening:
+    async def test_late_joiner_gets_snapshot_then_live_updates(self, broadcaster):
+        broadcaster.publish_progress("t1", "j1", 40, 100, "running")
+        received = []
+
+        async def on_update(data):
+            received.append((data["processed"], data["status"]))
+
+        listener = asyncio.create_task(broadcaster.listen_for_updates("t1", "j1", on_update))
+        await asyncio.sleep(0.05)
+        broadcaster.publish_progress("t1", "j1", 60, 100, "running", force=True)
+        await asyncio.sleep(0.05)
+        broadcaster.publish_progress("t1", "j1", 100, 100, "completed")
+        await asyncio.wait_for(listener, 2)
+
+        assert received == [(40, "running"), (60, "running"), (100, "completed")]
+        assert broadcaster._channel.listener_count == 0
+        await broadcaster.close()
+
+    async def test_listener_stops_on_terminal_even_if_callback_fails(self, broadcaster):
+        broadcaster.publish_progress("t1", "j1", 5, 5, "failed")
+
+        async def on_update(data):
+            raise RuntimeError("client went away")
+
+        await asyncio.wait_for(broadcaster.listen_for_updates("t1", "j1", on_update), 2)
+        await broadcaster.close()
+
+    async def test_reconnect_replays_snapshots(self, broadcaster):
+        channel = ProgressChannel(broadcaster.async_redis_client, min_interval=0.0)
+        subscription = await channel.subscribe("t1", "j1")
+        # Stop reading, as if the connection dropped; the update is missed live
+        channel._reader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await channel._reader
+        broadcaster.publish_progress("t1", "j1", 7, 10, "running")
+
+        await channel._resubscribe()
+
+        assert (await asyncio.wait_for(subscription.get(), 1))["processed"] == 7
+        await channel.close()
+
+    async def test_slow_listener_skips_to_latest(self):
+        subscription = ProgressSubscription("c", min_interval=0.0)
+        for seq in range(1, 6):
+            subscription.offer({"seq": seq, "status": "running"})
+        subscription.offer({"seq": 3, "status": "running"})
+
+        assert (await subscription.get())["seq"] == 5
+        assert subscription.skipped == 4
+
+    async def test_listener_rate_limit_does_not_delay_terminal(self):
+        subscription = ProgressSubscription("c", min_interval=10.0)
+        subscription.offer({"seq": 1, "status": "running"})
+        await subscription.get()
+        subscription.offer({"seq": 2, "status": "running"})
+        subscription.offer({"seq": 3, "status": "completed"})
+
+        data = await asyncio.wait_for(subscription.get(), 1)
+        assert data["status"] == "completed"
+        assert await subscription.get() is None
+
+    async def test_thousand_listeners_keep_loop_responsive(self, server):
+        jobs = 1000
+        publisher = ProgressBroadcaster(
+            redis_client=fakeredis.FakeRedis(server=server, decode_responses=True), min_publish_interval=0.0
+        )
+        channel = ProgressChannel(fakeredis.aioredis.FakeRedis(server=server, decode_responses=True), min_interval=0.05)
+        for job in range(0, jobs, 2):
+            publisher.publish_progress("t1", f"job-{job}", 1, 20, "running")
+        probe = LoopLagProbe().start()
+
+        finals = {}
+
+        async def listen(job_id):
+            subscription = await channel.subscribe("t1", job_id)
+            try:
+                async for data in subscription:
+                    finals[job_id] = data
+            finally:
+                await channel.unsubscribe(subscription)
+
+        listeners = [asyncio.create_task(listen(f"job-{job}")) for job in range(jobs)]
+        while channel.listener_count < jobs:
+            await asyncio.sleep(0.01)
+
+        def run_jobs():
+            # Publishers live in mapping workers, not on the listeners' loop
+            for processed in range(2, 20):
+                for job in range(jobs):
+                    publisher.publish_progress("t1", f"job-{job}", processed, 20, "running")
+            for job in range(jobs):
+                publisher.publish_progress("t1", f"job-{job}", 20, 20, "completed")
+
+        start = time.perf_counter()
+        await asyncio.to_thread(run_jobs)
+        await asyncio.wait_for(asyncio.gather(*listeners), 30)
+        elapsed = time.perf_counter() - start
+
+        await probe.stop()
+        await channel.close()
+
+        assert len(finals) == jobs
+        assert all(data["status"] == "completed" and data["processed"] == 20 for data in finals.values())
+        assert channel.listener_count == 0
+        assert probe.max_lag < LOOP_LAG_BOUND_SECONDS, (probe.max_lag, elapsed)
@@ -0,0 +1,212 @@
+"""
+Tests for the background resource sampler and admission control.
+
+psutil is replaced by a scripted fake and the sampler clock is injected, so
+smoothing and hysteresis are checked deterministically.
+"""
+
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from services.mapping_intelligence.resource_monitor import AdmissionController, ResourceMonitor, ResourceSampler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProcess:
+    def __init__(self, psutil):
+        self.psutil = psutil
+
+    def cpu_percent(self, interval=None):
+        assert interval is None, "sampling must not block"
+        return self.psutil.process_cpu
+
+    def memory_info(self):
+        return SimpleNamespace(rss=256 * 1024 * 1024, vms=512 * 1024 * 1024)
+
+    def memory_percent(self):
+        return 3.0
+
+    def num_threads(self):
+        return 7
+
+
+class FakePsutil:
+    """Scripted system readings; set .cpu / .memory before each sample."""
+
+    def __init__(self, cpu=10.0, memory=40.0):
+        self.cpu = cpu
+        self.memory = memory
+        self.process_cpu = 5.0
+        self.cpu_calls = 0
+
+    def Process(self):
+        return FakeProcess(self)
+
+    def cpu_percent(self, interval=None):
+        assert interval is None, "sampling must not block"
+        self.cpu_calls += 1
+        return self.cpu
+
+    def virtual_memory(self):
+        return SimpleNamespace(percent=self.memory, available=(100 - self.memory) * 1024 * 1024)
+
+
+@pytest.fixture
+def fake():
+    return FakePsutil()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sampler(fake, clock):
+    return ResourceSampler(interval=1.0, smoothing_seconds=5.0, psutil_module=fake, clock=clock)
+
+
+def feed(sampler, fake, clock, cpu, seconds=1, memory=None):
+    """Sample once per second for `seconds` at the given readings."""
+    fake.cpu = cpu
+    if memory is not None:
+        fake.memory = memory
+    for _ in range(seconds):
+        clock.now += 1
+        sampler.sample()
+
+
+# ======================================================================
+# Sampling
+# ======================================================================
+class TestResourceSampler:
+    def test_first_sample_is_taken_as_is(self, sampler, fake, clock):
+        feed(sampler, fake, clock, cpu=30, memory=50)
+        snapshot = sampler.snapshot
+        assert snapshot.system_cpu_percent == 30
+        assert snapshot.system_memory_percent == 50
+        assert snapshot.memory_rss_mb == 256
+        assert snapshot.num_threads == 7
+        assert snapshot.samples == 1
+
+    def test_time_weighted_smoothing(self, sampler, fake, clock):
+        feed(sampler, fake, clock, cpu=0)
+        feed(sampler, fake, clock, cpu=100)
+        # weight for 1s with a 5s time constant
+        assert sampler.snapshot.system_cpu_percent == pytest.approx(100 * (1 - 2.718281828 ** -0.2), rel=1e-6)
+        feed(sampler, fake, clock, cpu=100, seconds=30)
+        assert sampler.snapshot.system_cpu_percent > 99
+
+    def test_age_follows_clock(self, sampler, fake, clock):
+        assert sampler.age() is None
+        feed(sampler, fake, clock, cpu=10)
+        clock.now += 3
+        assert sampler.age() == 3
+
+    def test_background_thread_samples_on_cadence(self, fake):
+        sampler = ResourceSampler(interval=0.01, psutil_module=fake).start()
+        try:
+            deadline = time.monotonic() + 2
+            while sampler.snapshot.samples < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            sampler.stop()
+        assert sampler.snapshot.samples >= 5
+
+
+# ======================================================================
+# Admission
+# ======================================================================
+class TestAdmissionController:
+    def test_single_spike_is_absorbed(self, sampler, fake, clock):
+        admission = AdmissionController(sampler)
+        feed(sampler, fake, clock, cpu=20, seconds=5)
+        feed(sampler, fake, clock, cpu=100)
+        assert admission.admit() == (True, "ok")
+
+    def test_hysteresis(self, sampler, fake, clock):
+        admission = AdmissionController(sampler, high_watermark=90, low_watermark=80)
+        feed(sampler, fake, clock, cpu=95, seconds=1)
+        assert admission.admit()[0] is False
+
+        # Between the watermarks: stays closed
+        feed(sampler, fake, clock, cpu=85, seconds=30)
+        assert admission.admit()[0] is False
+
+        feed(sampler, fake, clock, cpu=70, seconds=30)
+        assert admission.admit() == (True, "ok")
+
+        # Between the watermarks again: stays open
+        feed(sampler, fake, clock, cpu=88, seconds=30)
+        assert admission.admit()[0] is True
+
+    def test_decisions_do_not_flap_around_threshold(self, sampler, fake, clock):
+        admission = AdmissionController(sampler, high_watermark=90, low_watermark=80)
+        feed(sampler, fake, clock, cpu=89, seconds=20)
+        decisions = []
+        for i in range(200):
+            feed(sampler, fake, clock, cpu=80 if i % 2 else 100)
+            decisions.append(admission.admit()[0])
+        changes = sum(1 for a, b in zip(decisions, decisions[1:]) if a != b)
+        assert changes <= 1
+
+    def test_memory_pressure_closes_admission(self, sampler, fake, clock):
+        admission = AdmissionController(sampler)
+        feed(sampler, fake, clock, cpu=10, memory=97)
+        allowed, reason = admission.admit()
+        assert allowed is False
+        assert "memory 97.0%" in reason
+
+    def test_stale_snapshot_fails_open(self, sampler, fake, clock):
+        admission = AdmissionController(sampler, max_snapshot_age=10)
+        feed(sampler, fake, clock, cpu=100)
+        assert admission.admit()[0] is False
+        clock.now += 11
+        assert admission.admit() == (True, "no recent resource sample")
+
+    def test_invalid_watermarks(self, sampler):
+        with pytest.raises(ValueError):
+            AdmissionController(sampler, high_watermark=70, low_watermark=80)
+
+
+# ======================================================================
+# ResourceMonitor
+# ======================================================================
+class TestResourceMonitor:
+    def test_reads_do_not_block(self, sampler, fake, clock):
+        monitor = ResourceMonitor(fakeredis.FakeRedis(decode_responses=True), sampler=sampler)
+        feed(sampler, fake, clock, cpu=42)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            metrics = monitor.get_current_metrics()
+            assert monitor.check_resource_availability() is True
+        assert time.perf_counter() - start < 0.1
+        assert metrics["system_cpu_percent"] == 42
+        assert metrics["memory_rss_mb"] == 256
+
+    def test_metrics_sample_on_demand_before_first_tick(self, sampler, fake):
+        monitor = ResourceMonitor(fakeredis.FakeRedis(decode_responses=True), sampler=sampler)
+        assert monitor.get_current_metrics()["system_cpu_percent"] == fake.cpu
+
+    def test_batch_metrics_written_in_one_pipeline(self, sampler, fake, clock):
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        monitor = ResourceMonitor(redis_client, sampler=sampler)
+        feed(sampler, fake, clock, cpu=25)
+
+        monitor.record_jobs_metrics("t1", [f"job-{i}" for i in range(50)])
+
+        summary = monitor.get_tenant_metrics_summary("t1")
+        assert summary["job_count"] == 50
+        assert redis_client.zcard("job:metrics:index:tenant:t1") == 50
+        assert monitor.get_job_metrics("t1", "job-7")["system_cpu_percent"] == 25
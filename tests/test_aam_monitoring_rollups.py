@@ -0,0 +1,265 @@
+"""
+Tests for the incrementally maintained AAM monitoring rollups.
+
+Random Connection / JobHistory / DriftEvent transitions are committed through
+ORM sessions on SQLite; after each batch the Redis snapshot must equal the
+counts computed directly from the tables.
+"""
+
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from aam_hybrid.core.monitoring_rollups import ALL_SCOPE, DRIFT_SOURCES, MonitoringRollups
+from aam_hybrid.shared.models import Connection, ConnectionStatus, JobHistory, JobStatus, SyncCatalogVersion
+from app.models import Base, DriftEvent
+
+NOW = datetime(2026, 3, 18, 12, 30, 0)
+WINDOW_START = NOW.replace(minute=0, second=0) - timedelta(hours=23)
+
+
+# ======================================================================
+# Reference counts straight from the tables
+# ======================================================================
+def reference(session, tenant=None):
+    conns = session.query(Connection).all()
+    tenant_of = {c.id: c.tenant_id for c in conns}
+    if tenant:
+        conns = [c for c in conns if c.tenant_id == tenant]
+    by_status = Counter(c.status.value for c in conns)
+
+    jobs = [
+        j for j in session.query(JobHistory).all()
+        if j.started_at >= WINDOW_START and (tenant is None or tenant_of[j.connection_id] == tenant)
+    ]
+    repairs = [(j.completed_at - j.started_at).total_seconds() for j in jobs if j.completed_at]
+
+    drift = {source: 0 for source in DRIFT_SOURCES}
+    for d in session.query(DriftEvent).all():
+        if d.created_at >= WINDOW_START and (tenant is None or d.tenant_id == tenant):
+            source = (d.new_schema or {}).get("source_type") or "unknown"
+            drift[source] = drift.get(source, 0) + 1
+
+    return {
+        "total_connections": len(conns),
+        "connections_by_status": dict(by_status),
+        "jobs_24h": dict(Counter(j.status.value for j in jobs)),
+        "average_repair_time_seconds": round(sum(repairs) / len(repairs), 2) if repairs else 0,
+        "drift_24h": drift,
+    }
+
+
+def observed(rollups, tenant=None):
+    snapshot = rollups.snapshot(tenant)
+    snapshot.pop("reconciled_at")
+    return snapshot
+
+
+@pytest.fixture
+def env():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(
+        engine,
+        tables=[Connection.__table__, SyncCatalogVersion.__table__, JobHistory.__table__, DriftEvent.__table__],
+    )
+    factory = sessionmaker(bind=engine)
+    rollups = MonitoringRollups(fakeredis.FakeRedis(), clock=lambda: NOW)
+    rollups.install(factory)
+    with factory() as session:
+        rollups.reconcile(session)
+    yield factory, rollups
+    rollups.uninstall()
+    engine.dispose()
+
+
+# ======================================================================
+# Random transitions
+# ======================================================================
+def _random_transition(session, rng, tenants):
+    conns = session.query(Connection).all()
+    jobs = session.query(JobHistory).all()
+    op = rng.choice(
+        ["add_conn"] * 3 + ["conn_status"] * 3 + ["delete_conn"]
+        + ["add_job"] * 4 + ["finish_job"] * 3 + ["delete_job"] + ["add_drift"] * 2 + ["delete_drift"]
+    )
+    if op == "add_conn" or not conns:
+        session.add(Connection(
+            tenant_id=rng.choice(tenants), name="c", source_type="salesforce",
+            status=rng.choice(list(ConnectionStatus)),
+        ))
+    elif op == "conn_status":
+        rng.choice(conns).status = rng.choice(list(ConnectionStatus))
+    elif op == "delete_conn":
+        session.delete(rng.choice(conns))
+    elif op == "add_job":
+        session.add(JobHistory(
+            connection_id=rng.choice(conns).id,
+            status=rng.choice([JobStatus.PENDING, JobStatus.RUNNING]),
+            started_at=NOW - timedelta(minutes=rng.randrange(30 * 60)),
+        ))
+    elif op == "finish_job" and jobs:
+        job = rng.choice(jobs)
+        job.status = rng.choice([JobStatus.SUCCEEDED, JobStatus.FAILED])
+        job.completed_at = job.started_at + timedelta(seconds=rng.randrange(1, 600))
+    elif op == "delete_job" and jobs:
+        session.delete(rng.choice(jobs))
+    elif op == "add_drift":
+        schema = {"source_type": rng.choice(DRIFT_SOURCES + ("dynamics",))} if rng.random() < 0.9 else None
+        session.add(DriftEvent(
+            tenant_id=rng.choice(tenants), new_schema=schema,
+            created_at=NOW - timedelta(minutes=rng.randrange(30 * 60)),
+        ))
+    elif op == "delete_drift":
+        events = session.query(DriftEvent).all()
+        if events:
+            session.delete(rng.choice(events))
+
+
+class TestIncrementalRollups:
+    def test_random_transitions_match_tables(self, env):
+        factory, rollups = env
+        rng = random.Random(37)
+        tenants = [uuid.uuid4() for _ in range(3)]
+
+        for step in range(400):
+            with factory() as session:
+                for _ in range(rng.randint(1, 3)):
+                    _random_transition(session, rng, tenants)
+                    session.flush()
+                if rng.random() < 0.15:
+                    session.rollback()
+                else:
+                    session.commit()
+
+            if step % 50 == 49:
+                with factory() as session:
+                    assert observed(rollups) == reference(session), step
+                    for tenant in tenants:
+                        assert observed(rollups, tenant) == reference(session, tenant), (step, tenant)
+
+        assert not rollups.needs_reconcile
+        assert rollups.stats["commits_applied"] > 0
+        before = {tenant: observed(rollups, tenant) for tenant in tenants}
+        with factory() as session:
+            rollups.reconcile(session)
+        assert {tenant: observed(rollups, tenant) for tenant in tenants} == before
+
+    def test_rollback_is_not_counted(self, env):
+        factory, rollups = env
+        tenant = uuid.uuid4()
+        with factory() as session:
+            session.add(Connection(tenant_id=tenant, name="c", source_type="mongodb", status=ConnectionStatus.ACTIVE))
+            session.flush()
+            session.rollback()
+
+        assert observed(rollups, tenant)["total_connections"] == 0
+        assert observed(rollups)["total_connections"] == 0
+
+    def test_job_tenant_resolved_from_known_connection(self, env):
+        factory, rollups = env
+        tenant = uuid.uuid4()
+        with factory() as session:
+            conn = Connection(tenant_id=tenant, name="c", source_type="supabase", status=ConnectionStatus.ACTIVE)
+            session.add(conn)
+            session.commit()
+            conn_id = conn.id
+
+        # New session: the connection is not in the identity map
+        with factory() as session:
+            session.add(JobHistory(
+                connection_id=conn_id, status=JobStatus.SUCCEEDED,
+                started_at=NOW - timedelta(minutes=10), completed_at=NOW - timedelta(minutes=8),
+            ))
+            session.commit()
+
+        snapshot = observed(rollups, tenant)
+        assert snapshot["jobs_24h"] == {"succeeded": 1}
+        assert snapshot["average_repair_time_seconds"] == 120.0
+
+
+class TestReconcile:
+    def test_reconcile_corrects_bulk_updates(self, env):
+        factory, rollups = env
+        tenant = uuid.uuid4()
+        with factory() as session:
+            for _ in range(5):
+                session.add(Connection(tenant_id=tenant, name="c", source_type="s", status=ConnectionStatus.PENDING))
+            session.commit()
+            # Core UPDATE bypasses the flush listener
+            session.execute(update(Connection).values(status=ConnectionStatus.ACTIVE))
+            session.commit()
+
+        assert observed(rollups, tenant)["connections_by_status"] == {"PENDING": 5}
+        with factory() as session:
+            rollups.reconcile(session)
+            assert observed(rollups, tenant) == reference(session, tenant)
+        assert observed(rollups, tenant)["connections_by_status"] == {"ACTIVE": 5}
+
+    def test_bulk_statements_schedule_reconcile(self, env):
+        factory, rollups = env
+        with factory() as session:
+            session.add(Connection(tenant_id=uuid.uuid4(), name="c", source_type="s", status=ConnectionStatus.PENDING))
+            session.commit()
+            session.execute(update(Connection).values(status=ConnectionStatus.ACTIVE))
+            session.rollback()
+            assert not rollups.needs_reconcile
+
+            session.execute(update(Connection).values(status=ConnectionStatus.ACTIVE))
+            session.commit()
+            assert rollups.needs_reconcile
+
+            rollups.reconcile(session)
+            session.execute(JobHistory.__table__.delete())
+            session.commit()
+            assert rollups.needs_reconcile
+
+            rollups.reconcile(session)
+            session.execute(update(SyncCatalogVersion).values(version_number=2))
+            session.commit()
+        assert not rollups.needs_reconcile
+
+    def test_tenant_move_schedules_reconcile(self, env):
+        factory, rollups = env
+        old, new = uuid.uuid4(), uuid.uuid4()
+        with factory() as session:
+            conn = Connection(tenant_id=old, name="c", source_type="s", status=ConnectionStatus.ACTIVE)
+            conn.job_history.append(JobHistory(status=JobStatus.RUNNING, started_at=NOW))
+            session.add(conn)
+            session.commit()
+            conn.tenant_id = new
+            session.commit()
+
+        assert rollups.needs_reconcile
+        with factory() as session:
+            rollups.reconcile(session)
+            assert observed(rollups, old) == reference(session, old)
+            assert observed(rollups, new) == reference(session, new)
+        assert observed(rollups, new)["jobs_24h"] == {"running": 1}
+        assert not rollups.needs_reconcile
+
+    def test_reconcile_drops_vanished_scopes(self, env):
+        factory, rollups = env
+        tenant = uuid.uuid4()
+        with factory() as session:
+            session.add(Connection(tenant_id=tenant, name="c", source_type="s", status=ConnectionStatus.ACTIVE))
+            session.commit()
+        with factory() as session:
+            session.execute(Connection.__table__.delete())
+            session.commit()
+            rollups.reconcile(session)
+
+        assert observed(rollups, tenant)["total_connections"] == 0
+        assert observed(rollups, ALL_SCOPE)["total_connections"] == 0
+
+    def test_snapshot_none_before_first_reconcile(self):
+        rollups = MonitoringRollups(fakeredis.FakeRedis(), clock=lambda: NOW)
+        assert rollups.snapshot() is None
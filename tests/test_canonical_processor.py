@@ -342,3 +342,266 @@ class TestCanonicalProcessorUnit:
         
         assert processor.redis_client is not None
         assert processor.PROCESSOR_VERSION is not None
+
+
+def _legacy_snake_case(name):
+    import re
+    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+    s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
+    s3 = s2.replace(' ', '_').replace('-', '_')
+    return re.sub('_+', '_', s3.lower()).strip('_')
+
+
+def _fingerprint(hash_value, fields=("id",)):
+    return SchemaFingerprint(
+        fingerprint_hash=hash_value,
+        field_count=len(fields),
+        field_names=list(fields),
+        schema_version="v1.0",
+        connector_name="salesforce",
+        entity_type="Account"
+    )
+
+
+def _drift_event(event_id, previous="fp-1", current="fp-2", tenant_id="tenant-a"):
+    from app.contracts.canonical_event import DriftEvent
+    return DriftEvent(
+        event_id=event_id,
+        drift_type="schema_change",
+        severity="medium",
+        connector_name="salesforce",
+        entity_type="Account",
+        tenant_id=tenant_id,
+        changes={"added_fields": ["NewField"]},
+        previous_fingerprint=_fingerprint(previous),
+        current_fingerprint=_fingerprint(current),
+    )
+
+
+class TestNormalizationMemo:
+    """Test suite for memoized field-name normalization"""
+    
+    NAMES = [
+        "firstName", "First Name", "FIRST_NAME", "first-name", "AccountID",
+        "HTTPResponseCode", "x", "__weird--Name__", "Amount2Total", "already_snake",
+        "IsActive", "Opportunity Stage Name", "ÅngströmValue", "",
+    ]
+    
+    def test_matches_regex_conversion(self, mock_redis):
+        """Memoized conversion gives the same names as the regex pipeline"""
+        from aam_hybrid.core.canonical_processor import CanonicalProcessor, to_snake_case
+        
+        processor = CanonicalProcessor(mock_redis)
+        for name in self.NAMES:
+            assert to_snake_case(name) == _legacy_snake_case(name)
+            assert processor._to_snake_case(name) == _legacy_snake_case(name)
+    
+    def test_plan_reused_per_schema(self, mock_redis, sample_canonical_event):
+        """Events of one schema share a plan; payloads normalize identically"""
+        from aam_hybrid.core.canonical_processor import CanonicalProcessor, _normalization_plans
+        
+        _normalization_plans.clear()
+        processor = CanonicalProcessor(mock_redis)
+        first = sample_canonical_event.model_copy(deep=True)
+        second = sample_canonical_event.model_copy(deep=True)
+        second.payload = {"ExtraField": "n/a", **second.payload}
+        
+        original = dict(first.payload)
+        processor.normalize_event(first)
+        processor.normalize_event(second)
+        
+        assert len(_normalization_plans) == 1
+        plan = processor._normalization_plan(first)
+        assert set(plan) == set(original) | {"ExtraField"}
+        assert first.payload == {
+            _legacy_snake_case(k): processor._infer_and_convert_type(v) for k, v in original.items()
+        }
+        assert second.payload["extra_field"] is None
+    
+    def test_plan_cache_is_bounded(self):
+        """Least recently used schemas are evicted past max_plans"""
+        from aam_hybrid.core.canonical_processor import _NormalizationPlans
+        
+        plans = _NormalizationPlans(max_plans=3)
+        first = plans.get("sf", "fp-0")
+        first["A"] = "a"
+        for i in range(1, 4):
+            plans.get("sf", f"fp-{i}")
+        
+        assert len(plans) == 3
+        assert plans.get("sf", "fp-0") == {}
+    
+    def test_type_constants_unchanged(self, mock_redis):
+        """Null and boolean spellings still convert; other strings are preserved"""
+        from aam_hybrid.core.canonical_processor import CanonicalProcessor
+        
+        processor = CanonicalProcessor(mock_redis)
+        convert = processor._infer_and_convert_type
+        assert [convert(v) for v in ("NULL", "N/A", "na", "", None)] == [None] * 5
+        assert [convert(v) for v in ("TRUE", "Yes", "y")] == [True] * 3
+        assert [convert(v) for v in ("False", "NO", "n")] == [False] * 3
+        assert [convert(v) for v in ("123", "nothing", "yesterday", 5)] == ["123", "nothing", "yesterday", 5]
+
+
+class TestRepairCoordination:
+    """Test suite for the shared, coalescing RepairAgent front"""
+    
+    def _gated_agent(self, gate, started=None):
+        import threading
+        from aam_hybrid.core.repair_types import RepairBatch
+        
+        calls = []
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+        
+        def suggest_repairs(drift_event, canonical_event, db_session=None):
+            with lock:
+                calls.append(drift_event.event_id)
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            if started:
+                started.set()
+            gate.wait(5)
+            with lock:
+                active["now"] -= 1
+            return RepairBatch(drift_event_id=drift_event.event_id, total_fields=1)
+        
+        agent = MagicMock()
+        agent.suggest_repairs.side_effect = suggest_repairs
+        return agent, calls, active
+    
+    def test_identical_signatures_coalesce(self, sample_canonical_event):
+        """Concurrent identical drift runs one repair; each caller gets its own event ID"""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from aam_hybrid.core.repair_agent import RepairCoordinator
+        
+        gate, started = threading.Event(), threading.Event()
+        agent, calls, _ = self._gated_agent(gate, started)
+        coordinator = RepairCoordinator(agent)
+        
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            leader = pool.submit(coordinator.suggest_repairs, _drift_event("d-0"), sample_canonical_event)
+            assert started.wait(5)
+            followers = [
+                pool.submit(coordinator.suggest_repairs, _drift_event(f"d-{i}"), sample_canonical_event)
+                for i in range(1, 6)
+            ]
+            time.sleep(0.1)
+            gate.set()
+            results = [leader.result(5)] + [f.result(5) for f in followers]
+        
+        assert calls == ["d-0"]
+        assert [r.drift_event_id for r in results] == [f"d-{i}" for i in range(6)]
+        assert all(r.total_fields == 1 for r in results)
+        assert coordinator.stats["repairs"] + coordinator.stats["coalesced"] == 6
+        assert not coordinator._inflight
+    
+    def test_followers_get_their_own_hitl_audit(self, sample_canonical_event):
+        """Coalesced callers record HITL audits under their own drift event ID"""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from aam_hybrid.core.repair_agent import RepairCoordinator
+        from aam_hybrid.core.repair_types import RepairAction, RepairBatch, RepairSuggestion
+        
+        gate, started = threading.Event(), threading.Event()
+        
+        def suggest_repairs(drift_event, canonical_event, db_session=None):
+            started.set()
+            gate.wait(5)
+            batch = RepairBatch(drift_event_id=drift_event.event_id)
+            for field_name, action in (("amt", RepairAction.HITL_QUEUED), ("nm", RepairAction.AUTO_APPLIED)):
+                batch.add_suggestion(RepairSuggestion(
+                    field_name=field_name, suggested_mapping=field_name, confidence=0.7,
+                    confidence_reason="test", repair_action=action,
+                ))
+            return batch
+        
+        agent = MagicMock()
+        agent.suggest_repairs.side_effect = suggest_repairs
+        coordinator = RepairCoordinator(agent)
+        db = object()
+        
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            leader = pool.submit(coordinator.suggest_repairs, _drift_event("d-0"), sample_canonical_event, db)
+            assert started.wait(5)
+            followers = [
+                pool.submit(coordinator.suggest_repairs, _drift_event(f"d-{i}"), sample_canonical_event, db)
+                for i in (1, 2)
+            ]
+            time.sleep(0.1)
+            gate.set()
+            [f.result(5) for f in [leader] + followers]
+        
+        audited = sorted(
+            (c.args[0].field_name, c.args[1].event_id, c.args[2]) for c in agent.persist_hitl_audit.call_args_list
+        )
+        assert audited == [("amt", "d-1", db), ("amt", "d-2", db)]
+    
+    def test_concurrency_limit(self, sample_canonical_event):
+        """Distinct signatures run separately, at most max_concurrent at once"""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from aam_hybrid.core.repair_agent import RepairCoordinator
+        
+        gate = threading.Event()
+        agent, calls, active = self._gated_agent(gate)
+        coordinator = RepairCoordinator(agent, max_concurrent=2)
+        
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [
+                pool.submit(coordinator.suggest_repairs, _drift_event(f"d-{i}", current=f"fp-{i}"), sample_canonical_event)
+                for i in range(6)
+            ]
+            time.sleep(0.1)
+            assert active["now"] == 2
+            gate.set()
+            [f.result(5) for f in futures]
+        
+        assert sorted(calls) == [f"d-{i}" for i in range(6)]
+        assert active["max"] == 2
+    
+    def test_leader_error_reaches_followers(self, sample_canonical_event):
+        """A failed repair is reported to every coalesced caller and not cached"""
+        from aam_hybrid.core.repair_agent import RepairCoordinator
+        
+        agent = MagicMock()
+        agent.suggest_repairs.side_effect = RuntimeError("DCL down")
+        coordinator = RepairCoordinator(agent)
+        
+        with pytest.raises(RuntimeError):
+            coordinator.suggest_repairs(_drift_event("d-0"), sample_canonical_event)
+        with pytest.raises(RuntimeError):
+            coordinator.suggest_repairs(_drift_event("d-1"), sample_canonical_event)
+        assert agent.suggest_repairs.call_count == 2
+    
+    def test_processor_uses_shared_agent(self, mock_redis, sample_canonical_event):
+        """Drift across a batch reuses one RepairAgent per Redis client"""
+        from aam_hybrid.core import repair_agent as repair_agent_module
+        from aam_hybrid.core.canonical_processor import CanonicalProcessor
+        from aam_hybrid.core.repair_agent import reset_repair_coordinators
+        from aam_hybrid.core.repair_types import RepairBatch
+        
+        events = [sample_canonical_event.model_copy(deep=True) for _ in range(5)]
+        detector = MagicMock()
+        detector.return_value.detect_drift.side_effect = lambda e: _drift_event(f"d-{e.event_id}")
+        
+        with patch('aam_hybrid.core.canonical_processor.FeatureFlagConfig.is_enabled', return_value=True), \
+             patch('aam_hybrid.core.drift_detector.DriftDetector', detector), \
+             patch('aam_hybrid.core.repair_agent.RepairAgent') as agent_cls:
+            agent_cls.return_value.suggest_repairs.side_effect = (
+                lambda drift, event, db_session=None: RepairBatch(drift_event_id=drift.event_id)
+            )
+            CanonicalProcessor(mock_redis).process_events(events)
+            CanonicalProcessor(mock_redis).process_events([sample_canonical_event.model_copy(deep=True)])
+        
+        assert agent_cls.call_count == 1
+        assert agent_cls.return_value.suggest_repairs.call_count == 6
+        assert all(e.metadata.get("repair_processed") for e in events)
+        
+        reset_repair_coordinators()
+        agent_cls.return_value.close.assert_called_once()
+        assert not repair_agent_module._coordinators
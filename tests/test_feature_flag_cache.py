@@ -0,0 +1,181 @@
+"""
+Tests for the process-local feature flag snapshot cache in shared/feature_flags.py.
+
+Uses fakeredis: two clients on one FakeServer stand in for two worker
+processes sharing a Redis instance.
+"""
+
+import time
+
+import fakeredis
+import pytest
+
+from shared import feature_flags
+from shared.feature_flags import (
+    FlagSnapshotCache,
+    clear_feature_flag,
+    get_feature_flag,
+    get_feature_flag_percentage,
+    is_feature_enabled_for_user,
+    list_all_flags,
+    set_feature_flag,
+    set_feature_flag_percentage,
+)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(server, monkeypatch):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(feature_flags, "get_redis_client", lambda: client)
+    feature_flags.reset_flag_cache()
+    yield client
+    feature_flags.reset_flag_cache()
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if predicate():
+            return time.perf_counter() - start
+        time.sleep(0.005)
+    raise AssertionError("condition not met within timeout")
+
+
+def _wait_listening(cache: FlagSnapshotCache) -> None:
+    _wait_for(lambda: cache.listening)
+
+
+class TestSnapshotReads:
+    def test_read_your_writes_in_process(self, redis_client):
+        set_feature_flag("FLAG_A", True, "acme")
+        assert get_feature_flag("FLAG_A", "acme") is True
+
+        set_feature_flag("FLAG_A", False, "acme")
+        assert get_feature_flag("FLAG_A", "acme") is False
+
+        clear_feature_flag("FLAG_A", "acme")
+        assert get_feature_flag("FLAG_A", "acme") is False
+
+    def test_hot_path_does_not_hit_redis(self, redis_client, monkeypatch):
+        set_feature_flag("FLAG_A", True, "default")
+        set_feature_flag_percentage("FLAG_B", 50, "acme")
+        get_feature_flag("FLAG_A", "acme")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("unexpected Redis round trip")
+
+        monkeypatch.setattr(redis_client, "get", fail)
+        monkeypatch.setattr(redis_client, "hgetall", fail)
+
+        for i in range(1000):
+            assert get_feature_flag("FLAG_A", "acme") is True
+            is_feature_enabled_for_user("FLAG_B", f"user_{i}", "acme")
+        assert get_feature_flag_percentage("FLAG_B", "acme") == 50
+
+    def test_percentage_rollout_semantics_unchanged(self, redis_client):
+        set_feature_flag_percentage("FLAG_P", 50, "default")
+        enabled = sum(is_feature_enabled_for_user("FLAG_P", f"user_{i}") for i in range(100))
+        assert 40 <= enabled <= 60
+
+        set_feature_flag_percentage("FLAG_P", 0, "default")
+        assert not any(is_feature_enabled_for_user("FLAG_P", f"user_{i}") for i in range(10))
+
+        clear_feature_flag("FLAG_P", "default")
+        set_feature_flag("FLAG_P", True, "default")
+        assert is_feature_enabled_for_user("FLAG_P", "anyone") is True
+
+    def test_tenant_falls_back_to_default(self, redis_client):
+        set_feature_flag("FLAG_A", True, "default")
+        set_feature_flag("FLAG_B", True, "default")
+        set_feature_flag("FLAG_B", False, "acme")
+
+        assert get_feature_flag("FLAG_A", "acme") is True
+        assert get_feature_flag("FLAG_B", "acme") is False
+
+
+class TestInventory:
+    def test_list_all_flags_never_uses_keys(self, redis_client, monkeypatch):
+        monkeypatch.setattr(redis_client, "keys", lambda *a, **k: pytest.fail("KEYS called"))
+        set_feature_flag("FLAG_1", True, "test_tenant")
+        set_feature_flag("FLAG_2", False, "test_tenant")
+        set_feature_flag_percentage("FLAG_3", 10, "test_tenant")
+        set_feature_flag("FLAG_1", True, "other_tenant")
+
+        assert list_all_flags("test_tenant") == {"FLAG_1": True, "FLAG_2": False}
+
+    def test_legacy_keys_are_backfilled_once(self, redis_client):
+        redis_client.set("feature_flag:OLD_FLAG:acme", "1")
+        redis_client.set("feature_flag:OLD_FLAG:acme:percentage", "25")
+
+        assert list_all_flags("acme") == {"OLD_FLAG": True}
+        assert get_feature_flag_percentage("OLD_FLAG", "acme") == 25
+        assert redis_client.exists("feature_flag_index:__backfilled__")
+
+        # Per-flag keys stay in sync for readers that still use them
+        set_feature_flag("NEW_FLAG", True, "acme")
+        assert redis_client.get("feature_flag:NEW_FLAG:acme") == "1"
+
+
+class TestPropagation:
+    def test_change_reaches_other_process_quickly(self, redis_client, server):
+        other = FlagSnapshotCache(fakeredis.FakeRedis(server=server, decode_responses=True))
+        try:
+            _wait_listening(other)
+            assert other.get("acme") == {}
+            _wait_listening(feature_flags._get_snapshot_cache(redis_client))
+
+            set_feature_flag("FLAG_A", True, "acme")
+            delay = _wait_for(lambda: other.get("acme").get("FLAG_A") == "1")
+
+            clear_feature_flag("FLAG_A", "acme")
+            _wait_for(lambda: "FLAG_A" not in other.get("acme"))
+        finally:
+            other.close()
+
+        assert delay < 0.5
+        assert other.stats["loads"] == 1
+        assert other.stats["updates_applied"] >= 2
+
+    def test_reload_when_subscription_is_down(self, server):
+        now = [0.0]
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        cache = FlagSnapshotCache(client, max_staleness_s=5, clock=lambda: now[0], listen=False)
+
+        assert cache.get("acme") == {}
+        client.hset("feature_flag_index:acme", "FLAG_A", "1")
+
+        now[0] = 4.9
+        assert cache.get("acme") == {}
+        now[0] = 5.0
+        assert cache.get("acme") == {"FLAG_A": "1"}
+
+
+class TestRedisUnavailable:
+    def test_serves_last_snapshot_when_redis_goes_down(self, redis_client, server):
+        set_feature_flag("FLAG_A", True, "acme")
+        cache = feature_flags._get_snapshot_cache(redis_client)
+        _wait_listening(cache)
+        assert get_feature_flag("FLAG_A", "acme") is True
+        cache.max_age_s = cache.max_staleness_s = 0  # Force a reload attempt
+
+        server.connected = False
+        assert get_feature_flag("FLAG_A", "acme") is True
+        assert cache.stats["stale_served"] >= 1
+
+    def test_cold_cache_falls_back_to_false(self, redis_client, server):
+        server.connected = False
+        assert get_feature_flag("FLAG_A", "acme") is False
+        assert get_feature_flag_percentage("FLAG_A", "acme") is None
+        assert list_all_flags("acme") == {}
+        assert set_feature_flag("FLAG_A", True, "acme") is False
+
+    def test_no_client_behaves_as_before(self, monkeypatch):
+        monkeypatch.setattr(feature_flags, "get_redis_client", lambda: None)
+        assert get_feature_flag("FLAG_A") is False
+        assert is_feature_enabled_for_user("FLAG_A", "user") is False
+        assert list_all_flags() == {}
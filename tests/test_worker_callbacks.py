@@ -0,0 +1,310 @@
+"""
+Tests for the RQ worker's phase commits and the durable callback dispatcher.
+
+execute_task runs against SQLite and fakeredis; callbacks are delivered to a
+local HTTP stub that injects latency and failures.
+"""
+
+import os
+import time
+import uuid
+
+import fakeredis
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import callbacks, worker
+from app.callbacks import DEAD_LETTER_KEY, SCHEDULE_KEY, CallbackDispatcher, task_log_writer
+from app.models import Base, Task, TaskLog, Tenant
+from tests.fixtures.callback_endpoint_stub import StubCallbackEndpoint
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def endpoint():
+    stub = StubCallbackEndpoint().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def db_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Tenant.__table__, Task.__table__, TaskLog.__table__])
+    factory = sessionmaker(bind=engine)
+    factory.commits = 0
+
+    @event.listens_for(factory, "after_commit")
+    def count(session):
+        factory.commits += 1
+
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def dispatcher(db_factory, monkeypatch):
+    redis = fakeredis.FakeRedis()
+    clock = Clock()
+    client = httpx.Client(timeout=2.0)
+    dispatcher = CallbackDispatcher(
+        redis, client=client, max_attempts=3, backoff=[10, 60], concurrency=4,
+        lease_seconds=30, on_outcome=task_log_writer(db_factory), clock=clock,
+    )
+    dispatcher.clock_control = clock
+    monkeypatch.setattr(worker, "SessionLocal", db_factory)
+    monkeypatch.setattr(worker, "_redis_conn", redis)
+    monkeypatch.setattr(callbacks, "_dispatcher", dispatcher)
+    yield dispatcher
+    dispatcher.stop()
+    client.close()
+
+
+def make_task(factory, payload, **fields):
+    with factory() as db:
+        tenant = Tenant(name=f"tenant-{uuid.uuid4().hex[:8]}")
+        db.add(tenant)
+        db.flush()
+        task = Task(tenant_id=tenant.id, payload=payload, **fields)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+    factory.commits = 0
+    return task_id
+
+
+def task_logs(factory, task_id):
+    with factory() as db:
+        return [
+            log.message for log in
+            db.query(TaskLog).filter(TaskLog.task_id == task_id).order_by(TaskLog.timestamp).all()
+        ]
+
+
+# ======================================================================
+# execute_task
+# ======================================================================
+class TestExecuteTask:
+    def test_one_commit_per_phase(self, db_factory, dispatcher, endpoint):
+        task_id = make_task(
+            db_factory, {"action": "aoa_connect", "tenant_id": "t1", "sources": "a, b"}, callback_url=endpoint.url
+        )
+
+        worker.execute_task(str(task_id))
+
+        # start + success (which also records the queued callback)
+        assert db_factory.commits == 2
+        with db_factory() as db:
+            task = db.get(Task, task_id)
+            assert task.status == "success"
+            assert task.result["sources"] == ["a", "b"]
+        logs = task_logs(db_factory, task_id)
+        assert logs[0] == "Task execution started"
+        assert logs[-1].startswith("Queued callback ")
+        assert len(logs) == 4
+        # Nothing was sent inline
+        assert endpoint.requests == 0
+        assert dispatcher.pending() == 1
+
+    def test_slow_callback_does_not_block_worker(self, db_factory, dispatcher, endpoint):
+        endpoint.latency = 0.5
+        task_id = make_task(db_factory, {"action": "aoa_reset", "tenant_id": "t1"}, callback_url=endpoint.url)
+
+        start = time.perf_counter()
+        worker.execute_task(str(task_id))
+        assert time.perf_counter() - start < 0.4
+
+        outcomes = dispatcher.drain()
+        assert [o.status for o in outcomes] == ["delivered"]
+        assert endpoint.received[0]["id"] == str(task_id)
+        assert endpoint.received[0]["status"] == "success"
+        assert task_logs(db_factory, task_id)[-1] == "Successfully sent callback with status 200"
+
+    def test_failure_is_one_commit(self, db_factory, dispatcher):
+        task_id = make_task(db_factory, {"action": "unknown"})
+
+        worker.execute_task(str(task_id))
+
+        assert db_factory.commits == 2
+        with db_factory() as db:
+            task = db.get(Task, task_id)
+            assert task.status == "failed"
+            assert task.result["error_type"] == "ValueError"
+        assert task_logs(db_factory, task_id) == [
+            "Task execution started",
+            "Task failed with error: Unknown action: unknown",
+            "Task permanently failed after all retries",
+        ]
+
+    def test_handler_logs_survive_failure(self, db_factory, dispatcher, monkeypatch):
+        def broken(log, payload):
+            log("Attempting something")
+            raise RuntimeError("boom")
+
+        monkeypatch.setitem(worker.ACTION_HANDLERS, "broken", broken)
+        task_id = make_task(db_factory, {"action": "broken"})
+
+        worker.execute_task(str(task_id))
+
+        assert task_logs(db_factory, task_id) == [
+            "Task execution started",
+            "Attempting something",
+            "Task failed with error: boom",
+            "Task permanently failed after all retries",
+        ]
+
+    def test_callback_queued_only_after_commit(self, db_factory, dispatcher, endpoint):
+        task_id = make_task(db_factory, {"action": "aoa_reset", "tenant_id": "t1"}, callback_url=endpoint.url)
+        commits = []
+
+        @event.listens_for(db_factory, "before_commit")
+        def fail_success_commit(session):
+            commits.append(dispatcher.pending())
+            if len(commits) == 2:
+                raise RuntimeError("database went away")
+
+        worker.execute_task(str(task_id))
+
+        # Nothing was queued before either phase committed
+        assert commits == [0, 0, 0]
+        outcomes = dispatcher.drain()
+        assert [o.status for o in outcomes] == ["delivered"]
+        assert [body["status"] for body in endpoint.received] == ["failed"]
+        logs = task_logs(db_factory, task_id)
+        assert sum(line.startswith("Queued callback ") for line in logs) == 1
+        assert f"Queued callback {outcomes[0].delivery.id} to {endpoint.url}" in logs
+
+    def test_chained_task_committed_before_enqueue(self, db_factory, dispatcher, monkeypatch):
+        enqueued = []
+
+        def enqueue(next_task_id, next_task_data):
+            with db_factory() as db:
+                enqueued.append(db.get(Task, next_task_id) is not None)
+
+        monkeypatch.setattr(worker, "_enqueue_chained_task", enqueue)
+        task_id = make_task(
+            db_factory,
+            {"action": "aoa_reset", "tenant_id": "t1"},
+            on_success_next_task={"payload": {"action": "aoa_reset", "tenant_id": "t1"}},
+        )
+
+        worker.execute_task(str(task_id))
+
+        assert enqueued == [True]
+        assert db_factory.commits == 2
+        with db_factory() as db:
+            assert db.get(Task, task_id).next_task_id is not None
+
+
+# ======================================================================
+# CallbackDispatcher
+# ======================================================================
+class TestCallbackDispatcher:
+    def test_retries_with_backoff_then_delivers(self, dispatcher, endpoint):
+        clock = dispatcher.clock_control
+        endpoint.fail_remaining = 2
+        dispatcher.enqueue(endpoint.url, {"n": 1})
+
+        assert [o.status for o in dispatcher.drain()] == ["retrying"]
+        # Not due again until the backoff has elapsed
+        assert dispatcher.drain() == []
+        clock.now += 8
+        assert dispatcher.drain() == []
+        clock.now += 5
+        assert [o.status for o in dispatcher.drain()] == ["retrying"]
+        clock.now += 75
+        outcomes = dispatcher.drain()
+
+        assert [o.status for o in outcomes] == ["delivered"]
+        assert outcomes[0].delivery.attempts == 3
+        assert endpoint.received == [{"n": 1}]
+        assert dispatcher.pending() == 0
+
+    def test_dead_letter_and_requeue(self, dispatcher, endpoint):
+        clock = dispatcher.clock_control
+        endpoint.fail_remaining = 100
+        endpoint.fail_status = 500
+        delivery_id = dispatcher.enqueue(endpoint.url, {"n": 1})
+
+        for _ in range(3):
+            dispatcher.drain()
+            clock.now += 100
+
+        assert dispatcher.pending() == 0
+        dead = dispatcher.dead_letters()
+        assert [d.id for d in dead] == [delivery_id]
+        assert dead[0].attempts == 3
+        assert "500" in dead[0].last_error
+
+        endpoint.fail_remaining = 0
+        assert dispatcher.requeue_dead(delivery_id)
+        assert dispatcher.redis.llen(DEAD_LETTER_KEY) == 0
+        assert [o.status for o in dispatcher.drain()] == ["delivered"]
+
+    def test_unsettled_claim_is_redelivered_after_lease(self, dispatcher, endpoint):
+        clock = dispatcher.clock_control
+        dispatcher.enqueue(endpoint.url, {"n": 1})
+
+        # A dispatcher that claims and then dies
+        assert len(dispatcher._claim(10)) == 1
+        assert dispatcher._claim(10) == []
+        clock.now += 31
+
+        assert [o.status for o in dispatcher.drain()] == ["delivered"]
+        assert dispatcher.redis.zcard(SCHEDULE_KEY) == 0
+
+    def test_parallel_delivery(self, dispatcher, endpoint):
+        endpoint.latency = 0.2
+        for n in range(8):
+            dispatcher.enqueue(endpoint.url, {"n": n})
+
+        start = time.perf_counter()
+        outcomes = dispatcher.drain()
+        elapsed = time.perf_counter() - start
+
+        assert len(outcomes) == 8 and all(o.status == "delivered" for o in outcomes)
+        # concurrency=4: two rounds rather than eight
+        assert elapsed < 1.2
+        assert sorted(body["n"] for body in endpoint.received) == list(range(8))
+
+    def test_restart_after_stop_delivers(self, dispatcher, endpoint):
+        dispatcher.start(poll_interval=0.01)
+        dispatcher.stop()
+        dispatcher.start(poll_interval=0.01)
+        dispatcher.enqueue(endpoint.url, {"n": 1})
+
+        deadline = time.time() + 2
+        while not endpoint.received and time.time() < deadline:
+            time.sleep(0.01)
+        assert endpoint.received == [{"n": 1}]
+
+
+# ======================================================================
+# Shared HTTP client
+# ======================================================================
+class TestHttpClient:
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_forked_child_gets_its_own_client(self):
+        parent_client = callbacks.get_http_client()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            same = callbacks.get_http_client() is parent_client
+            os.write(write_fd, b"same" if same else b"fresh")
+            os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd, "rb") as reader:
+            assert reader.read() == b"fresh"
+        assert callbacks.get_http_client() is parent_client